@@ -13,6 +13,19 @@ Funcionalidades:
 - Calcula scores agregados
 - Actualiza perfil en BD
 
+AGREGACIÓN INCREMENTAL:
+- Por juez se guardan estadísticas fusionables (conteo, suma, suma de
+  cuadrados e histogramas) en estadisticas_jueces.
+- Triggers sobre sentencias_por_juez_arg anotan en cambios_perfil_sentencia
+  cada sentencia insertada, re-analizada o borrada; la marca de agua es el
+  último seq procesado. Cada corrida sólo lee esas sentencias.
+- aportes_agregacion guarda el aporte de cada sentencia: si se re-analiza o
+  se borra, se resta el aporte anterior antes de sumar el nuevo.
+- Las métricas se leen de metricas_sentencia (columnas tipadas, ver
+  metricas_sentencia.py), no del JSON de perfil_cognitivo.
+- --reconstruir recalcula todo desde cero; --verificar compara las
+  estadísticas incrementales con el cálculo completo original sin escribir.
+
 AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
@@ -23,8 +36,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 from collections import Counter
+import math
 import statistics
 
+from metricas_sentencia import asegurar_metricas
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -50,6 +66,236 @@ def print_info(text):
     print(f"{Colors.OKBLUE}ℹ {text}{Colors.ENDC}")
 
 
+# Métricas escalares: campo en el perfil del juez <- campo en analisis_judicial
+CAMPOS_ESCALARES = {
+    'tendencia_activismo': 'tendencia_activismo',
+    'formalismo_vs_sustancialismo': 'formalismo_vs_sustancialismo',
+    'proteccion_derechos_fundamentales': 'proteccion_general',
+    'deferencia_legislativo': 'deferencia_legislativo',
+    'deferencia_ejecutivo': 'deferencia_ejecutivo',
+}
+
+# Diccionarios de métricas (se promedia cada clave donde aparece)
+CAMPOS_DICCIONARIO = {
+    'derechos_protegidos': 'derechos_protegidos',
+    'tests_aplicados': 'tests_aplicados',
+    'in_dubio_pro': 'in_dubio_pro_aplicado',
+    'sesgos': 'sesgos_detectados',
+    'fuentes': 'fuentes_citadas',
+}
+
+# Categorías (se toma la moda)
+CAMPOS_CATEGORIA = {
+    'interpretacion_normativa': 'interpretacion_normativa',
+    'estandar_prueba_preferido': 'estandar_prueba',
+    'sesgo_dominante': 'sesgo_dominante',
+}
+
+SQL_CAMBIOS = """
+CREATE TABLE IF NOT EXISTS cambios_perfil_sentencia (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    sentencia_id TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_cambio_perfil_insert
+AFTER INSERT ON sentencias_por_juez_arg
+WHEN NEW.perfil_cognitivo IS NOT NULL
+BEGIN
+    INSERT INTO cambios_perfil_sentencia (sentencia_id) VALUES (NEW.sentencia_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cambio_perfil_update
+AFTER UPDATE OF perfil_cognitivo, juez, materia ON sentencias_por_juez_arg
+BEGIN
+    INSERT INTO cambios_perfil_sentencia (sentencia_id) VALUES (NEW.sentencia_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cambio_perfil_delete
+AFTER DELETE ON sentencias_por_juez_arg
+BEGIN
+    INSERT INTO cambios_perfil_sentencia (sentencia_id) VALUES (OLD.sentencia_id);
+END;
+
+CREATE TABLE IF NOT EXISTS aportes_agregacion (
+    sentencia_id TEXT PRIMARY KEY,
+    juez TEXT NOT NULL,
+    aporte TEXT NOT NULL              -- JSON: ver extraer_aporte()
+);
+CREATE INDEX IF NOT EXISTS idx_aportes_juez ON aportes_agregacion(juez);
+
+CREATE TABLE IF NOT EXISTS estadisticas_jueces (
+    juez TEXT PRIMARY KEY,
+    estado TEXT NOT NULL,             -- JSON: EstadisticasJuez.a_dict()
+    fecha TEXT
+);
+
+CREATE TABLE IF NOT EXISTS agregacion_marcas (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+# Métricas ya proyectadas + materia (no lee el JSON de perfil_cognitivo)
+SQL_METRICAS = """
+SELECT m.*, s.materia AS materia_sentencia
+FROM metricas_sentencia m
+JOIN sentencias_por_juez_arg s ON s.sentencia_id = m.sentencia_id
+"""
+
+
+def _numero(valor) -> float:
+    try:
+        return float(valor or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def moda_determinista(histograma: Dict[str, int]) -> Optional[str]:
+    """Valor más frecuente; ante empate, el menor alfabéticamente"""
+    vivos = [(c, v) for v, c in histograma.items() if c > 0]
+    if not vivos:
+        return None
+    return min(vivos, key=lambda cv: (-cv[0], cv[1]))[1]
+
+
+def extraer_aporte(metricas: Dict, materia: Optional[str]) -> Dict:
+    """
+    Reduce una fila de metricas_sentencia (perfil_cognitivo ya proyectado en
+    columnas) a lo que necesita la agregación.
+    """
+    aporte = {'materia': materia, 'cognitivo': bool(metricas.get('tiene_cognitivo'))}
+    if metricas.get('tiene_judicial'):
+        aporte['escalares'] = {
+            campo: _numero(metricas.get(origen)) for campo, origen in CAMPOS_ESCALARES.items()
+        }
+        aporte['diccionarios'] = {
+            campo: {k: _numero(v) for k, v in json.loads(metricas[origen]).items()}
+            for campo, origen in CAMPOS_DICCIONARIO.items() if metricas.get(origen)
+        }
+        aporte['categorias'] = {
+            campo: metricas[origen]
+            for campo, origen in CAMPOS_CATEGORIA.items() if metricas.get(origen)
+        }
+    return aporte
+
+
+class EstadisticasJuez:
+    """
+    Estadísticas fusionables de un juez: [conteo, suma, suma de cuadrados]
+    por métrica e histogramas por categoría. Sumar o restar el aporte de una
+    sentencia es O(tamaño del aporte); dos estados se combinan con fusionar().
+    """
+
+    def __init__(self):
+        self.n_sentencias = 0
+        self.n_judicial = 0
+        self.n_cognitivo = 0
+        self.escalares: Dict[str, List[float]] = {}
+        self.diccionarios: Dict[str, Dict[str, List[float]]] = {}
+        self.categorias: Dict[str, Dict[str, int]] = {}
+        self.materias: Dict[str, int] = {}
+
+    @staticmethod
+    def _acumular(momentos: List[float], valor: float, signo: int):
+        momentos[0] += signo
+        momentos[1] += signo * valor
+        momentos[2] += signo * valor * valor
+
+    def agregar(self, aporte: Dict, signo: int = 1):
+        """Suma (signo=1) o resta (signo=-1) el aporte de una sentencia"""
+        self.n_sentencias += signo
+        if aporte.get('cognitivo'):
+            self.n_cognitivo += signo
+        if aporte.get('materia'):
+            self.materias[aporte['materia']] = self.materias.get(aporte['materia'], 0) + signo
+
+        if 'escalares' not in aporte:
+            return
+        self.n_judicial += signo
+        for campo, valor in aporte['escalares'].items():
+            self._acumular(self.escalares.setdefault(campo, [0, 0.0, 0.0]), valor, signo)
+        for grupo, valores in aporte['diccionarios'].items():
+            destino = self.diccionarios.setdefault(grupo, {})
+            for clave, valor in valores.items():
+                self._acumular(destino.setdefault(clave, [0, 0.0, 0.0]), valor, signo)
+        for campo, valor in aporte['categorias'].items():
+            histograma = self.categorias.setdefault(campo, {})
+            histograma[valor] = histograma.get(valor, 0) + signo
+
+    def fusionar(self, otro: 'EstadisticasJuez'):
+        """Combina otro estado en éste (p.ej. particiones calculadas en paralelo)"""
+        self.n_sentencias += otro.n_sentencias
+        self.n_judicial += otro.n_judicial
+        self.n_cognitivo += otro.n_cognitivo
+        for campo, m in otro.escalares.items():
+            destino = self.escalares.setdefault(campo, [0, 0.0, 0.0])
+            for i in range(3):
+                destino[i] += m[i]
+        for grupo, claves in otro.diccionarios.items():
+            destino_grupo = self.diccionarios.setdefault(grupo, {})
+            for clave, m in claves.items():
+                destino = destino_grupo.setdefault(clave, [0, 0.0, 0.0])
+                for i in range(3):
+                    destino[i] += m[i]
+        for campo, histograma in otro.categorias.items():
+            destino = self.categorias.setdefault(campo, {})
+            for valor, c in histograma.items():
+                destino[valor] = destino.get(valor, 0) + c
+        for materia, c in otro.materias.items():
+            self.materias[materia] = self.materias.get(materia, 0) + c
+
+    @staticmethod
+    def media(momentos: List[float]) -> Optional[float]:
+        return momentos[1] / momentos[0] if momentos[0] > 0 else None
+
+    @staticmethod
+    def desvio(momentos: List[float]) -> Optional[float]:
+        """Desvío estándar poblacional"""
+        if momentos[0] <= 0:
+            return None
+        media = momentos[1] / momentos[0]
+        return math.sqrt(max(momentos[2] / momentos[0] - media * media, 0.0))
+
+    def resultado(self) -> Dict:
+        """Mismo formato que agregar_perfil_judicial()"""
+        if self.n_judicial <= 0:
+            return {}
+        agregado = {}
+        for campo in CAMPOS_ESCALARES:
+            media = self.media(self.escalares.get(campo, [0, 0.0, 0.0]))
+            if media is not None:
+                agregado[campo] = round(media, 3)
+        for grupo in CAMPOS_DICCIONARIO:
+            agregado[grupo] = {
+                clave: round(m[1] / m[0], 3)
+                for clave, m in self.diccionarios.get(grupo, {}).items() if m[0] > 0
+            }
+        for campo in CAMPOS_CATEGORIA:
+            moda = moda_determinista(self.categorias.get(campo, {}))
+            if moda is not None:
+                agregado[campo] = moda
+        return agregado
+
+    def temas(self, top_n: int = 10) -> List[str]:
+        vivos = [(c, m) for m, c in self.materias.items() if c > 0]
+        return [m for _, m in sorted(vivos, key=lambda cm: (-cm[0], cm[1]))[:top_n]]
+
+    def a_dict(self) -> Dict:
+        return {
+            'n_sentencias': self.n_sentencias, 'n_judicial': self.n_judicial,
+            'n_cognitivo': self.n_cognitivo, 'escalares': self.escalares,
+            'diccionarios': self.diccionarios, 'categorias': self.categorias,
+            'materias': self.materias
+        }
+
+    @classmethod
+    def de_dict(cls, datos: Dict) -> 'EstadisticasJuez':
+        estado = cls()
+        for clave, valor in datos.items():
+            setattr(estado, clave, valor)
+        return estado
+
+
 class AgregadorPerfilesJueces:
     """
     Agrega análisis de múltiples sentencias para consolidar perfiles de jueces
@@ -69,6 +315,8 @@ class AgregadorPerfilesJueces:
 
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
+        self.conn.executescript(SQL_CAMBIOS)
+        asegurar_metricas(self.conn)
 
     def cerrar_bd(self):
         """Cierra la conexión"""
@@ -142,8 +390,8 @@ class AgregadorPerfilesJueces:
             return (None, 0)
 
         counter = Counter(valores)
-        moda = counter.most_common(1)[0]
-        return moda
+        moda = moda_determinista(counter)
+        return (moda, counter[moda])
 
     def agregar_perfil_judicial(self, sentencias: List[Dict]) -> Dict:
         """
@@ -268,7 +516,7 @@ class AgregadorPerfilesJueces:
             return []
 
         counter = Counter(materias)
-        return [tema for tema, _ in counter.most_common(top_n)]
+        return [tema for tema, _ in sorted(counter.items(), key=lambda tc: (-tc[1], tc[0]))[:top_n]]
 
     def calcular_confianza_perfil(self, n_sentencias: int) -> float:
         """
@@ -290,6 +538,180 @@ class AgregadorPerfilesJueces:
         else:
             return 1.0
 
+    # ------------------------------------------------------
+    # Estadísticas incrementales
+    # ------------------------------------------------------
+    def _filas_dict(self) -> List[Dict]:
+        columnas = [desc[0] for desc in self.cursor.description]
+        return [dict(zip(columnas, fila)) for fila in self.cursor.fetchall()]
+
+    def _marca(self) -> Optional[int]:
+        self.cursor.execute("SELECT valor FROM agregacion_marcas WHERE clave = 'cambios'")
+        fila = self.cursor.fetchone()
+        return fila[0] if fila else None
+
+    def _cargar_estados(self, jueces) -> Dict[str, EstadisticasJuez]:
+        jueces = list(jueces)
+        estados = {}
+        for i in range(0, len(jueces), 500):
+            bloque = jueces[i:i + 500]
+            self.cursor.execute(
+                f"SELECT juez, estado FROM estadisticas_jueces WHERE juez IN ({','.join('?' * len(bloque))})",
+                bloque
+            )
+            for juez, estado in self.cursor.fetchall():
+                estados[juez] = EstadisticasJuez.de_dict(json.loads(estado))
+        return estados
+
+    def _guardar_estados(self, estados: Dict[str, EstadisticasJuez], marca: int):
+        ahora = datetime.now().isoformat()
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO estadisticas_jueces (juez, estado, fecha) VALUES (?, ?, ?)",
+            [(juez, json.dumps(e.a_dict(), ensure_ascii=False), ahora) for juez, e in estados.items()]
+        )
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO agregacion_marcas (clave, valor) VALUES ('cambios', ?)", (marca,)
+        )
+        self.cursor.execute("DELETE FROM cambios_perfil_sentencia WHERE seq <= ?", (marca,))
+
+    def procesar_cambios(self) -> List[str]:
+        """
+        Incorpora a las estadísticas sólo las sentencias cambiadas desde la
+        marca de agua. Devuelve los jueces afectados.
+        """
+        marca = self._marca()
+        if marca is None:
+            print_info("Sin estadísticas previas: reconstrucción completa")
+            return self.reconstruir_estadisticas()
+
+        self.cursor.execute("SELECT MAX(seq) FROM cambios_perfil_sentencia WHERE seq > ?", (marca,))
+        nueva_marca = self.cursor.fetchone()[0]
+        if nueva_marca is None:
+            return []
+
+        self.cursor.execute(
+            "SELECT DISTINCT sentencia_id FROM cambios_perfil_sentencia WHERE seq > ? AND seq <= ?",
+            (marca, nueva_marca)
+        )
+        ids = [fila[0] for fila in self.cursor.fetchall()]
+
+        anteriores, actuales = {}, {}
+        for i in range(0, len(ids), 500):
+            bloque = ids[i:i + 500]
+            marcadores = ','.join('?' * len(bloque))
+            self.cursor.execute(
+                f"SELECT sentencia_id, juez, aporte FROM aportes_agregacion WHERE sentencia_id IN ({marcadores})",
+                bloque
+            )
+            for sent_id, juez, aporte in self.cursor.fetchall():
+                anteriores[sent_id] = (juez, json.loads(aporte))
+            self.cursor.execute(
+                f"""{SQL_METRICAS} WHERE m.sentencia_id IN ({marcadores})""", bloque
+            )
+            for metricas in self._filas_dict():
+                actuales[metricas['sentencia_id']] = (
+                    metricas['juez'], extraer_aporte(metricas, metricas['materia_sentencia'])
+                )
+
+        jueces = {juez for juez, _ in anteriores.values()} | {juez for juez, _ in actuales.values()}
+        estados = self._cargar_estados(jueces)
+        for juez in jueces:
+            estados.setdefault(juez, EstadisticasJuez())
+
+        for juez, aporte in anteriores.values():
+            estados[juez].agregar(aporte, -1)
+        for juez, aporte in actuales.values():
+            estados[juez].agregar(aporte)
+
+        try:
+            self.cursor.executemany(
+                "DELETE FROM aportes_agregacion WHERE sentencia_id = ?",
+                [(sent_id,) for sent_id in anteriores if sent_id not in actuales]
+            )
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO aportes_agregacion (sentencia_id, juez, aporte) VALUES (?, ?, ?)",
+                [(sent_id, juez, json.dumps(aporte, ensure_ascii=False))
+                 for sent_id, (juez, aporte) in actuales.items()]
+            )
+            self._guardar_estados(estados, nueva_marca)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+        print_info(f"Sentencias incorporadas: {len(ids)} (marca {marca} → {nueva_marca})")
+        return sorted(jueces)
+
+    def reconstruir_estadisticas(self) -> List[str]:
+        """Recalcula estadísticas y aportes de todas las sentencias desde cero"""
+        self.cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios_perfil_sentencia")
+        marca = self.cursor.fetchone()[0]
+
+        estados: Dict[str, EstadisticasJuez] = {}
+        aportes = []
+        lector = self.conn.execute(SQL_METRICAS)
+        columnas = [desc[0] for desc in lector.description]
+        for fila in lector:
+            metricas = dict(zip(columnas, fila))
+            juez = metricas['juez']
+            aporte = extraer_aporte(metricas, metricas['materia_sentencia'])
+            estados.setdefault(juez, EstadisticasJuez()).agregar(aporte)
+            aportes.append((metricas['sentencia_id'], juez, json.dumps(aporte, ensure_ascii=False)))
+
+        try:
+            self.cursor.execute("DELETE FROM aportes_agregacion")
+            self.cursor.execute("DELETE FROM estadisticas_jueces")
+            self.cursor.executemany(
+                "INSERT INTO aportes_agregacion (sentencia_id, juez, aporte) VALUES (?, ?, ?)", aportes
+            )
+            self._guardar_estados(estados, marca)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+        print_info(f"Estadísticas reconstruidas: {len(aportes)} sentencias, {len(estados)} jueces")
+        return sorted(estados)
+
+    def _escribir_perfil(self, juez: str, estado: EstadisticasJuez) -> float:
+        """UPDATE del perfil a partir de las estadísticas (sin commit). Devuelve la confianza"""
+        valores = estado.resultado()
+        temas = estado.temas()
+        confianza = self.calcular_confianza_perfil(estado.n_sentencias)
+
+        self.cursor.execute("""
+        UPDATE perfiles_judiciales_argentinos
+        SET
+            total_sentencias_analizadas = ?,
+            tendencia_activismo = ?,
+            interpretacion_normativa = ?,
+            formalismo_vs_sustancialismo = ?,
+            proteccion_derechos_fundamentales = ?,
+            deferencia_legislativo = ?,
+            deferencia_ejecutivo = ?,
+            estandar_prueba_preferido = ?,
+            temas_recurrentes = ?,
+            confianza_perfil = ?,
+            ultima_actualizacion = ?,
+            version_analyser = ?
+        WHERE juez = ?
+        """, (
+            estado.n_sentencias,
+            valores.get('tendencia_activismo'),
+            valores.get('interpretacion_normativa'),
+            valores.get('formalismo_vs_sustancialismo'),
+            valores.get('proteccion_derechos_fundamentales'),
+            valores.get('deferencia_legislativo'),
+            valores.get('deferencia_ejecutivo'),
+            valores.get('estandar_prueba_preferido'),
+            json.dumps(temas, ensure_ascii=False),
+            confianza,
+            datetime.now().isoformat(),
+            '1.1-incremental',
+            juez
+        ))
+        return confianza
+
     def actualizar_perfil_juez(self, juez: str) -> bool:
         """
         Actualiza el perfil completo de un juez en la BD
@@ -302,70 +724,25 @@ class AgregadorPerfilesJueces:
         """
         print(f"\n{Colors.BOLD}Agregando perfil para: {juez}{Colors.ENDC}")
 
-        # 1. Obtener todas las sentencias
-        print_info("Obteniendo sentencias...")
-        sentencias = self.obtener_sentencias_juez(juez)
+        # 1. Incorporar sentencias nuevas o re-analizadas (de todos los jueces)
+        print_info("Incorporando cambios desde la última agregación...")
+        self.procesar_cambios()
 
-        if not sentencias:
+        estado = self._cargar_estados([juez]).get(juez)
+        if estado is None or estado.n_sentencias <= 0:
             print_error("No hay sentencias analizadas para este juez")
             return False
 
-        print_success(f"Sentencias encontradas: {len(sentencias)}")
-
-        # 2. Agregar perfiles
-        print_info("Agregando análisis judicial...")
-        perfil_judicial_agregado = self.agregar_perfil_judicial(sentencias)
-
-        print_info("Agregando análisis cognitivo...")
-        perfil_cognitivo_agregado = self.agregar_perfil_cognitivo(sentencias)
-
-        # 3. Temas recurrentes
-        temas = self.identificar_temas_recurrentes(sentencias)
+        print_success(f"Sentencias agregadas: {estado.n_sentencias}")
 
-        # 4. Confianza
-        confianza = self.calcular_confianza_perfil(len(sentencias))
-
-        # 5. Actualizar BD
+        # 2. Actualizar BD
         print_info("Actualizando base de datos...")
         try:
-            # Extraer valores del perfil judicial agregado
-            valores = perfil_judicial_agregado
-
-            self.cursor.execute("""
-            UPDATE perfiles_judiciales_argentinos
-            SET
-                total_sentencias_analizadas = ?,
-                tendencia_activismo = ?,
-                interpretacion_normativa = ?,
-                formalismo_vs_sustancialismo = ?,
-                proteccion_derechos_fundamentales = ?,
-                deferencia_legislativo = ?,
-                deferencia_ejecutivo = ?,
-                estandar_prueba_preferido = ?,
-                temas_recurrentes = ?,
-                confianza_perfil = ?,
-                ultima_actualizacion = ?,
-                version_analyser = ?
-            WHERE juez = ?
-            """, (
-                len(sentencias),
-                valores.get('tendencia_activismo'),
-                valores.get('interpretacion_normativa'),
-                valores.get('formalismo_vs_sustancialismo'),
-                valores.get('proteccion_derechos_fundamentales'),
-                valores.get('deferencia_legislativo'),
-                valores.get('deferencia_ejecutivo'),
-                valores.get('estandar_prueba_preferido'),
-                json.dumps(temas, ensure_ascii=False),
-                confianza,
-                datetime.now().isoformat(),
-                '1.0-agregado',
-                juez
-            ))
-
+            confianza = self._escribir_perfil(juez, estado)
             self.conn.commit()
+            temas = estado.temas()
             print_success(f"Perfil actualizado exitosamente")
-            print_info(f"  - Sentencias: {len(sentencias)}")
+            print_info(f"  - Sentencias: {estado.n_sentencias}")
             print_info(f"  - Confianza: {confianza:.2f}")
             print_info(f"  - Temas: {', '.join(temas[:3]) if temas else 'N/A'}")
 
@@ -376,45 +753,44 @@ class AgregadorPerfilesJueces:
             self.conn.rollback()
             return False
 
-    def agregar_todos_los_jueces(self) -> Dict:
+    def agregar_todos_los_jueces(self, reconstruir: bool = False) -> Dict:
         """
-        Agrega perfiles de todos los jueces que tienen sentencias
+        Agrega perfiles de los jueces con sentencias nuevas desde la última
+        corrida (todos si reconstruir=True)
 
         Returns:
             Estadísticas del procesamiento
         """
         print(f"\n{Colors.BOLD}{'='*70}")
-        print("AGREGACIÓN DE PERFILES - TODOS LOS JUECES")
+        print("AGREGACIÓN DE PERFILES - " + ("RECONSTRUCCIÓN COMPLETA" if reconstruir else "INCREMENTAL"))
         print(f"{'='*70}{Colors.ENDC}\n")
 
-        # Obtener todos los jueces con sentencias analizadas
-        self.cursor.execute("""
-        SELECT DISTINCT juez
-        FROM sentencias_por_juez_arg
-        WHERE perfil_cognitivo IS NOT NULL
-        """)
-
-        jueces = [row[0] for row in self.cursor.fetchall()]
+        jueces = self.reconstruir_estadisticas() if reconstruir else self.procesar_cambios()
 
         if not jueces:
-            print_error("No hay jueces con sentencias analizadas")
+            print_info("No hay sentencias nuevas desde la última agregación")
             return {'total': 0, 'exitosos': 0, 'fallidos': 0}
 
-        print_info(f"Jueces a procesar: {len(jueces)}")
+        print_info(f"Jueces a actualizar: {len(jueces)}")
 
-        # Procesar cada juez
         exitosos = 0
         fallidos = 0
+        estados = self._cargar_estados(jueces)
 
         for juez in jueces:
+            estado = estados.get(juez)
+            if estado is None or estado.n_sentencias <= 0:
+                # Se quedó sin sentencias analizadas: se conserva el perfil anterior
+                print_error(f"{juez}: sin sentencias analizadas")
+                fallidos += 1
+                continue
             try:
-                if self.actualizar_perfil_juez(juez):
-                    exitosos += 1
-                else:
-                    fallidos += 1
-            except Exception as e:
+                self._escribir_perfil(juez, estado)
+                exitosos += 1
+            except sqlite3.Error as e:
                 print_error(f"Error procesando {juez}: {e}")
                 fallidos += 1
+        self.conn.commit()
 
         # Resumen
         print(f"\n{Colors.BOLD}{'='*70}")
@@ -430,6 +806,52 @@ class AgregadorPerfilesJueces:
             'fallidos': fallidos
         }
 
+    def verificar(self, tolerancia: float = 2e-3) -> Dict[str, List[str]]:
+        """
+        Compara las estadísticas incrementales (tras incorporar los cambios
+        pendientes) con el cálculo completo original, juez por juez.
+
+        Returns:
+            {juez: [diferencias]} sólo para los jueces que no coinciden
+        """
+        self.procesar_cambios()
+        self.cursor.execute("""
+        SELECT DISTINCT juez FROM sentencias_por_juez_arg WHERE perfil_cognitivo IS NOT NULL
+        """)
+        jueces = [fila[0] for fila in self.cursor.fetchall()]
+        estados = self._cargar_estados(jueces)
+
+        def comparar(ruta, a, b, diferencias):
+            if isinstance(a, dict) and isinstance(b, dict):
+                for clave in set(a) | set(b):
+                    comparar(f"{ruta}.{clave}", a.get(clave), b.get(clave), diferencias)
+            elif isinstance(a, (int, float)) and isinstance(b, (int, float)):
+                if abs(a - b) > tolerancia:
+                    diferencias.append(f"{ruta}: completo={a} incremental={b}")
+            elif a != b:
+                diferencias.append(f"{ruta}: completo={a!r} incremental={b!r}")
+
+        discrepancias = {}
+        for juez in jueces:
+            sentencias = self.obtener_sentencias_juez(juez)
+            estado = estados.get(juez, EstadisticasJuez())
+            diferencias = []
+            comparar('perfil', self.agregar_perfil_judicial(sentencias), estado.resultado(), diferencias)
+            comparar('temas', self.identificar_temas_recurrentes(sentencias), estado.temas(), diferencias)
+            comparar('n_sentencias', len(sentencias), estado.n_sentencias, diferencias)
+            if diferencias:
+                discrepancias[juez] = diferencias
+
+        if discrepancias:
+            print_error(f"Discrepancias en {len(discrepancias)} de {len(jueces)} jueces")
+            for juez, diferencias in discrepancias.items():
+                print(f"  {juez}:")
+                for d in diferencias[:10]:
+                    print(f"    - {d}")
+        else:
+            print_success(f"Agregación incremental verificada: {len(jueces)} jueces coinciden")
+        return discrepancias
+
 
 def main():
     """Función principal"""
@@ -447,7 +869,17 @@ def main():
     parser.add_argument(
         '--todos',
         action='store_true',
-        help='Agregar perfiles de todos los jueces'
+        help='Agregar perfiles de los jueces con sentencias nuevas'
+    )
+    parser.add_argument(
+        '--reconstruir',
+        action='store_true',
+        help='Recalcular las estadísticas de todos los jueces desde cero'
+    )
+    parser.add_argument(
+        '--verificar',
+        action='store_true',
+        help='Comparar la agregación incremental con el cálculo completo'
     )
 
     args = parser.parse_args()
@@ -460,9 +892,12 @@ def main():
         sys.exit(1)
 
     try:
-        if args.todos:
-            # Procesar todos
-            stats = agregador.agregar_todos_los_jueces()
+        if args.verificar:
+            sys.exit(0 if not agregador.verificar() else 1)
+
+        elif args.todos or args.reconstruir:
+            # Procesar todos (sólo los que cambiaron, salvo --reconstruir)
+            stats = agregador.agregar_todos_los_jueces(reconstruir=args.reconstruir)
             sys.exit(0 if stats['fallidos'] == 0 else 1)
 
         elif args.juez:
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+🗄️ ALMACÉN VECTORIAL CONSOLIDADO (MEMORY-MAPPED)
+===============================================
+
+Reemplaza los miles de archivos .npy sueltos de
+bases_rag/cognitiva/faiss_index/ por un único archivo:
+
+- vectores.f32       matriz float32 (filas x dim), sólo se agrega al final
+                     (vectores.N.f32 tras la N-ésima compactación)
+- vectores_map.json  id -> fila, dimensión, filas totales, lápidas y el
+                     archivo de matriz vigente
+
+Lecturas: np.memmap de sólo lectura (una apertura para todos los vectores).
+Escrituras: agregados en lote (un append + un reemplazo atómico del mapa).
+Borrados: lápidas; compactar() escribe las filas vivas en la matriz de la
+generación siguiente y la activa al reemplazar el mapa: una caída a mitad
+deja el almacén en la generación anterior, intacta.
+
+Las escrituras están serializadas dentro del proceso; no está pensado para
+varios procesos escribiendo a la vez sobre el mismo almacén.
+
+MIGRACIÓN DE LOS .npy EXISTENTES:
+    python almacen_vectorial.py --migrar
+    python almacen_vectorial.py --migrar --eliminar-npy   # borra los .npy migrados
+    python almacen_vectorial.py --compactar
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+ARCHIVO_MATRIZ = "vectores.f32"
+ARCHIVO_MAPA = "vectores_map.json"
+
+
+def nombre_matriz(generacion: int) -> str:
+    """Archivo de matriz de una generación (0 = el original, sin compactar)"""
+    return ARCHIVO_MATRIZ if not generacion else f"vectores.{generacion}.f32"
+
+# Prefijo de perfiles_cognitivos.vector_path para vectores del almacén
+PREFIJO_REFERENCIA = "mmap:"
+
+
+class AlmacenVectorialMmap:
+    """Matriz float32 append-only con mapa id -> fila y lápidas"""
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.generacion = 0
+        self.ruta_matriz = self.directorio / nombre_matriz(0)
+        self.ruta_mapa = self.directorio / ARCHIVO_MAPA
+
+        self._lock = threading.Lock()
+        self._pendientes: List[Tuple[str, np.ndarray]] = []
+        self._memmap = None
+        self._memmap_filas = -1
+
+        self.dim: Optional[int] = None
+        self.filas = 0
+        self.ids: Dict[str, int] = {}
+        self.lapidas: List[int] = []
+        self._cargar_mapa()
+
+    # ------------------------------------------------------
+    # Persistencia del mapa
+    # ------------------------------------------------------
+    def _cargar_mapa(self):
+        if not self.ruta_mapa.exists():
+            return
+        with open(self.ruta_mapa, "r", encoding="utf-8") as f:
+            mapa = json.load(f)
+        self.dim = mapa.get("dim")
+        self.filas = mapa.get("filas", 0)
+        self.ids = mapa.get("ids", {})
+        self.lapidas = mapa.get("lapidas", [])
+        self.generacion = mapa.get("generacion", 0)
+        self.ruta_matriz = self.directorio / nombre_matriz(self.generacion)
+
+        # Un append interrumpido puede dejar bytes de más: se ignoran
+        if self.dim and self.ruta_matriz.exists():
+            filas_en_disco = self.ruta_matriz.stat().st_size // (4 * self.dim)
+            if filas_en_disco < self.filas:
+                raise ValueError(
+                    f"Almacén inconsistente: el mapa declara {self.filas} filas y hay {filas_en_disco}"
+                )
+
+    def _guardar_mapa(self):
+        mapa = {"dim": self.dim, "filas": self.filas, "ids": self.ids, "lapidas": self.lapidas,
+                "generacion": self.generacion}
+        tmp = self.ruta_mapa.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(mapa, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.ruta_mapa)
+
+    # ------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------
+    def agregar(self, vector_id: str, vector: np.ndarray):
+        """Encola un vector; se escribe en el próximo confirmar()"""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        if self.dim is None:
+            self.dim = int(vector.shape[0])
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Dimensión {vector.shape[0]} incompatible con el almacén ({self.dim})")
+        with self._lock:
+            self._pendientes.append((vector_id, vector))
+
+    def confirmar(self) -> int:
+        """Escribe los vectores pendientes en un único append. Devuelve cuántos escribió"""
+        with self._lock:
+            if not self._pendientes:
+                return 0
+
+            pendientes, self._pendientes = self._pendientes, []
+            bloque = np.vstack([v for _, v in pendientes]).astype(np.float32, copy=False)
+
+            # Truncar restos de un append previo interrumpido
+            with open(self.ruta_matriz, "ab") as f:
+                f.truncate(self.filas * 4 * self.dim)
+                f.write(bloque.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            for i, (vector_id, _) in enumerate(pendientes):
+                anterior = self.ids.get(vector_id)
+                if anterior is not None:
+                    self.lapidas.append(anterior)
+                self.ids[vector_id] = self.filas + i
+            self.filas += len(pendientes)
+
+            self._guardar_mapa()
+            return len(pendientes)
+
+    def agregar_lote(self, items: Iterable[Tuple[str, np.ndarray]]) -> int:
+        """Agrega varios vectores con un solo append"""
+        for vector_id, vector in items:
+            self.agregar(vector_id, vector)
+        return self.confirmar()
+
+    def eliminar(self, vector_id: str) -> bool:
+        """Marca un vector como borrado (lápida)"""
+        with self._lock:
+            fila = self.ids.pop(vector_id, None)
+            if fila is None:
+                return False
+            self.lapidas.append(fila)
+            self._guardar_mapa()
+            return True
+
+    def compactar(self) -> int:
+        """
+        Reescribe sólo las filas vivas y vacía las lápidas. Devuelve filas liberadas.
+
+        La matriz compactada es un archivo nuevo (generación siguiente) que
+        recién pasa a usarse cuando el mapa que la nombra reemplaza al
+        anterior; hasta ese momento el mapa y la matriz vigentes no se tocan.
+        """
+        with self._lock:
+            if not self.lapidas or not self.dim:
+                return 0
+
+            ids_ordenados = sorted(self.ids.items(), key=lambda kv: kv[1])
+            origen = self._abrir_memmap()
+            generacion = self.generacion + 1
+            destino = self.directorio / nombre_matriz(generacion)
+            with open(destino, "wb") as f:
+                for vector_id, fila in ids_ordenados:
+                    f.write(np.asarray(origen[fila], dtype=np.float32).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Soltar el mapeo antes de borrar la matriz anterior (requerido en Windows)
+            del origen
+            self._memmap = None
+            liberadas = self.filas - len(ids_ordenados)
+
+            self.ids = {vector_id: i for i, (vector_id, _) in enumerate(ids_ordenados)}
+            self.filas = len(ids_ordenados)
+            self.lapidas = []
+            self.generacion = generacion
+            self.ruta_matriz = destino
+            self._guardar_mapa()
+
+            # Matrices de generaciones anteriores (incluidas las que dejó una
+            # compactación interrumpida antes o después de cambiar el mapa)
+            for ruta in self.directorio.glob("vectores*.f32"):
+                if ruta != destino:
+                    try:
+                        ruta.unlink()
+                    except OSError:
+                        # Otro proceso todavía la tiene mapeada: se borra en la próxima
+                        pass
+            return liberadas
+
+    # ------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------
+    def _abrir_memmap(self) -> np.ndarray:
+        if not self.filas or not self.dim:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        if self._memmap is None or self._memmap_filas != self.filas:
+            self._memmap = np.memmap(self.ruta_matriz, dtype=np.float32, mode="r",
+                                     shape=(self.filas, self.dim))
+            self._memmap_filas = self.filas
+        return self._memmap
+
+    def matriz(self) -> np.ndarray:
+        """Matriz completa mapeada en memoria (incluye filas con lápida)"""
+        return self._abrir_memmap()
+
+    def obtener(self, vector_id: str) -> Optional[np.ndarray]:
+        fila = self.ids.get(vector_id)
+        if fila is None:
+            return None
+        return np.array(self._abrir_memmap()[fila])
+
+    def vivos(self) -> Tuple[List[str], np.ndarray]:
+        """Ids y matriz de vectores vivos, en orden de fila"""
+        ids_ordenados = sorted(self.ids.items(), key=lambda kv: kv[1])
+        filas = np.fromiter((fila for _, fila in ids_ordenados), dtype=np.int64, count=len(ids_ordenados))
+        return [vector_id for vector_id, _ in ids_ordenados], self._abrir_memmap()[filas]
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def referencia(vector_id: str) -> str:
+    """Valor de vector_path para un vector guardado en el almacén"""
+    return f"{PREFIJO_REFERENCIA}{vector_id}"
+
+
+def es_referencia(vector_path: str) -> bool:
+    return bool(vector_path) and vector_path.startswith(PREFIJO_REFERENCIA)
+
+
+def id_de_referencia(vector_path: str) -> str:
+    return vector_path[len(PREFIJO_REFERENCIA):]
+
+
+# ----------------------------------------------------------
+# MIGRACIÓN DE .npy SUELTOS
+# ----------------------------------------------------------
+def migrar_npy(directorio, db_path=None, eliminar_npy: bool = False, tamano_lote: int = 256) -> Dict[str, int]:
+    """
+    Migra todos los .npy de ``directorio`` al almacén consolidado del mismo
+    directorio y actualiza perfiles_cognitivos.vector_path en ``db_path``.
+    """
+    directorio = Path(directorio)
+    almacen = AlmacenVectorialMmap(directorio)
+    archivos = sorted(directorio.glob("*.npy"))
+    resumen = {"encontrados": len(archivos), "migrados": 0, "omitidos": 0, "referencias_actualizadas": 0}
+
+    migrados: List[Path] = []
+    for i, ruta in enumerate(archivos, 1):
+        try:
+            almacen.agregar(ruta.stem, np.load(ruta))
+            migrados.append(ruta)
+        except Exception as e:
+            print(f"⚠️ Omitido {ruta.name}: {e}")
+            resumen["omitidos"] += 1
+        if i % tamano_lote == 0:
+            almacen.confirmar()
+    almacen.confirmar()
+    resumen["migrados"] = len(migrados)
+
+    if db_path and Path(db_path).exists():
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        for ruta in migrados:
+            # Sufijo exacto: en LIKE, "_" (frecuente en los nombres) es comodín
+            sufijo = f"{os.sep}{ruta.name}"
+            cursor.execute(
+                "UPDATE perfiles_cognitivos SET vector_path = ? "
+                "WHERE vector_path = ? OR substr(vector_path, -?) = ?",
+                (referencia(ruta.stem), str(ruta), len(sufijo), sufijo)
+            )
+            resumen["referencias_actualizadas"] += cursor.rowcount
+        conn.commit()
+        conn.close()
+
+    if eliminar_npy:
+        for ruta in migrados:
+            ruta.unlink()
+
+    return resumen
+
+
+def main():
+    base = Path(__file__).parent.parent / "bases_rag" / "cognitiva"
+
+    parser = argparse.ArgumentParser(description="Almacén vectorial consolidado")
+    parser.add_argument("--directorio", default=str(base / "faiss_index"))
+    parser.add_argument("--db", default=str(base / "metadatos.db"))
+    parser.add_argument("--migrar", action="store_true", help="Migra los .npy sueltos al almacén")
+    parser.add_argument("--eliminar-npy", action="store_true", help="Borra los .npy ya migrados")
+    parser.add_argument("--compactar", action="store_true", help="Elimina filas con lápida")
+    args = parser.parse_args()
+
+    if args.migrar:
+        print(f"🔄 Migrando .npy de {args.directorio}")
+        resumen = migrar_npy(args.directorio, args.db, args.eliminar_npy)
+        for clave, valor in resumen.items():
+            print(f"  {clave}: {valor}")
+
+    if args.compactar:
+        liberadas = AlmacenVectorialMmap(args.directorio).compactar()
+        print(f"🧹 Compactación: {liberadas} filas liberadas")
+
+    almacen = AlmacenVectorialMmap(args.directorio)
+    print(f"📊 Almacén: {len(almacen)} vectores vivos, {almacen.filas} filas, dim={almacen.dim}")
+
+
+if __name__ == "__main__":
+    main()
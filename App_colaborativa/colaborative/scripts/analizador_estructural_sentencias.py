@@ -61,6 +61,8 @@ class AnalizadorEstructuralSentencias:
     """
     
     def __init__(self):
+        self._analizador_honorarios = None
+
         # Patrones para identificar secciones principales
         self.patrones_visto = [
             r'\bVISTO\b:?\s*',
@@ -374,8 +376,10 @@ class AnalizadorEstructuralSentencias:
                 "instrucciones": "Importe honorarios_judiciales y valores_jus_cordoba"
             }
 
-        analizador = AnalizadorHonorarios()
-        resultado = analizador.analizar_sentencia(texto, materia, objeto, fecha)
+        # Un solo analizador por instancia: comparte el indice de valores JUS
+        if self._analizador_honorarios is None:
+            self._analizador_honorarios = AnalizadorHonorarios()
+        resultado = self._analizador_honorarios.analizar_sentencia(texto, materia, objeto, fecha)
 
         return {
             "tipo_causa": resultado.tipo_causa.value,
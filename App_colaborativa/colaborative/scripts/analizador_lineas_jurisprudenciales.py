@@ -28,6 +28,8 @@ from typing import Dict, List, Optional, Tuple
 from collections import Counter, defaultdict
 import statistics
 
+from metricas_sentencia import asegurar_metricas, perfil_desde_metricas
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -75,6 +77,7 @@ class AnalizadorLineasJurisprudenciales:
 
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
+        asegurar_metricas(self.conn)
 
     def cerrar_bd(self):
         """Cierra la conexión"""
@@ -88,37 +91,34 @@ class AnalizadorLineasJurisprudenciales:
         Returns:
             Lista de diccionarios con sentencia y análisis
         """
+        # Las métricas salen de metricas_sentencia (sin json.loads del perfil completo)
         self.cursor.execute("""
         SELECT
-            sentencia_id,
-            materia,
-            fecha_sentencia,
-            resultado,
-            perfil_cognitivo,
-            texto_completo,
-            caratula
-        FROM sentencias_por_juez_arg
-        WHERE juez = ? AND perfil_cognitivo IS NOT NULL
-        ORDER BY fecha_sentencia
+            s.sentencia_id,
+            s.materia,
+            s.fecha_sentencia,
+            s.resultado,
+            s.texto_completo,
+            s.caratula,
+            m.*
+        FROM sentencias_por_juez_arg s
+        LEFT JOIN metricas_sentencia m ON m.sentencia_id = s.sentencia_id
+        WHERE s.juez = ? AND s.perfil_cognitivo IS NOT NULL
+        ORDER BY s.fecha_sentencia
         """, (juez,))
+        columnas_metricas = [desc[0] for desc in self.cursor.description[6:]]
 
         sentencias = []
         for row in self.cursor.fetchall():
-            sent_id, materia, fecha, resultado, perfil_json, texto, caratula = row
-
-            perfil = {}
-            if perfil_json:
-                try:
-                    perfil = json.loads(perfil_json)
-                except json.JSONDecodeError:
-                    pass
+            sent_id, materia, fecha, resultado, texto, caratula = row[:6]
+            metricas = dict(zip(columnas_metricas, row[6:]))
 
             sentencias.append({
                 'sentencia_id': sent_id,
                 'materia': materia,
                 'fecha': fecha,
                 'resultado': resultado,
-                'perfil': perfil,
+                'perfil': perfil_desde_metricas(metricas),
                 'texto': texto,
                 'caratula': caratula
             })
@@ -24,6 +24,8 @@ import json
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+from instrumentacion import instrumentar
+
 # ========================================
 # PATRONES PARA ACTIVISMO JUDICIAL
 # ========================================
@@ -198,6 +200,7 @@ class AnalizadorPensamientoJudicialArg:
     def __init__(self):
         self.version = "v1.0"
 
+    @instrumentar("analizador_judicial")
     def analizar(self, texto: str) -> AnalisisJudicial:
         """
         Análisis completo de una sentencia
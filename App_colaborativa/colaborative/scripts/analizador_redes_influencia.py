@@ -13,18 +13,20 @@ Funcionalidades:
 - Identifica jueces más influyentes
 - Guarda en tabla redes_influencia_judicial
 
+Las citas se extraen una vez por sentencia a citas_sentencia (ver
+citas_sentencia.py; la ingesta ya las registra). Cada corrida sólo extrae
+las sentencias nuevas o modificadas y reconstruye con un INSERT ... SELECT
+agrupado las aristas de los jueces afectados.
+
 AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
 import sqlite3
-import json
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple
-from collections import Counter, defaultdict
+from typing import Dict
 
-from extractor_citas_jurisprudenciales import ExtractorCitasJurisprudenciales
+from citas_sentencia import asegurar_citas, extraer_pendientes, tomar_jueces_pendientes
 
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
@@ -64,7 +66,6 @@ class AnalizadorRedesInfluencia:
         self.db_path = db_path
         self.conn = None
         self.cursor = None
-        self.extractor_citas = ExtractorCitasJurisprudenciales()
         self.conectar_bd()
 
     def conectar_bd(self):
@@ -74,151 +75,108 @@ class AnalizadorRedesInfluencia:
 
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
+        asegurar_citas(self.conn)
 
     def cerrar_bd(self):
         """Cierra la conexión"""
         if self.conn:
             self.conn.close()
 
-    def obtener_sentencias_juez(self, juez: str) -> List[Dict]:
-        """Obtiene sentencias de un juez"""
-        self.cursor.execute("""
-        SELECT sentencia_id, texto_completo
-        FROM sentencias_por_juez_arg
-        WHERE juez = ? AND texto_completo IS NOT NULL
-        """, (juez,))
-
-        sentencias = []
-        for row in self.cursor.fetchall():
-            sentencias.append({
-                'sentencia_id': row[0],
-                'texto': row[1]
-            })
-
-        return sentencias
-
     def extraer_citas_juez(self, juez: str) -> Dict:
         """
-        Extrae todas las citas de las sentencias de un juez
+        Citas consolidadas de las sentencias de un juez (extrae sólo las
+        sentencias que aún no están en citas_sentencia)
 
         Returns:
             Diccionario con citas consolidadas
         """
         print_info(f"Extrayendo citas de {juez}...")
+        nuevas, _ = extraer_pendientes(self.conn, juez)
+        if nuevas:
+            print_info(f"  Sentencias nuevas procesadas: {nuevas}")
 
-        sentencias = self.obtener_sentencias_juez(juez)
-
-        if not sentencias:
-            print_warning(f"  No hay sentencias para {juez}")
-            return {}
-
-        # Consolidar citas de todas las sentencias
-        citas_csjn_total = []
-        citas_camaras_total = []
-        citas_doctrinales_total = []
-
-        for sent in sentencias:
-            citas = self.extractor_citas.extraer_todas_citas(sent['texto'])
-            citas_csjn_total.extend(citas['citas_csjn'])
-            citas_camaras_total.extend(citas['citas_camaras'])
-            citas_doctrinales_total.extend(citas['citas_doctrinales'])
-
-        # Contar frecuencias
-        tribunales_counter = Counter()
-        autores_counter = Counter()
-
-        for cita in citas_csjn_total:
-            tribunales_counter['CSJN'] += 1
+        self.cursor.execute("""
+        SELECT c.tipo_destino, c.destino, COUNT(*)
+        FROM citas_sentencia c
+        JOIN citas_extraidas e ON e.sentencia_id = c.sentencia_id
+        WHERE e.juez = ?
+        GROUP BY c.tipo_destino, c.destino
+        """, (juez,))
 
-        for cita in citas_camaras_total:
-            if cita.tribunal:
-                key = f"{cita.tribunal} - Sala {cita.sala}" if cita.sala else cita.tribunal
-                tribunales_counter[key] += 1
+        tribunales, autores = {}, {}
+        for tipo_destino, destino, cantidad in self.cursor.fetchall():
+            if tipo_destino == 'autor_doctrinal':
+                autores[destino] = cantidad
+            else:
+                tribunales[destino] = cantidad
 
-        for cita in citas_doctrinales_total:
-            autores_counter[cita.autor] += 1
+        if not tribunales and not autores:
+            self.cursor.execute("SELECT 1 FROM citas_extraidas WHERE juez = ? LIMIT 1", (juez,))
+            if self.cursor.fetchone() is None:
+                print_warning(f"  No hay sentencias para {juez}")
+                return {}
 
-        print_success(f"  Citas encontradas: {len(citas_csjn_total)} CSJN, {len(citas_camaras_total)} Cámaras, {len(citas_doctrinales_total)} doctrinales")
+        total_csjn = tribunales.get('CSJN', 0)
+        total_camaras = sum(tribunales.values()) - total_csjn
+        total_doctrina = sum(autores.values())
+        print_success(f"  Citas encontradas: {total_csjn} CSJN, {total_camaras} Cámaras, {total_doctrina} doctrinales")
 
         return {
             'juez': juez,
-            'tribunales': dict(tribunales_counter),
-            'autores': dict(autores_counter),
-            'total_citas': len(citas_csjn_total) + len(citas_camaras_total) + len(citas_doctrinales_total)
+            'tribunales': tribunales,
+            'autores': autores,
+            'total_citas': total_csjn + total_camaras + total_doctrina
         }
 
-    def guardar_relaciones(self, juez_origen: str, citas_data: Dict) -> int:
+    def reconstruir_aristas(self, jueces) -> int:
         """
-        Guarda las relaciones de influencia en la BD
+        Reemplaza las aristas de ``jueces`` con una agregación SQL sobre
+        citas_sentencia (sin commit)
 
         Returns:
             Cantidad de relaciones guardadas
         """
-        guardadas = 0
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS jueces_red (juez TEXT PRIMARY KEY)")
+        self.cursor.execute("DELETE FROM jueces_red")
+        self.cursor.executemany("INSERT OR IGNORE INTO jueces_red (juez) VALUES (?)",
+                                [(juez,) for juez in jueces])
 
         # Limpiar relaciones antiguas
-        self.cursor.execute("DELETE FROM redes_influencia_judicial WHERE juez_origen = ?", (juez_origen,))
-
-        # Guardar citas a tribunales
-        for tribunal, cantidad in citas_data.get('tribunales', {}).items():
-            tipo_destino = 'csjn' if tribunal == 'CSJN' else 'tribunal_superior'
-
-            try:
-                self.cursor.execute("""
-                INSERT INTO redes_influencia_judicial (
-                    juez_origen,
-                    juez_destino,
-                    tipo_destino,
-                    tipo_influencia,
-                    intensidad,
-                    cantidad_citas,
-                    fecha_primera_cita,
-                    fecha_ultima_cita
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    juez_origen,
-                    tribunal,
-                    tipo_destino,
-                    'cita_literal',
-                    min(1.0, cantidad / 10.0),  # Normalizar intensidad
-                    cantidad,
-                    datetime.now().date().isoformat(),
-                    datetime.now().date().isoformat()
-                ))
-                guardadas += 1
-            except sqlite3.Error:
-                pass
-
-        # Guardar citas a autores
-        for autor, cantidad in citas_data.get('autores', {}).items():
-            try:
-                self.cursor.execute("""
-                INSERT INTO redes_influencia_judicial (
-                    juez_origen,
-                    juez_destino,
-                    tipo_destino,
-                    tipo_influencia,
-                    intensidad,
-                    cantidad_citas,
-                    fecha_primera_cita,
-                    fecha_ultima_cita
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    juez_origen,
-                    autor,
-                    'autor_doctrinal',
-                    'cita_literal',
-                    min(1.0, cantidad / 5.0),
-                    cantidad,
-                    datetime.now().date().isoformat(),
-                    datetime.now().date().isoformat()
-                ))
-                guardadas += 1
-            except sqlite3.Error:
-                pass
+        self.cursor.execute("""
+        DELETE FROM redes_influencia_judicial
+        WHERE juez_origen IN (SELECT juez FROM jueces_red)
+        """)
 
-        self.conn.commit()
-        return guardadas
+        # Intensidad normalizada: 10 citas a un tribunal o 5 a un autor = 1.0
+        self.cursor.execute("""
+        INSERT INTO redes_influencia_judicial (
+            juez_origen,
+            juez_destino,
+            tipo_destino,
+            tipo_influencia,
+            intensidad,
+            cantidad_citas,
+            sentencias_evidencia,
+            fecha_primera_cita,
+            fecha_ultima_cita
+        )
+        SELECT
+            e.juez,
+            c.destino,
+            c.tipo_destino,
+            'cita_literal',
+            MIN(1.0, COUNT(*) / CASE c.tipo_destino WHEN 'autor_doctrinal' THEN 5.0 ELSE 10.0 END),
+            COUNT(*),
+            json_group_array(DISTINCT c.sentencia_id),
+            COALESCE(MIN(s.fecha_sentencia), date('now')),
+            COALESCE(MAX(s.fecha_sentencia), date('now'))
+        FROM citas_sentencia c
+        JOIN citas_extraidas e ON e.sentencia_id = c.sentencia_id
+        LEFT JOIN sentencias_por_juez_arg s ON s.sentencia_id = c.sentencia_id
+        WHERE e.juez IN (SELECT juez FROM jueces_red)
+        GROUP BY e.juez, c.tipo_destino, c.destino
+        """)
+        return self.cursor.rowcount
 
     def analizar_juez(self, juez: str) -> Dict:
         """
@@ -236,7 +194,9 @@ class AnalizadorRedesInfluencia:
             return {'juez': juez, 'relaciones': 0}
 
         # Guardar relaciones
-        relaciones = self.guardar_relaciones(juez, citas_data)
+        relaciones = self.reconstruir_aristas([juez])
+        self.cursor.execute("DELETE FROM red_jueces_pendientes WHERE juez = ?", (juez,))
+        self.conn.commit()
 
         print_success(f"  Relaciones guardadas: {relaciones}")
 
@@ -246,35 +206,40 @@ class AnalizadorRedesInfluencia:
             'total_citas': citas_data.get('total_citas', 0)
         }
 
-    def analizar_todos_los_jueces(self) -> Dict:
-        """Analiza la red de todos los jueces"""
+    def analizar_todos_los_jueces(self, reconstruir: bool = False, reextraer: bool = False) -> Dict:
+        """
+        Actualiza la red: extrae las citas de sentencias nuevas y reconstruye
+        las aristas de los jueces afectados.
+
+        Args:
+            reconstruir: reconstruir las aristas de todos los jueces
+            reextraer: volver a correr las regex sobre todas las sentencias
+        """
         print(f"\n{Colors.BOLD}{'='*70}")
         print("ANÁLISIS DE REDES DE INFLUENCIA - TODOS LOS JUECES")
         print(f"{'='*70}{Colors.ENDC}\n")
 
-        # Obtener todos los jueces
-        self.cursor.execute("""
-        SELECT DISTINCT juez
-        FROM sentencias_por_juez_arg
-        WHERE texto_completo IS NOT NULL
-        """)
+        if reextraer:
+            self.cursor.execute("DELETE FROM citas_sentencia")
+            self.cursor.execute("DELETE FROM citas_extraidas")
+            self.conn.commit()
 
-        jueces = [row[0] for row in self.cursor.fetchall()]
+        sentencias, citas = extraer_pendientes(self.conn)
+        print_info(f"Sentencias nuevas o modificadas: {sentencias} ({citas} citas)")
 
-        if not jueces:
-            print_error("No hay jueces con sentencias")
-            return {'total': 0, 'relaciones': 0}
+        jueces = tomar_jueces_pendientes(self.conn)
+        if reconstruir or reextraer:
+            self.cursor.execute("SELECT DISTINCT juez FROM citas_extraidas")
+            jueces |= {row[0] for row in self.cursor.fetchall()}
 
-        print_info(f"Jueces a analizar: {len(jueces)}")
+        if not jueces:
+            self.conn.commit()
+            print_info("La red ya está al día")
+            return {'total_jueces': 0, 'total_relaciones': 0}
 
-        # Analizar cada juez
-        total_relaciones = 0
-        for juez in jueces:
-            try:
-                stats = self.analizar_juez(juez)
-                total_relaciones += stats.get('relaciones', 0)
-            except Exception as e:
-                print_error(f"Error procesando {juez}: {e}")
+        print_info(f"Jueces a actualizar: {len(jueces)}")
+        total_relaciones = self.reconstruir_aristas(jueces)
+        self.conn.commit()
 
         # Resumen
         print(f"\n{Colors.BOLD}{'='*70}")
@@ -305,7 +270,17 @@ def main():
     parser.add_argument(
         '--todos',
         action='store_true',
-        help='Analizar todos los jueces'
+        help='Actualizar la red (sólo sentencias nuevas o modificadas)'
+    )
+    parser.add_argument(
+        '--reconstruir',
+        action='store_true',
+        help='Reconstruir las aristas de todos los jueces'
+    )
+    parser.add_argument(
+        '--reextraer',
+        action='store_true',
+        help='Volver a extraer las citas de todas las sentencias'
     )
 
     args = parser.parse_args()
@@ -318,8 +293,8 @@ def main():
         sys.exit(1)
 
     try:
-        if args.todos:
-            stats = analizador.analizar_todos_los_jueces()
+        if args.todos or args.reconstruir or args.reextraer:
+            stats = analizador.analizar_todos_los_jueces(args.reconstruir, args.reextraer)
             sys.exit(0)
 
         elif args.juez:
@@ -2,16 +2,172 @@
 📅 ANALIZADOR TEMPORAL DE EVOLUCIÓN DOCTRINAL
 ==============================================
 Detecta evolución de pensamiento y conceptos a lo largo del tiempo.
+
+Las ventanas, cambios y tendencias se calculan con NumPy sobre acumulados
+por (autor, año), para todos los autores a la vez:
+
+- rollup_temporal_autor:        cantidad y suma de cada rasgo por autor y año
+- rollup_temporal_razonamiento: cantidad por autor, año y razonamiento dominante
+
+Triggers sobre perfiles_cognitivos mantienen los acumulados al insertar,
+modificar o borrar un perfil; la primera vez se llenan con un GROUP BY.
+Un reporte de todo el corpus lee esas tablas una vez, sin volver a consultar
+perfiles_cognitivos por autor ni por ventana. pandas figura en
+requirements_rag_v74.txt, pero acá no hace falta: los acumulados ya vienen
+agrupados de SQLite y bincount/unique/lexsort de NumPy los reducen sin armar
+un DataFrame por consulta.
+
+USO:
+    analizador = AnalizadorTemporal(db_path)
+    analizador.analizar_evolucion_autor('Autor X')
+    analizador.reporte_corpus(ventana_años=5)      # {autor: evolución}
+    python analizador_temporal.py --db metadatos.db --reporte salida.json
 """
 
 import re
 import sqlite3
+import argparse
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-from collections import defaultdict
 import json
 
+import numpy as np
+
+RASGOS = (
+    'formalismo', 'creatividad', 'dogmatismo', 'empirismo',
+    'interdisciplinariedad', 'nivel_abstraccion',
+    'complejidad_sintactica', 'uso_jurisprudencia'
+)
+
+UMBRAL_CAMBIO_SIGNIFICATIVO = 0.15  # 15% de cambio
+UMBRAL_CAMBIO_ALTO = 0.25
+
+
+def _sql_rollups() -> str:
+    columnas = ",\n    ".join(f"suma_{r} REAL NOT NULL DEFAULT 0" for r in RASGOS)
+    return f"""
+CREATE TABLE IF NOT EXISTS rollup_temporal_autor (
+    autor TEXT NOT NULL,
+    anio INTEGER NOT NULL,
+    cantidad INTEGER NOT NULL,
+    {columnas},
+    PRIMARY KEY (autor, anio)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_temporal_razonamiento (
+    autor TEXT NOT NULL,
+    anio INTEGER NOT NULL,
+    razonamiento TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    PRIMARY KEY (autor, anio, razonamiento)
+);
+"""
+
+
+def _sumar(origen: str, signo: str) -> str:
+    """Sentencias que suman (signo '+') o restan (signo '-') la fila ``origen`` (NEW/OLD)"""
+    anio = f"CAST({origen}.fecha_publicacion AS INTEGER)"
+    condicion = f"{origen}.fecha_publicacion IS NOT NULL AND {origen}.autor IS NOT NULL"
+    razon = f"{origen}.razonamiento_dominante"
+    condicion_razon = f"{condicion} AND {razon} IS NOT NULL AND {razon} != ''"
+
+    if signo == '+':
+        valores = ", ".join(f"COALESCE({origen}.{r}, 0)" for r in RASGOS)
+        actualizar = ", ".join(f"suma_{r} = suma_{r} + excluded.suma_{r}" for r in RASGOS)
+        return f"""
+    INSERT INTO rollup_temporal_autor (autor, anio, cantidad, {', '.join('suma_' + r for r in RASGOS)})
+    SELECT {origen}.autor, {anio}, 1, {valores}
+    WHERE {condicion}
+    ON CONFLICT(autor, anio) DO UPDATE SET cantidad = cantidad + 1, {actualizar};
+    INSERT INTO rollup_temporal_razonamiento (autor, anio, razonamiento, cantidad)
+    SELECT {origen}.autor, {anio}, {razon}, 1
+    WHERE {condicion_razon}
+    ON CONFLICT(autor, anio, razonamiento) DO UPDATE SET cantidad = cantidad + 1;"""
+
+    restar = ", ".join(f"suma_{r} = suma_{r} - COALESCE({origen}.{r}, 0)" for r in RASGOS)
+    return f"""
+    UPDATE rollup_temporal_autor SET cantidad = cantidad - 1, {restar}
+    WHERE {condicion} AND autor = {origen}.autor AND anio = {anio};
+    DELETE FROM rollup_temporal_autor WHERE cantidad <= 0;
+    UPDATE rollup_temporal_razonamiento SET cantidad = cantidad - 1
+    WHERE {condicion_razon} AND autor = {origen}.autor AND anio = {anio} AND razonamiento = {razon};
+    DELETE FROM rollup_temporal_razonamiento WHERE cantidad <= 0;"""
+
+
+def _sql_triggers() -> str:
+    columnas = ", ".join(('autor', 'fecha_publicacion', 'razonamiento_dominante') + RASGOS)
+    return f"""
+CREATE TRIGGER IF NOT EXISTS trg_rollup_temporal_insert
+AFTER INSERT ON perfiles_cognitivos
+BEGIN{_sumar('NEW', '+')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_temporal_update
+AFTER UPDATE OF {columnas} ON perfiles_cognitivos
+BEGIN{_sumar('OLD', '-')}{_sumar('NEW', '+')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_temporal_delete
+AFTER DELETE ON perfiles_cognitivos
+BEGIN{_sumar('OLD', '-')}
+END;
+"""
+
+
+def reconstruir_rollups(conn: sqlite3.Connection) -> int:
+    """Recalcula los acumulados desde perfiles_cognitivos. Devuelve cuántos (autor, año) quedaron."""
+    conn.execute("DELETE FROM rollup_temporal_autor")
+    conn.execute("DELETE FROM rollup_temporal_razonamiento")
+    cursor = conn.execute(f"""
+    INSERT INTO rollup_temporal_autor (autor, anio, cantidad, {', '.join('suma_' + r for r in RASGOS)})
+    SELECT autor, CAST(fecha_publicacion AS INTEGER), COUNT(*),
+           {', '.join(f'TOTAL({r})' for r in RASGOS)}
+    FROM perfiles_cognitivos
+    WHERE fecha_publicacion IS NOT NULL AND autor IS NOT NULL
+    GROUP BY autor, CAST(fecha_publicacion AS INTEGER)
+    """)
+    conn.execute("""
+    INSERT INTO rollup_temporal_razonamiento (autor, anio, razonamiento, cantidad)
+    SELECT autor, CAST(fecha_publicacion AS INTEGER), razonamiento_dominante, COUNT(*)
+    FROM perfiles_cognitivos
+    WHERE fecha_publicacion IS NOT NULL AND autor IS NOT NULL
+      AND razonamiento_dominante IS NOT NULL AND razonamiento_dominante != ''
+    GROUP BY autor, CAST(fecha_publicacion AS INTEGER), razonamiento_dominante
+    """)
+    conn.commit()
+    return cursor.rowcount
+
+
+def asegurar_rollups(conn: sqlite3.Connection) -> bool:
+    """
+    Crea las tablas de acumulados y sus triggers si faltan; la primera vez
+    las llena. Devuelve True si hubo que reconstruir.
+    """
+    existia = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_temporal_autor'"
+    ).fetchone()
+    conn.executescript(_sql_rollups() + _sql_triggers())
+    if existia:
+        return False
+    reconstruir_rollups(conn)
+    return True
+
+
+def _agrupar(claves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Claves únicas ordenadas y el índice de grupo de cada fila"""
+    return np.unique(claves, return_inverse=True)
+
+
+def _sumar_por_grupo(grupo: np.ndarray, valores: np.ndarray, cantidad_grupos: int) -> np.ndarray:
+    """Suma por grupo de cada columna de ``valores`` (filas x columnas)"""
+    return np.stack(
+        [np.bincount(grupo, weights=valores[:, j], minlength=cantidad_grupos) for j in range(valores.shape[1])],
+        axis=1
+    )
+
+
+
 class AnalizadorTemporal:
     """
     Analiza evolución temporal de conceptos, autores y doctrinas.
@@ -25,6 +181,7 @@ class AnalizadorTemporal:
             'contemporaneo': (1991, 2010),
             'actual': (2011, 2030)
         }
+        self._rollups_listos = False
     
     def extraer_fecha_publicacion(self, texto_pdf: str, metadata: Dict) -> Tuple[int, str]:
         """
@@ -98,201 +255,224 @@ class AnalizadorTemporal:
                 return periodo
         return 'indeterminado'
     
+    def _conectar(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        if not self._rollups_listos:
+            asegurar_rollups(conn)
+            self._rollups_listos = True
+        return conn
+
+    def _cargar_rollup(self, conn: sqlite3.Connection, autor: Optional[str] = None) -> Tuple[List, List]:
+        """Filas de los acumulados (de un autor o de todo el corpus)"""
+        filtro, parametros = ("WHERE autor = ?", (autor,)) if autor is not None else ("", ())
+        filas = conn.execute(f"""
+            SELECT autor, anio, cantidad, {', '.join('suma_' + r for r in RASGOS)}
+            FROM rollup_temporal_autor {filtro} ORDER BY autor, anio
+        """, parametros).fetchall()
+        razones = conn.execute(f"""
+            SELECT autor, anio, razonamiento, cantidad
+            FROM rollup_temporal_razonamiento {filtro} ORDER BY autor, anio
+        """, parametros).fetchall()
+        return filas, razones
+
+    def _extremos_razonamiento(self, conn: sqlite3.Connection,
+                               autor: Optional[str] = None) -> Dict[str, Tuple[str, str, int]]:
+        """Primer y último razonamiento dominante de cada autor (una sola consulta)"""
+        filtro, parametros = ("AND autor = ?", (autor,)) if autor is not None else ("", ())
+        filas = conn.execute(f"""
+            WITH r AS (
+                SELECT autor, razonamiento_dominante AS razon,
+                       ROW_NUMBER() OVER (PARTITION BY autor ORDER BY fecha_publicacion, rowid) AS primero,
+                       ROW_NUMBER() OVER (PARTITION BY autor ORDER BY fecha_publicacion DESC, rowid DESC) AS ultimo,
+                       COUNT(*) OVER (PARTITION BY autor) AS total
+                FROM perfiles_cognitivos
+                WHERE fecha_publicacion IS NOT NULL
+                  AND razonamiento_dominante IS NOT NULL AND razonamiento_dominante != '' {filtro}
+            )
+            SELECT autor, MAX(CASE WHEN primero = 1 THEN razon END),
+                   MAX(CASE WHEN ultimo = 1 THEN razon END), MAX(total)
+            FROM r GROUP BY autor
+        """, parametros).fetchall()
+        return {fila[0]: (fila[1], fila[2], fila[3]) for fila in filas}
+
+    def _evolucion(self, filas: List, razones: List, extremos: Dict,
+                   ventana_años: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Ventanas, cambios significativos y tendencias de todos los autores de
+        ``filas`` a la vez. Cada ventana arranca en el primer año del autor.
+        """
+        if not filas:
+            return {}
+
+        nombres, autor_idx = np.unique(np.array([f[0] for f in filas], dtype=object), return_inverse=True)
+        anios = np.array([f[1] for f in filas], dtype=np.int64)
+        cantidad = np.array([f[2] for f in filas], dtype=np.float64)
+        sumas = np.array([f[3:] for f in filas], dtype=np.float64)
+        total_autores = len(nombres)
+
+        anio_min = np.full(total_autores, np.iinfo(np.int64).max)
+        anio_max = np.full(total_autores, np.iinfo(np.int64).min)
+        np.minimum.at(anio_min, autor_idx, anios)
+        np.maximum.at(anio_max, autor_idx, anios)
+        docs_autor = np.bincount(autor_idx, weights=cantidad, minlength=total_autores)
+
+        # Ventana = (autor, nro de ventana); las claves únicas quedan ordenadas por autor y tiempo
+        nro_ventana = (anios - anio_min[autor_idx]) // ventana_años
+        ancho = int(nro_ventana.max()) + 1
+        ventanas, grupo = np.unique(autor_idx * ancho + nro_ventana, return_inverse=True)
+        total_ventanas = len(ventanas)
+        autor_v = ventanas // ancho
+        inicio_v = anio_min[autor_v] + (ventanas % ancho) * ventana_años
+        docs_v = np.bincount(grupo, weights=cantidad, minlength=total_ventanas)
+        medias = _sumar_por_grupo(grupo, sumas, total_ventanas) / docs_v[:, None]
+
+        # Razonamiento dominante por ventana: moda (empates por orden alfabético)
+        dominante_v = np.full(total_ventanas, None, dtype=object)
+        if razones:
+            indice_autor = {nombre: i for i, nombre in enumerate(nombres)}
+            razones = [r for r in razones if r[0] in indice_autor]
+        if razones:
+            r_autor = np.array([indice_autor[r[0]] for r in razones], dtype=np.int64)
+            r_anio = np.array([r[1] for r in razones], dtype=np.int64)
+            r_cantidad = np.array([r[3] for r in razones], dtype=np.float64)
+            codigos, r_codigo = np.unique(np.array([r[2] for r in razones], dtype=object), return_inverse=True)
+            r_grupo = np.searchsorted(ventanas, r_autor * ancho + (r_anio - anio_min[r_autor]) // ventana_años)
+            conteos = np.zeros((total_ventanas, len(codigos)))
+            np.add.at(conteos, (r_grupo, r_codigo), r_cantidad)
+            con_datos = conteos.max(axis=1) > 0
+            dominante_v[con_datos] = codigos[conteos.argmax(axis=1)[con_datos]]
+
+        # Cambios entre ventanas consecutivas del mismo autor
+        diferencias = medias[1:] - medias[:-1]
+        anteriores = medias[:-1]
+        mismo_autor = autor_v[1:] == autor_v[:-1]
+        significativos = mismo_autor[:, None] & (np.abs(diferencias) >= UMBRAL_CAMBIO_SIGNIFICATIVO)
+        par, rasgo = np.nonzero(significativos)
+        cambio = diferencias[par, rasgo]
+        base = anteriores[par, rasgo]
+        porcentaje = np.where(base > 0, cambio / np.where(base > 0, base, 1) * 100, 0.0)
+        # Por autor y de mayor a menor magnitud (lexsort es estable, como sort())
+        orden = np.lexsort((-np.abs(cambio), autor_v[par + 1]))
+
+        # Tendencia: primera contra última ventana de cada autor
+        primera = np.searchsorted(autor_v, np.arange(total_autores), side='left')
+        ultima = np.searchsorted(autor_v, np.arange(total_autores), side='right') - 1
+        delta = medias[ultima] - medias[primera]
+        tendencia = np.select(
+            [np.abs(delta) < 0.05, delta > 0.15, delta > 0, delta < -0.15],
+            ['estable', 'creciente', 'creciente_leve', 'decreciente'],
+            'decreciente_leve'
+        )
+
+        periodos = [f"{i}-{i + ventana_años - 1}" for i in inicio_v.tolist()]
+        resultado: Dict[str, Dict[str, Any]] = {}
+        for a, nombre in enumerate(nombres.tolist()):
+            desde, hasta = int(primera[a]), int(ultima[a])
+            lista_ventanas = []
+            for v in range(desde, hasta + 1):
+                lista_ventanas.append({
+                    'periodo': periodos[v],
+                    'año_inicio': int(inicio_v[v]),
+                    'año_fin': int(inicio_v[v]) + ventana_años - 1,
+                    'cantidad_docs': int(docs_v[v]),
+                    'rasgos_promedio': dict(zip(RASGOS, medias[v].tolist())),
+                    'razonamiento_dominante': dominante_v[v]
+                })
+
+            evolucion_conceptual = []
+            if nombre in extremos:
+                inicial, final, total = extremos[nombre]
+                if total >= 2 and inicial != final:
+                    evolucion_conceptual.append({
+                        'tipo': 'cambio_metodologico',
+                        'descripcion': f'Transición de {inicial} a {final}',
+                        'periodo': f"{int(anio_min[a])} → {int(anio_max[a])}"
+                    })
+
+            resultado[nombre] = {
+                'autor': nombre,
+                'total_documentos': int(docs_autor[a]),
+                'rango_temporal': (int(anio_min[a]), int(anio_max[a])),
+                'ventanas_temporales': lista_ventanas,
+                'cambios_significativos': [],
+                'tendencias': dict(zip(RASGOS, tendencia[a].tolist())) if hasta > desde else {},
+                'evolucion_conceptual': evolucion_conceptual
+            }
+
+        for i in orden.tolist():
+            p, r = int(par[i]), int(rasgo[i])
+            resultado[nombres[autor_v[p + 1]]]['cambios_significativos'].append({
+                'periodo_origen': periodos[p],
+                'periodo_destino': periodos[p + 1],
+                'rasgo': RASGOS[r],
+                'cambio': float(cambio[i]),
+                'porcentaje_cambio': float(porcentaje[i]),
+                'direccion': 'aumento' if cambio[i] > 0 else 'disminución',
+                'significancia': 'alta' if abs(cambio[i]) > UMBRAL_CAMBIO_ALTO else 'media'
+            })
+
+        return resultado
+
     def analizar_evolucion_autor(self, autor: str, ventana_años: int = 5) -> Dict[str, Any]:
         """
         Analiza evolución del pensamiento de un autor a lo largo del tiempo.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Obtener todos los documentos del autor con fecha
-        cursor.execute("""
-            SELECT archivo, fecha_publicacion, periodo_doctrinal,
-                   formalismo, creatividad, dogmatismo, empirismo,
-                   interdisciplinariedad, nivel_abstraccion,
-                   complejidad_sintactica, uso_jurisprudencia,
-                   razonamiento_dominante
-            FROM perfiles_cognitivos
-            WHERE autor = ? AND fecha_publicacion IS NOT NULL
-            ORDER BY fecha_publicacion
-        """, (autor,))
-        
-        docs = cursor.fetchall()
+        conn = self._conectar()
+        filas, razones = self._cargar_rollup(conn, autor)
+        extremos = self._extremos_razonamiento(conn, autor) if filas else {}
         conn.close()
-        
-        if not docs:
+
+        if not filas:
             return {'estado': 'sin_datos', 'autor': autor}
-        
-        # Agrupar por ventanas temporales
-        ventanas = self._crear_ventanas_temporales(docs, ventana_años)
-        
-        # Calcular cambios significativos
-        cambios = self._detectar_cambios_significativos(ventanas)
-        
-        # Detectar tendencias
-        tendencias = self._calcular_tendencias(ventanas)
-        
-        return {
-            'autor': autor,
-            'total_documentos': len(docs),
-            'rango_temporal': (docs[0][1], docs[-1][1]) if docs else None,
-            'ventanas_temporales': ventanas,
-            'cambios_significativos': cambios,
-            'tendencias': tendencias,
-            'evolucion_conceptual': self._analizar_evolucion_conceptual(docs)
-        }
-    
-    def _crear_ventanas_temporales(self, docs: List, ventana_años: int) -> List[Dict]:
-        """Agrupa documentos en ventanas temporales."""
-        if not docs:
-            return []
-        
-        año_min = min(doc[1] for doc in docs if doc[1])
-        año_max = max(doc[1] for doc in docs if doc[1])
-        
-        ventanas = []
-        for año_inicio in range(año_min, año_max + 1, ventana_años):
-            año_fin = año_inicio + ventana_años - 1
-            
-            docs_ventana = [doc for doc in docs if doc[1] and año_inicio <= doc[1] <= año_fin]
-            
-            if docs_ventana:
-                # Calcular promedios de rasgos
-                rasgos_promedio = {
-                    'formalismo': sum(d[3] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'creatividad': sum(d[4] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'dogmatismo': sum(d[5] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'empirismo': sum(d[6] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'interdisciplinariedad': sum(d[7] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'nivel_abstraccion': sum(d[8] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'complejidad_sintactica': sum(d[9] or 0 for d in docs_ventana) / len(docs_ventana),
-                    'uso_jurisprudencia': sum(d[10] or 0 for d in docs_ventana) / len(docs_ventana)
-                }
-                
-                ventanas.append({
-                    'periodo': f"{año_inicio}-{año_fin}",
-                    'año_inicio': año_inicio,
-                    'año_fin': año_fin,
-                    'cantidad_docs': len(docs_ventana),
-                    'rasgos_promedio': rasgos_promedio,
-                    'razonamiento_dominante': self._moda([d[11] for d in docs_ventana if d[11]])
-                })
-        
-        return ventanas
-    
-    def _detectar_cambios_significativos(self, ventanas: List[Dict]) -> List[Dict]:
-        """Detecta cambios significativos entre ventanas temporales."""
-        cambios = []
-        umbral_significativo = 0.15  # 15% de cambio
-        
-        for i in range(1, len(ventanas)):
-            ventana_anterior = ventanas[i-1]
-            ventana_actual = ventanas[i]
-            
-            rasgos_ant = ventana_anterior['rasgos_promedio']
-            rasgos_act = ventana_actual['rasgos_promedio']
-            
-            for rasgo in rasgos_ant.keys():
-                diferencia = rasgos_act[rasgo] - rasgos_ant[rasgo]
-                
-                if abs(diferencia) >= umbral_significativo:
-                    cambios.append({
-                        'periodo_origen': ventana_anterior['periodo'],
-                        'periodo_destino': ventana_actual['periodo'],
-                        'rasgo': rasgo,
-                        'cambio': diferencia,
-                        'porcentaje_cambio': (diferencia / rasgos_ant[rasgo] * 100) if rasgos_ant[rasgo] > 0 else 0,
-                        'direccion': 'aumento' if diferencia > 0 else 'disminución',
-                        'significancia': 'alta' if abs(diferencia) > 0.25 else 'media'
-                    })
-        
-        # Ordenar por magnitud del cambio
-        cambios.sort(key=lambda x: abs(x['cambio']), reverse=True)
-        
-        return cambios
-    
-    def _calcular_tendencias(self, ventanas: List[Dict]) -> Dict[str, str]:
-        """Calcula tendencias generales por rasgo."""
-        if len(ventanas) < 2:
-            return {}
-        
-        tendencias = {}
-        
-        primera_ventana = ventanas[0]['rasgos_promedio']
-        ultima_ventana = ventanas[-1]['rasgos_promedio']
-        
-        for rasgo in primera_ventana.keys():
-            valor_inicial = primera_ventana[rasgo]
-            valor_final = ultima_ventana[rasgo]
-            diferencia = valor_final - valor_inicial
-            
-            if abs(diferencia) < 0.05:
-                tendencia = 'estable'
-            elif diferencia > 0:
-                tendencia = 'creciente' if diferencia > 0.15 else 'creciente_leve'
-            else:
-                tendencia = 'decreciente' if diferencia < -0.15 else 'decreciente_leve'
-            
-            tendencias[rasgo] = tendencia
-        
-        return tendencias
-    
-    def _analizar_evolucion_conceptual(self, docs: List) -> List[Dict]:
-        """Analiza evolución de conceptos clave."""
-        # Simplificado - en producción extraer keywords de cada documento
-        evoluciones = []
-        
-        # Detectar cambios en razonamiento dominante
-        razonamientos = [doc[11] for doc in docs if doc[11]]
-        if len(razonamientos) >= 2:
-            if razonamientos[0] != razonamientos[-1]:
-                evoluciones.append({
-                    'tipo': 'cambio_metodologico',
-                    'descripcion': f'Transición de {razonamientos[0]} a {razonamientos[-1]}',
-                    'periodo': f"{docs[0][1]} → {docs[-1][1]}"
-                })
-        
-        return evoluciones
-    
+        return self._evolucion(filas, razones, extremos, ventana_años)[autor]
+
+    def reporte_corpus(self, ventana_años: int = 5) -> Dict[str, Dict[str, Any]]:
+        """
+        Evolución de todos los autores del corpus en una pasada:
+        {autor: mismo formato que analizar_evolucion_autor}.
+        """
+        conn = self._conectar()
+        filas, razones = self._cargar_rollup(conn)
+        extremos = self._extremos_razonamiento(conn) if filas else {}
+        conn.close()
+        return self._evolucion(filas, razones, extremos, ventana_años)
+
     def analizar_evolucion_concepto(self, concepto: str) -> Dict[str, Any]:
         """
         Analiza cómo evoluciona un concepto específico en el corpus a lo largo del tiempo.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Buscar documentos que mencionen el concepto
+        conn = self._conectar()
         # Nota: esto requeriría búsqueda full-text, simplificamos por ahora
-        cursor.execute("""
-            SELECT autor, fecha_publicacion, archivo,
-                   formalismo, creatividad, nivel_abstraccion
-            FROM perfiles_cognitivos
-            WHERE fecha_publicacion IS NOT NULL
-            ORDER BY fecha_publicacion
-        """)
-        
-        docs = cursor.fetchall()
+        filas = conn.execute("""
+            SELECT autor, anio, cantidad, suma_formalismo, suma_creatividad, suma_nivel_abstraccion
+            FROM rollup_temporal_autor
+        """).fetchall()
         conn.close()
-        
-        # Agrupar por década
-        por_decada = defaultdict(list)
-        for doc in docs:
-            if doc[1]:
-                decada = (doc[1] // 10) * 10
-                por_decada[decada].append(doc)
-        
+
         evolucion = []
-        for decada in sorted(por_decada.keys()):
-            docs_decada = por_decada[decada]
-            evolucion.append({
-                'decada': f"{decada}s",
-                'cantidad_autores': len(set(d[0] for d in docs_decada)),
-                'cantidad_documentos': len(docs_decada),
-                'formalismo_promedio': sum(d[3] or 0 for d in docs_decada) / len(docs_decada),
-                'creatividad_promedio': sum(d[4] or 0 for d in docs_decada) / len(docs_decada),
-                'abstraccion_promedio': sum(d[5] or 0 for d in docs_decada) / len(docs_decada)
-            })
-        
+        if filas:
+            _, autor_idx = np.unique(np.array([f[0] for f in filas], dtype=object), return_inverse=True)
+            anios = np.array([f[1] for f in filas], dtype=np.int64)
+            cantidad = np.array([f[2] for f in filas], dtype=np.float64)
+            sumas = np.array([f[3:] for f in filas], dtype=np.float64)
+
+            # Agrupar por década
+            decadas, grupo = np.unique((anios // 10) * 10, return_inverse=True)
+            docs = np.bincount(grupo, weights=cantidad, minlength=len(decadas))
+            promedios = _sumar_por_grupo(grupo, sumas, len(decadas)) / docs[:, None]
+            pares = np.unique(grupo * (int(autor_idx.max()) + 1) + autor_idx)
+            autores = np.bincount(pares // (int(autor_idx.max()) + 1), minlength=len(decadas))
+
+            for d, decada in enumerate(decadas.tolist()):
+                evolucion.append({
+                    'decada': f"{decada}s",
+                    'cantidad_autores': int(autores[d]),
+                    'cantidad_documentos': int(docs[d]),
+                    'formalismo_promedio': float(promedios[d, 0]),
+                    'creatividad_promedio': float(promedios[d, 1]),
+                    'abstraccion_promedio': float(promedios[d, 2])
+                })
+
         return {
             'concepto': concepto,
             'evolucion_por_decada': evolucion,
@@ -361,15 +541,37 @@ class AnalizadorTemporal:
 # EJEMPLO DE USO
 # ==========================================================
 if __name__ == "__main__":
-    # Simulación (requiere BD real para funcionar)
+    parser = argparse.ArgumentParser(description="📅 Analizador temporal de evolución doctrinal")
+    parser.add_argument("--db", default=str(Path(__file__).parent.parent / "bases_rag" / "cognitiva" / "metadatos.db"))
+    parser.add_argument("--ventana", type=int, default=5, help="Años por ventana temporal")
+    parser.add_argument("--autor", help="Analizar un solo autor")
+    parser.add_argument("--reporte", help="Guardar el reporte del corpus en este JSON")
+    parser.add_argument("--reconstruir", action="store_true", help="Recalcula los acumulados por año")
+    args = parser.parse_args()
+
     print("📅 ANALIZADOR TEMPORAL - Módulo de Evolución Doctrinal")
     print("=" * 70)
-    print("✅ Funcionalidades implementadas:")
-    print("   • Extracción automática de fechas de publicación")
-    print("   • Clasificación en periodos doctrinales")
-    print("   • Análisis de evolución de autores")
-    print("   • Detección de cambios significativos")
-    print("   • Timeline de evolución conceptual")
-    print("   • Tendencias temporales por rasgo cognitivo")
-    print("\n💡 Uso: analizador = AnalizadorTemporal(db_path)")
-    print("        evolucion = analizador.analizar_evolucion_autor('Autor X')")
+    if not Path(args.db).exists():
+        print(f"❌ No existe la base: {args.db}")
+        raise SystemExit(1)
+
+    analizador = AnalizadorTemporal(args.db)
+    if args.reconstruir:
+        conn = sqlite3.connect(args.db)
+        asegurar_rollups(conn)
+        print(f"✅ Acumulados reconstruidos: {reconstruir_rollups(conn)} (autor, año)")
+        conn.close()
+
+    if args.autor:
+        print(json.dumps(analizador.analizar_evolucion_autor(args.autor, args.ventana),
+                         ensure_ascii=False, indent=2))
+    else:
+        inicio = datetime.now()
+        reporte = analizador.reporte_corpus(args.ventana)
+        segundos = (datetime.now() - inicio).total_seconds()
+        cambios = sum(len(r['cambios_significativos']) for r in reporte.values())
+        print(f"✅ {len(reporte)} autores, {cambios} cambios significativos ({segundos:.2f}s)")
+        if args.reporte:
+            with open(args.reporte, 'w', encoding='utf-8') as f:
+                json.dump(reporte, f, ensure_ascii=False, indent=2)
+            print(f"💾 Reporte guardado en {args.reporte}")
@@ -21,7 +21,6 @@ AUTOR: Sistema Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
-import sqlite3
 import json
 from pathlib import Path
 from datetime import datetime
@@ -39,6 +38,9 @@ except ImportError:
 # Importar analizador judicial
 from analizador_pensamiento_judicial_arg import AnalizadorPensamientoJudicialArg
 
+from pool_sqlite import obtener_pool
+from indice_nombres import obtener_indice
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -58,8 +60,7 @@ class AnalyserJudicialAdapter:
     def __init__(self, db_path: Path = DB_JUDICIAL):
         """Inicializa adaptador"""
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pool = None
 
         # Motor cognitivo (el original, sin modificar)
         if ANALYSER_DISPONIBLE:
@@ -74,12 +75,11 @@ class AnalyserJudicialAdapter:
         self.conectar_bd()
 
     def conectar_bd(self):
-        """Conecta a BD judicial"""
+        """Conecta a BD judicial (pool compartido, seguro entre hilos)"""
         if not self.db_path.exists():
             raise FileNotFoundError(f"BD judicial no encontrada: {self.db_path}")
 
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        self.pool = obtener_pool(self.db_path)
 
     def analizar_sentencia(self, texto: str, metadata: Dict = None) -> Dict:
         """
@@ -207,8 +207,7 @@ class AnalyserJudicialAdapter:
                 WHERE juez = ?
                 """
 
-                self.cursor.execute(query, valores)
-                self.conn.commit()
+                self.pool.ejecutar(query, valores)
 
                 return True
 
@@ -237,16 +236,14 @@ class AnalyserJudicialAdapter:
             FROM sentencias_por_juez_arg
             WHERE juez = ? AND sentencia_id IN ({placeholders})
             """
-            self.cursor.execute(query, [juez] + sentencias_ids)
+            sentencias = self.pool.consultar(query, [juez] + sentencias_ids)
         else:
             query = """
             SELECT sentencia_id, texto_completo, metadata
             FROM sentencias_por_juez_arg
             WHERE juez = ?
             """
-            self.cursor.execute(query, (juez,))
-
-        sentencias = self.cursor.fetchall()
+            sentencias = self.pool.consultar(query, (juez,))
 
         stats = {
             'juez': juez,
@@ -281,21 +278,23 @@ class AnalyserJudicialAdapter:
         Devuelve mismo formato que el sistema de autores,
         pero para jueces
         """
-        self.cursor.execute("""
+        return self.pool.consultar_dict("""
         SELECT *
         FROM perfiles_judiciales_argentinos
         WHERE juez = ?
-        """, (juez,))
-
-        row = self.cursor.fetchone()
-        if not row:
-            return None
+        """, (self.resolver_juez(juez),))
 
-        # Obtener nombres de columnas
-        columnas = [desc[0] for desc in self.cursor.description]
-        perfil = dict(zip(columnas, row))
-
-        return perfil
+    def resolver_juez(self, juez: str) -> str:
+        """
+        Nombre con el que ``juez`` figura en perfiles_judiciales_argentinos:
+        el mismo si existe tal cual; si no, su canónico (acentos, iniciales,
+        orden); si tampoco, el nombre recibido.
+        """
+        if self.pool.consultar_uno(
+            "SELECT 1 FROM perfiles_judiciales_argentinos WHERE juez = ?", (juez,)
+        ) is not None:
+            return juez
+        return self.indice_jueces().resolver(juez) or juez
 
     def listar_jueces(self) -> List[Dict]:
         """
@@ -303,7 +302,7 @@ class AnalyserJudicialAdapter:
 
         Equivalente a listar_autores() del sistema antiguo
         """
-        self.cursor.execute("""
+        filas = self.pool.consultar("""
         SELECT
             juez,
             tipo_entidad,
@@ -317,7 +316,7 @@ class AnalyserJudicialAdapter:
         """)
 
         jueces = []
-        for row in self.cursor.fetchall():
+        for row in filas:
             jueces.append({
                 'nombre': row[0],
                 'tipo': row[1],
@@ -334,25 +333,32 @@ class AnalyserJudicialAdapter:
         """
         Busca jueces por nombre o fuero
 
-        Equivalente a buscar_autores() del sistema antiguo
+        Equivalente a buscar_autores() del sistema antiguo.
+        Usa el índice de nombres canónicos (tolera acentos, iniciales, orden
+        y errores de tipeo) en lugar de un LIKE '%termino%' sobre toda la tabla.
         """
-        query = """
+        coincidencias = self.indice_jueces().buscar(termino, limite=100)
+        if not coincidencias:
+            return []
+        puntajes = dict(coincidencias)
+
+        marcadores = ",".join("?" * len(puntajes))
+        query = f"""
         SELECT juez, tipo_entidad, fuero, total_sentencias
         FROM perfiles_judiciales_argentinos
-        WHERE juez LIKE ?
+        WHERE juez IN ({marcadores})
         """
-        params = [f"%{termino}%"]
+        params = list(puntajes)
 
         if fuero:
             query += " AND fuero = ?"
             params.append(fuero)
 
-        query += " ORDER BY total_sentencias DESC LIMIT 20"
-
-        self.cursor.execute(query, params)
+        filas = sorted(self.pool.consultar(query, params),
+                       key=lambda row: (-puntajes[row[0]], -(row[3] or 0)))
 
         resultados = []
-        for row in self.cursor.fetchall():
+        for row in filas[:20]:
             resultados.append({
                 'nombre': row[0],
                 'tipo': row[1],
@@ -362,10 +368,14 @@ class AnalyserJudicialAdapter:
 
         return resultados
 
+    def indice_jueces(self):
+        """Índice de nombres canónicos de jueces (compartido por el proceso)"""
+        return obtener_indice(self.db_path, "juez", "perfiles_judiciales_argentinos", "juez")
+
     def cerrar(self):
-        """Cierra conexión a BD"""
-        if self.conn:
-            self.conn.close()
+        """Devuelve la conexión de lectura del hilo al pool (el pool es compartido)"""
+        if self.pool:
+            self.pool.liberar()
 
 
 # ============================================================================
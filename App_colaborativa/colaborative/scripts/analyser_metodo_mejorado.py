@@ -25,6 +25,8 @@ from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
 import math
 from validador_contexto_retorica import ValidadorContextoRetorica
+from pattern_bank import PatternBank, compilar, contar_matches
+from instrumentacion import instrumentar
 
 # PATRONES EXPANDIDOS PARA ANÁLISIS PROFUNDO
 RAZONAMIENTO_PATTERNS = {
@@ -106,16 +108,33 @@ FUENTES = {
     "evidencia_empirica": r"\b(estadístic|datos|encuesta|muestra|regresión|dataset)\b"
 }
 
+# BANCOS COMPILADOS (una compilación por taxonomía, compartida por todas las instancias)
+FLAGS_SCORING = re.IGNORECASE | re.MULTILINE
+
+BANCOS = {
+    "razonamiento": PatternBank(RAZONAMIENTO_PATTERNS, FLAGS_SCORING),
+    "modalidad": PatternBank(MODALIDAD_EPISTEMICA_PATTERNS, FLAGS_SCORING),
+    "retorica": PatternBank(RETORICA_PATTERNS, FLAGS_SCORING),
+    "estilos": PatternBank(ESTILOS_LITERARIOS, FLAGS_SCORING),
+    "falacias": PatternBank(FALACIAS_HINTS, FLAGS_SCORING),
+    "axiomas": PatternBank(AXIOMAS, FLAGS_SCORING),
+    "sesgos": PatternBank(SESGOS_VALORATIVOS, FLAGS_SCORING),
+    "fuentes": PatternBank(FUENTES, FLAGS_SCORING)
+}
+
 class AnalyserMetodoMejorado:
     """Motor ANALYSER MÉTODO mejorado con taxonomía expandida"""
     
     def __init__(self):
         self.version = "v2.0_mejorado"
+    
+    def _normalizar(self, text: str, conteo: int) -> float:
+        """Normaliza un conteo por cada 800 caracteres"""
+        return min(1.0, conteo / max(1, len(text) // 800))
         
     def score_pattern(self, text: str, pattern: str) -> float:
         """Scoring rápido por conteos normalizados"""
-        matches = re.findall(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
-        return min(1.0, len(matches) / max(1, len(text) // 800))
+        return self._normalizar(text, contar_matches(compilar(pattern, FLAGS_SCORING), text))
     
     def score_group(self, text: str, patterns_dict: Dict[str, str]) -> Dict[str, float]:
         """Score múltiples patrones"""
@@ -128,6 +147,18 @@ class AnalyserMetodoMejorado:
             total_score += self.score_pattern(text, pattern)
         return min(1.0, total_score / max(1, len(patterns_list)))
     
+    def score_bank(self, text: str, banco: PatternBank) -> Dict[str, float]:
+        """Score de todas las categorías de un banco compilado"""
+        return {k: self._normalizar(text, n) for k, n in banco.contar(text).items()}
+    
+    def score_style_bank(self, text: str, banco: PatternBank) -> Dict[str, float]:
+        """Score de estilos desde un banco compilado (promedio de subpatrones)"""
+        scores = {}
+        for estilo, conteos in banco.contar_detalle(text).items():
+            total_score = sum(self._normalizar(text, n) for n in conteos)
+            scores[estilo] = min(1.0, total_score / max(1, len(conteos)))
+        return scores
+    
     def detectar_estructuras_argumentativas(self, text: str) -> Dict[str, float]:
         """Detección de estructuras argumentativas heurística"""
         estructuras = {}
@@ -169,22 +200,15 @@ class AnalyserMetodoMejorado:
     
     def detectar_falacias(self, text: str) -> List[str]:
         """Detecta falacias probables"""
-        falacias_detectadas = []
-        
-        for falacia, pattern in FALACIAS_HINTS.items():
-            if self.score_pattern(text, pattern) > 0.1:
-                falacias_detectadas.append(falacia)
-        
-        return falacias_detectadas
+        scores = self.score_bank(text, BANCOS["falacias"])
+        return [falacia for falacia, score in scores.items() if score > 0.1]
     
     def extraer_dogmas_y_valores(self, text: str) -> Dict[str, Any]:
         """Extrae axiomas del autor, creencias y sesgos valorativos"""
         
         # Axiomas detectados
-        axiomas_detectados = []
-        for axioma, pattern in AXIOMAS.items():
-            if self.score_pattern(text, pattern) > 0.1:
-                axiomas_detectados.append(axioma)
+        scores_axiomas = self.score_bank(text, BANCOS["axiomas"])
+        axiomas_detectados = [axioma for axioma, score in scores_axiomas.items() if score > 0.1]
         
         # Creencias explícitas (heurística)
         creencias = []
@@ -195,7 +219,7 @@ class AnalyserMetodoMejorado:
         creencias = [match[1].strip() for match in matches_creencias[:3]]
         
         # Sesgos valorativos
-        sesgos = self.score_group(text, SESGOS_VALORATIVOS)
+        sesgos = self.score_bank(text, BANCOS["sesgos"])
         
         return {
             "axiomas_autor": axiomas_detectados,
@@ -206,7 +230,7 @@ class AnalyserMetodoMejorado:
     def extraer_puntos_apoyo(self, text: str) -> Dict[str, Any]:
         """Extrae fuentes y puntos de apoyo del argumento"""
         
-        intensidades = self.score_group(text, FUENTES)
+        intensidades = self.score_bank(text, BANCOS["fuentes"])
         fuentes_principales = [k for k, v in intensidades.items() if v > 0.1]
         
         return {
@@ -255,15 +279,14 @@ class AnalyserMetodoMejorado:
             "coherencia_global": 0.5  # placeholder - se puede mejorar con análisis de conectores
         }
     
+    @instrumentar("analyser_perfil_autoral")
     def generar_perfil_autoral_completo(self, texto: str, autor: str = None, fuente: str = None) -> Dict[str, Any]:
         """Genera perfil autoral completo según esquema JSON unificado"""
         
         print(f"🧠 Generando perfil autoral completo para: {autor or 'Autor desconocido'}")
         
         # Análisis de estilos literarios
-        estilos_scores = {}
-        for estilo, patterns in ESTILOS_LITERARIOS.items():
-            estilos_scores[estilo] = self.score_style_group(texto, patterns)
+        estilos_scores = self.score_style_bank(texto, BANCOS["estilos"])
         
         # Perfil completo según esquema unificado
         perfil_autoral = {
@@ -274,10 +297,10 @@ class AnalyserMetodoMejorado:
                 "version_analyser": self.version
             },
             "cognicion": {
-                "razonamiento_formal": self.score_group(texto, RAZONAMIENTO_PATTERNS),
-                "modalidad_epistemica": self.score_group(texto, MODALIDAD_EPISTEMICA_PATTERNS),
+                "razonamiento_formal": self.score_bank(texto, BANCOS["razonamiento"]),
+                "modalidad_epistemica": self.score_bank(texto, BANCOS["modalidad"]),
                 "retorica": {
-                    **self.score_group(texto, RETORICA_PATTERNS),
+                    **self.score_bank(texto, BANCOS["retorica"]),
                     "falacias_probables": self.detectar_falacias(texto)
                 },
                 "estilo_literario": estilos_scores,
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ BENCHMARK DE RUTAS CRÍTICAS (benchmark_rendimiento)
+=====================================================
+
+Mide, sin red ni documentos reales, las rutas calientes del sistema sobre un
+corpus sintético reproducible (corpus_sintetico.py):
+
+- analizador_judicial: AnalizadorPensamientoJudicialArg.analizar (sentencias)
+- analyser_metodo:     AnalyserMetodoMejorado.generar_perfil_autoral_completo (doctrina)
+- extractor_citas:     ExtractorCitasJurisprudenciales.extraer_todas_citas (sentencias)
+- chunker_semantico:   ChunkerInteligente.fragmentar_lote (codificador hash
+                       determinista, o --modelo-embeddings con un modelo local)
+- faiss_carga:         read_index + metadatos pickle, como load_index_and_meta
+- faiss_busqueda:      IndexFlatL2.search de a una consulta, como buscar()
+- busqueda_mmap:       producto matriz·consulta + top-k sobre AlmacenVectorialMmap
+
+Por caso registra tiempo (mediana y mínimo de N repeticiones tras un
+calentamiento), throughput (documentos/s y MB/s) y pico de memoria
+(tracemalloc, en una corrida aparte para no distorsionar los tiempos; no ve
+la memoria interna de FAISS). Los casos cuyo módulo o dependencia falta se
+informan como omitidos.
+
+La línea base se guarda por escala en data/benchmark_linea_base.json; cada
+corrida se compara contra ella y termina con código 1 si algún caso empeora
+más que la tolerancia.
+
+USO:
+    python benchmark_rendimiento.py --escala mediano --guardar-linea-base
+    python benchmark_rendimiento.py --escala mediano            # compara
+    python benchmark_rendimiento.py --casos extractor_citas,analizador_judicial -r 10
+"""
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import json
+import os
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from corpus_sintetico import ESCALAS, generar_corpus
+
+SCRIPT_DIR = Path(__file__).parent
+LINEA_BASE = SCRIPT_DIR.parent / "data" / "benchmark_linea_base.json"
+
+TOLERANCIA_TIEMPO = 0.15    # 15% más lento que la línea base = regresión
+TOLERANCIA_MEMORIA = 0.25
+REPETICIONES = 5
+
+# Vectores sintéticos para las rutas de búsqueda
+VECTORES_POR_ESCALA = {"chico": 2_000, "mediano": 20_000, "grande": 100_000}
+DIMENSION = 768             # all-mpnet-base-v2
+CONSULTAS = 50
+TOP_K = 8
+
+# nombre -> preparar(corpus, contexto) -> (operación, documentos, bytes procesados)
+Preparador = Callable[[Dict, Dict], Tuple[Callable[[], object], int, int]]
+CASOS: Dict[str, Preparador] = {}
+
+
+def caso(nombre: str):
+    def registrar(preparar: Preparador) -> Preparador:
+        CASOS[nombre] = preparar
+        return preparar
+    return registrar
+
+
+def _bytes(documentos: List[Dict]) -> int:
+    return sum(len(doc["texto"].encode("utf-8")) for doc in documentos)
+
+
+def _vectores(cantidad: int, semilla: int) -> np.ndarray:
+    rng = np.random.default_rng(semilla)
+    vectores = rng.standard_normal((cantidad, DIMENSION), dtype=np.float32)
+    vectores /= np.linalg.norm(vectores, axis=1, keepdims=True)
+    return vectores
+
+
+class CodificadorHash:
+    """
+    Codificador determinista (bolsa de palabras con hashing) con la interfaz
+    encode() de SentenceTransformer. Aísla el costo del algoritmo de
+    fragmentación del costo del modelo, y no necesita descargar nada.
+    """
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def encode(self, textos, batch_size: int = 32, normalize_embeddings: bool = False, **_):
+        matriz = np.zeros((len(textos), self.dimension), dtype=np.float32)
+        for i, texto in enumerate(textos):
+            for palabra in texto.lower().split():
+                indice = int.from_bytes(hashlib.blake2b(palabra.encode("utf-8"), digest_size=4).digest(), "little")
+                matriz[i, indice % self.dimension] += 1.0
+        if normalize_embeddings:
+            matriz /= np.maximum(np.linalg.norm(matriz, axis=1, keepdims=True), 1e-12)
+        return matriz
+
+
+# =============================================================================
+# CASOS
+# =============================================================================
+
+@caso("analizador_judicial")
+def _preparar_analizador_judicial(corpus: Dict, contexto: Dict):
+    from analizador_pensamiento_judicial_arg import AnalizadorPensamientoJudicialArg
+
+    analizador = AnalizadorPensamientoJudicialArg()
+    textos = [doc["texto"] for doc in corpus["sentencias"]]
+    return (lambda: [analizador.analizar(texto) for texto in textos],
+            len(textos), _bytes(corpus["sentencias"]))
+
+
+@caso("analyser_metodo")
+def _preparar_analyser_metodo(corpus: Dict, contexto: Dict):
+    from analyser_metodo_mejorado import AnalyserMetodoMejorado
+
+    analyser = AnalyserMetodoMejorado()
+    documentos = corpus["doctrina"]
+    return (lambda: [analyser.generar_perfil_autoral_completo(doc["texto"], doc["autor"]) for doc in documentos],
+            len(documentos), _bytes(documentos))
+
+
+@caso("extractor_citas")
+def _preparar_extractor_citas(corpus: Dict, contexto: Dict):
+    from extractor_citas_jurisprudenciales import ExtractorCitasJurisprudenciales
+
+    extractor = ExtractorCitasJurisprudenciales()
+    textos = [doc["texto"] for doc in corpus["sentencias"]]
+    return (lambda: [extractor.extraer_todas_citas(texto) for texto in textos],
+            len(textos), _bytes(corpus["sentencias"]))
+
+
+@caso("chunker_semantico")
+def _preparar_chunker_semantico(corpus: Dict, contexto: Dict):
+    from chunker_inteligente import ChunkerInteligente
+
+    if contexto.get("modelo_embeddings"):
+        chunker = ChunkerInteligente(contexto["modelo_embeddings"])
+    else:
+        chunker = ChunkerInteligente.__new__(ChunkerInteligente)
+        chunker.model = CodificadorHash()
+        chunker.umbral_similitud = 0.75
+    documentos = corpus["sentencias"] + corpus["doctrina"]
+    textos = [doc["texto"] for doc in documentos]
+    return lambda: chunker.fragmentar_lote(textos), len(textos), _bytes(documentos)
+
+
+def _indice_faiss(corpus: Dict, contexto: Dict) -> Tuple[Path, Path]:
+    """Índice IndexFlatL2 + metadatos pickle en disco, como los deja la ingesta del webapp"""
+    import faiss
+
+    if "faiss" not in contexto:
+        vectores = _vectores(VECTORES_POR_ESCALA[contexto["escala"]], contexto["semilla"])
+        index = faiss.IndexFlatL2(DIMENSION)
+        index.add(vectores)
+        ruta_indice = contexto["directorio"] / "faiss.idx"
+        ruta_meta = contexto["directorio"] / "meta.pkl"
+        faiss.write_index(index, str(ruta_indice))
+        documentos = corpus["sentencias"] + corpus["doctrina"]
+        textos = [documentos[i % len(documentos)]["texto"][:1200] for i in range(len(vectores))]
+        with open(ruta_meta, "wb") as f:
+            pickle.dump({"textos": textos, "fuentes": [f"doc_{i}" for i in range(len(textos))]}, f)
+        contexto["faiss"] = (ruta_indice, ruta_meta)
+    return contexto["faiss"]
+
+
+@caso("faiss_carga")
+def _preparar_faiss_carga(corpus: Dict, contexto: Dict):
+    import faiss
+
+    ruta_indice, ruta_meta = _indice_faiss(corpus, contexto)
+
+    def cargar():
+        index = faiss.read_index(str(ruta_indice))
+        with open(ruta_meta, "rb") as f:
+            meta = pickle.load(f)
+        return index, meta["textos"], meta["fuentes"]
+
+    return cargar, 1, ruta_indice.stat().st_size + ruta_meta.stat().st_size
+
+
+@caso("faiss_busqueda")
+def _preparar_faiss_busqueda(corpus: Dict, contexto: Dict):
+    import faiss
+
+    ruta_indice, _ = _indice_faiss(corpus, contexto)
+    index = faiss.read_index(str(ruta_indice))
+    consultas = _vectores(CONSULTAS, contexto["semilla"] + 1)
+    return (lambda: [index.search(consultas[i:i + 1], TOP_K) for i in range(len(consultas))],
+            len(consultas), consultas.nbytes)
+
+
+@caso("busqueda_mmap")
+def _preparar_busqueda_mmap(corpus: Dict, contexto: Dict):
+    from almacen_vectorial import AlmacenVectorialMmap
+
+    vectores = _vectores(VECTORES_POR_ESCALA[contexto["escala"]], contexto["semilla"])
+    almacen = AlmacenVectorialMmap(contexto["directorio"] / "vectores")
+    almacen.agregar_lote((f"v{i}", vector) for i, vector in enumerate(vectores))
+    consultas = _vectores(CONSULTAS, contexto["semilla"] + 1)
+
+    def buscar_todas():
+        ids, matriz = almacen.vivos()
+        for consulta in consultas:
+            puntajes = matriz @ consulta
+            mejores = np.argpartition(-puntajes, TOP_K - 1)[:TOP_K]
+            [ids[i] for i in mejores[np.argsort(-puntajes[mejores])]]
+
+    return buscar_todas, len(consultas), vectores.nbytes
+
+
+# =============================================================================
+# MEDICIÓN Y COMPARACIÓN
+# =============================================================================
+
+def medir(operacion: Callable[[], object], repeticiones: int) -> Tuple[List[float], int]:
+    """Tiempos de ``repeticiones`` corridas (tras una de calentamiento) y pico de memoria"""
+    # Los analizadores imprimen progreso por documento: se descarta durante la medición
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        operacion()
+        tiempos = []
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            operacion()
+            tiempos.append(time.perf_counter() - inicio)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            operacion()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return tiempos, pico
+
+
+def ejecutar(escala: str, semilla: int = 42, repeticiones: int = REPETICIONES,
+             casos: Optional[List[str]] = None, modelo_embeddings: Optional[str] = None) -> Dict:
+    """Corre los casos pedidos y devuelve {'casos': {...}, 'omitidos': {...}, ...}"""
+    corpus = generar_corpus(escala, semilla)
+    resultados, omitidos = {}, {}
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as directorio:
+        contexto = {"escala": escala, "semilla": semilla, "directorio": Path(directorio),
+                    "modelo_embeddings": modelo_embeddings}
+        for nombre in casos or list(CASOS):
+            try:
+                operacion, documentos, procesados = CASOS[nombre](corpus, contexto)
+            except ImportError as e:
+                omitidos[nombre] = f"dependencia no disponible: {e}"
+                print(f"   ⏭️  {nombre:20} omitido ({e})")
+                continue
+
+            tiempos, pico = medir(operacion, repeticiones)
+            mediana = statistics.median(tiempos)
+            resultados[nombre] = {
+                "mediana_s": round(mediana, 6),
+                "min_s": round(min(tiempos), 6),
+                "documentos": documentos,
+                "documentos_por_s": round(documentos / mediana, 2) if mediana else None,
+                "mb_por_s": round(procesados / 1e6 / mediana, 3) if mediana else None,
+                "pico_mb": round(pico / 1e6, 3),
+                "repeticiones": repeticiones,
+            }
+            r = resultados[nombre]
+            print(f"   ⏱️  {nombre:20} {mediana * 1000:10.1f} ms  {r['documentos_por_s']:>10} doc/s  "
+                  f"{r['mb_por_s']:>8} MB/s  pico {r['pico_mb']:.1f} MB")
+
+    return {
+        "escala": escala,
+        "semilla": semilla,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "casos": resultados,
+        "omitidos": omitidos,
+    }
+
+
+def leer_linea_base(ruta: Path) -> Dict:
+    if not ruta.exists():
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_linea_base(ruta: Path, corrida: Dict):
+    lineas = leer_linea_base(ruta)
+    lineas[corrida["escala"]] = {clave: valor for clave, valor in corrida.items() if clave != "omitidos"}
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(lineas, f, ensure_ascii=False, indent=2)
+
+
+def comparar(corrida: Dict, base: Dict, tolerancia: float = TOLERANCIA_TIEMPO,
+             tolerancia_memoria: float = TOLERANCIA_MEMORIA) -> Dict[str, Dict]:
+    """
+    Compara cada caso contra la línea base de la misma escala. Estado:
+    'regresion', 'mejora', 'estable' o 'sin_base'.
+    """
+    comparacion = {}
+    for nombre, actual in corrida["casos"].items():
+        previo = base.get("casos", {}).get(nombre)
+        if not previo or base.get("semilla") != corrida["semilla"]:
+            comparacion[nombre] = {"estado": "sin_base"}
+            continue
+
+        razon_tiempo = actual["mediana_s"] / previo["mediana_s"] if previo["mediana_s"] else 1.0
+        razon_memoria = actual["pico_mb"] / previo["pico_mb"] if previo["pico_mb"] else 1.0
+        if razon_tiempo > 1 + tolerancia or razon_memoria > 1 + tolerancia_memoria:
+            estado = "regresion"
+        elif razon_tiempo < 1 - tolerancia:
+            estado = "mejora"
+        else:
+            estado = "estable"
+        comparacion[nombre] = {
+            "estado": estado,
+            "razon_tiempo": round(razon_tiempo, 3),
+            "razon_memoria": round(razon_memoria, 3),
+        }
+    return comparacion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline de las rutas críticas")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="chico")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("-r", "--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--casos", help=f"Separados por coma (default: todos: {', '.join(CASOS)})")
+    parser.add_argument("--linea-base", default=str(LINEA_BASE))
+    parser.add_argument("--guardar-linea-base", action="store_true",
+                        help="Guarda esta corrida como línea base de la escala")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_TIEMPO,
+                        help="Fracción de tiempo extra tolerada antes de marcar regresión")
+    parser.add_argument("--modelo-embeddings", help="Modelo local para chunker_semantico (default: codificador hash)")
+    parser.add_argument("--salida-json", help="Escribe el resultado completo en este archivo")
+    args = parser.parse_args()
+
+    casos = [c.strip() for c in args.casos.split(",")] if args.casos else None
+    desconocidos = [c for c in casos or [] if c not in CASOS]
+    if desconocidos:
+        parser.error(f"Casos desconocidos: {', '.join(desconocidos)}")
+
+    print(f"⏱️ BENCHMARK - escala '{args.escala}', semilla {args.semilla}, {args.repeticiones} repeticiones")
+    print("=" * 70)
+    corrida = ejecutar(args.escala, args.semilla, args.repeticiones, casos, args.modelo_embeddings)
+
+    ruta_base = Path(args.linea_base)
+    base = leer_linea_base(ruta_base).get(args.escala, {})
+    corrida["comparacion"] = comparar(corrida, base, args.tolerancia)
+
+    print("=" * 70)
+    iconos = {"regresion": "⚠️  REGRESIÓN", "mejora": "🚀 mejora", "estable": "✅ estable", "sin_base": "·  sin línea base"}
+    for nombre, comp in corrida["comparacion"].items():
+        detalle = ""
+        if "razon_tiempo" in comp:
+            detalle = f" (tiempo x{comp['razon_tiempo']}, memoria x{comp['razon_memoria']})"
+        print(f"   {nombre:20} {iconos[comp['estado']]}{detalle}")
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as f:
+            json.dump(corrida, f, ensure_ascii=False, indent=2)
+    if args.guardar_linea_base:
+        guardar_linea_base(ruta_base, corrida)
+        print(f"💾 Línea base '{args.escala}' guardada en {ruta_base}")
+
+    regresiones = [n for n, c in corrida["comparacion"].items() if c["estado"] == "regresion"]
+    if regresiones:
+        print(f"🎯 RESULTADO: {len(regresiones)} regresión(es): {', '.join(regresiones)}")
+        return False
+    print("🎯 RESULTADO: sin regresiones")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
-import sqlite3, numpy as np, faiss, pickle, datetime
+import argparse, sqlite3, numpy as np, faiss, pickle, datetime
 from pathlib import Path
 from tqdm import tqdm
 from sentence_transformers import SentenceTransformer
 from config_rutas import PENSAMIENTO_DB, FAISS_IDX, FAISS_META, EMBEDDING_MODEL
+from deduplicador import colapsar_duplicados, UMBRAL_DUPLICADO
 
 def load_chunks():
     con = sqlite3.connect(PENSAMIENTO_DB)
@@ -14,11 +15,25 @@ def load_chunks():
     return rows
 
 def main():
+    parser = argparse.ArgumentParser(description="Construye el índice FAISS de chunks de sentencias")
+    parser.add_argument("--sin-dedup", action="store_true", help="Indexa también los chunks casi duplicados")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_DUPLICADO, help="Similitud mínima de duplicado")
+    args = parser.parse_args()
+
     rows = load_chunks()
     if not rows:
         print("⚠️ No hay chunks en la base. Corré ingesta_sentencias.py primero.")
         return
 
+    # Casi-duplicados (MinHash/LSH): sólo se embebe el primer ejemplar;
+    # los demás quedan como alias en el meta (query_rag_sentencias los devuelve
+    # con el puntaje de su original)
+    alias = {}
+    if not args.sin_dedup:
+        total = len(rows)
+        rows, alias = colapsar_duplicados(rows, umbral=args.umbral)
+        print(f"🧬 Casi-duplicados colapsados: {len(alias)}/{total} chunks")
+
     texts = [t for _, t in rows]
     ids = [i for i, _ in rows]
 
@@ -43,6 +58,7 @@ def main():
             "modelo": EMBEDDING_MODEL,
             "dimension": dim,
             "total_chunks": len(ids),
+            "alias": alias,
             "fecha_creacion": datetime.datetime.now().isoformat(timespec="seconds")
         }, f)
     print(f"✅ FAISS listo: {len(ids)} chunks, dim={dim}, modelo={EMBEDDING_MODEL}")
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+🔎 BUSCADOR FACETADO DE SENTENCIAS (HÍBRIDO: SQL + FTS5 + VECTORES)
+==================================================================
+
+Búsqueda sobre sentencias_por_juez_arg (juez_centrico_arg.db) para la ruta
+/judicial/buscar/query:
+
+1. Facetas (juez, fuero, jurisdicción, rango de fechas, resultado) → WHERE
+   sobre columnas indexadas: se resuelven en SQL antes de cualquier otra cosa.
+2. Recuperación léxica: índice FTS5 (sentencias_fts) sobre carátula, materia
+   y texto, restringido a las filas que pasan las facetas.
+3. Recuperación vectorial: un vector por sentencia en un AlmacenVectorialMmap
+   (bases_rag/cognitiva/vectores_sentencias/); sólo se puntúan las filas
+   candidatas.
+4. Fusión por rango recíproco (RRF), paginación y conteos por faceta
+   (cada faceta se cuenta sin su propio filtro).
+
+Sin texto de búsqueda se listan las sentencias filtradas por fecha descendente.
+Si no hay vectores o modelo de embeddings, la búsqueda queda en modo léxico.
+
+USO:
+    python buscador_sentencias.py --preparar            # índices + FTS5
+    python buscador_sentencias.py --vectorizar          # vectores faltantes
+    python buscador_sentencias.py --buscar "despido embarazo" --fuero laboral
+"""
+
+import argparse
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from almacen_vectorial import AlmacenVectorialMmap, ARCHIVO_MAPA
+from carga_perezosa import REGISTRO
+from deduplicador import claves_duplicadas
+from pool_sqlite import obtener_pool
+
+SCRIPT_DIR = Path(__file__).parent
+BASE_DIR = SCRIPT_DIR.parent
+BASES_RAG_DIR = BASE_DIR / "bases_rag" / "cognitiva"
+DB_JUDICIAL = BASES_RAG_DIR / "juez_centrico_arg.db"
+DIR_VECTORES = BASES_RAG_DIR / "vectores_sentencias"
+
+# Columnas facetables (todas con índice)
+FACETAS = ("juez", "fuero", "jurisdiccion", "resultado")
+
+COLUMNAS_RESULTADO = (
+    "id", "sentencia_id", "juez", "fecha_sentencia", "expediente", "caratula",
+    "fuero", "jurisdiccion", "tribunal", "materia", "resultado"
+)
+
+LIMITE_CANDIDATOS = 1000   # por cada recuperador, antes de fusionar
+RRF_K = 60
+MAX_POR_PAGINA = 100
+MAX_VALORES_FACETA = 20
+CARACTERES_A_VECTORIZAR = 4000
+
+SQL_PREPARAR = """
+CREATE INDEX IF NOT EXISTS idx_sentencia_jurisdiccion ON sentencias_por_juez_arg(jurisdiccion);
+CREATE INDEX IF NOT EXISTS idx_sentencia_resultado ON sentencias_por_juez_arg(resultado);
+CREATE INDEX IF NOT EXISTS idx_sentencia_juez_fecha ON sentencias_por_juez_arg(juez, fecha_sentencia);
+-- Índice cubriente: los conteos por faceta no leen las filas (que incluyen el texto completo)
+CREATE INDEX IF NOT EXISTS idx_sentencia_facetas
+    ON sentencias_por_juez_arg(fuero, jurisdiccion, resultado, juez, fecha_sentencia, sentencia_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS sentencias_fts USING fts5(
+    caratula, materia, texto_completo,
+    content='sentencias_por_juez_arg', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS sentencias_fts_ai AFTER INSERT ON sentencias_por_juez_arg BEGIN
+    INSERT INTO sentencias_fts(rowid, caratula, materia, texto_completo)
+    VALUES (new.id, new.caratula, new.materia, new.texto_completo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sentencias_fts_ad AFTER DELETE ON sentencias_por_juez_arg BEGIN
+    INSERT INTO sentencias_fts(sentencias_fts, rowid, caratula, materia, texto_completo)
+    VALUES ('delete', old.id, old.caratula, old.materia, old.texto_completo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sentencias_fts_au AFTER UPDATE OF caratula, materia, texto_completo
+ON sentencias_por_juez_arg BEGIN
+    INSERT INTO sentencias_fts(sentencias_fts, rowid, caratula, materia, texto_completo)
+    VALUES ('delete', old.id, old.caratula, old.materia, old.texto_completo);
+    INSERT INTO sentencias_fts(rowid, caratula, materia, texto_completo)
+    VALUES (new.id, new.caratula, new.materia, new.texto_completo);
+END;
+"""
+
+
+def _crear_modelo_embeddings():
+    from sentence_transformers import SentenceTransformer
+    from config_rutas import EMBEDDING_MODEL
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+REGISTRO.registrar("embedder_sentencias", _crear_modelo_embeddings)
+
+
+@lru_cache(maxsize=256)
+def _vector_consulta(query: str) -> np.ndarray:
+    modelo = REGISTRO.obtener("embedder_sentencias")
+    return np.asarray(modelo.encode([query], normalize_embeddings=True), dtype=np.float32)[0]
+
+
+def consulta_fts(query: str) -> str:
+    """Convierte texto libre en una consulta FTS5 segura (términos entre comillas, OR)"""
+    terminos = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{t}"' for t in terminos if len(t) > 2)
+
+
+class BuscadorSentencias:
+    """Búsqueda híbrida facetada sobre sentencias_por_juez_arg"""
+
+    def __init__(self, db_path: Path = DB_JUDICIAL, dir_vectores: Path = DIR_VECTORES):
+        self.db_path = Path(db_path)
+        self.dir_vectores = Path(dir_vectores)
+        self.pool = obtener_pool(self.db_path)
+        self._almacen: Optional[AlmacenVectorialMmap] = None
+        self._almacen_mtime = None
+        self._vivos: Optional[Tuple[int, List[str], np.ndarray]] = None
+        self.fts_disponible = self._existe_tabla("sentencias_fts")
+        # Bases creadas antes del índice cubriente no lo tienen hasta preparar_indices()
+        self.indice_facetas_disponible = self._existe_tabla("idx_sentencia_facetas")
+
+    # ------------------------------------------------------
+    # Preparación (índices, FTS5, vectores)
+    # ------------------------------------------------------
+    def _existe_tabla(self, nombre: str) -> bool:
+        return self.pool.consultar_uno(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (nombre,)
+        ) is not None
+
+    def preparar_indices(self, reconstruir_fts: bool = False) -> bool:
+        """Crea índices de facetas y el índice FTS5 (idempotente)"""
+        nuevo = not self._existe_tabla("sentencias_fts")
+        with self.pool.escritura() as cursor:
+            cursor.executescript(SQL_PREPARAR)
+            if nuevo or reconstruir_fts:
+                cursor.execute("INSERT INTO sentencias_fts(sentencias_fts) VALUES ('rebuild')")
+                cursor.execute("ANALYZE sentencias_por_juez_arg")
+        self.fts_disponible = True
+        self.indice_facetas_disponible = True
+        if nuevo:
+            print("✅ Índice FTS5 de sentencias creado")
+        return nuevo
+
+    def almacen(self) -> Optional[AlmacenVectorialMmap]:
+        """Almacén de vectores; se recarga si otro proceso lo actualizó"""
+        ruta_mapa = self.dir_vectores / ARCHIVO_MAPA
+        if not ruta_mapa.exists():
+            return None
+        mtime = ruta_mapa.stat().st_mtime
+        if self._almacen is None or mtime != self._almacen_mtime:
+            self._almacen = AlmacenVectorialMmap(self.dir_vectores)
+            self._almacen_mtime = mtime
+            self._vivos = None
+        return self._almacen
+
+    def vectorizar_pendientes(self, tamano_lote: int = 64) -> int:
+        """
+        Calcula el vector de cada sentencia que todavía no está en el almacén.
+        Las sentencias registradas como casi-duplicado (deduplicador.py) no se
+        vectorizan: su original ya ocupa ese lugar en los resultados.
+        """
+        almacen = AlmacenVectorialMmap(self.dir_vectores)
+        modelo = REGISTRO.obtener("embedder_sentencias")
+        duplicadas = claves_duplicadas(self.pool.lector(), "sentencia")
+
+        filas = self.pool.consultar(
+            f"""SELECT sentencia_id, caratula, materia, substr(texto_completo, 1, {CARACTERES_A_VECTORIZAR})
+            FROM sentencias_por_juez_arg ORDER BY id"""
+        )
+        pendientes = [f for f in filas if f[0] not in almacen and f[0] not in duplicadas]
+
+        total = 0
+        for inicio in range(0, len(pendientes), tamano_lote):
+            lote = pendientes[inicio:inicio + tamano_lote]
+            textos = [". ".join(p for p in (c, m, t) if p) for _, c, m, t in lote]
+            vectores = modelo.encode(textos, batch_size=tamano_lote, normalize_embeddings=True)
+            total += almacen.agregar_lote(zip([f[0] for f in lote], vectores))
+            print(f"   🧮 {total}/{len(pendientes)} sentencias vectorizadas")
+        return total
+
+    # ------------------------------------------------------
+    # Filtros
+    # ------------------------------------------------------
+    @staticmethod
+    def _where(filtros: Dict[str, Any], excluir: Optional[str] = None,
+               alias: str = "") -> Tuple[str, List[Any]]:
+        condiciones, params = [], []
+        for campo in FACETAS:
+            valor = filtros.get(campo)
+            if campo == excluir or valor in (None, "", []):
+                continue
+            if isinstance(valor, (list, tuple)):
+                condiciones.append(f"{alias}{campo} IN ({','.join('?' * len(valor))})")
+                params.extend(valor)
+            else:
+                condiciones.append(f"{alias}{campo} = ?")
+                params.append(valor)
+        if filtros.get("fecha_desde"):
+            condiciones.append(f"{alias}fecha_sentencia >= ?")
+            params.append(filtros["fecha_desde"])
+        if filtros.get("fecha_hasta"):
+            condiciones.append(f"{alias}fecha_sentencia <= ?")
+            params.append(filtros["fecha_hasta"])
+        return (" AND ".join(condiciones) or "1"), params
+
+    def _indice_facetas(self, where: str) -> str:
+        if where == "1" or not self.indice_facetas_disponible:
+            return ""
+        return "INDEXED BY idx_sentencia_facetas"
+
+    def contar_facetas(self, filtros: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Conteos por valor de cada faceta (sin aplicar el filtro de la propia faceta).
+
+        Con otros filtros activos se fuerza el índice cubriente (si la base
+        ya lo tiene): sin él, SQLite
+        prefiere recorrer un índice ordenado por la faceta y leer cada fila
+        completa para filtrar.
+        """
+        facetas = {}
+        for campo in FACETAS:
+            where, params = self._where(filtros, excluir=campo)
+            filas = self.pool.consultar(
+                f"""SELECT {campo}, COUNT(*) FROM sentencias_por_juez_arg {self._indice_facetas(where)}
+                WHERE {where} AND {campo} IS NOT NULL
+                GROUP BY {campo} ORDER BY COUNT(*) DESC LIMIT {MAX_VALORES_FACETA}""",
+                params
+            )
+            facetas[campo] = [{"valor": v, "cantidad": n} for v, n in filas]
+
+        where, params = self._where({k: v for k, v in filtros.items()
+                                     if k not in ("fecha_desde", "fecha_hasta")})
+        filas = self.pool.consultar(
+            f"""SELECT substr(fecha_sentencia, 1, 4) AS anio, COUNT(*)
+            FROM sentencias_por_juez_arg {self._indice_facetas(where)}
+            WHERE {where} AND fecha_sentencia IS NOT NULL
+            GROUP BY anio ORDER BY anio DESC""",
+            params
+        )
+        facetas["anio"] = [{"valor": v, "cantidad": n} for v, n in filas]
+        return facetas
+
+    # ------------------------------------------------------
+    # Recuperadores
+    # ------------------------------------------------------
+    def _candidatos_lexicos(self, query: str, filtros: Dict[str, Any]) -> List[str]:
+        consulta = consulta_fts(query)
+        if not consulta or not self.fts_disponible:
+            return []
+        where, params = self._where(filtros, alias="s.")
+        filas = self.pool.consultar(
+            f"""SELECT s.sentencia_id
+            FROM sentencias_fts
+            JOIN sentencias_por_juez_arg s ON s.id = sentencias_fts.rowid
+            WHERE sentencias_fts MATCH ? AND {where}
+            ORDER BY bm25(sentencias_fts)
+            LIMIT {LIMITE_CANDIDATOS}""",
+            [consulta] + params
+        )
+        return [f[0] for f in filas]
+
+    def _matriz_viva(self, almacen: AlmacenVectorialMmap) -> Tuple[List[str], np.ndarray]:
+        if self._vivos is None or self._vivos[0] != almacen.filas:
+            ids, matriz = almacen.vivos()
+            self._vivos = (almacen.filas, ids, np.ascontiguousarray(matriz))
+        return self._vivos[1], self._vivos[2]
+
+    def _candidatos_vectoriales(self, query: str, filtros: Dict[str, Any],
+                                hay_filtros: bool) -> List[str]:
+        almacen = self.almacen()
+        if almacen is None or not len(almacen):
+            return []
+        try:
+            vector = _vector_consulta(query)
+        except Exception as e:
+            print(f"⚠️ Búsqueda vectorial no disponible: {e}")
+            return []
+
+        if hay_filtros:
+            where, params = self._where(filtros)
+            permitidos = self.pool.consultar(
+                f"SELECT sentencia_id FROM sentencias_por_juez_arg WHERE {where}", params
+            )
+            ids = [f[0] for f in permitidos if f[0] in almacen.ids]
+            if not ids:
+                return []
+            filas = np.fromiter((almacen.ids[i] for i in ids), dtype=np.int64, count=len(ids))
+            matriz = almacen.matriz()[filas]
+        else:
+            ids, matriz = self._matriz_viva(almacen)
+
+        puntajes = matriz @ vector
+        k = min(LIMITE_CANDIDATOS, len(ids))
+        mejores = np.argpartition(-puntajes, k - 1)[:k]
+        mejores = mejores[np.argsort(-puntajes[mejores])]
+        return [ids[i] for i in mejores]
+
+    # ------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------
+    def _filas_por_id(self, sentencia_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not sentencia_ids:
+            return {}
+        filas = self.pool.consultar_dicts(
+            f"""SELECT {', '.join(COLUMNAS_RESULTADO)}, substr(texto_completo, 1, 300) AS fragmento
+            FROM sentencias_por_juez_arg
+            WHERE sentencia_id IN ({','.join('?' * len(sentencia_ids))})""",
+            sentencia_ids
+        )
+        return {f["sentencia_id"]: f for f in filas}
+
+    def buscar(self, query: str = "", filtros: Optional[Dict[str, Any]] = None,
+               pagina: int = 1, por_pagina: int = 20, con_facetas: bool = True) -> Dict[str, Any]:
+        """
+        Búsqueda híbrida paginada.
+
+        Args:
+            query: texto libre (vacío = listar por fecha)
+            filtros: juez, fuero, jurisdiccion, resultado (valor o lista),
+                     fecha_desde, fecha_hasta (YYYY-MM-DD)
+        """
+        inicio = time.perf_counter()
+        filtros = filtros or {}
+        query = (query or "").strip()
+        pagina = max(1, int(pagina))
+        por_pagina = max(1, min(MAX_POR_PAGINA, int(por_pagina)))
+        desde = (pagina - 1) * por_pagina
+        hay_filtros = any(filtros.get(c) for c in FACETAS + ("fecha_desde", "fecha_hasta"))
+
+        modo = "listado"
+        if not query:
+            where, params = self._where(filtros)
+            total = self.pool.consultar_uno(
+                f"SELECT COUNT(*) FROM sentencias_por_juez_arg WHERE {where}", params
+            )[0]
+            pagina_ids = [f[0] for f in self.pool.consultar(
+                f"""SELECT sentencia_id FROM sentencias_por_juez_arg WHERE {where}
+                ORDER BY fecha_sentencia DESC, id DESC LIMIT ? OFFSET ?""",
+                params + [por_pagina, desde]
+            )]
+            puntajes, fuentes = {}, {}
+        else:
+            lexicos = self._candidatos_lexicos(query, filtros)
+            vectoriales = self._candidatos_vectoriales(query, filtros, hay_filtros)
+            modo = "hibrido" if lexicos and vectoriales else ("vectorial" if vectoriales else "lexico")
+
+            puntajes: Dict[str, float] = {}
+            fuentes: Dict[str, List[str]] = {}
+            for nombre, lista in (("lexica", lexicos), ("vectorial", vectoriales)):
+                for rango, sentencia_id in enumerate(lista):
+                    puntajes[sentencia_id] = puntajes.get(sentencia_id, 0.0) + 1.0 / (RRF_K + rango + 1)
+                    fuentes.setdefault(sentencia_id, []).append(nombre)
+
+            ordenados = sorted(puntajes, key=puntajes.get, reverse=True)
+            total = len(ordenados)
+            pagina_ids = ordenados[desde:desde + por_pagina]
+
+        filas = self._filas_por_id(pagina_ids)
+        resultados = []
+        for sentencia_id in pagina_ids:
+            fila = filas.get(sentencia_id)
+            if fila is None:
+                continue
+            if sentencia_id in puntajes:
+                fila["score"] = round(puntajes[sentencia_id], 6)
+                fila["fuentes"] = fuentes[sentencia_id]
+            resultados.append(fila)
+
+        respuesta = {
+            "query": query,
+            "filtros": filtros,
+            "modo": modo,
+            "total": total,
+            "pagina": pagina,
+            "por_pagina": por_pagina,
+            "paginas": (total + por_pagina - 1) // por_pagina,
+            "resultados": resultados
+        }
+        if con_facetas:
+            respuesta["facetas"] = self.contar_facetas(filtros)
+        respuesta["ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+        return respuesta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buscador facetado de sentencias")
+    parser.add_argument("--db", default=str(DB_JUDICIAL))
+    parser.add_argument("--preparar", action="store_true", help="Crea índices y FTS5")
+    parser.add_argument("--reconstruir-fts", action="store_true", help="Reconstruye el índice FTS5")
+    parser.add_argument("--vectorizar", action="store_true", help="Vectoriza sentencias nuevas")
+    parser.add_argument("--buscar", default=None, help="Texto a buscar")
+    for campo in FACETAS + ("fecha_desde", "fecha_hasta"):
+        parser.add_argument(f"--{campo.replace('_', '-')}", dest=campo, default=None)
+    parser.add_argument("--pagina", type=int, default=1)
+    args = parser.parse_args()
+
+    buscador = BuscadorSentencias(args.db)
+    if args.preparar or args.reconstruir_fts:
+        buscador.preparar_indices(reconstruir_fts=args.reconstruir_fts)
+    if args.vectorizar:
+        print(f"✅ {buscador.vectorizar_pendientes()} sentencias vectorizadas")
+
+    if args.buscar is not None:
+        filtros = {c: getattr(args, c) for c in FACETAS + ("fecha_desde", "fecha_hasta") if getattr(args, c)}
+        r = buscador.buscar(args.buscar, filtros, pagina=args.pagina)
+        print(f"🔍 {r['total']} resultados ({r['modo']}, {r['ms']} ms) - página {r['pagina']}/{r['paginas']}")
+        for fila in r["resultados"]:
+            print(f"  [{fila['sentencia_id']}] {fila['fecha_sentencia']} {fila['juez']} | "
+                  f"{fila['caratula']} | {fila['resultado']} | score={fila.get('score', '-')}")
+        for campo, valores in r["facetas"].items():
+            print(f"  {campo}: " + ", ".join(f"{v['valor']} ({v['cantidad']})" for v in valores[:8]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ CACHÉ HTTP CONDICIONAL POR GENERACIÓN DE DATOS (cache_respuestas)
+====================================================================
+
+Las páginas analíticas (/radar, /autores, /autor/<nombre>, /informe-autor,
+/biblioteca, /juez/<nombre>) recalculan figuras Plotly, agregados SQL y HTML
+grande en cada request, aunque los datos sólo cambian cuando corre la ingesta.
+
+- generaciones_datos: tabla en cada base con un contador por entidad
+  (autor | juez) y clave (nombre, o '*' para toda la base). Triggers sobre
+  las tablas de origen lo incrementan en cada insert/update/delete, así que
+  ningún escritor tiene que acordarse de invalidar nada.
+- @cache_condicional: la vista declara de qué generaciones depende. El ETag
+  sale de esas generaciones (y la URL); Last-Modified, de la última escritura.
+  Si el navegador ya tiene esa versión se responde 304 sin ejecutar la vista;
+  si otro cliente ya la pidió, se sirve desde la caché en memoria.
+- Sólo se cachean GET con respuesta 200.
+
+USO:
+    from cache_respuestas import cache_condicional, DB_COGNITIVA
+
+    @app.route('/autor/<nombre>')
+    @cache_condicional(lambda nombre: [(DB_COGNITIVA, 'autor', nombre)])
+    def perfil_autor(nombre): ...
+
+    python cache_respuestas.py --db ../bases_rag/cognitiva/metadatos.db
+"""
+
+import argparse
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import Response, make_response, request
+
+from pool_sqlite import obtener_pool
+
+SCRIPT_DIR = Path(__file__).parent
+BASE_DIR = SCRIPT_DIR.parent
+BASES_RAG_DIR = BASE_DIR / "bases_rag" / "cognitiva"
+DB_COGNITIVA = BASES_RAG_DIR / "metadatos.db"
+DB_AUTOR_CENTRICO = BASES_RAG_DIR / "autor_centrico.db"
+DB_JUDICIAL = BASES_RAG_DIR / "juez_centrico_arg.db"
+DB_PERFILES = BASE_DIR / "data" / "perfiles.db"
+
+# Por nombre de archivo de la base: (tabla, columna con el nombre, entidad)
+FUENTES: Dict[str, List[Tuple[str, str, str]]] = {
+    "metadatos.db": [("perfiles_cognitivos", "autor", "autor")],
+    "perfiles.db": [("perfiles_cognitivos", "autor_detectado", "autor")],
+    "autor_centrico.db": [("perfiles_autorales_expandidos", "autor", "autor")],
+    "juez_centrico_arg.db": [
+        ("perfiles_judiciales_argentinos", "juez", "juez"),
+        ("sentencias_por_juez_arg", "juez", "juez"),
+        ("lineas_jurisprudenciales", "juez", "juez"),
+        ("redes_influencia_judicial", "juez_origen", "juez"),
+        ("factores_predictivos", "juez", "juez"),
+    ],
+}
+
+TODA_LA_BASE = "*"
+CACHE_MAX_ENTRADAS = 256
+
+# Cambia en cada arranque: un ETag de otra versión del código nunca valida
+_ARRANQUE = str(time.time_ns())
+
+SQL_GENERACIONES = """
+CREATE TABLE IF NOT EXISTS generaciones_datos (
+    entidad TEXT NOT NULL,            -- autor | juez
+    clave TEXT NOT NULL,              -- nombre, o '*' para toda la base
+    generacion INTEGER NOT NULL,
+    modificado TEXT NOT NULL,         -- UTC ISO
+    PRIMARY KEY (entidad, clave)
+);
+"""
+
+
+def _incremento(entidad: str, expresion: str, condicion: str = "") -> str:
+    return f"""
+    INSERT INTO generaciones_datos (entidad, clave, generacion, modificado)
+    SELECT '{entidad}', {expresion}, 1, strftime('%Y-%m-%dT%H:%M:%S', 'now')
+    WHERE {expresion} IS NOT NULL{condicion}
+    ON CONFLICT(entidad, clave) DO UPDATE SET
+        generacion = generacion + 1, modificado = excluded.modificado;"""
+
+
+def _triggers(tabla: str, columna: str, entidad: str) -> str:
+    base = _incremento(entidad, f"'{TODA_LA_BASE}'")
+    return f"""
+CREATE TRIGGER IF NOT EXISTS trg_gen_{tabla}_insert
+AFTER INSERT ON {tabla}
+BEGIN{_incremento(entidad, f"NEW.{columna}")}{base}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_gen_{tabla}_update
+AFTER UPDATE ON {tabla}
+BEGIN{_incremento(entidad, f"OLD.{columna}")}{_incremento(entidad, f"NEW.{columna}", f" AND NEW.{columna} IS NOT OLD.{columna}")}{base}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_gen_{tabla}_delete
+AFTER DELETE ON {tabla}
+BEGIN{_incremento(entidad, f"OLD.{columna}")}{base}
+END;
+"""
+
+
+_BASES_INICIALIZADAS: Set[str] = set()
+_LOCK_BASES = threading.Lock()
+
+
+def asegurar_generaciones(db_path) -> bool:
+    """
+    Crea generaciones_datos y los triggers de las tablas de origen que ya
+    existen. No crea la base si falta. True si la base quedó completa.
+    """
+    ruta = Path(db_path)
+    clave = str(ruta.resolve())
+    if clave in _BASES_INICIALIZADAS:
+        return True
+    if not ruta.exists():
+        return False
+
+    with _LOCK_BASES:
+        if clave in _BASES_INICIALIZADAS:
+            return True
+        pool = obtener_pool(ruta)
+        existentes = {fila[0] for fila in pool.consultar("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        fuentes = FUENTES.get(ruta.name, [])
+        with pool.escritura() as cursor:
+            cursor.executescript(SQL_GENERACIONES + "".join(
+                _triggers(tabla, columna, entidad)
+                for tabla, columna, entidad in fuentes if tabla in existentes
+            ))
+        # Si falta alguna tabla de origen se reintenta en la próxima lectura
+        if all(tabla in existentes for tabla, _, _ in fuentes):
+            _BASES_INICIALIZADAS.add(clave)
+            return True
+        return False
+
+
+def generacion(db_path, entidad: str, clave: str = TODA_LA_BASE) -> Tuple[int, Optional[str]]:
+    """(generación, última modificación UTC) de una entidad; (0, None) si nunca cambió"""
+    if not Path(db_path).exists():
+        return 0, None
+    asegurar_generaciones(db_path)
+    fila = obtener_pool(db_path).consultar_uno(
+        "SELECT generacion, modificado FROM generaciones_datos WHERE entidad = ? AND clave = ?",
+        (entidad, clave)
+    )
+    return (fila[0], fila[1]) if fila else (0, None)
+
+
+def etiqueta(recurso: str, dependencias: Iterable[Tuple]) -> Tuple[str, Optional[datetime]]:
+    """ETag y Last-Modified de ``recurso`` según las generaciones de las que depende"""
+    h = hashlib.sha1(f"{_ARRANQUE}|{recurso}".encode("utf-8"))
+    ultima = None
+    for db_path, entidad, clave in dependencias:
+        numero, modificado = generacion(db_path, entidad, clave)
+        h.update(f"|{Path(db_path).name}:{entidad}:{clave}={numero}".encode("utf-8"))
+        if modificado and (ultima is None or modificado > ultima):
+            ultima = modificado
+    if ultima:
+        ultima = datetime.strptime(ultima, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return h.hexdigest(), ultima
+
+
+class CacheRespuestas:
+    """Respuestas renderizadas por recurso (LRU), válidas mientras el ETag coincida"""
+
+    def __init__(self, max_entradas: int = CACHE_MAX_ENTRADAS):
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[str, Tuple[str, bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.no_modificados = 0
+
+    def obtener(self, recurso: str, etag: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entrada = self._entradas.get(recurso)
+            if entrada is None or entrada[0] != etag:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(recurso)
+            self.aciertos += 1
+            return entrada[1], entrada[2]
+
+    def guardar(self, recurso: str, etag: str, cuerpo: bytes, mimetype: str):
+        with self._lock:
+            self._entradas[recurso] = (etag, cuerpo, mimetype)
+            self._entradas.move_to_end(recurso)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def vaciar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estado(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": sum(len(entrada[1]) for entrada in self._entradas.values()),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "no_modificados": self.no_modificados,
+            }
+
+
+CACHE = CacheRespuestas()
+
+
+def _no_modificado(etag: str, ultima: Optional[datetime]) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    return bool(ultima and request.if_modified_since and request.if_modified_since >= ultima)
+
+
+def cache_condicional(dependencias: Callable[..., Iterable[Tuple]], cache: CacheRespuestas = CACHE):
+    """
+    Decorador de vistas Flask. ``dependencias`` recibe los argumentos de la
+    ruta y devuelve [(db_path, entidad, clave), ...].
+    """
+    def decorador(vista):
+        @functools.wraps(vista)
+        def envoltura(*args, **kwargs):
+            if request.method != "GET":
+                return vista(*args, **kwargs)
+
+            recurso = f"{request.endpoint}|{request.full_path}"
+            etag, ultima = etiqueta(recurso, dependencias(*args, **kwargs))
+
+            if _no_modificado(etag, ultima):
+                cache.no_modificados += 1
+                respuesta = Response(status=304)
+            else:
+                guardada = cache.obtener(recurso, etag)
+                if guardada:
+                    respuesta = Response(guardada[0], mimetype=guardada[1])
+                else:
+                    respuesta = make_response(vista(*args, **kwargs))
+                    if respuesta.status_code != 200 or respuesta.is_streamed:
+                        return respuesta
+                    cache.guardar(recurso, etag, respuesta.get_data(), respuesta.mimetype)
+
+            respuesta.set_etag(etag)
+            if ultima:
+                respuesta.last_modified = ultima
+            respuesta.cache_control.no_cache = True
+            return respuesta
+        return envoltura
+    return decorador
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generaciones de datos para la caché HTTP")
+    parser.add_argument("--db", default=str(DB_COGNITIVA))
+    args = parser.parse_args()
+
+    completa = asegurar_generaciones(args.db)
+    filas = obtener_pool(args.db).consultar(
+        "SELECT entidad, clave, generacion, modificado FROM generaciones_datos ORDER BY entidad, clave"
+    )
+    print(f"🗂️ generaciones_datos en {Path(args.db).name}: {len(filas)} claves"
+          f"{'' if completa else ' (faltan tablas de origen)'}")
+    for entidad, clave, numero, modificado in filas[:50]:
+        print(f"   {entidad:6} {clave[:50]:50} gen {numero:>6}  {modificado}")
+
+
+if __name__ == "__main__":
+    main()
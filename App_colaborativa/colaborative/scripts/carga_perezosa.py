@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+⏱️ CARGA PEREZOSA Y PERFIL DE ARRANQUE
+=====================================
+
+Registro de módulos y modelos pesados (faiss, sentence_transformers,
+transformers, reportlab, docx, google.generativeai, pipelines doctrinarios,
+modelo cognitivo...) que se importan/cargan en el primer uso de la ruta
+que los necesita, en lugar de al importar end2end_webapp.py.
+
+USO:
+    from carga_perezosa import REGISTRO
+    faiss = REGISTRO.modulo("faiss")              # proxy: importa al primer acceso
+    REGISTRO.registrar("embedder", crear_embedder)
+    REGISTRO.obtener("embedder")                   # carga una sola vez (thread-safe)
+    REGISTRO.precalentar(["faiss", "embedder"])    # hilo en segundo plano
+
+PERFIL DE ARRANQUE (desglose de tiempos de importación):
+    python carga_perezosa.py --perfil end2end_webapp --top 25
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class ModuloPerezoso:
+    """Proxy de un módulo que se importa en el primer acceso a un atributo"""
+
+    def __init__(self, registro: "RegistroPerezoso", nombre: str):
+        object.__setattr__(self, "_registro", registro)
+        object.__setattr__(self, "_nombre", nombre)
+
+    def __getattr__(self, atributo: str) -> Any:
+        return getattr(self._registro.obtener(self._nombre), atributo)
+
+    def __repr__(self) -> str:
+        estado = "cargado" if self._registro.cargado(self._nombre) else "pendiente"
+        return f"<ModuloPerezoso {self._nombre} ({estado})>"
+
+
+class RegistroPerezoso:
+    """
+    Registro de recursos pesados con carga única y thread-safe.
+
+    Cada recurso tiene su propio lock: cargar el modelo de embeddings no
+    bloquea a una ruta que sólo necesita reportlab.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fabricas: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._cargados: Dict[str, Any] = {}
+        self._tiempos: Dict[str, float] = {}
+        self._errores: Dict[str, str] = {}
+
+    def registrar(self, nombre: str, fabrica: Callable[[], Any]):
+        """Registra la función que construye el recurso (no la ejecuta)"""
+        with self._lock:
+            self._fabricas.setdefault(nombre, fabrica)
+            self._locks.setdefault(nombre, threading.Lock())
+
+    def modulo(self, nombre: str) -> ModuloPerezoso:
+        """Registra un módulo y devuelve un proxy que lo importa al primer uso"""
+        self.registrar(nombre, lambda: importlib.import_module(nombre))
+        return ModuloPerezoso(self, nombre)
+
+    def disponible(self, nombre_modulo: str) -> bool:
+        """Indica si un módulo está instalado sin importarlo"""
+        try:
+            return importlib.util.find_spec(nombre_modulo) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def cargado(self, nombre: str) -> bool:
+        return nombre in self._cargados
+
+    def obtener(self, nombre: str) -> Any:
+        """Devuelve el recurso, construyéndolo una sola vez"""
+        if nombre in self._cargados:
+            return self._cargados[nombre]
+
+        if nombre not in self._fabricas:
+            raise KeyError(f"Recurso no registrado: {nombre}")
+
+        with self._locks[nombre]:
+            if nombre not in self._cargados:
+                inicio = time.perf_counter()
+                try:
+                    recurso = self._fabricas[nombre]()
+                except Exception as e:
+                    self._errores[nombre] = str(e)
+                    raise
+                self._tiempos[nombre] = time.perf_counter() - inicio
+                self._errores.pop(nombre, None)
+                self._cargados[nombre] = recurso
+                print(f"⏱️ Carga perezosa: {nombre} ({self._tiempos[nombre]:.2f}s)")
+
+        return self._cargados[nombre]
+
+    def precalentar(self, nombres: Optional[List[str]] = None,
+                    esperar: Optional[Callable[[], bool]] = None) -> threading.Thread:
+        """
+        Carga recursos en un hilo daemon.
+
+        Args:
+            nombres: recursos a cargar (por defecto, todos los registrados)
+            esperar: función que bloquea hasta que se pueda empezar
+                     (p.ej. hasta que el servidor acepte conexiones)
+        """
+        def _tarea():
+            if esperar:
+                esperar()
+            for nombre in nombres or list(self._fabricas):
+                try:
+                    self.obtener(nombre)
+                except Exception as e:
+                    print(f"⚠️ Precalentamiento de {nombre} falló: {e}")
+            print("✅ Precalentamiento completado")
+
+        hilo = threading.Thread(target=_tarea, name="precalentamiento", daemon=True)
+        hilo.start()
+        return hilo
+
+    def estado(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de cada recurso registrado (para diagnóstico)"""
+        return {
+            nombre: {
+                "cargado": nombre in self._cargados,
+                "segundos": round(self._tiempos.get(nombre, 0.0), 3),
+                "error": self._errores.get(nombre)
+            }
+            for nombre in self._fabricas
+        }
+
+
+# Registro compartido por todo el proceso
+REGISTRO = RegistroPerezoso()
+
+
+def esperar_puerto(host: str, puerto: int, timeout: float = 60.0) -> bool:
+    """Bloquea hasta que host:puerto acepte conexiones (o venza el timeout)"""
+    import socket
+
+    limite = time.time() + timeout
+    while time.time() < limite:
+        try:
+            with socket.create_connection((host, puerto), timeout=1.0):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+# ----------------------------------------------------------
+# PERFIL DE ARRANQUE
+# ----------------------------------------------------------
+def perfil_importacion(modulo: str, top: int = 25) -> List[Tuple[str, float, float]]:
+    """
+    Importa ``modulo`` en un proceso aparte con ``-X importtime`` y devuelve
+    los ``top`` imports más costosos como (paquete, propio_s, acumulado_s).
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=script_dir, capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        try:
+            propio, acumulado, paquete = linea[len("import time:"):].split("|", 2)
+            filas.append((paquete.strip(), int(propio) / 1e6, int(acumulado) / 1e6))
+        except ValueError:
+            continue
+
+    if proceso.returncode != 0:
+        ultima = proceso.stderr.strip().splitlines()[-1:] or ["sin detalle"]
+        print(f"⚠️ La importación de {modulo} falló: {ultima[0]}")
+
+    filas.sort(key=lambda f: f[2], reverse=True)
+    return filas[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de tiempos de importación")
+    parser.add_argument("--perfil", default="end2end_webapp", help="Módulo a perfilar")
+    parser.add_argument("--top", type=int, default=25, help="Cantidad de imports a mostrar")
+    args = parser.parse_args()
+
+    print(f"⏱️ PERFIL DE ARRANQUE: import {args.perfil}")
+    print("=" * 70)
+    print(f"{'acumulado (s)':>14} {'propio (s)':>11}  paquete")
+    for paquete, propio, acumulado in perfil_importacion(args.perfil, args.top):
+        print(f"{acumulado:>14.3f} {propio:>11.3f}  {paquete}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,32 @@
 🔬 CHUNKER INTELIGENTE - Fragmentación Semántica Avanzada
 =========================================================
 Mejora el RAG fragmentando por temas coherentes en lugar de tamaño fijo.
+
+El agrupamiento es O(n) en párrafos: el grupo en curso se resume en la suma
+de sus embeddings (centroide) y la suma de sus embeddings normalizados, de
+la que sale la similitud promedio entre pares sin compararlos uno a uno.
+fragmentar_lote() codifica los párrafos de varios documentos en una sola
+llamada al modelo.
+
+sentence_transformers (y torch) se importan recién al crear el chunker con
+un modelo: importar este módulo no los requiere, así que se puede usar con
+otro codificador (p.ej. el de benchmark_rendimiento.py).
 """
 
+import importlib.util
 import re
 from typing import List, Dict, Tuple
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
+EMBEDDINGS_DISPONIBLE = importlib.util.find_spec("sentence_transformers") is not None
+
 class ChunkerInteligente:
     """
     Fragmenta texto respetando coherencia semántica y estructura argumentativa.
     """
     
     def __init__(self, modelo_embeddings='all-mpnet-base-v2'):
+        from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(modelo_embeddings)
         self.umbral_similitud = 0.75  # Umbral para considerar párrafos del mismo tema
         
@@ -34,12 +47,37 @@ class ChunkerInteligente:
                 'tipo_contenido': str  # 'introduccion', 'desarrollo', 'conclusion'
             }
         """
+        return self.fragmentar_lote([texto], max_tokens, overlap)[0]
+    
+    def fragmentar_lote(self, textos: List[str],
+                        max_tokens: int = 512,
+                        overlap: int = 50,
+                        batch_size: int = 64) -> List[List[Dict]]:
+        """
+        Fragmenta varios documentos; los párrafos de todos se codifican en
+        una sola llamada al modelo.
+        
+        Returns:
+            Una lista de chunks por documento (mismo formato que
+            fragmentar_por_coherencia)
+        """
         # 1. DIVIDIR EN PÁRRAFOS LÓGICOS
-        parrafos = self._extraer_parrafos_estructurales(texto)
+        parrafos_por_doc = [self._extraer_parrafos_estructurales(texto) for texto in textos]
         
-        # 2. CALCULAR EMBEDDINGS DE CADA PÁRRAFO
-        embeddings = self.model.encode([p['texto'] for p in parrafos])
+        # 2. CALCULAR EMBEDDINGS DE TODOS LOS PÁRRAFOS JUNTOS
+        todos = [p['texto'] for parrafos in parrafos_por_doc for p in parrafos]
+        embeddings = self.model.encode(todos, batch_size=batch_size) if todos else np.zeros((0, 0))
         
+        resultado = []
+        desde = 0
+        for parrafos in parrafos_por_doc:
+            hasta = desde + len(parrafos)
+            resultado.append(self._enriquecer(parrafos, embeddings[desde:hasta], max_tokens))
+            desde = hasta
+        return resultado
+    
+    def _enriquecer(self, parrafos: List[Dict], embeddings: np.ndarray,
+                    max_tokens: int) -> List[Dict]:
         # 3. AGRUPAR POR SIMILITUD SEMÁNTICA
         grupos = self._agrupar_por_similitud(parrafos, embeddings, max_tokens)
         
@@ -109,59 +147,58 @@ class ChunkerInteligente:
                                embeddings: np.ndarray,
                                max_tokens: int) -> List[Dict]:
         """Agrupa párrafos semánticamente similares."""
+        if not parrafos:
+            return []
+        
+        embeddings = np.asarray(embeddings, dtype=np.float64)
+        normas = np.linalg.norm(embeddings, axis=1)
+        unitarios = embeddings / np.where(normas > 0, normas, 1.0)[:, None]
+        palabras = [len(p['texto'].split()) for p in parrafos]
+        
         grupos = []
-        grupo_actual = []
-        embedding_grupo = []
-        tokens_acumulados = 0
+        inicio_grupo = 0
+        suma = embeddings[0].copy()           # centroide = suma / k (misma dirección)
+        suma_unitarios = unitarios[0].copy()  # para la similitud promedio entre pares
+        tokens_acumulados = palabras[0]
         
-        for i, parrafo in enumerate(parrafos):
-            palabras = len(parrafo['texto'].split())
-            
+        for i in range(1, len(parrafos)):
             # Verificar si agregar este párrafo mantiene coherencia
-            if grupo_actual:
-                similitud = self._calcular_similitud(
-                    np.mean(embedding_grupo, axis=0),
-                    embeddings[i]
-                )
-                
-                # Si supera tokens O no es coherente, crear nuevo grupo
-                if tokens_acumulados + palabras > max_tokens or similitud < self.umbral_similitud:
-                    # Guardar grupo actual
-                    grupos.append({
-                        'texto_completo': ' '.join([p['texto'] for p in grupo_actual]),
-                        'inicio': grupo_actual[0]['posicion'],
-                        'fin': grupo_actual[-1]['posicion'],
-                        'similitud_promedio': np.mean([
-                            self._calcular_similitud(embedding_grupo[j], embedding_grupo[k])
-                            for j in range(len(embedding_grupo))
-                            for k in range(j+1, len(embedding_grupo))
-                        ]) if len(embedding_grupo) > 1 else 1.0
-                    })
-                    
-                    # Iniciar nuevo grupo
-                    grupo_actual = []
-                    embedding_grupo = []
-                    tokens_acumulados = 0
+            norma_suma = np.linalg.norm(suma)
+            similitud = float(suma @ unitarios[i]) / norma_suma if norma_suma > 0 else 0.0
             
-            grupo_actual.append(parrafo)
-            embedding_grupo.append(embeddings[i])
-            tokens_acumulados += palabras
+            # Si supera tokens O no es coherente, crear nuevo grupo
+            if tokens_acumulados + palabras[i] > max_tokens or similitud < self.umbral_similitud:
+                grupos.append(self._cerrar_grupo(parrafos[inicio_grupo:i], suma_unitarios))
+                inicio_grupo = i
+                suma = embeddings[i].copy()
+                suma_unitarios = unitarios[i].copy()
+                tokens_acumulados = palabras[i]
+            else:
+                suma += embeddings[i]
+                suma_unitarios += unitarios[i]
+                tokens_acumulados += palabras[i]
         
         # Añadir último grupo
-        if grupo_actual:
-            grupos.append({
-                'texto_completo': ' '.join([p['texto'] for p in grupo_actual]),
-                'inicio': grupo_actual[0]['posicion'],
-                'fin': grupo_actual[-1]['posicion'],
-                'similitud_promedio': np.mean([
-                    self._calcular_similitud(embedding_grupo[j], embedding_grupo[k])
-                    for j in range(len(embedding_grupo))
-                    for k in range(j+1, len(embedding_grupo))
-                ]) if len(embedding_grupo) > 1 else 1.0
-            })
-        
+        grupos.append(self._cerrar_grupo(parrafos[inicio_grupo:], suma_unitarios))
         return grupos
     
+    def _cerrar_grupo(self, grupo: List[Dict], suma_unitarios: np.ndarray) -> Dict:
+        """
+        Datos del grupo. La similitud promedio entre pares sale de
+        |Σu|² = k + 2·Σ_{j<l} u_j·u_l (u = embeddings normalizados).
+        """
+        k = len(grupo)
+        if k > 1:
+            similitud_promedio = (float(suma_unitarios @ suma_unitarios) - k) / (k * (k - 1))
+        else:
+            similitud_promedio = 1.0
+        return {
+            'texto_completo': ' '.join([p['texto'] for p in grupo]),
+            'inicio': grupo[0]['posicion'],
+            'fin': grupo[-1]['posicion'],
+            'similitud_promedio': similitud_promedio
+        }
+    
     def _calcular_similitud(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
         """Similitud coseno entre dos embeddings."""
         return np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📎 CITAS POR SENTENCIA (citas_sentencia)
+=======================================
+
+Las citas (CSJN, Cámaras, doctrina) se extraen UNA vez por sentencia, al
+ingresar, y quedan normalizadas en SQL:
+
+- citas_sentencia:   una fila por cita (destino normalizado, tipo, extracto)
+- citas_extraidas:   sentencia_id + hash del texto ya procesado
+- red_jueces_pendientes: jueces cuyas aristas de red quedaron desactualizadas
+
+Triggers sobre sentencias_por_juez_arg invalidan la extracción si cambia el
+texto o el juez, o si se borra la sentencia; la próxima corrida sólo
+re-extrae esas. AnalizadorRedesInfluencia arma las aristas con un
+GROUP BY sobre citas_sentencia, sin volver a correr las regex.
+
+USO:
+    from citas_sentencia import asegurar_citas, registrar_citas, extraer_pendientes
+    asegurar_citas(conn)
+    registrar_citas(conn, sentencia_id, juez, texto)  # en la ingesta (sin commit)
+    extraer_pendientes(conn)                          # sentencias sin extraer
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from extractor_citas_jurisprudenciales import ExtractorCitasJurisprudenciales
+
+SQL_CITAS = """
+CREATE TABLE IF NOT EXISTS citas_sentencia (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sentencia_id TEXT NOT NULL,
+    hash_texto TEXT NOT NULL,
+    tipo TEXT NOT NULL,               -- csjn | camara | doctrina
+    destino TEXT NOT NULL,            -- 'CSJN', 'Tribunal - Sala X' o autor
+    tipo_destino TEXT NOT NULL,       -- csjn | tribunal_superior | autor_doctrinal
+    fallo_nro TEXT,
+    autos TEXT,
+    extracto TEXT,
+    posicion INTEGER,
+    confianza REAL
+);
+CREATE INDEX IF NOT EXISTS idx_citas_sentencia ON citas_sentencia(sentencia_id);
+CREATE INDEX IF NOT EXISTS idx_citas_destino ON citas_sentencia(destino);
+
+CREATE TABLE IF NOT EXISTS citas_extraidas (
+    sentencia_id TEXT PRIMARY KEY,
+    hash_texto TEXT NOT NULL,
+    juez TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    fecha TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_citas_extraidas_juez ON citas_extraidas(juez);
+
+CREATE TABLE IF NOT EXISTS red_jueces_pendientes (
+    juez TEXT PRIMARY KEY
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_citas_update
+AFTER UPDATE OF texto_completo, juez, sentencia_id ON sentencias_por_juez_arg
+BEGIN
+    DELETE FROM citas_sentencia WHERE sentencia_id = OLD.sentencia_id;
+    DELETE FROM citas_extraidas WHERE sentencia_id = OLD.sentencia_id;
+    INSERT OR IGNORE INTO red_jueces_pendientes (juez) VALUES (OLD.juez);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_citas_delete
+AFTER DELETE ON sentencias_por_juez_arg
+BEGIN
+    DELETE FROM citas_sentencia WHERE sentencia_id = OLD.sentencia_id;
+    DELETE FROM citas_extraidas WHERE sentencia_id = OLD.sentencia_id;
+    INSERT OR IGNORE INTO red_jueces_pendientes (juez) VALUES (OLD.juez);
+END;
+"""
+
+_extractor: Optional[ExtractorCitasJurisprudenciales] = None
+
+
+def _obtener_extractor() -> ExtractorCitasJurisprudenciales:
+    global _extractor
+    if _extractor is None:
+        _extractor = ExtractorCitasJurisprudenciales()
+    return _extractor
+
+
+def hash_texto(texto: str) -> str:
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def asegurar_citas(conn: sqlite3.Connection):
+    """Crea las tablas y triggers de citas si faltan"""
+    conn.executescript(SQL_CITAS)
+
+
+def filas_citas(sentencia_id: str, texto: str, huella: str,
+                extractor: Optional[ExtractorCitasJurisprudenciales] = None) -> List[Tuple]:
+    """Citas de ``texto`` como filas de citas_sentencia (sin id)"""
+    extractor = extractor or _obtener_extractor()
+    citas = extractor.extraer_todas_citas(texto)
+
+    filas = []
+    for cita in citas['citas_csjn']:
+        filas.append((sentencia_id, huella, 'csjn', 'CSJN', 'csjn', cita.fallo_nro, cita.autos,
+                      cita.extracto_textual, cita.posicion_inicio, cita.confianza))
+    for cita in citas['citas_camaras']:
+        if not cita.tribunal:
+            continue
+        destino = f"{cita.tribunal} - Sala {cita.sala}" if cita.sala else cita.tribunal
+        filas.append((sentencia_id, huella, 'camara', destino, 'tribunal_superior', None, cita.autos,
+                      cita.extracto_textual, cita.posicion_inicio, cita.confianza))
+    for cita in citas['citas_doctrinales']:
+        filas.append((sentencia_id, huella, 'doctrina', cita.autor, 'autor_doctrinal', None, None,
+                      cita.extracto_textual, cita.posicion_inicio, cita.confianza))
+    return filas
+
+
+def _guardar(conn: sqlite3.Connection, sentencia_id: str, juez: str, huella: str, filas: List[Tuple]):
+    conn.execute("DELETE FROM citas_sentencia WHERE sentencia_id = ?", (sentencia_id,))
+    conn.executemany("""
+    INSERT INTO citas_sentencia (sentencia_id, hash_texto, tipo, destino, tipo_destino,
+                                 fallo_nro, autos, extracto, posicion, confianza)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, filas)
+    conn.execute(
+        "INSERT OR REPLACE INTO citas_extraidas (sentencia_id, hash_texto, juez, cantidad, fecha) VALUES (?, ?, ?, ?, ?)",
+        (sentencia_id, huella, juez, len(filas), datetime.now().isoformat(timespec='seconds'))
+    )
+    conn.execute("INSERT OR IGNORE INTO red_jueces_pendientes (juez) VALUES (?)", (juez,))
+
+
+def registrar_citas(conn: sqlite3.Connection, sentencia_id: str, juez: str, texto: str,
+                    extractor: Optional[ExtractorCitasJurisprudenciales] = None) -> int:
+    """
+    Extrae y guarda las citas de una sentencia recién ingresada. No hace
+    commit: queda en la transacción del llamador. Devuelve cuántas citas guardó.
+    """
+    if not texto:
+        return 0
+    huella = hash_texto(texto)
+    filas = filas_citas(sentencia_id, texto, huella, extractor)
+    _guardar(conn, sentencia_id, juez, huella, filas)
+    return len(filas)
+
+
+def extraer_pendientes(conn: sqlite3.Connection, juez: Optional[str] = None,
+                       tamano_lote: int = 200) -> Tuple[int, int]:
+    """
+    Extrae las citas de las sentencias que todavía no las tienen (nuevas, o
+    invalidadas por un cambio de texto/juez). Commit por lote de ``tamano_lote``.
+
+    Returns:
+        (sentencias procesadas, citas guardadas)
+    """
+    consulta = """
+    SELECT s.sentencia_id
+    FROM sentencias_por_juez_arg s
+    LEFT JOIN citas_extraidas c ON c.sentencia_id = s.sentencia_id
+    WHERE c.sentencia_id IS NULL AND s.texto_completo IS NOT NULL
+    """
+    parametros: Tuple = ()
+    if juez is not None:
+        consulta += " AND s.juez = ?"
+        parametros = (juez,)
+    pendientes = [fila[0] for fila in conn.execute(consulta, parametros)]
+
+    extractor = _obtener_extractor()
+    citas = 0
+    # Los textos se leen por lote para no cargar todo el corpus en memoria
+    for i in range(0, len(pendientes), tamano_lote):
+        lote = pendientes[i:i + tamano_lote]
+        textos = conn.execute(
+            f"""SELECT sentencia_id, juez, texto_completo FROM sentencias_por_juez_arg
+            WHERE sentencia_id IN ({','.join('?' * len(lote))})""", lote
+        ).fetchall()
+        for sentencia_id, juez_sentencia, texto in textos:
+            huella = hash_texto(texto)
+            filas = filas_citas(sentencia_id, texto, huella, extractor)
+            _guardar(conn, sentencia_id, juez_sentencia, huella, filas)
+            citas += len(filas)
+        conn.commit()
+    return len(pendientes), citas
+
+
+def tomar_jueces_pendientes(conn: sqlite3.Connection) -> Set[str]:
+    """Jueces con aristas desactualizadas (vacía la lista; sin commit)"""
+    jueces = {fila[0] for fila in conn.execute("SELECT juez FROM red_jueces_pendientes")}
+    conn.execute("DELETE FROM red_jueces_pendientes")
+    return jueces
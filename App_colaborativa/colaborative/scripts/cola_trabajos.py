@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📬 COLA DE TRABAJOS EN SEGUNDO PLANO (cola_trabajos)
+===================================================
+
+La ingesta de bases, la exportación a PDF y la generación de informes
+judiciales corrían dentro del request HTTP: bloqueaban un hilo del servidor
+por minutos y el navegador cortaba por timeout.
+
+- trabajos (SQLite, data/cola_trabajos.db): tipo, parámetros JSON, estado
+  (pendiente | en_curso | terminado | error | cancelado), progreso y resultado.
+- encolar(): devuelve enseguida el id. Si ya hay un trabajo PENDIENTE
+  idéntico (mismo tipo y parámetros) devuelve ese en vez de duplicarlo.
+- Trabajadores: procesos aparte que toman el próximo pendiente con una
+  transacción IMMEDIATE (nunca dos toman el mismo) y ejecutan la función
+  registrada en TAREAS ("modulo:funcion", importada recién en el trabajador).
+- La función recibe un Contexto: contexto.progreso(0.4, "Embeddings...")
+  actualiza el avance y lanza TrabajoCancelado si se pidió cancelar.
+- Un trabajo en curso cuyo trabajador dejó de dar señales se reencola
+  (hasta MAX_INTENTOS).
+
+Rutas (registrar_rutas_trabajos):
+    GET  /trabajos                      últimos trabajos (JSON)
+    GET  /trabajos/<id>                 estado y progreso (JSON)
+    GET  /trabajos/<id>/ver             página que sigue el progreso
+    POST /trabajos/<id>/cancelar
+    GET  /trabajos/<id>/resultado       descarga el archivo generado
+
+USO:
+    from cola_trabajos import encolar, iniciar_trabajadores, registrar_rutas_trabajos
+    trabajo_id, nuevo = encolar("ingesta", {"base": "general"})
+
+    python cola_trabajos.py --trabajadores 2      # trabajadores sin la webapp
+    python cola_trabajos.py --listar
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pool_sqlite import obtener_pool
+
+SCRIPT_DIR = Path(__file__).parent
+BASE_DIR = SCRIPT_DIR.parent
+DB_COLA = BASE_DIR / "data" / "cola_trabajos.db"
+
+# tipo -> "modulo:funcion(contexto, **parametros) -> dict | None"
+TAREAS: Dict[str, str] = {
+    "ingesta": "end2end_webapp:trabajo_ingesta",
+    "exportar_pdf": "end2end_webapp:trabajo_exportar_pdf",
+    "informe_juez": "generador_informes_judicial:trabajo_informe_juez",
+}
+
+PENDIENTE, EN_CURSO, TERMINADO, ERROR, CANCELADO = "pendiente", "en_curso", "terminado", "error", "cancelado"
+ESTADOS_FINALES = (TERMINADO, ERROR, CANCELADO)
+
+ESPERA_SIN_TRABAJO = 1.0          # segundos entre consultas con la cola vacía
+LATIDO_SEGUNDOS = 15
+SIN_LATIDO_SEGUNDOS = 300         # en curso sin latido por más de esto = trabajador caído
+MAX_INTENTOS = 3
+
+SQL_COLA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    parametros TEXT NOT NULL,         -- JSON canónico (claves ordenadas)
+    clave TEXT NOT NULL,              -- sha1(tipo + parametros) para deduplicar
+    estado TEXT NOT NULL,
+    progreso REAL NOT NULL DEFAULT 0,
+    mensaje TEXT,
+    resultado TEXT,                   -- JSON devuelto por la tarea
+    error TEXT,
+    cancelar INTEGER NOT NULL DEFAULT 0,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    trabajador TEXT,
+    creado TEXT NOT NULL,
+    iniciado TEXT,
+    terminado TEXT,
+    latido TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos(estado, id);
+-- Un solo pendiente por clave: encolar dos veces lo mismo devuelve el existente
+CREATE UNIQUE INDEX IF NOT EXISTS idx_trabajos_pendiente
+    ON trabajos(clave) WHERE estado = 'pendiente';
+"""
+
+COLUMNAS_PUBLICAS = ("id", "tipo", "parametros", "estado", "progreso", "mensaje", "resultado",
+                     "error", "intentos", "creado", "iniciado", "terminado")
+
+
+class TrabajoCancelado(Exception):
+    """Se pidió cancelar el trabajo en curso"""
+
+
+def _ahora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+_BASES_INICIALIZADAS = set()
+_LOCK_BASES = threading.Lock()
+
+
+def _pool(db_path=None):
+    ruta = Path(db_path or DB_COLA)
+    clave = str(ruta.resolve())
+    if clave not in _BASES_INICIALIZADAS:
+        with _LOCK_BASES:
+            if clave not in _BASES_INICIALIZADAS:
+                ruta.parent.mkdir(parents=True, exist_ok=True)
+                pool = obtener_pool(ruta)
+                with pool.escritura() as cursor:
+                    cursor.execute("PRAGMA journal_mode = WAL")
+                    cursor.executescript(SQL_COLA)
+                _BASES_INICIALIZADAS.add(clave)
+    return obtener_pool(ruta)
+
+
+def _a_dict(fila: Optional[Dict]) -> Optional[Dict[str, Any]]:
+    if fila is None:
+        return None
+    trabajo = {c: fila[c] for c in COLUMNAS_PUBLICAS}
+    for campo in ("parametros", "resultado"):
+        if trabajo[campo]:
+            trabajo[campo] = json.loads(trabajo[campo])
+    return trabajo
+
+
+# ============================================================
+# API DE LA COLA
+# ============================================================
+def encolar(tipo: str, parametros: Optional[Dict] = None, db_path=None) -> Tuple[int, bool]:
+    """
+    Encola un trabajo. Devuelve (id, nuevo); nuevo=False si ya había uno
+    pendiente idéntico y se devolvió ese.
+    """
+    if tipo not in TAREAS:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    parametros_json = json.dumps(parametros or {}, ensure_ascii=False, sort_keys=True)
+    clave = hashlib.sha1(f"{tipo}|{parametros_json}".encode("utf-8")).hexdigest()
+
+    pool = _pool(db_path)
+    with pool.escritura() as cursor:
+        cursor.execute("""
+        INSERT INTO trabajos (tipo, parametros, clave, estado, creado)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(clave) WHERE estado = 'pendiente' DO NOTHING
+        """, (tipo, parametros_json, clave, PENDIENTE, _ahora()))
+        if cursor.rowcount:
+            return cursor.lastrowid, True
+        cursor.execute("SELECT id FROM trabajos WHERE clave = ? AND estado = ?", (clave, PENDIENTE))
+        return cursor.fetchone()[0], False
+
+
+def obtener(trabajo_id: int, db_path=None) -> Optional[Dict[str, Any]]:
+    return _a_dict(_pool(db_path).consultar_dict(
+        "SELECT * FROM trabajos WHERE id = ?", (trabajo_id,)
+    ))
+
+
+def listar(limite: int = 50, estado: Optional[str] = None, db_path=None) -> List[Dict[str, Any]]:
+    consulta = "SELECT * FROM trabajos"
+    parametros: Tuple = ()
+    if estado:
+        consulta += " WHERE estado = ?"
+        parametros = (estado,)
+    consulta += " ORDER BY id DESC LIMIT ?"
+    return [_a_dict(f) for f in _pool(db_path).consultar_dicts(consulta, parametros + (limite,))]
+
+
+def cancelar(trabajo_id: int, db_path=None) -> Optional[str]:
+    """
+    Un pendiente se cancela en el acto; uno en curso queda marcado y se
+    detiene en su próximo progreso(). Devuelve el estado resultante.
+    """
+    with _pool(db_path).escritura() as cursor:
+        cursor.execute(
+            "UPDATE trabajos SET estado = ?, terminado = ? WHERE id = ? AND estado = ?",
+            (CANCELADO, _ahora(), trabajo_id, PENDIENTE)
+        )
+        cursor.execute(
+            "UPDATE trabajos SET cancelar = 1 WHERE id = ? AND estado = ?", (trabajo_id, EN_CURSO)
+        )
+        cursor.execute("SELECT estado FROM trabajos WHERE id = ?", (trabajo_id,))
+        fila = cursor.fetchone()
+    return fila[0] if fila else None
+
+
+def _reencolar_caidos(cursor):
+    """Trabajos en curso sin latido: el trabajador murió. Se reintentan o fallan"""
+    limite = (datetime.now() - timedelta(seconds=SIN_LATIDO_SEGUNDOS)).isoformat(timespec="seconds")
+    # Si entretanto se encoló uno idéntico, ese lo reemplaza: este queda en error
+    cursor.execute("""
+    UPDATE trabajos SET estado = CASE
+            WHEN intentos >= ? OR cancelar = 1
+              OR EXISTS (SELECT 1 FROM trabajos p WHERE p.clave = trabajos.clave AND p.estado = ?)
+            THEN ? ELSE ? END,
+        error = 'El trabajador dejó de responder', trabajador = NULL
+    WHERE estado = ? AND COALESCE(latido, iniciado) < ?
+    """, (MAX_INTENTOS, PENDIENTE, ERROR, PENDIENTE, EN_CURSO, limite))
+
+
+def tomar_siguiente(trabajador: str, db_path=None) -> Optional[Dict[str, Any]]:
+    """Marca como en curso el pendiente más antiguo y lo devuelve (o None)"""
+    pool = _pool(db_path)
+    with pool.escritura() as cursor:
+        # IMMEDIATE: reserva la escritura antes de leer, así dos procesos
+        # trabajadores no pueden tomar el mismo pendiente
+        cursor.execute("BEGIN IMMEDIATE")
+        _reencolar_caidos(cursor)
+        cursor.execute("SELECT id FROM trabajos WHERE estado = ? ORDER BY id LIMIT 1", (PENDIENTE,))
+        fila = cursor.fetchone()
+        if fila is None:
+            return None
+        ahora = _ahora()
+        cursor.execute("""
+        UPDATE trabajos SET estado = ?, iniciado = ?, latido = ?, trabajador = ?,
+                            intentos = intentos + 1, progreso = 0, mensaje = NULL, error = NULL
+        WHERE id = ?
+        """, (EN_CURSO, ahora, ahora, trabajador, fila[0]))
+        cursor.execute("SELECT * FROM trabajos WHERE id = ?", (fila[0],))
+        columnas = [d[0] for d in cursor.description]
+        return _a_dict(dict(zip(columnas, cursor.fetchone())))
+
+
+def _finalizar(trabajo_id: int, estado: str, resultado=None, error: Optional[str] = None, db_path=None):
+    _pool(db_path).ejecutar("""
+    UPDATE trabajos SET estado = ?, resultado = ?, error = ?, terminado = ?, latido = ?,
+                        progreso = CASE WHEN ? = 'terminado' THEN 1 ELSE progreso END
+    WHERE id = ?
+    """, (estado, json.dumps(resultado, ensure_ascii=False) if resultado is not None else None,
+          error, _ahora(), _ahora(), estado, trabajo_id))
+
+
+class Contexto:
+    """Lo que recibe la tarea: progreso, cancelación y parámetros"""
+
+    def __init__(self, trabajo: Dict[str, Any], db_path=None):
+        self.id = trabajo["id"]
+        self.tipo = trabajo["tipo"]
+        self.parametros = trabajo["parametros"]
+        self.db_path = db_path
+
+    def progreso(self, fraccion: float, mensaje: Optional[str] = None):
+        """Registra el avance (0..1) y corta con TrabajoCancelado si lo cancelaron"""
+        with _pool(self.db_path).escritura() as cursor:
+            cursor.execute(
+                "UPDATE trabajos SET progreso = ?, mensaje = COALESCE(?, mensaje), latido = ? WHERE id = ?",
+                (max(0.0, min(1.0, float(fraccion))), mensaje, _ahora(), self.id)
+            )
+            cursor.execute("SELECT cancelar FROM trabajos WHERE id = ?", (self.id,))
+            fila = cursor.fetchone()
+        if fila and fila[0]:
+            raise TrabajoCancelado(f"Trabajo {self.id} cancelado")
+
+
+# ============================================================
+# TRABAJADORES
+# ============================================================
+_FUNCIONES: Dict[str, Callable] = {}
+
+
+def resolver_tarea(tipo: str) -> Callable:
+    funcion = _FUNCIONES.get(tipo)
+    if funcion is None:
+        modulo, nombre = TAREAS[tipo].split(":")
+        funcion = getattr(importlib.import_module(modulo), nombre)
+        _FUNCIONES[tipo] = funcion
+    return funcion
+
+
+def _latir(contexto: Contexto, detener: threading.Event):
+    """Latido periódico mientras la tarea no reporta progreso (p.ej. un encode largo)"""
+    while not detener.wait(LATIDO_SEGUNDOS):
+        try:
+            _pool(contexto.db_path).ejecutar(
+                "UPDATE trabajos SET latido = ? WHERE id = ?", (_ahora(), contexto.id)
+            )
+        except Exception as e:
+            print(f"⚠️ Latido del trabajo {contexto.id} falló: {e}")
+
+
+def ejecutar_trabajo(trabajo: Dict[str, Any], db_path=None) -> str:
+    """Ejecuta un trabajo ya tomado y registra el resultado. Devuelve el estado final"""
+    contexto = Contexto(trabajo, db_path)
+    detener = threading.Event()
+    hilo = threading.Thread(target=_latir, args=(contexto, detener), daemon=True)
+    hilo.start()
+    try:
+        resultado = resolver_tarea(trabajo["tipo"])(contexto, **trabajo["parametros"])
+        _finalizar(trabajo["id"], TERMINADO, resultado, db_path=db_path)
+        return TERMINADO
+    except TrabajoCancelado:
+        _finalizar(trabajo["id"], CANCELADO, db_path=db_path)
+        return CANCELADO
+    except Exception as e:
+        traceback.print_exc()
+        _finalizar(trabajo["id"], ERROR, error=f"{type(e).__name__}: {e}", db_path=db_path)
+        return ERROR
+    finally:
+        detener.set()
+        hilo.join()
+
+
+def bucle_trabajador(db_path=None, detener: Optional[Any] = None, una_vez: bool = False):
+    """Toma y ejecuta trabajos hasta que ``detener`` (Event) se active"""
+    nombre = f"{os.getpid()}"
+    print(f"📬 Trabajador {nombre} esperando trabajos")
+    while detener is None or not detener.is_set():
+        trabajo = tomar_siguiente(nombre, db_path)
+        if trabajo is None:
+            if una_vez:
+                return
+            time.sleep(ESPERA_SIN_TRABAJO)
+            continue
+        print(f"📬 [{nombre}] trabajo {trabajo['id']} ({trabajo['tipo']})")
+        estado = ejecutar_trabajo(trabajo, db_path)
+        print(f"📬 [{nombre}] trabajo {trabajo['id']}: {estado}")
+
+
+def iniciar_trabajadores(cantidad: int = 1, db_path=None) -> List[multiprocessing.Process]:
+    """Lanza ``cantidad`` procesos trabajadores (daemon: mueren con la webapp)"""
+    _pool(db_path)
+    # spawn: el trabajador arranca limpio, sin heredar conexiones SQLite ni
+    # los hilos del servidor Flask
+    contexto = multiprocessing.get_context("spawn")
+    procesos = []
+    for i in range(max(0, cantidad)):
+        proceso = contexto.Process(target=bucle_trabajador, args=(db_path,),
+                                          name=f"trabajador-{i + 1}", daemon=True)
+        proceso.start()
+        procesos.append(proceso)
+    return procesos
+
+
+# ============================================================
+# RUTAS FLASK
+# ============================================================
+def respuesta_encolado(trabajo_id: int, nuevo: bool):
+    """Cuerpo JSON + 202 para las rutas que encolan"""
+    from flask import jsonify, url_for
+    respuesta = jsonify({
+        "success": True,
+        "trabajo": trabajo_id,
+        "nuevo": nuevo,
+        "estado_url": url_for("estado_trabajo", trabajo_id=trabajo_id),
+        "ver_url": url_for("ver_trabajo", trabajo_id=trabajo_id),
+    })
+    respuesta.status_code = 202
+    respuesta.headers["Location"] = url_for("estado_trabajo", trabajo_id=trabajo_id)
+    return respuesta
+
+
+def registrar_rutas_trabajos(app, db_path=None):
+    """Rutas de estado, cancelación y descarga de resultados (idempotente)"""
+    from flask import abort, jsonify, render_template_string, request, send_file
+
+    if app.extensions.get("cola_trabajos"):
+        return
+    app.extensions["cola_trabajos"] = True
+
+    @app.route("/trabajos")
+    def listar_trabajos():
+        try:
+            limite = int(request.args.get("limite", 50))
+        except ValueError:
+            limite = 0
+        if limite < 1:
+            return jsonify({"error": "limite debe ser un entero positivo"}), 400
+        return jsonify(listar(limite, request.args.get("estado"), db_path))
+
+    @app.route("/trabajos/<int:trabajo_id>")
+    def estado_trabajo(trabajo_id):
+        trabajo = obtener(trabajo_id, db_path)
+        if trabajo is None:
+            abort(404)
+        return jsonify(trabajo)
+
+    @app.route("/trabajos/<int:trabajo_id>/ver")
+    def ver_trabajo(trabajo_id):
+        if obtener(trabajo_id, db_path) is None:
+            abort(404)
+        return render_template_string(TEMPLATE_TRABAJO, trabajo_id=trabajo_id)
+
+    @app.route("/trabajos/<int:trabajo_id>/cancelar", methods=["POST"])
+    def cancelar_trabajo(trabajo_id):
+        estado = cancelar(trabajo_id, db_path)
+        if estado is None:
+            abort(404)
+        return jsonify({"trabajo": trabajo_id, "estado": estado})
+
+    @app.route("/trabajos/<int:trabajo_id>/resultado")
+    def resultado_trabajo(trabajo_id):
+        trabajo = obtener(trabajo_id, db_path)
+        if trabajo is None:
+            abort(404)
+        if trabajo["estado"] != TERMINADO:
+            return jsonify(trabajo), 409
+        archivo = (trabajo["resultado"] or {}).get("archivo")
+        if not archivo or not Path(archivo).exists():
+            return jsonify(trabajo)
+        return send_file(archivo, as_attachment=True,
+                         download_name=(trabajo["resultado"] or {}).get("nombre") or Path(archivo).name)
+
+
+TEMPLATE_TRABAJO = """
+<!doctype html>
+<html lang="es">
+<head>
+  <meta charset="utf-8">
+  <title>Trabajo #{{ trabajo_id }}</title>
+  <style>
+    body { background:#0b1020; color:#e8ecf1; font-family:Segoe UI,Arial; margin:0; padding:30px; }
+    .card { max-width:700px; margin:auto; background:#121a33; padding:25px; border-radius:12px; }
+    .barra { background:#0f1630; border-radius:8px; height:18px; overflow:hidden; margin:15px 0; }
+    .barra div { background:#2e6ef7; height:100%; width:0; transition:width .4s; }
+    .btn { background:#2e6ef7; color:#fff; border:none; border-radius:8px; padding:8px 12px; cursor:pointer; text-decoration:none; }
+    .btn-rojo { background:#ea4335; }
+    pre { background:#0f1630; padding:10px; border-radius:8px; white-space:pre-wrap; }
+  </style>
+</head>
+<body>
+  <div class="card">
+    <h2>📬 Trabajo #{{ trabajo_id }} <span id="tipo"></span></h2>
+    <div id="estado">Consultando...</div>
+    <div class="barra"><div id="avance"></div></div>
+    <div id="mensaje"></div>
+    <p id="acciones">
+      <button class="btn btn-rojo" onclick="cancelar()">Cancelar</button>
+      <a class="btn" href="/">🏠 Inicio</a>
+    </p>
+  </div>
+  <script>
+    const id = {{ trabajo_id }};
+    function actualizar() {
+      fetch('/trabajos/' + id).then(r => r.json()).then(t => {
+        document.getElementById('tipo').textContent = '(' + t.tipo + ')';
+        document.getElementById('estado').textContent = 'Estado: ' + t.estado;
+        document.getElementById('avance').style.width = Math.round(t.progreso * 100) + '%';
+        document.getElementById('mensaje').textContent = t.error || t.mensaje || '';
+        if (t.estado === 'terminado') {
+          const r = t.resultado || {};
+          const acciones = document.getElementById('acciones');
+          if (r.archivo) {
+            acciones.innerHTML = '<a class="btn" href="/trabajos/' + id + '/resultado">⬇️ Descargar</a> <a class="btn" href="/">🏠 Inicio</a>';
+          } else {
+            // El resultado trae texto de los documentos procesados: nunca como HTML
+            const pre = document.createElement('pre');
+            pre.textContent = JSON.stringify(r, null, 2);
+            acciones.innerHTML = '<a class="btn" href="/">🏠 Inicio</a>';
+            acciones.prepend(pre);
+          }
+        } else if (t.estado === 'error' || t.estado === 'cancelado') {
+          document.getElementById('acciones').innerHTML = '<a class="btn" href="/">🏠 Inicio</a>';
+        } else {
+          setTimeout(actualizar, 1000);
+        }
+      });
+    }
+    function cancelar() {
+      fetch('/trabajos/' + id + '/cancelar', {method: 'POST'}).then(actualizar);
+    }
+    actualizar();
+  </script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cola de trabajos en segundo plano")
+    parser.add_argument("--db", default=str(DB_COLA))
+    parser.add_argument("--trabajadores", type=int, default=0, help="Procesos trabajadores a lanzar")
+    parser.add_argument("--listar", action="store_true")
+    parser.add_argument("--cancelar", type=int, help="Id del trabajo a cancelar")
+    args = parser.parse_args()
+
+    if args.cancelar:
+        print(f"🛑 Trabajo {args.cancelar}: {cancelar(args.cancelar, args.db)}")
+    if args.listar or not args.trabajadores:
+        for t in listar(30, db_path=args.db):
+            print(f"   #{t['id']:<5} {t['tipo']:14} {t['estado']:10} {t['progreso'] * 100:5.1f}%  "
+                  f"{t['creado']}  {t['mensaje'] or t['error'] or ''}")
+    if args.trabajadores:
+        procesos = iniciar_trabajadores(args.trabajadores, args.db)
+        print(f"📬 {len(procesos)} trabajadores en marcha (Ctrl+C para salir)")
+        try:
+            for proceso in procesos:
+                proceso.join()
+        except KeyboardInterrupt:
+            print("\n👋 Deteniendo trabajadores")
+
+
+if __name__ == "__main__":
+    main()
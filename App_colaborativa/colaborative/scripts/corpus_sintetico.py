@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧬 CORPUS SINTÉTICO DE SENTENCIAS Y DOCTRINA ARGENTINA (corpus_sintetico)
+========================================================================
+
+Genera sentencias y textos doctrinales con estructura realista para medir
+rendimiento sin depender de documentos reales:
+
+- Sentencias: encabezado del tribunal, Expte., carátula "X c/ Y s/ Z",
+  VISTO / CONSIDERANDO (I., II., ...) / RESUELVO, citas a Fallos de la CSJN,
+  a Cámaras y Salas, a doctrina ("como sostiene ...") y a normas, firma.
+- Doctrina: título, autor, secciones con citas a otros autores y a Fallos.
+
+Todo sale de un random.Random con semilla: la misma escala y semilla
+producen exactamente el mismo corpus.
+
+USO:
+    from corpus_sintetico import generar_corpus
+    corpus = generar_corpus("mediano", semilla=42)  # {'sentencias': [...], 'doctrina': [...]}
+    python corpus_sintetico.py --escala grande --salida ../data/corpus_sintetico
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPT_DIR = Path(__file__).parent
+DIR_SALIDA = SCRIPT_DIR.parent / "data" / "corpus_sintetico"
+
+# escala -> (sentencias, textos doctrinales, considerandos por sentencia, secciones por texto)
+ESCALAS = {
+    "chico": (20, 10, 6, 4),
+    "mediano": (200, 50, 10, 8),
+    "grande": (1000, 200, 16, 12),
+}
+
+FUEROS = {
+    "laboral": ("Cámara Nacional de Apelaciones del Trabajo", "CNTrab",
+                ["despido", "diferencias salariales", "accidente", "indemnización art. 245 LCT"]),
+    "civil": ("Cámara Nacional de Apelaciones en lo Civil", "CNCiv",
+              ["daños y perjuicios", "cumplimiento de contrato", "desalojo", "alimentos"]),
+    "comercial": ("Cámara Nacional de Apelaciones en lo Comercial", "CNCom",
+                  ["ordinario", "ejecutivo", "quiebra", "defensa del consumidor"]),
+    "contencioso administrativo": ("Cámara Nacional de Apelaciones en lo Contencioso Administrativo Federal",
+                                   "CNCAF", ["amparo", "empleo público", "medida cautelar", "nulidad de acto"]),
+    "familia": ("Cámara de Apelaciones en lo Civil y Comercial de Córdoba", "CCC",
+                ["régimen de comunicación", "cuidado personal", "alimentos", "divorcio"]),
+}
+SALAS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "A", "B", "C", "D"]
+NOMBRES = ["María", "Juan", "Carlos", "Ana", "Laura", "Jorge", "Silvia", "Pedro", "Graciela",
+           "Roberto", "Mónica", "Ricardo", "Claudia", "Horacio", "Beatriz", "Gustavo"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Gómez", "Díaz",
+             "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Benítez",
+             "Acosta", "Medina", "Herrera", "Aguirre"]
+EMPRESAS = ["Banco Nación", "Telecom Argentina S.A.", "Estado Nacional", "ANSES", "Swiss Medical S.A.",
+            "La Segunda ART S.A.", "Provincia de Córdoba", "Mercado Libre S.R.L.", "YPF S.A."]
+AUTORES_DOCTRINA = ["Bidart Campos", "Lorenzetti", "Gordillo", "Vázquez Vialard", "Kemelmajer",
+                    "Alterini", "Sagüés", "Gelli", "Cassagne", "Grisolía", "Fornieles", "Zannoni"]
+NORMAS = ["art. 14 bis de la Constitución Nacional", "art. 18 de la Constitución Nacional",
+          "art. 43 de la Constitución Nacional", "art. 75 inc. 22 de la Constitución Nacional",
+          "ley 20.744", "ley 24.240", "ley 24.557", "art. 1710 del Código Civil y Comercial",
+          "art. 1737 del Código Civil y Comercial", "art. 377 del CPCCN", "ley 26.061"]
+MESES = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+         "septiembre", "octubre", "noviembre", "diciembre"]
+ROMANOS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X",
+           "XI", "XII", "XIII", "XIV", "XV", "XVI", "XVII", "XVIII", "XIX", "XX"]
+
+FRASES = [
+    "corresponde analizar si la decisión recurrida se ajusta a derecho",
+    "la interpretación de la norma debe atender a su finalidad protectoria",
+    "no puede prescindirse de las circunstancias concretas de la causa",
+    "el principio de razonabilidad exige una relación proporcionada entre medios y fines",
+    "la carga de la prueba recae sobre quien afirma un hecho controvertido",
+    "en caso de duda debe estarse a la interpretación más favorable al trabajador",
+    "la tutela judicial efectiva impone una respuesta oportuna de la jurisdicción",
+    "el control de constitucionalidad es la última ratio del orden jurídico",
+    "los jueces no deben sustituir el criterio de los otros poderes del Estado",
+    "la prueba testimonial resulta conteste y verosímil en sus aspectos esenciales",
+    "el consumidor hipervulnerable merece una tutela reforzada",
+    "el interés superior del niño constituye una consideración primordial",
+    "la deferencia hacia el legislador no impide revisar la razonabilidad de la medida",
+    "el daño debe ser cierto, actual y guardar relación causal adecuada con el hecho",
+]
+CONECTORES = ["Por otra parte,", "Sin embargo,", "En consecuencia,", "Asimismo,", "Por lo tanto,",
+              "En ese orden de ideas,", "A mayor abundamiento,", "Desde esta perspectiva,"]
+DECISIONES = ["Hacer lugar al recurso de apelación interpuesto", "Rechazar el recurso de apelación interpuesto",
+              "Confirmar la sentencia de primera instancia", "Revocar la sentencia apelada",
+              "Hacer lugar parcialmente a la demanda"]
+
+
+def _persona(rng: random.Random) -> str:
+    return f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+
+
+def _caratula(rng: random.Random, objeto: str) -> str:
+    demandado = rng.choice(EMPRESAS) if rng.random() < 0.7 else _persona(rng)
+    return f"{rng.choice(APELLIDOS)}, {rng.choice(NOMBRES)} c/ {demandado} s/ {objeto}"
+
+
+def _cita(rng: random.Random) -> str:
+    tipo = rng.random()
+    if tipo < 0.35:
+        return f"(CSJN, Fallos: {rng.randint(250, 347)}:{rng.randint(1, 3200)})"
+    if tipo < 0.55:
+        return f'(Corte Suprema, autos "{_caratula(rng, "amparo")}")'
+    if tipo < 0.8:
+        camara, sigla, objetos = rng.choice(list(FUEROS.values()))
+        if rng.random() < 0.5:
+            return f'({sigla}, Sala {rng.choice(SALAS)}, autos "{_caratula(rng, rng.choice(objetos))}")'
+        return f"({camara}, Sala {rng.choice(SALAS)})"
+    return f"(conf. {rng.choice(NORMAS)})"
+
+
+def _parrafo(rng: random.Random, oraciones: int) -> str:
+    partes = []
+    for i in range(oraciones):
+        frase = rng.choice(FRASES)
+        if i:
+            frase = f"{rng.choice(CONECTORES)} {frase}"
+        else:
+            frase = f"Que {frase}"
+        if rng.random() < 0.45:
+            frase += f" {_cita(rng)}"
+        if rng.random() < 0.15:
+            frase += f". Como sostiene {rng.choice(AUTORES_DOCTRINA)}, {rng.choice(FRASES)}"
+        partes.append(frase[0].upper() + frase[1:] + ".")
+    return " ".join(partes)
+
+
+def generar_sentencia(rng: random.Random, considerandos: int = 8, numero: int = 0) -> Dict:
+    """Una sentencia con VISTO / CONSIDERANDO / RESUELVO y sus metadatos"""
+    fuero = rng.choice(list(FUEROS))
+    camara, _, objetos = FUEROS[fuero]
+    sala = rng.choice(SALAS)
+    objeto = rng.choice(objetos)
+    anio = rng.randint(2005, 2025)
+    mes = rng.randint(1, 12)
+    dia = rng.randint(1, 28)
+    juez = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+    vocales = [juez] + [_persona(rng) for _ in range(2)]
+    caratula = _caratula(rng, objeto)
+    expediente = f"{rng.randint(1000, 99999)}/{anio}"
+
+    lineas = [
+        f"{camara.upper()} - SALA {sala}",
+        f"Expte. N° {expediente}",
+        f'Autos: "{caratula}"',
+        "",
+        f"En la Ciudad de Buenos Aires, a los {dia} días del mes de {MESES[mes - 1]} de {anio}, "
+        f"reunidos los señores jueces de la Sala {sala} para dictar sentencia en los autos "
+        f'caratulados "{caratula}", se procede a votar en el orden de sorteo.',
+        "",
+        "VISTO:",
+        f"El recurso de apelación interpuesto por la parte {rng.choice(['actora', 'demandada'])} "
+        f"contra la sentencia de primera instancia, y q{_parrafo(rng, 2)[1:]}",
+        "",
+        "CONSIDERANDO:",
+    ]
+    for i in range(considerandos):
+        lineas.append(f"{ROMANOS[i % len(ROMANOS)]}. {_parrafo(rng, rng.randint(3, 7))}")
+        lineas.append("")
+    lineas += [
+        "Por ello, el Tribunal",
+        "RESUELVE:",
+        f"1) {rng.choice(DECISIONES)}.",
+        f"2) Imponer las costas a la parte {rng.choice(['vencida', 'actora', 'demandada'])} (art. 68 del CPCCN).",
+        "3) Regístrese, notifíquese y devuélvase.",
+        "",
+    ] + [f"Dr./Dra. {vocal} - Juez de Cámara" for vocal in vocales]
+
+    return {
+        "id": f"sintetica_{numero:06d}",
+        "tipo": "sentencia",
+        "juez": juez,
+        "tribunal": f"{camara} - Sala {sala}",
+        "fuero": fuero,
+        "materia": objeto,
+        "expediente": expediente,
+        "caratula": caratula,
+        "fecha": f"{anio:04d}-{mes:02d}-{dia:02d}",
+        "texto": "\n".join(lineas),
+    }
+
+
+def generar_doctrina(rng: random.Random, secciones: int = 6, numero: int = 0) -> Dict:
+    """Un artículo doctrinal con secciones, citas a autores y a Fallos"""
+    autor = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+    tema = rng.choice(FRASES)
+    lineas = [f"{tema.capitalize()}: una lectura crítica", f"Por {autor}", "", "Sumario:"]
+    lineas += [f"{i + 1}. {rng.choice(FRASES).capitalize()}." for i in range(secciones)]
+    lineas.append("")
+    for i in range(secciones):
+        lineas.append(f"{i + 1}. {rng.choice(FRASES).capitalize()}")
+        for _ in range(rng.randint(2, 4)):
+            citado = rng.choice(AUTORES_DOCTRINA)
+            arranque = rng.choice([
+                f"Como enseña {citado}, {rng.choice(FRASES)}.",
+                f"{citado} sostiene que {rng.choice(FRASES)}.",
+                f"Según {citado}, {rng.choice(FRASES)}.",
+                f"La doctrina de {citado} ha señalado que {rng.choice(FRASES)}.",
+            ])
+            desarrollo = _parrafo(rng, rng.randint(2, 5))[4:]
+            lineas.append(f"{arranque} {desarrollo[0].upper()}{desarrollo[1:]}")
+        lineas.append("")
+    lineas.append(f"Bibliografía: {', '.join(rng.sample(AUTORES_DOCTRINA, 4))}.")
+
+    return {
+        "id": f"doctrina_{numero:06d}",
+        "tipo": "doctrina",
+        "autor": autor,
+        "titulo": lineas[0],
+        "texto": "\n".join(lineas),
+    }
+
+
+def generar_corpus(escala: str = "chico", semilla: int = 42) -> Dict[str, List[Dict]]:
+    """Corpus reproducible: {'sentencias': [...], 'doctrina': [...]}"""
+    if escala not in ESCALAS:
+        raise ValueError(f"Escala desconocida: {escala} (opciones: {', '.join(ESCALAS)})")
+    n_sentencias, n_doctrina, considerandos, secciones = ESCALAS[escala]
+    rng = random.Random(semilla)
+    return {
+        "sentencias": [generar_sentencia(rng, considerandos, i) for i in range(n_sentencias)],
+        "doctrina": [generar_doctrina(rng, secciones, i) for i in range(n_doctrina)],
+    }
+
+
+def guardar_corpus(corpus: Dict[str, List[Dict]], salida: Path) -> int:
+    """Un .txt por documento y manifiesto.json con los metadatos"""
+    salida.mkdir(parents=True, exist_ok=True)
+    manifiesto = []
+    for documentos in corpus.values():
+        for doc in documentos:
+            (salida / f"{doc['id']}.txt").write_text(doc["texto"], encoding="utf-8")
+            manifiesto.append({clave: valor for clave, valor in doc.items() if clave != "texto"})
+    with open(salida / "manifiesto.json", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    return len(manifiesto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un corpus sintético de sentencias y doctrina")
+    parser.add_argument("--escala", choices=list(ESCALAS), default="chico")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default=str(DIR_SALIDA))
+    args = parser.parse_args()
+
+    corpus = generar_corpus(args.escala, args.semilla)
+    total = guardar_corpus(corpus, Path(args.salida))
+    caracteres = sum(len(doc["texto"]) for docs in corpus.values() for doc in docs)
+    print(f"🧬 Corpus '{args.escala}' (semilla {args.semilla}): {total} documentos, "
+          f"{caracteres / 1e6:.2f} M caracteres → {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+🧬 DETECTOR DE CASI-DUPLICADOS (MINHASH + LSH)
+=============================================
+
+Las mismas sentencias llegan varias veces: re-escaneos, apelaciones que
+transcriben el fallo de primera instancia, archivos con otro nombre. El
+hash_texto de rag_sentencias_chunks sólo detecta copias idénticas byte a byte.
+
+- Firma MinHash de los shingles de 5 palabras del texto normalizado
+  (minúsculas, sin acentos ni puntuación): la fracción de posiciones iguales
+  entre dos firmas estima la similitud de Jaccard.
+- Índice LSH por bandas: sólo se comparan documentos que comparten al menos
+  una banda, sin recorrer todo el corpus.
+- DetectorDuplicados persiste las firmas en la tabla firmas_minhash de la
+  misma base, así que la detección funciona entre corridas de ingesta.
+
+Políticas para un documento/chunk casi duplicado:
+- 'omitir':   no se guarda ni se registra
+- 'colapsar': no se guarda; queda registrado como alias del original
+- 'vincular': se guarda, pero marcado con su original (no se vectoriza)
+- 'ninguna':  sin detección
+
+Lo usan ingesta_sentencias_judicial.py, build_faiss_sentencias.py y
+buscador_sentencias.py (vectorizar_pendientes omite los vinculados).
+"""
+
+import re
+import sqlite3
+import unicodedata
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUM_PERMUTACIONES = 128
+BANDAS = 16                 # 16 bandas x 8 filas: umbral LSH efectivo ~0.7
+TAMANO_SHINGLE = 5
+UMBRAL_DUPLICADO = 0.85     # Jaccard estimado mínimo para considerar duplicado
+
+POLITICAS = ("omitir", "colapsar", "vincular", "ninguna")
+
+_rng = np.random.default_rng(20251118)
+# Multiplicadores de 64 bits: con claves de 32 bits, a y b deben ocupar 64 bits
+# para que (a*x + b) mod 2^64 >> 32 sea universal (si no, el mínimo no cambia)
+_A = _rng.integers(0, 2 ** 64, size=(NUM_PERMUTACIONES, 1), dtype=np.uint64, endpoint=False) | np.uint64(1)
+_B = _rng.integers(0, 2 ** 64, size=(NUM_PERMUTACIONES, 1), dtype=np.uint64, endpoint=False)
+_FIRMA_VACIA = np.full(NUM_PERMUTACIONES, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+_NO_PALABRA = re.compile(r"[^\w]+")
+
+
+def normalizar_texto(texto: str) -> List[str]:
+    """Palabras en minúsculas, sin acentos ni puntuación"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_PALABRA.sub(" ", texto).split()
+
+
+def shingles(texto: str, k: int = TAMANO_SHINGLE) -> Set[str]:
+    palabras = normalizar_texto(texto)
+    if len(palabras) <= k:
+        return {" ".join(palabras)} if palabras else set()
+    return {" ".join(palabras[i:i + k]) for i in range(len(palabras) - k + 1)}
+
+
+def firma_minhash(texto: str) -> np.ndarray:
+    """Firma MinHash (uint32 x NUM_PERMUTACIONES), estable entre procesos"""
+    conjunto = shingles(texto)
+    if not conjunto:
+        return _FIRMA_VACIA.copy()
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in conjunto),
+                    dtype=np.uint64, count=len(conjunto))
+    # Hash multiply-shift: ((a*x + b) mod 2^64) >> 32, una fila por permutación
+    valores = (_A * x + _B) >> np.uint64(32)
+    return valores.min(axis=1).astype(np.uint32)
+
+
+def similitud(firma_a: np.ndarray, firma_b: np.ndarray) -> float:
+    """Jaccard estimado entre dos firmas"""
+    return float(np.count_nonzero(firma_a == firma_b)) / len(firma_a)
+
+
+class IndiceLSH:
+    """Índice LSH en memoria: clave -> firma, con buckets por banda"""
+
+    def __init__(self, bandas: int = BANDAS, umbral: float = UMBRAL_DUPLICADO):
+        self.bandas = bandas
+        self.filas_por_banda = NUM_PERMUTACIONES // bandas
+        self.umbral = umbral
+        self.firmas: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bandas)]
+
+    def _claves_banda(self, firma: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        r = self.filas_por_banda
+        for b in range(self.bandas):
+            yield b, firma[b * r:(b + 1) * r].tobytes()
+
+    def agregar(self, clave: str, firma: np.ndarray):
+        self.firmas[clave] = firma
+        for b, llave in self._claves_banda(firma):
+            self._buckets[b].setdefault(llave, []).append(clave)
+
+    def quitar(self, clave: str):
+        firma = self.firmas.pop(clave, None)
+        if firma is None:
+            return
+        for b, llave in self._claves_banda(firma):
+            bucket = self._buckets[b].get(llave)
+            if bucket and clave in bucket:
+                bucket.remove(clave)
+                if not bucket:
+                    del self._buckets[b][llave]
+
+    def candidatos(self, firma: np.ndarray) -> Set[str]:
+        encontrados: Set[str] = set()
+        for b, llave in self._claves_banda(firma):
+            encontrados.update(self._buckets[b].get(llave, ()))
+        return encontrados
+
+    def buscar(self, firma: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Original más parecido con similitud >= umbral, o None"""
+        mejor = None
+        for clave in self.candidatos(firma):
+            sim = similitud(firma, self.firmas[clave])
+            if sim >= self.umbral and (mejor is None or sim > mejor[1]):
+                mejor = (clave, sim)
+        return mejor
+
+    def __len__(self) -> int:
+        return len(self.firmas)
+
+
+class DetectorDuplicados:
+    """
+    Índices LSH por tipo ('sentencia', 'chunk') respaldados en la tabla
+    firmas_minhash. Sólo los originales (canonica IS NULL) entran al índice:
+    una copia de una copia apunta al mismo original.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, umbral: float = UMBRAL_DUPLICADO):
+        self.conn = conn
+        self.umbral = umbral
+        self.indices: Dict[str, IndiceLSH] = {}
+        self._pendientes: List[Tuple[str, str, np.ndarray]] = []
+        self._crear_tabla()
+        self._cargar()
+
+    def _crear_tabla(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS firmas_minhash (
+            clave TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,          -- sentencia | chunk
+            firma BLOB NOT NULL,
+            canonica TEXT,               -- NULL = original; si no, clave del original
+            similitud REAL,
+            politica TEXT,
+            fecha TEXT
+        )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_firmas_canonica ON firmas_minhash(canonica)")
+        self.conn.commit()
+
+    def _cargar(self):
+        for clave, tipo, firma in self.conn.execute(
+            "SELECT clave, tipo, firma FROM firmas_minhash WHERE canonica IS NULL"
+        ):
+            self.indice(tipo).agregar(clave, np.frombuffer(firma, dtype=np.uint32))
+
+    def indice(self, tipo: str) -> IndiceLSH:
+        if tipo not in self.indices:
+            self.indices[tipo] = IndiceLSH(umbral=self.umbral)
+        return self.indices[tipo]
+
+    def buscar(self, tipo: str, firma: np.ndarray) -> Optional[Tuple[str, float]]:
+        return self.indice(tipo).buscar(firma)
+
+    def registrar(self, tipo: str, clave: str, firma: np.ndarray,
+                  canonica: Optional[str] = None, similitud_original: Optional[float] = None,
+                  politica: Optional[str] = None, confirmar: bool = True):
+        """
+        Guarda la firma; si es original, la agrega al índice.
+
+        Con confirmar=False la fila queda en la transacción del llamador. La
+        firma entra igual al índice en memoria (los chunks siguientes de la
+        misma sentencia la ven); descartar() la saca si hubo rollback.
+        """
+        self.conn.execute(
+            """INSERT OR REPLACE INTO firmas_minhash
+            (clave, tipo, firma, canonica, similitud, politica, fecha)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (clave, tipo, firma.tobytes(), canonica, similitud_original, politica,
+             datetime.now().isoformat(timespec="seconds"))
+        )
+        if canonica is None:
+            self.indice(tipo).agregar(clave, firma)
+            self._pendientes.append((tipo, clave, firma))
+        if confirmar:
+            self.confirmar()
+
+    def confirmar(self):
+        self.conn.commit()
+        self._pendientes = []
+
+    def descartar(self):
+        for tipo, clave, _ in self._pendientes:
+            self.indice(tipo).quitar(clave)
+        self._pendientes = []
+
+
+def claves_duplicadas(conn: sqlite3.Connection, tipo: str) -> Set[str]:
+    """Claves registradas como duplicado (no deben vectorizarse)"""
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'firmas_minhash'"
+    ).fetchone()
+    if not existe:
+        return set()
+    return {
+        fila[0] for fila in conn.execute(
+            "SELECT clave FROM firmas_minhash WHERE tipo = ? AND canonica IS NOT NULL", (tipo,)
+        )
+    }
+
+
+def colapsar_duplicados(items: Iterable[Tuple[str, str]],
+                        umbral: float = UMBRAL_DUPLICADO) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Deduplica (clave, texto) en memoria.
+
+    Returns:
+        (originales en el orden recibido, alias {clave_duplicada: clave_original})
+    """
+    indice = IndiceLSH(umbral=umbral)
+    originales, alias = [], {}
+    for clave, texto in items:
+        firma = firma_minhash(texto)
+        encontrado = indice.buscar(firma)
+        if encontrado:
+            alias[clave] = encontrado[0]
+        else:
+            indice.agregar(clave, firma)
+            originales.append((clave, texto))
+    return originales, alias
@@ -13,6 +13,15 @@ Ventajas:
 - Manejo robusto de terminología latina
 - Embeddings más discriminativos
 
+Batch:
+- Los 3 modelos codifican en paralelo (un hilo por modelo), repartiendo un
+  presupuesto de hilos de CPU (parámetro ``hilos``) entre ellos.
+- La fusión opera sobre matrices completas (normalización por filas y suma
+  ponderada), sin bucles por texto.
+- Con ``directorio_cache`` cada modelo guarda sus vectores en su propio
+  AlmacenVectorialMmap (clave: sha256 del texto). Cambiar los pesos de
+  fusión no obliga a volver a codificar.
+
 Autor: Sistema V7.8
 Fecha: 11 Nov 2025
 """
@@ -22,18 +31,37 @@ from sentence_transformers import SentenceTransformer
 import torch
 from typing import List, Dict, Tuple, Optional
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import warnings
 
+from almacen_vectorial import AlmacenVectorialMmap
+
 warnings.filterwarnings("ignore")
 
+MODELOS = ('general', 'legal', 'multilingual')
+
+
+def clave_texto(texto: str) -> str:
+    """Clave de caché de un texto (independiente del modelo)"""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def normalizar_filas(matriz: np.ndarray) -> np.ndarray:
+    """Normaliza cada fila a norma L2 = 1 (las filas nulas quedan nulas)"""
+    matriz = np.asarray(matriz, dtype=np.float32)
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    return np.divide(matriz, normas, out=np.zeros_like(matriz), where=normas > 0)
+
 
 class EmbeddingsFusion:
     """
     Genera embeddings multi-nivel mediante fusión ponderada de modelos especializados.
     """
     
-    def __init__(self, pesos: Optional[Dict[str, float]] = None, device: Optional[str] = None):
+    def __init__(self, pesos: Optional[Dict[str, float]] = None, device: Optional[str] = None,
+                 hilos: Optional[int] = None, directorio_cache: Optional[str] = None):
         """
         Inicializa el sistema de embeddings multi-nivel.
         
@@ -41,6 +69,10 @@ class EmbeddingsFusion:
             pesos: Diccionario con pesos para cada modelo
                    {'general': 0.5, 'legal': 0.35, 'multilingual': 0.15}
             device: 'cuda' o 'cpu'. Si None, detecta automáticamente
+            hilos: Presupuesto de hilos de CPU para codificar en batch
+                   (se reparte entre los 3 modelos). Si None, todos los núcleos
+            directorio_cache: Si se indica, cada modelo cachea sus vectores
+                   en un subdirectorio propio
         """
         # Configurar dispositivo
         if device is None:
@@ -58,13 +90,18 @@ class EmbeddingsFusion:
         }
         
         # Validar que sumen 1.0
-        suma_pesos = sum(self.pesos.values())
-        assert abs(suma_pesos - 1.0) < 0.01, f"Los pesos deben sumar 1.0 (actual: {suma_pesos})"
+        self._validar_pesos(self.pesos)
         
         # Modelos (se cargan bajo demanda)
         self.modelo_general = None
         self.modelo_legal = None
         self.modelo_multilingual = None
+        self.nombres_modelos: Dict[str, str] = {}
+        
+        # Paralelismo y caché por modelo
+        self.hilos = max(1, hilos or os.cpu_count() or 1)
+        self.directorio_cache = Path(directorio_cache) if directorio_cache else None
+        self.caches: Dict[str, AlmacenVectorialMmap] = {}
         
         # Dimensiones de cada modelo
         self.dim_general = 768
@@ -77,6 +114,19 @@ class EmbeddingsFusion:
               f"Legal={self.pesos['legal']:.2f}, "
               f"Multilingual={self.pesos['multilingual']:.2f}")
     
+    @staticmethod
+    def _validar_pesos(pesos: Dict[str, float]):
+        suma_pesos = sum(pesos.values())
+        assert abs(suma_pesos - 1.0) < 0.01, f"Los pesos deben sumar 1.0 (actual: {suma_pesos})"
+    
+    def establecer_pesos(self, pesos: Dict[str, float]):
+        """
+        Cambia los pesos de fusión. Con caché activa, el próximo batch
+        reutiliza los vectores ya codificados.
+        """
+        self._validar_pesos(pesos)
+        self.pesos = dict(pesos)
+    
     def cargar_modelos(self, force_download: bool = False):
         """
         Carga los 3 modelos de embeddings.
@@ -93,6 +143,7 @@ class EmbeddingsFusion:
                 'sentence-transformers/all-mpnet-base-v2',
                 device=self.device
             )
+            self.nombres_modelos['general'] = 'sentence-transformers/all-mpnet-base-v2'
             print(f"   ✅ Dimensión: {self.modelo_general.get_sentence_embedding_dimension()}D")
             
             # 2. Modelo Legal (legal-bert)
@@ -102,6 +153,7 @@ class EmbeddingsFusion:
                     'nlpaueb/legal-bert-base-uncased',
                     device=self.device
                 )
+                self.nombres_modelos['legal'] = 'nlpaueb/legal-bert-base-uncased'
                 print(f"   ✅ Dimensión: {self.modelo_legal.get_sentence_embedding_dimension()}D")
             except Exception as e:
                 print(f"   ⚠️  Legal-BERT no disponible: {e}")
@@ -110,6 +162,7 @@ class EmbeddingsFusion:
                     'sentence-transformers/distilbert-base-uncased',
                     device=self.device
                 )
+                self.nombres_modelos['legal'] = 'sentence-transformers/distilbert-base-uncased'
                 print(f"   ✅ Fallback cargado (Dimensión: {self.modelo_legal.get_sentence_embedding_dimension()}D)")
             
             # 3. Modelo Multilingüe (paraphrase-multilingual)
@@ -118,6 +171,7 @@ class EmbeddingsFusion:
                 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2',
                 device=self.device
             )
+            self.nombres_modelos['multilingual'] = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
             print(f"   ✅ Dimensión: {self.modelo_multilingual.get_sentence_embedding_dimension()}D")
             
             print("\n✅ Todos los modelos cargados exitosamente")
@@ -187,20 +241,25 @@ class EmbeddingsFusion:
         Returns:
             Embedding fusionado y normalizado
         """
-        # Normalizar cada embedding individualmente
-        emb_general_norm = self.normalizar_embedding(embeddings['general'])
-        emb_legal_norm = self.normalizar_embedding(embeddings['legal'])
-        emb_multi_norm = self.normalizar_embedding(embeddings['multilingual'])
-        
-        # Fusión ponderada
-        embedding_fusionado = (
-            self.pesos['general'] * emb_general_norm +
-            self.pesos['legal'] * emb_legal_norm +
-            self.pesos['multilingual'] * emb_multi_norm
-        )
-        
-        # Normalizar resultado final
-        return self.normalizar_embedding(embedding_fusionado)
+        matrices = {nombre: np.atleast_2d(embeddings[nombre]) for nombre in MODELOS}
+        return self.fusionar_matrices(matrices)[0]
+    
+    def fusionar_matrices(
+        self,
+        embeddings: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Fusiona matrices de embeddings (n_textos x dim) de los 3 modelos.
+        
+        Args:
+            embeddings: Diccionario {'general': m1, 'legal': m2, 'multilingual': m3}
+            
+        Returns:
+            Matriz fusionada con filas normalizadas (float32)
+        """
+        # Normalizar cada fila de cada modelo, sumar ponderado y normalizar el resultado
+        fusion = sum(self.pesos[nombre] * normalizar_filas(embeddings[nombre]) for nombre in MODELOS)
+        return normalizar_filas(fusion)
     
     def generar_embedding_fusion(
         self, 
@@ -249,6 +308,82 @@ class EmbeddingsFusion:
         
         return embedding_final
     
+    def _modelo(self, nombre: str) -> SentenceTransformer:
+        modelo = getattr(self, f"modelo_{nombre}")
+        if modelo is None:
+            raise ValueError(f"Modelo {nombre} no cargado. Ejecuta cargar_modelos() primero")
+        return modelo
+    
+    def _cache(self, nombre: str) -> Optional[AlmacenVectorialMmap]:
+        """Almacén de vectores del modelo (un subdirectorio por modelo real)"""
+        if self.directorio_cache is None:
+            return None
+        if nombre not in self.caches:
+            modelo_id = self.nombres_modelos.get(nombre, nombre).replace('/', '__')
+            self.caches[nombre] = AlmacenVectorialMmap(self.directorio_cache / modelo_id)
+        return self.caches[nombre]
+    
+    def codificar_modelo(
+        self,
+        nombre: str,
+        textos: List[str],
+        claves: Optional[List[str]] = None,
+        batch_size: int = 32,
+        hilos_torch: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Codifica ``textos`` con un modelo. Con caché, sólo codifica los textos
+        que ese modelo todavía no vio.
+        
+        Returns:
+            Matriz (n_textos, dim) en el orden de ``textos``
+        """
+        if hilos_torch:
+            torch.set_num_threads(hilos_torch)
+        modelo = self._modelo(nombre)
+        cache = self._cache(nombre)
+        if cache is None:
+            return modelo.encode(textos, batch_size=batch_size,
+                                 convert_to_numpy=True, show_progress_bar=False)
+        
+        claves = claves or [clave_texto(t) for t in textos]
+        faltantes: Dict[str, int] = {}
+        for i, clave in enumerate(claves):
+            if clave not in cache and clave not in faltantes:
+                faltantes[clave] = i
+        if faltantes:
+            nuevos = modelo.encode([textos[i] for i in faltantes.values()], batch_size=batch_size,
+                                   convert_to_numpy=True, show_progress_bar=False)
+            cache.agregar_lote(zip(faltantes.keys(), nuevos))
+        
+        filas = np.fromiter((cache.ids[clave] for clave in claves), dtype=np.int64, count=len(claves))
+        return np.array(cache.matriz()[filas])
+    
+    def codificar_todos(
+        self,
+        textos: List[str],
+        batch_size: int = 32
+    ) -> Dict[str, np.ndarray]:
+        """
+        Codifica ``textos`` con los 3 modelos en paralelo, repartiendo
+        ``self.hilos`` entre ellos.
+        """
+        claves = [clave_texto(t) for t in textos] if self.directorio_cache else None
+        trabajadores = min(len(MODELOS), self.hilos)
+        hilos_por_modelo = max(1, self.hilos // trabajadores)
+        hilos_previos = torch.get_num_threads()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=trabajadores) as executor:
+                futuros = {
+                    nombre: executor.submit(self.codificar_modelo, nombre, textos, claves,
+                                            batch_size, hilos_por_modelo)
+                    for nombre in MODELOS
+                }
+                return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+        finally:
+            torch.set_num_threads(hilos_previos)
+    
     def generar_embeddings_batch(
         self, 
         textos: List[str],
@@ -260,50 +395,22 @@ class EmbeddingsFusion:
         
         Args:
             textos: Lista de textos
-            batch_size: Tamaño del batch
+            batch_size: Tamaño del batch de cada modelo
             show_progress: Mostrar progreso
             
         Returns:
-            Array de embeddings (n_textos, 768)
+            Array de embeddings (n_textos, 768), float32
         """
         n_textos = len(textos)
-        embeddings_finales = np.zeros((n_textos, self.dim_final))
+        if n_textos == 0:
+            return np.zeros((0, self.dim_final), dtype=np.float32)
         
         if show_progress:
-            print(f"\n🔄 Procesando {n_textos} textos en batches de {batch_size}...")
+            print(f"\n🔄 Procesando {n_textos} textos en batches de {batch_size} "
+                  f"({self.hilos} hilos para {len(MODELOS)} modelos)...")
         
-        for i in range(0, n_textos, batch_size):
-            batch = textos[i:i+batch_size]
-            
-            # Generar embeddings individuales para el batch
-            embs_general = self.modelo_general.encode(
-                batch, 
-                convert_to_numpy=True,
-                show_progress_bar=False
-            )
-            embs_legal = self.modelo_legal.encode(
-                batch,
-                convert_to_numpy=True,
-                show_progress_bar=False
-            )
-            embs_multi = self.modelo_multilingual.encode(
-                batch,
-                convert_to_numpy=True,
-                show_progress_bar=False
-            )
-            
-            # Fusionar cada texto del batch
-            for j, _ in enumerate(batch):
-                embeddings_dict = {
-                    'general': embs_general[j],
-                    'legal': embs_legal[j],
-                    'multilingual': embs_multi[j]
-                }
-                embeddings_finales[i+j] = self.fusionar_ponderado(embeddings_dict)
-            
-            if show_progress:
-                progreso = min(i + batch_size, n_textos)
-                print(f"   Procesados: {progreso}/{n_textos} ({100*progreso/n_textos:.1f}%)")
+        embeddings = self.codificar_todos(textos, batch_size)
+        embeddings_finales = self.fusionar_matrices(embeddings)
         
         if show_progress:
             print("✅ Batch completado")
@@ -14,17 +14,28 @@ sys.path.insert(0, os.path.dirname(__file__))  # Agregar directorio actual prime
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 import re
+import ast
 import pickle
 import uuid
 from pathlib import Path
 from typing import List
 
-from flask import Flask, request, redirect, url_for, render_template_string, flash, send_file, jsonify
+from flask import Flask, Response, request, redirect, url_for, render_template_string, flash, send_file, jsonify
 from werkzeug.utils import secure_filename
 
-import faiss
 import numpy as np
 
+# ====================================
+# Módulos pesados: se importan en el primer uso (ver carga_perezosa.py)
+# ====================================
+from carga_perezosa import REGISTRO, esperar_puerto
+from pool_sqlite import obtener_pool, registrar_en_flask, cerrar_pools
+from cache_respuestas import cache_condicional, CACHE, DB_COGNITIVA, DB_PERFILES, DB_AUTOR_CENTRICO
+from instrumentacion import REGISTRO_METRICAS, TIPO_CONTENIDO, exponer, instrumentar, medir
+from cola_trabajos import encolar, iniciar_trabajadores, registrar_rutas_trabajos
+
+faiss = REGISTRO.modulo("faiss")
+
 # Importar nuevo sistema de referencias de autores
 try:
     from sistema_referencias_autores import SistemaReferenciasAutores
@@ -35,32 +46,18 @@ except ImportError as e:
     print(f"   Detalles del error: {e}")
     REFERENCIAS_DISPONIBLE = False
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from io import BytesIO
 import datetime
 
-from sentence_transformers import SentenceTransformer
-from transformers import (
-    AutoTokenizer, AutoModelForTokenClassification, pipeline as hf_pipeline,
-    AutoModelForSeq2SeqLM
-)
-from docx import Document
-try:
-    from pypdf import PdfReader
-except ImportError:
-    from PyPDF2 import PdfReader
-
 # ====================================
-# Importa el pipeline doctrinario
+# Importa el pipeline doctrinario (perezoso: carga transformers y Gemini)
 # ====================================
-from pipeline_resumen_doctrinario import (
-    run_doctrina_pipeline,
-    doctrina_respuesta_to_dict
-)
-from pipeline_refinamiento import self_refine_doctrina, cargar_historial
+_pipeline_refinamiento = REGISTRO.modulo("pipeline_refinamiento")
+
+def self_refine_doctrina(*args, **kwargs):
+    return _pipeline_refinamiento.self_refine_doctrina(*args, **kwargs)
+
+def cargar_historial(*args, **kwargs):
+    return _pipeline_refinamiento.cargar_historial(*args, **kwargs)
 
 # ====================================
 # Importa sistema autor-céntrico
@@ -106,12 +103,11 @@ except ImportError:
 # ====================================
 # Importación de Gemini para fusión contextual
 # ====================================
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
+GEMINI_AVAILABLE = REGISTRO.disponible("google.generativeai")
+if GEMINI_AVAILABLE:
+    genai = REGISTRO.modulo("google.generativeai")
+else:
     print("⚠️ Google Generative AI no disponible. Algunas funciones estarán limitadas.")
-    GEMINI_AVAILABLE = False
 
 # ====================================
 # Importar Generador de Informes Gemini
@@ -159,6 +155,12 @@ ALLOWED_EXT = {".pdf", ".txt", ".docx"}
 app = Flask(__name__)
 app.secret_key = "colaborative_e2e_secret"
 
+# Conexiones SQLite compartidas: cada request devuelve las suyas al pool al terminar
+registrar_en_flask(app)
+
+# Ingesta, PDF e informes corren en procesos trabajadores (ver cola_trabajos.py)
+registrar_rutas_trabajos(app)
+
 # Variable global para el sistema de referencias
 sistema_referencias_global = None
 
@@ -172,6 +174,7 @@ def leer_txt(path: Path) -> str:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         return f.read()
 
+@instrumentar("extraccion_pdf")
 def leer_pdf(path: Path) -> str:
     """Lee PDF usando PyMuPDF (fitz) que maneja mejor encriptación."""
     text = ""
@@ -204,6 +207,7 @@ def leer_pdf(path: Path) -> str:
     return text
 
 def leer_docx(path: Path) -> str:
+    from docx import Document
     doc = Document(str(path))
     return "\n".join(p.text for p in doc.paragraphs)
 
@@ -220,31 +224,34 @@ def dividir_en_chunks(text: str, chunk_size:int=CHUNK_SIZE, overlap:int=OVERLAP)
 # ====================================
 # CARGA PEREZOSA DE MODELOS
 # ====================================
-_embedder = None
-_ner_pipe = None
-_gen_pipe = None
+def _crear_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(str(EMBEDDINGS_PATH), local_files_only=True)
+
+def _crear_ner():
+    from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline as hf_pipeline
+    tok = AutoTokenizer.from_pretrained(str(NER_PATH), local_files_only=True)
+    mdl = AutoModelForTokenClassification.from_pretrained(str(NER_PATH), local_files_only=True)
+    return hf_pipeline("ner", model=mdl, tokenizer=tok, aggregation_strategy="simple")
+
+def _crear_generator():
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline as hf_pipeline
+    tok = AutoTokenizer.from_pretrained(str(GEN_PATH), local_files_only=True)
+    mdl = AutoModelForSeq2SeqLM.from_pretrained(str(GEN_PATH), local_files_only=True)
+    return hf_pipeline("text2text-generation", model=mdl, tokenizer=tok)
+
+REGISTRO.registrar("embedder", _crear_embedder)
+REGISTRO.registrar("ner", _crear_ner)
+REGISTRO.registrar("generator", _crear_generator)
 
 def get_embedder():
-    global _embedder
-    if _embedder is None:
-        _embedder = SentenceTransformer(str(EMBEDDINGS_PATH), local_files_only=True)
-    return _embedder
+    return REGISTRO.obtener("embedder")
 
 def get_ner():
-    global _ner_pipe
-    if _ner_pipe is None:
-        tok = AutoTokenizer.from_pretrained(str(NER_PATH), local_files_only=True)
-        mdl = AutoModelForTokenClassification.from_pretrained(str(NER_PATH), local_files_only=True)
-        _ner_pipe = hf_pipeline("ner", model=mdl, tokenizer=tok, aggregation_strategy="simple")
-    return _ner_pipe
+    return REGISTRO.obtener("ner")
 
 def get_generator():
-    global _gen_pipe
-    if _gen_pipe is None:
-        tok = AutoTokenizer.from_pretrained(str(GEN_PATH), local_files_only=True)
-        mdl = AutoModelForSeq2SeqLM.from_pretrained(str(GEN_PATH), local_files_only=True)
-        _gen_pipe = hf_pipeline("text2text-generation", model=mdl, tokenizer=tok)
-    return _gen_pipe
+    return REGISTRO.obtener("generator")
 
 # ====================================
 # GESTIÓN DE BASES RAG MÚLTIPLES
@@ -280,10 +287,17 @@ def procesar_documentos(base="general") -> List[dict]:
             docs.append({"texto": c, "fuente": path.name})
     return docs
 
-def crear_indice_vectorial(base="general"):
-    """Crea un índice FAISS para la base seleccionada."""
+LOTE_EMBEDDINGS_INGESTA = 256
+
+def crear_indice_vectorial(base="general", progreso=None):
+    """
+    Crea un índice FAISS para la base seleccionada.
+    progreso(fraccion, mensaje), si se pasa, recibe el avance (lo usa la cola de trabajos).
+    """
+    progreso = progreso or (lambda fraccion, mensaje=None: None)
     pdf_dir, chunk_dir, faiss_idx, meta_pkl = base_paths(base)
 
+    progreso(0.0, "Leyendo documentos")
     documentos = procesar_documentos(base)
     textos = [d["texto"] for d in documentos]
     fuentes = [d["fuente"] for d in documentos]
@@ -291,19 +305,41 @@ def crear_indice_vectorial(base="general"):
     if not textos:
         raise RuntimeError(f"No se encontraron documentos en {pdf_dir}")
 
-    embeddings = get_embedder().encode(textos, show_progress_bar=True, convert_to_numpy=True)
+    # Embeddings por lotes: el avance se reporta entre lotes (10% → 90%)
+    partes = []
+    with medir("embedding_lote"):
+        for inicio in range(0, len(textos), LOTE_EMBEDDINGS_INGESTA):
+            progreso(0.1 + 0.8 * inicio / len(textos), f"Embeddings {inicio}/{len(textos)} chunks")
+            partes.append(get_embedder().encode(textos[inicio:inicio + LOTE_EMBEDDINGS_INGESTA],
+                                                show_progress_bar=False, convert_to_numpy=True))
+    embeddings = np.vstack(partes)
+    progreso(0.9, "Escribiendo índice")
     dim = embeddings.shape[1]
     index = faiss.IndexFlatL2(dim)
     index.add(embeddings)
 
-    faiss.write_index(index, str(faiss_idx))
-    with open(meta_pkl, "wb") as f:
+    # Ambos archivos se escriben aparte y se reemplazan juntos al final:
+    # buscar() sigue leyendo el índice anterior mientras dura la escritura
+    faiss_tmp = faiss_idx.with_suffix(".faiss.tmp")
+    meta_tmp = meta_pkl.with_suffix(".pkl.tmp")
+    faiss.write_index(index, str(faiss_tmp))
+    with open(meta_tmp, "wb") as f:
         pickle.dump({"textos": textos, "fuentes": fuentes}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(faiss_tmp, faiss_idx)
+    os.replace(meta_tmp, meta_pkl)
 
     with open(chunk_dir / "chunks.txt", "w", encoding="utf-8") as f:
         for i, d in enumerate(documentos):
             f.write(f"[{i}] {d['fuente']}\n{d['texto']}\n{'-'*80}\n")
+    return {"base": base, "chunks": len(textos), "documentos": len(set(fuentes))}
 
+def trabajo_ingesta(contexto, base="general"):
+    """Tarea 'ingesta' de la cola de trabajos"""
+    return crear_indice_vectorial(base, progreso=contexto.progreso)
+
+@instrumentar("load_index_and_meta")
 def load_index_and_meta(base="general"):
     """Carga el índice FAISS y metadatos de la base indicada."""
     _, _, faiss_idx, meta_pkl = base_paths(base)
@@ -317,9 +353,11 @@ def load_index_and_meta(base="general"):
 # ====================================
 # BÚSQUEDA
 # ====================================
+@instrumentar("embedding_consulta")
 def embed_query(q: str) -> np.ndarray:
     return get_embedder().encode([q], convert_to_numpy=True)
 
+@instrumentar("buscar")
 def buscar(q: str, k:int=8, base:str="general"):
     idx, textos, fuentes = load_index_and_meta(base)
     v = embed_query(q)
@@ -525,7 +563,8 @@ Redacta ahora el documento doctrinario unificado:
 
         # ⑥ Generar respuesta con Gemini
         try:
-            respuesta = model.generate_content(prompt)
+            with medir("gemini"):
+                respuesta = model.generate_content(prompt)
             texto_final = respuesta.text.strip()
         except Exception as gemini_error:
             error_str = str(gemini_error)
@@ -682,6 +721,7 @@ PAGE = """
             <option value="{{b}}">{{b|capitalize}}</option>
           {% endfor %}
         </select>
+        <label><input type="checkbox" name="ingestar" value="1"> Ingestar al subir</label>
         <button class="btn" type="submit">⬆️ Subir</button>
       </form>
       <form method="POST" action="{{url_for('ingest')}}">
@@ -807,16 +847,24 @@ def upload():
         ok += 1
 
     flash(f"✅ Base '{base}': subidos {ok} archivo(s) (ignorados {skip})", "success")
+    if ok and request.form.get("ingestar"):
+        flash_trabajo_ingesta(base)
     return redirect(url_for("home", base=base))
 
+def flash_trabajo_ingesta(base):
+    trabajo_id, nuevo = encolar("ingesta", {"base": base})
+    estado = "encolada" if nuevo else "ya estaba en cola"
+    flash(f"⏳ Ingesta de '{base}' {estado} (trabajo #{trabajo_id}): "
+          f"{url_for('ver_trabajo', trabajo_id=trabajo_id)}", "success")
+    return trabajo_id
+
 @app.route("/ingest", methods=["POST"])
 def ingest():
     base = request.form.get("base", "general")
-    try:
-        crear_indice_vectorial(base)
-        flash(f"✅ Ingesta completada para base '{base}'.", "success")
-    except Exception as e:
-        flash(f"❌ Error en ingesta ({base}): {e}", "error")
+    trabajo_id = flash_trabajo_ingesta(base)
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify({"success": True, "trabajo": trabajo_id,
+                        "estado_url": url_for("estado_trabajo", trabajo_id=trabajo_id)}), 202
     return redirect(url_for("home", base=base))
 
 @app.route("/doctrina", methods=["POST"])
@@ -1074,6 +1122,13 @@ def diagnostico_gemini():
     </html>
     """
 
+@app.route("/metrics")
+def metricas():
+    """Tiempos por etapa y estado de la caché HTTP, en formato Prometheus."""
+    for clave, valor in CACHE.estado().items():
+        REGISTRO_METRICAS.fijar("cache_respuestas", valor, "Estado de la caché de páginas analíticas", dato=clave)
+    return Response(exponer(), content_type=TIPO_CONTENIDO)
+
 @app.route("/historial")
 def ver_historial():
     registros = cargar_historial()
@@ -1103,17 +1158,49 @@ def ver_historial():
     """
     return render_template_string(html, registros=registros)
 
+EXPORTS_DIR = DATA_DIR / "exports"
+
 @app.route("/exportar_pdf", methods=["POST"])
 def exportar_pdf():
-    concepto = request.form.get("concepto", "")
-    base = request.form.get("base", "")
-    entidades = eval(request.form.get("entidades", "{}"))  # convert string to dict safely
-    q = request.form.get("q", "")
+    """Encola la generación del PDF y muestra la página de progreso del trabajo"""
+    try:
+        # literal_eval: el formulario trae el repr() de un dict, nunca código
+        entidades = ast.literal_eval(request.form.get("entidades") or "{}")
+    except (ValueError, SyntaxError):
+        entidades = {}
+    if not isinstance(entidades, dict):
+        entidades = {}
+
+    trabajo_id, _ = encolar("exportar_pdf", {
+        "concepto": request.form.get("concepto", ""),
+        "base": request.form.get("base", ""),
+        "entidades": entidades,
+        "q": request.form.get("q", ""),
+    })
+    return redirect(url_for("ver_trabajo", trabajo_id=trabajo_id))
+
+def trabajo_exportar_pdf(contexto, concepto="", base="", entidades=None, q=""):
+    """Tarea 'exportar_pdf' de la cola de trabajos: deja el PDF en data/exports"""
+    EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    filename = f"Informe_Doctrinario_{base}_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+    destino = EXPORTS_DIR / f"trabajo_{contexto.id}_{filename}"
+    contexto.progreso(0.1, "Armando el documento")
+    # contexto.progreso corta con TrabajoCancelado entre etapas y entre páginas
+    construir_pdf_doctrinario(destino, concepto, base, entidades or {}, q, progreso=contexto.progreso)
+    return {"archivo": str(destino.resolve()), "nombre": filename}
+
+@instrumentar("exportar_pdf")
+def construir_pdf_doctrinario(destino, concepto, base, entidades, q, progreso=None):
+    """``progreso(fraccion, mensaje)`` se llama entre las etapas y en cada página"""
+    progreso = progreso or (lambda fraccion, mensaje=None: None)
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
     fecha_gen = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
 
-    # Crear PDF en memoria
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=40, bottomMargin=40)
+    doc = SimpleDocTemplate(str(destino), pagesize=A4, topMargin=40, bottomMargin=40)
     styles = getSampleStyleSheet()
     story = []
 
@@ -1132,12 +1219,14 @@ def exportar_pdf():
     story.append(PageBreak())
 
     # ======= CONCEPTO =======
+    progreso(0.2, "Concepto doctrinario")
     story.append(Paragraph("<b>Concepto doctrinario refinado</b>", styles["Heading1"]))
     story.append(Spacer(1, 10))
     story.append(Paragraph(concepto.replace("\n", "<br/>"), styles["Normal"]))
     story.append(Spacer(1, 20))
 
     # ======= ENTIDADES DETECTADAS =======
+    progreso(0.3, "Entidades detectadas")
     story.append(Paragraph("<b>Entidades jurídicas detectadas</b>", styles["Heading1"]))
     story.append(Spacer(1, 8))
     tabla_entidades = [
@@ -1162,6 +1251,7 @@ def exportar_pdf():
     story.append(Spacer(1, 20))
 
     # ======= METADATOS TÉCNICOS =======
+    progreso(0.4, "Metadatos del proceso")
     story.append(Paragraph("<b>Metadatos del proceso</b>", styles["Heading1"]))
     data_meta = [
         ["Modelo de generación local", "Flan-T5-Base (SentenceTransformer + FAISS)"],
@@ -1185,11 +1275,12 @@ def exportar_pdf():
         ParagraphStyle("footer", parent=styles["Normal"], alignment=1, fontSize=8)
     ))
 
-    doc.build(story)
-    buffer.seek(0)
+    def pagina_lista(canvas, documento):
+        progreso(min(0.95, 0.5 + 0.05 * documento.page), f"Página {documento.page}")
 
-    filename = f"Informe_Doctrinario_{base}_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-    return send_file(buffer, as_attachment=True, download_name=filename, mimetype='application/pdf')
+    progreso(0.5, "Renderizando PDF")
+    doc.build(story, onFirstPage=pagina_lista, onLaterPages=pagina_lista)
+    return destino
 
 @app.route("/resultado/<resultado_id>")
 def ver_resultado(resultado_id):
@@ -1846,6 +1937,7 @@ def panel_cognitivo():
 # 📊 Panel de Radar Cognitivo (VISUALIZACIÓN)
 # ====================================
 @app.route("/radar", methods=["GET", "POST"])
+@cache_condicional(lambda: [(DB_COGNITIVA, "autor", "*"), (DB_PERFILES, "autor", "*")])
 def panel_radar():
     """
     Panel de visualización radar cognitivo.
@@ -2113,12 +2205,13 @@ def panel_radar():
           <a href="/" style="background: #007bff; color: white; padding: 10px; text-decoration: none; border-radius: 4px;">🏠 Volver</a>
         </body>
         </html>
-        """
+        """, 500
 
 # ====================================
 # RUTA AUTOR-CÉNTRICA
 # ====================================
 @app.route('/autores', methods=['GET', 'POST'])
+@cache_condicional(lambda: [(DB_AUTOR_CENTRICO, 'autor', '*'), (DB_COGNITIVA, 'autor', '*')])
 def panel_autor_centrico():
     """
     Panel especializado en análisis autor-céntrico y metodologías
@@ -2337,7 +2430,7 @@ def panel_autor_centrico():
           <a href="/" style="background: #007bff; color: white; padding: 10px; text-decoration: none; border-radius: 4px;">🏠 Volver</a>
         </body>
         </html>
-        """
+        """, 500
 
 # ====================================
 # RUTA PENSAMIENTO MULTI-CAPA
@@ -2571,6 +2664,7 @@ def perfil_recientes():
 
 
 @app.route('/autor/<nombre>', methods=['GET'])
+@cache_condicional(lambda nombre: [(DB_COGNITIVA, 'autor', nombre)])
 def perfil_autor(nombre):
     """Muestra el perfil detallado de un autor - búsqueda directa en BD"""
     try:
@@ -2579,7 +2673,6 @@ def perfil_autor(nombre):
         if not REFERENCIAS_DISPONIBLE:
             return f"<h2>❌ Sistema de Referencias no disponible</h2>", 503
         
-        import sqlite3
         import os
         
         # Usar ruta absoluta
@@ -2590,9 +2683,8 @@ def perfil_autor(nombre):
         if not os.path.exists(db_path):
             return f"<h2>❌ Base de datos no encontrada</h2>", 500
         
-        # Conectar y buscar
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        # Buscar (conexión de lectura del pool)
+        cursor = obtener_pool(db_path).lector().cursor()
         
         try:
             cursor.execute('''
@@ -2714,7 +2806,7 @@ def perfil_autor(nombre):
             return html
             
         finally:
-            conn.close()
+            cursor.close()
         
     except Exception as e:
         return f"""
@@ -3068,6 +3160,7 @@ def integrar_biblioteca_cognitiva():
 # RUTA INFORME GEMINI
 # ====================================
 @app.route('/informe-autor/<nombre_autor>', methods=['GET'])
+@cache_condicional(lambda nombre_autor: [(DB_COGNITIVA, 'autor', nombre_autor)])
 def informe_autor(nombre_autor):
     """Genera informe completo del autor con Gemini"""
     if not GENERADOR_INFORMES_DISPONIBLE or generador_informes is None:
@@ -3139,7 +3232,7 @@ def informe_autor(nombre_autor):
               </div>
             </body>
             </html>
-            """
+            """, 503
         
         # Convertir markdown a HTML básico
         import re
@@ -3362,6 +3455,7 @@ if __name__ == "__main__":
             biblioteca = BibliotecaCognitiva()
             
             @app.route('/biblioteca')
+            @cache_condicional(lambda: [(DB_COGNITIVA, 'autor', '*')])
             def pagina_biblioteca():
                 """Página principal de la biblioteca cognitiva de autores"""
                 return biblioteca.generar_pagina_principal_html()
@@ -3459,5 +3553,18 @@ if __name__ == "__main__":
         print("⚠️ Sistema Judicial no disponible - verifica imports")
 
 
+    # Precalentamiento opcional: carga modelos y módulos pesados en segundo
+    # plano una vez que el servidor ya acepta conexiones (WEBAPP_PRECALENTAR=0 lo desactiva)
+    if os.getenv("WEBAPP_PRECALENTAR", "1") != "0":
+        REGISTRO.precalentar(
+            ["faiss", "embedder", "pipeline_refinamiento"],
+            esperar=lambda: esperar_puerto("127.0.0.1", 5002)
+        )
+
+    # Trabajadores de la cola (ingesta, PDF, informes): WEBAPP_TRABAJADORES=0 los
+    # desactiva, p.ej. si corren aparte con `python cola_trabajos.py --trabajadores N`
+    iniciar_trabajadores(int(os.getenv("WEBAPP_TRABAJADORES", "1")))
+
     # Iniciar Flask
     app.run(host="127.0.0.1", port=5002, debug=False)
+    cerrar_pools()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧊 EXPORTACIÓN COLUMNAR EN STREAMING (exportador_columnar)
+==========================================================
+
+Snapshots de perfiles, sentencias, chunks, citas y similitudes en Parquet
+(o JSONL) con memoria acotada, para que la analítica offline lea archivos
+compactos en vez de las bases SQLite vivas.
+
+- Las filas salen de SQLite con fetchmany(tamano_lote) y se escriben lote a
+  lote: un row group de Parquet (o N líneas JSONL) por lote. Nunca está la
+  tabla entera en memoria.
+- --columnas recorta las columnas en el SELECT, no después.
+- Las similitudes entre autores se calculan por bloques de filas de la matriz
+  de vectores y se escriben en formato largo (autor_a, autor_b, similitud).
+- Cada corrida deja _manifiesto.json con filas, columnas y origen de cada
+  dataset. Se escribe a un temporal y se renombra al final, así un lector
+  nunca ve un archivo a medias.
+- Sin pyarrow se exporta JSONL.
+
+USO:
+    python exportador_columnar.py                       # todos, Parquet
+    python exportador_columnar.py sentencias citas --formato jsonl
+    python exportador_columnar.py chunks --columnas expediente,tribunal,distancia_doctrinal
+
+    from exportador_columnar import exportar_dataset, leer_snapshot
+    for lote in leer_snapshot("../data/snapshots/chunks.parquet", ["tribunal"]): ...
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_rutas import PENSAMIENTO_DB
+from pool_sqlite import obtener_pool
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+SCRIPT_DIR = Path(__file__).parent
+BASE_DIR = SCRIPT_DIR.parent
+BASES_RAG_DIR = BASE_DIR / "bases_rag" / "cognitiva"
+DB_COGNITIVA = BASES_RAG_DIR / "metadatos.db"
+DB_AUTOR_CENTRICO = BASES_RAG_DIR / "autor_centrico.db"
+DB_JUDICIAL = BASES_RAG_DIR / "juez_centrico_arg.db"
+# config_rutas es relativo a la raíz del proyecto (padre de colaborative/)
+DB_PENSAMIENTO = BASE_DIR.parent / PENSAMIENTO_DB
+SNAPSHOTS_DIR = BASE_DIR / "data" / "snapshots"
+
+TAMANO_LOTE = 2000
+TAMANO_BLOQUE_SIMILITUD = 256
+MANIFIESTO = "_manifiesto.json"
+
+# nombre -> (base, tabla). "similitudes" se calcula, no se copia.
+DATASETS: Dict[str, Tuple[Path, str]] = {
+    "perfiles_cognitivos": (DB_COGNITIVA, "perfiles_cognitivos"),
+    "perfiles_autorales": (DB_AUTOR_CENTRICO, "perfiles_autorales_expandidos"),
+    "perfiles_judiciales": (DB_JUDICIAL, "perfiles_judiciales_argentinos"),
+    "perfiles_integrados": (DB_PENSAMIENTO, "perfiles_integrados_v2"),
+    "sentencias": (DB_JUDICIAL, "sentencias_por_juez_arg"),
+    "chunks": (DB_PENSAMIENTO, "rag_sentencias_chunks"),
+    "citas": (DB_JUDICIAL, "citas_sentencia"),
+    "comparaciones": (DB_PENSAMIENTO, "comparaciones_mentales"),
+    "similitudes": (DB_PENSAMIENTO, "perfiles_integrados_v2"),
+}
+EXTENSIONES = {"parquet": ".parquet", "jsonl": ".jsonl"}
+
+
+# ============================================================
+# ESCRITORES
+# ============================================================
+def tipo_afinidad(declarado: Optional[str]) -> str:
+    """Tipo de columna según las reglas de afinidad de SQLite"""
+    declarado = (declarado or "").upper()
+    if "INT" in declarado:
+        return "entero"
+    if any(t in declarado for t in ("CHAR", "CLOB", "TEXT")):
+        return "texto"
+    if "BLOB" in declarado:
+        return "binario"
+    if any(t in declarado for t in ("REAL", "FLOA", "DOUB")):
+        return "real"
+    # Sin tipo declarado o NUMERIC/DATETIME: en este repo suelen ser fechas ISO
+    return "texto"
+
+
+def _coercer(valor, tipo: str):
+    """Valor -> tipo de la columna; None si no entra (SQLite no obliga a respetarlo)"""
+    if valor is None:
+        return None
+    try:
+        if tipo == "texto":
+            return valor if isinstance(valor, str) else str(valor)
+        if tipo == "entero":
+            return int(valor) if not isinstance(valor, float) or valor.is_integer() else None
+        if tipo == "real":
+            return float(valor)
+        return valor if isinstance(valor, bytes) else str(valor).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+
+
+def coercer_columnas(filas: Sequence[Sequence], tipos: Sequence[str]) -> Tuple[List[List], int]:
+    """
+    Columnas de ``filas`` convertidas al tipo de cada una (ver ``_coercer``).
+    Devuelve (columnas, cantidad de valores no nulos que quedaron nulos).
+    """
+    columnas, descartados = [], 0
+    for valores, tipo in zip(zip(*filas), tipos):
+        convertidos = [_coercer(v, tipo) for v in valores]
+        descartados += sum(1 for v, c in zip(valores, convertidos) if v is not None and c is None)
+        columnas.append(convertidos)
+    return columnas, descartados
+
+
+class EscritorJSONL:
+    """Mismas conversiones de tipo que EscritorParquet: los dos formatos tienen los mismos valores"""
+
+    def __init__(self, ruta: Path, columnas: Sequence[Tuple[str, str]]):
+        self.nombres = [nombre for nombre, _ in columnas]
+        self.tipos = [tipo for _, tipo in columnas]
+        self.descartados = 0
+        self._archivo = open(ruta, "w", encoding="utf-8")
+
+    def escribir(self, filas: Sequence[Sequence]):
+        columnas, descartados = coercer_columnas(filas, self.tipos)
+        self.descartados += descartados
+        self._archivo.writelines(
+            json.dumps(dict(zip(self.nombres, fila)), ensure_ascii=False, default=str) + "\n"
+            for fila in zip(*columnas)
+        )
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class EscritorParquet:
+    """
+    Un row group por lote, con el esquema fijado de antemano. Los valores que
+    no entran en el tipo declarado de la columna se escriben como nulos y se
+    cuentan en ``descartados``.
+    """
+
+    ARROW = {"entero": "int64", "real": "float64", "texto": "string", "binario": "binary"}
+
+    def __init__(self, ruta: Path, columnas: Sequence[Tuple[str, str]]):
+        self.nombres = [nombre for nombre, _ in columnas]
+        self.tipos = [tipo for _, tipo in columnas]
+        self.descartados = 0
+        self._esquema = pa.schema([
+            (nombre, getattr(pa, self.ARROW[tipo])()) for nombre, tipo in columnas
+        ])
+        self._escritor = pq.ParquetWriter(str(ruta), self._esquema, compression="zstd")
+
+    def escribir(self, filas: Sequence[Sequence]):
+        columnas, descartados = coercer_columnas(filas, self.tipos)
+        self.descartados += descartados
+        arrays = [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, self._esquema)]
+        self._escritor.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._esquema))
+
+    def cerrar(self):
+        self._escritor.close()
+
+
+def abrir_escritor(ruta: Path, columnas: Sequence[Tuple[str, str]], formato: str):
+    if formato == "parquet":
+        return EscritorParquet(ruta, columnas)
+    return EscritorJSONL(ruta, columnas)
+
+
+def escribir_lotes(lotes: Iterable[Sequence[Sequence]], columnas: Sequence[Tuple[str, str]],
+                   ruta: Path, formato: str) -> Tuple[int, int]:
+    """
+    Escribe ``lotes`` en ``ruta`` de forma atómica. ``columnas`` son pares
+    (nombre, tipo). Devuelve (filas, valores descartados por tipo).
+    """
+    temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    escritor = abrir_escritor(temporal, columnas, formato)
+    filas = 0
+    try:
+        for lote in lotes:
+            if lote:
+                escritor.escribir(lote)
+                filas += len(lote)
+        escritor.cerrar()
+    except BaseException:
+        escritor.cerrar()
+        temporal.unlink(missing_ok=True)
+        raise
+    os.replace(temporal, ruta)
+    return filas, escritor.descartados
+
+
+# ============================================================
+# ORÍGENES
+# ============================================================
+def _columnas_tabla(db_path: Path, tabla: str) -> Dict[str, str]:
+    """{columna: tipo} en el orden de la tabla; vacío si la tabla no existe"""
+    return {fila[1]: tipo_afinidad(fila[2])
+            for fila in obtener_pool(db_path).consultar(f"PRAGMA table_info({tabla})")}
+
+
+def _lotes_consulta(db_path: Path, sql: str, parametros: Sequence = (),
+                    tamano_lote: int = TAMANO_LOTE) -> Iterator[List[tuple]]:
+    # Cursor propio (no el del hilo): el generador puede quedar a medias
+    cursor = obtener_pool(db_path).lector().cursor()
+    try:
+        cursor.execute(sql, parametros)
+        while True:
+            lote = cursor.fetchmany(tamano_lote)
+            if not lote:
+                break
+            yield lote
+    finally:
+        cursor.close()
+
+
+def _lotes_similitudes(db_path: Path, tamano_lote: int) -> Iterator[List[tuple]]:
+    """
+    Coseno entre todos los vectores cognitivos, en bloques de filas: la
+    memoria es bloque x autores, no autores x autores. El triángulo superior
+    de cada bloque se extrae con índices de NumPy, sin recorrerlo en Python.
+    """
+    autores, vectores = [], []
+    for lote in _lotes_consulta(db_path, """
+        SELECT autor, vector_cognitivo FROM perfiles_integrados_v2
+        WHERE vector_cognitivo IS NOT NULL ORDER BY autor""", (), tamano_lote):
+        for autor, vector_json in lote:
+            try:
+                vector = json.loads(vector_json)
+            except (TypeError, json.JSONDecodeError):
+                continue
+            if vector and (not vectores or len(vector) == len(vectores[0])):
+                autores.append(autor)
+                vectores.append(vector)
+    if not vectores:
+        return
+
+    matriz = np.asarray(vectores, dtype=np.float32)
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    matriz /= np.where(normas == 0, 1.0, normas)
+
+    nombres = np.asarray(autores, dtype=object)
+    columnas = np.arange(len(autores))
+    for inicio in range(0, len(autores), TAMANO_BLOQUE_SIMILITUD):
+        bloque = matriz[inicio:inicio + TAMANO_BLOQUE_SIMILITUD] @ matriz.T
+        # Sólo el triángulo superior (b > a): la matriz es simétrica
+        filas_a, filas_b = np.nonzero(columnas[None, :] > (inicio + np.arange(len(bloque)))[:, None])
+        similitudes = np.round(bloque[filas_a, filas_b].astype(np.float64), 6)
+        filas_a += inicio
+        for desde in range(0, len(similitudes), tamano_lote):
+            hasta = desde + tamano_lote
+            yield list(zip(nombres[filas_a[desde:hasta]].tolist(),
+                           nombres[filas_b[desde:hasta]].tolist(),
+                           similitudes[desde:hasta].tolist()))
+
+
+# ============================================================
+# EXPORTACIÓN
+# ============================================================
+def exportar_dataset(nombre: str, destino: Path = SNAPSHOTS_DIR, formato: str = "parquet",
+                     columnas: Optional[Sequence[str]] = None, tamano_lote: int = TAMANO_LOTE,
+                     db_path: Optional[Path] = None) -> Optional[Dict]:
+    """
+    Exporta un dataset de DATASETS. Devuelve su entrada de manifiesto, o None
+    si la base o la tabla no existen.
+    """
+    base, tabla = DATASETS[nombre]
+    base = Path(db_path or base)
+    if formato == "parquet" and not PYARROW_DISPONIBLE:
+        print("⚠️ pyarrow no disponible: se exporta JSONL")
+        formato = "jsonl"
+    if not base.exists():
+        print(f"⚠️ {nombre}: no existe {base}")
+        return None
+    disponibles = _columnas_tabla(base, tabla)
+    if not disponibles:
+        print(f"⚠️ {nombre}: no existe la tabla {tabla} en {base.name}")
+        return None
+
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    ruta = destino / f"{nombre}{EXTENSIONES[formato]}"
+
+    if nombre == "similitudes":
+        seleccion = [("autor_a", "texto"), ("autor_b", "texto"), ("similitud", "real")]
+        lotes = _lotes_similitudes(base, tamano_lote)
+    else:
+        nombres = list(columnas) if columnas else list(disponibles)
+        faltantes = [c for c in nombres if c not in disponibles]
+        if faltantes:
+            raise ValueError(f"{nombre}: columnas inexistentes en {tabla}: {', '.join(faltantes)}")
+        seleccion = [(c, disponibles[c]) for c in nombres]
+        lista = ", ".join(f'"{c}"' for c in nombres)
+        lotes = _lotes_consulta(base, f"SELECT {lista} FROM {tabla}", (), tamano_lote)
+
+    filas, descartados = escribir_lotes(lotes, seleccion, ruta, formato)
+    print(f"   🧊 {nombre:22} {filas:>9} filas  {len(seleccion):>3} columnas  → {ruta.name}")
+    if descartados:
+        print(f"   ⚠️ {descartados} valores no respetaban el tipo de su columna y quedaron nulos")
+    return {
+        "archivo": ruta.name,
+        "formato": formato,
+        "filas": filas,
+        "columnas": {c: tipo for c, tipo in seleccion},
+        "origen": f"{base.name}:{tabla}",
+        "origen_modificado": datetime.fromtimestamp(base.stat().st_mtime).isoformat(timespec="seconds"),
+    }
+
+
+def exportar(nombres: Optional[Sequence[str]] = None, destino: Path = SNAPSHOTS_DIR,
+             formato: str = "parquet", columnas: Optional[Sequence[str]] = None,
+             tamano_lote: int = TAMANO_LOTE) -> Dict:
+    """Exporta varios datasets y actualiza el manifiesto del directorio"""
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    ruta_manifiesto = destino / MANIFIESTO
+    manifiesto = {"datasets": {}}
+    if ruta_manifiesto.exists():
+        try:
+            manifiesto = json.loads(ruta_manifiesto.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            pass
+
+    print(f"🧊 Exportando a {destino}")
+    for nombre in nombres or list(DATASETS):
+        entrada = exportar_dataset(nombre, destino, formato, columnas, tamano_lote)
+        if entrada:
+            manifiesto["datasets"][nombre] = entrada
+    manifiesto["generado"] = datetime.now().isoformat(timespec="seconds")
+
+    temporal = ruta_manifiesto.with_name(f".{MANIFIESTO}.tmp")
+    temporal.write_text(json.dumps(manifiesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temporal, ruta_manifiesto)
+    return manifiesto
+
+
+# ============================================================
+# LECTURA
+# ============================================================
+def leer_snapshot(ruta, columnas: Optional[Sequence[str]] = None,
+                  tamano_lote: int = TAMANO_LOTE) -> Iterator[List[Dict]]:
+    """
+    Lotes de filas (dicts) de un snapshot. En Parquet sólo se leen del disco
+    las columnas pedidas.
+    """
+    ruta = Path(ruta)
+    if ruta.suffix == ".parquet":
+        if not PYARROW_DISPONIBLE:
+            raise ImportError("pyarrow es necesario para leer snapshots Parquet")
+        archivo = pq.ParquetFile(str(ruta))
+        for lote in archivo.iter_batches(batch_size=tamano_lote, columns=list(columnas) if columnas else None):
+            yield lote.to_pylist()
+        return
+
+    lote = []
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            fila = json.loads(linea)
+            lote.append({c: fila.get(c) for c in columnas} if columnas else fila)
+            if len(lote) >= tamano_lote:
+                yield lote
+                lote = []
+    if lote:
+        yield lote
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshots columnar de las bases para analítica offline")
+    parser.add_argument("datasets", nargs="*",
+                        help=f"Datasets a exportar (default: todos): {', '.join(DATASETS)}")
+    parser.add_argument("--formato", choices=list(EXTENSIONES), default="parquet")
+    parser.add_argument("--salida", default=str(SNAPSHOTS_DIR))
+    parser.add_argument("--columnas", help="Columnas separadas por coma (un solo dataset)")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por lote / row group")
+    args = parser.parse_args()
+
+    desconocidos = [d for d in args.datasets if d not in DATASETS]
+    if desconocidos:
+        parser.error(f"datasets desconocidos: {', '.join(desconocidos)}")
+    columnas = [c.strip() for c in args.columnas.split(",") if c.strip()] if args.columnas else None
+    if columnas and len(args.datasets) != 1:
+        parser.error("--columnas requiere exactamente un dataset")
+
+    manifiesto = exportar(args.datasets or None, Path(args.salida), args.formato, columnas, args.lote)
+    print(f"✅ {len(manifiesto['datasets'])} datasets en {Path(args.salida) / MANIFIESTO}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
 import json
 
+from instrumentacion import instrumentar
+
 @dataclass
 class CitaJurisprudencial:
     """Representa una cita jurisprudencial"""
@@ -36,9 +38,7 @@ class CitaJurisprudencial:
     confianza: float  # 0-1
 
 @dataclass
-class CitaDoctri
-
-nal:
+class CitaDoctrial:
     """Representa una cita doctrinal"""
     autor: str
     obra: Optional[str]
@@ -278,6 +278,7 @@ class ExtractorCitasJurisprudenciales:
 
         return citas
 
+    @instrumentar("extractor_citas")
     def extraer_todas_citas(self, texto: str) -> Dict[str, List]:
         """
         Extrae todas las citas de un texto
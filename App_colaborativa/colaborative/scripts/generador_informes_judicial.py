@@ -14,18 +14,31 @@ Tipos de informes:
 
 Formatos: TXT, JSON, Markdown
 
+Modo masivo (generar_informes_lote / --todos): cada sección se precarga
+para todos los jueces con una consulta por bloque, los informes se
+renderizan en un pool de procesos y se omiten los jueces cuyos datos no
+cambiaron desde su último informe (huella en manifiesto_informes.json).
+
+USO:
+    python generador_informes_judicial.py "Juez X" --formato md
+    python generador_informes_judicial.py --todos --procesos 4 [--forzar]
+
 AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
-import sqlite3
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 import pickle
 
+from pool_sqlite import obtener_pool
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -37,6 +50,74 @@ INFORMES_DIR = BASE_DIR / "informes_generados"
 # Crear directorio de informes
 INFORMES_DIR.mkdir(parents=True, exist_ok=True)
 
+SEPARADOR = "=" * 80
+SUBRAYADO = "-" * 80
+
+# Jueces por consulta IN (...) en el modo masivo (límite de variables de SQLite)
+TAMANO_BLOQUE_IN = 500
+
+# Huella de datos del último informe de cada juez/formato (modo masivo)
+MANIFIESTO_INFORMES = INFORMES_DIR / "manifiesto_informes.json"
+
+SQL_SENTENCIAS = """
+SELECT
+    juez,
+    sentencia_id,
+    expediente,
+    caratula,
+    fecha_sentencia,
+    fuero,
+    tribunal,
+    materia,
+    resultado,
+    actor,
+    demandado
+FROM sentencias_por_juez_arg
+WHERE juez IN ({marcas})
+ORDER BY juez, fecha_sentencia DESC
+"""
+
+SQL_LINEAS = """
+SELECT
+    juez,
+    tema,
+    cantidad_sentencias,
+    consistencia_score,
+    criterio_dominante,
+    casos_tipo,
+    excepciones_identificadas,
+    confianza_linea
+FROM lineas_jurisprudenciales
+WHERE juez IN ({marcas})
+ORDER BY juez, cantidad_sentencias DESC
+"""
+
+SQL_RED = """
+SELECT
+    juez_origen,
+    juez_destino,
+    tipo_destino,
+    tipo_influencia,
+    intensidad,
+    cantidad_citas
+FROM redes_influencia_judicial
+WHERE juez_origen IN ({marcas})
+ORDER BY juez_origen, cantidad_citas DESC
+"""
+
+# Los 15 factores de mayor peso de cada juez
+SQL_FACTORES = """
+SELECT juez, factor, peso, confianza
+FROM (
+    SELECT juez, factor, peso, confianza,
+           ROW_NUMBER() OVER (PARTITION BY juez ORDER BY peso DESC) AS orden
+    FROM factores_predictivos
+    WHERE juez IN ({marcas})
+)
+WHERE orden <= 15
+ORDER BY juez, orden
+"""
+
 # Colores
 class Colors:
     OKGREEN = '\033[92m'
@@ -59,6 +140,369 @@ def print_info(text):
     print(f"{Colors.OKBLUE}ℹ {text}{Colors.ENDC}")
 
 
+# =============================================================================
+# RENDERIZADO (funciones de módulo: se usan también desde el pool de procesos)
+# =============================================================================
+
+def _interpretar_activismo(score: float) -> str:
+    """Interpreta el score de activismo"""
+    if score > 0.6:
+        return "Juez marcadamente activista. Interviene activamente en cuestiones de constitucionalidad y políticas públicas."
+    elif score > 0.3:
+        return "Juez moderadamente activista. Ocasionalmente ejerce control de constitucionalidad y expansión de derechos."
+    elif score > -0.3:
+        return "Juez equilibrado. Balance entre activismo y restricción judicial."
+    elif score > -0.6:
+        return "Juez moderadamente restrictivo. Tiende a la deferencia con otros poderes."
+    else:
+        return "Juez muy restrictivo. Alta deferencia con poderes políticos, interpretación estricta."
+
+
+def _interpretar_formalismo(score: float) -> str:
+    """Interpreta el score de formalismo"""
+    if score > 0.6:
+        return "Alto formalismo. Enfoque muy procedimentalista, énfasis en requisitos formales."
+    elif score > 0.3:
+        return "Formalismo moderado. Balance entre forma y sustancia."
+    else:
+        return "Bajo formalismo. Prioriza sustancia sobre forma, flexibilidad procesal."
+
+
+def _explicar_interpretacion(tipo: str) -> str:
+    """Explica el tipo de interpretación"""
+    explicaciones = {
+        'literal': "Interpretación apegada al texto de la norma, significado ordinario de las palabras.",
+        'sistematica': "Interpretación considerando el sistema jurídico completo, coherencia normativa.",
+        'teleologica': "Interpretación orientada a los fines y objetivos de la norma.",
+        'historica': "Interpretación considerando el contexto histórico y evolución normativa.",
+        'mixta': "Combinación de varios métodos interpretativos según el caso."
+    }
+    return explicaciones.get(tipo, "No disponible")
+
+
+def renderizar_txt(juez: str, perfil: Dict, sentencias: List[Dict], lineas: List[Dict], red: Dict,
+                   factores: List[Dict], modelo: Optional[Dict], fecha: datetime) -> str:
+    """Renderiza el informe completo en formato TXT"""
+    lineas_txt = []
+
+    # Encabezado
+    lineas_txt.append(SEPARADOR)
+    lineas_txt.append(f"INFORME COMPLETO DEL JUEZ: {juez}".center(80))
+    lineas_txt.append(SEPARADOR)
+    lineas_txt.append(f"Fecha: {fecha.strftime('%d/%m/%Y %H:%M')}")
+    lineas_txt.append(f"Sistema: Análisis de Pensamiento Judicial Argentina v1.0")
+    lineas_txt.append(SEPARADOR)
+    lineas_txt.append("")
+
+    # SECCIÓN 1: INFORMACIÓN BÁSICA
+    lineas_txt.append("1. INFORMACIÓN BÁSICA")
+    lineas_txt.append(SUBRAYADO)
+    lineas_txt.append(f"Nombre: {juez}")
+    lineas_txt.append(f"Tipo: {perfil.get('tipo_entidad', 'N/D')}")
+    lineas_txt.append(f"Fuero: {perfil.get('fuero', 'N/D')}")
+    lineas_txt.append(f"Jurisdicción: {perfil.get('jurisdiccion', 'N/D')}")
+    lineas_txt.append(f"Tribunal: {perfil.get('tribunal', 'N/D')}")
+    lineas_txt.append(f"Sentencias analizadas: {perfil.get('total_sentencias', 0)}")
+    lineas_txt.append(f"Confianza del análisis: {perfil.get('confianza_analisis', 0):.2f}")
+    lineas_txt.append("")
+
+    # SECCIÓN 2: PERFIL JUDICIAL
+    lineas_txt.append("2. PERFIL JUDICIAL")
+    lineas_txt.append(SUBRAYADO)
+
+    activismo = perfil.get('tendencia_activismo', 0)
+    lineas_txt.append(f"\n2.1 ACTIVISMO JUDICIAL: {activismo:.2f}")
+    lineas_txt.append(_interpretar_activismo(activismo))
+
+    formalism = perfil.get('nivel_formalismo', 0)
+    lineas_txt.append(f"\n2.2 FORMALISMO: {formalism:.2f}")
+    lineas_txt.append(_interpretar_formalismo(formalism))
+
+    # Interpretación dominante
+    interpretacion = perfil.get('interpretacion_dominante', 'N/D')
+    lineas_txt.append(f"\n2.3 INTERPRETACIÓN DOMINANTE: {interpretacion}")
+    lineas_txt.append(_explicar_interpretacion(interpretacion))
+
+    # Estándar probatorio
+    estandar = perfil.get('estandar_probatorio_dominante', 'N/D')
+    lineas_txt.append(f"\n2.4 ESTÁNDAR PROBATORIO: {estandar}")
+    lineas_txt.append("")
+
+    # SECCIÓN 3: PROTECCIÓN DE DERECHOS
+    lineas_txt.append("3. PROTECCIÓN DE DERECHOS")
+    lineas_txt.append(SUBRAYADO)
+    lineas_txt.append(f"Trabajo: {perfil.get('proteccion_trabajo', 0):.2f}")
+    lineas_txt.append(f"Igualdad: {perfil.get('proteccion_igualdad', 0):.2f}")
+    lineas_txt.append(f"Libertad expresión: {perfil.get('proteccion_libertad_expresion', 0):.2f}")
+    lineas_txt.append(f"Privacidad: {perfil.get('proteccion_privacidad', 0):.2f}")
+    lineas_txt.append(f"Propiedad: {perfil.get('proteccion_propiedad', 0):.2f}")
+    lineas_txt.append(f"Consumidor: {perfil.get('proteccion_consumidor', 0):.2f}")
+    lineas_txt.append("")
+
+    # SECCIÓN 4: TESTS Y DOCTRINAS
+    lineas_txt.append("4. TESTS Y DOCTRINAS APLICADOS")
+    lineas_txt.append(SUBRAYADO)
+    tests_aplicados = []
+    if perfil.get('usa_test_proporcionalidad', 0) > 0.3:
+        tests_aplicados.append(f"✓ Test de proporcionalidad (frecuencia: {perfil.get('usa_test_proporcionalidad', 0):.2f})")
+    if perfil.get('usa_test_razonabilidad', 0) > 0.3:
+        tests_aplicados.append(f"✓ Test de razonabilidad (frecuencia: {perfil.get('usa_test_razonabilidad', 0):.2f})")
+    if perfil.get('usa_in_dubio_pro_operario', 0) > 0.3:
+        tests_aplicados.append(f"✓ In dubio pro operario (frecuencia: {perfil.get('usa_in_dubio_pro_operario', 0):.2f})")
+    if perfil.get('usa_in_dubio_pro_consumidor', 0) > 0.3:
+        tests_aplicados.append(f"✓ In dubio pro consumidor (frecuencia: {perfil.get('usa_in_dubio_pro_consumidor', 0):.2f})")
+
+    if tests_aplicados:
+        lineas_txt.extend(tests_aplicados)
+    else:
+        lineas_txt.append("No se identificaron tests o doctrinas recurrentes.")
+    lineas_txt.append("")
+
+    # SECCIÓN 5: SESGOS ARGENTINOS
+    lineas_txt.append("5. SESGOS Y TENDENCIAS")
+    lineas_txt.append(SUBRAYADO)
+    lineas_txt.append(f"Pro-trabajador: {perfil.get('sesgo_pro_trabajador', 0):.2f}")
+    lineas_txt.append(f"Pro-empresa: {perfil.get('sesgo_pro_empresa', 0):.2f}")
+    lineas_txt.append(f"Garantista: {perfil.get('sesgo_garantista', 0):.2f}")
+    lineas_txt.append(f"Punitivista: {perfil.get('sesgo_punitivista', 0):.2f}")
+    lineas_txt.append(f"Pro-consumidor: {perfil.get('sesgo_pro_consumidor', 0):.2f}")
+    lineas_txt.append("")
+
+    # SECCIÓN 6: LÍNEAS JURISPRUDENCIALES
+    lineas_txt.append("6. LÍNEAS JURISPRUDENCIALES")
+    lineas_txt.append(SUBRAYADO)
+    if lineas:
+        for i, linea in enumerate(lineas, 1):
+            lineas_txt.append(f"\n6.{i} {linea['tema'].upper()}")
+            lineas_txt.append(f"   Sentencias: {linea['cantidad']}")
+            lineas_txt.append(f"   Consistencia: {linea['consistencia']:.2f}")
+            lineas_txt.append(f"   Confianza: {linea['confianza']:.2f}")
+            lineas_txt.append(f"   Criterio: {linea['criterio']}")
+
+            if linea['casos_paradigmaticos']:
+                lineas_txt.append(f"   Casos paradigmáticos: {', '.join(linea['casos_paradigmaticos'][:3])}")
+
+            if linea['excepciones']:
+                lineas_txt.append(f"   Excepciones: {len(linea['excepciones'])} casos")
+    else:
+        lineas_txt.append("No hay suficientes sentencias para identificar líneas consolidadas.")
+    lineas_txt.append("")
+
+    # SECCIÓN 7: RED DE INFLUENCIAS
+    lineas_txt.append("7. RED DE INFLUENCIAS")
+    lineas_txt.append(SUBRAYADO)
+
+    lineas_txt.append("\n7.1 CSJN")
+    if red['csjn']:
+        for cita in red['csjn'][:5]:
+            lineas_txt.append(f"   • {cita['citas']} citas (intensidad: {cita['intensidad']:.2f})")
+    else:
+        lineas_txt.append("   No se detectaron citas a CSJN")
+
+    lineas_txt.append("\n7.2 TRIBUNALES SUPERIORES")
+    if red['tribunales']:
+        for trib in red['tribunales'][:5]:
+            lineas_txt.append(f"   • {trib['destino']}: {trib['citas']} citas (intensidad: {trib['intensidad']:.2f})")
+    else:
+        lineas_txt.append("   No se detectaron citas a tribunales")
+
+    lineas_txt.append("\n7.3 AUTORES DOCTRINALES")
+    if red['autores']:
+        for autor in red['autores'][:10]:
+            lineas_txt.append(f"   • {autor['destino']}: {autor['citas']} citas (intensidad: {autor['intensidad']:.2f})")
+    else:
+        lineas_txt.append("   No se detectaron citas doctrinales")
+    lineas_txt.append("")
+
+    # SECCIÓN 8: ANÁLISIS PREDICTIVO
+    lineas_txt.append("8. ANÁLISIS PREDICTIVO")
+    lineas_txt.append(SUBRAYADO)
+
+    if modelo:
+        lineas_txt.append(f"Modelo disponible: SÍ")
+        lineas_txt.append(f"Accuracy: {modelo.get('accuracy', 0):.2%}")
+        lineas_txt.append(f"Sentencias de entrenamiento: {modelo.get('n_sentencias', 0)}")
+        lineas_txt.append(f"Clases predichas: {', '.join(modelo.get('clases', []))}")
+        lineas_txt.append(f"\nFactores más importantes:")
+
+        if factores:
+            for i, factor in enumerate(factores[:10], 1):
+                lineas_txt.append(f"   {i}. {factor['factor']}: {factor['peso']:.3f} (confianza: {factor['confianza']:.2f})")
+    else:
+        lineas_txt.append("Modelo predictivo no disponible.")
+        lineas_txt.append("Razones posibles:")
+        lineas_txt.append("  • Insuficientes sentencias (<5)")
+        lineas_txt.append("  • Modelo no entrenado aún")
+    lineas_txt.append("")
+
+    # SECCIÓN 9: SENTENCIAS ANALIZADAS
+    lineas_txt.append("9. SENTENCIAS ANALIZADAS")
+    lineas_txt.append(SUBRAYADO)
+    lineas_txt.append(f"Total: {len(sentencias)}")
+    lineas_txt.append("\nÚltimas 10 sentencias:")
+    for i, sent in enumerate(sentencias[:10], 1):
+        lineas_txt.append(f"\n{i}. {sent['caratula'] or sent['sentencia_id']}")
+        lineas_txt.append(f"   Expediente: {sent['expediente'] or 'N/D'}")
+        lineas_txt.append(f"   Fecha: {sent['fecha'] or 'N/D'}")
+        lineas_txt.append(f"   Materia: {sent['materia'] or 'N/D'}")
+        lineas_txt.append(f"   Resultado: {sent['resultado'] or 'N/D'}")
+    lineas_txt.append("")
+
+    # Pie de página
+    lineas_txt.append(SEPARADOR)
+    lineas_txt.append("FIN DEL INFORME")
+    lineas_txt.append(SEPARADOR)
+
+    return '\n'.join(lineas_txt)
+
+
+def renderizar_json(juez: str, perfil: Dict, sentencias: List[Dict], lineas: List[Dict], red: Dict,
+                    factores: List[Dict], modelo: Optional[Dict], fecha: datetime) -> str:
+    """Renderiza el informe completo en formato JSON"""
+    data = {
+        'juez': juez,
+        'fecha_generacion': fecha.isoformat(),
+        'perfil': perfil,
+        'sentencias': sentencias,
+        'lineas_jurisprudenciales': lineas,
+        'red_influencias': red,
+        'factores_predictivos': factores,
+        'modelo_predictivo': {
+            'disponible': modelo is not None,
+            'accuracy': modelo.get('accuracy') if modelo else None,
+            'n_sentencias': modelo.get('n_sentencias') if modelo else None,
+            'clases': modelo.get('clases') if modelo else None
+        }
+    }
+
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def renderizar_md(juez: str, perfil: Dict, sentencias: List[Dict], lineas: List[Dict], red: Dict,
+                  factores: List[Dict], modelo: Optional[Dict], fecha: datetime) -> str:
+    """Renderiza el informe completo en formato Markdown"""
+    md = []
+
+    md.append(f"# Informe Completo del Juez: {juez}\n")
+    md.append(f"**Fecha**: {fecha.strftime('%d/%m/%Y %H:%M')}\n")
+    md.append(f"**Sistema**: Análisis de Pensamiento Judicial Argentina v1.0\n")
+    md.append("---\n")
+
+    # Información básica
+    md.append("## 1. Información Básica\n")
+    md.append(f"- **Nombre**: {juez}")
+    md.append(f"- **Tipo**: {perfil.get('tipo_entidad', 'N/D')}")
+    md.append(f"- **Fuero**: {perfil.get('fuero', 'N/D')}")
+    md.append(f"- **Jurisdicción**: {perfil.get('jurisdiccion', 'N/D')}")
+    md.append(f"- **Sentencias analizadas**: {perfil.get('total_sentencias', 0)}\n")
+
+    # Perfil judicial
+    md.append("## 2. Perfil Judicial\n")
+    md.append(f"### 2.1 Activismo: {perfil.get('tendencia_activismo', 0):.2f}\n")
+    md.append(f"{_interpretar_activismo(perfil.get('tendencia_activismo', 0))}\n")
+
+    # Líneas jurisprudenciales
+    md.append("## 6. Líneas Jurisprudenciales\n")
+    if lineas:
+        for linea in lineas:
+            md.append(f"### {linea['tema'].title()}\n")
+            md.append(f"- **Sentencias**: {linea['cantidad']}")
+            md.append(f"- **Consistencia**: {linea['consistencia']:.2f}")
+            md.append(f"- **Criterio**: {linea['criterio']}\n")
+
+    # Red de influencias
+    md.append("## 7. Red de Influencias\n")
+    if red['autores']:
+        md.append("### Autores más citados\n")
+        for autor in red['autores'][:10]:
+            md.append(f"- **{autor['destino']}**: {autor['citas']} citas")
+
+    return '\n'.join(md)
+
+
+# =============================================================================
+# MODELOS, HUELLAS Y GUARDADO
+# =============================================================================
+
+def ruta_modelo_predictivo(juez: str) -> Path:
+    """Archivo del modelo predictivo del juez (puede no existir)"""
+    nombre_archivo = juez.replace(" ", "_").replace(".", "_")
+    return MODELOS_DIR / f"modelo_{nombre_archivo}.pkl"
+
+
+def cargar_modelo(ruta: Path) -> Optional[Dict]:
+    if not ruta.exists():
+        return None
+    try:
+        with open(ruta, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def huella_datos(datos: Dict) -> str:
+    """
+    Huella de todo lo que entra en el informe de un juez: las secciones
+    precargadas y el archivo del modelo (mtime y tamaño).
+    """
+    secciones = {clave: valor for clave, valor in datos.items() if clave != 'ruta_modelo'}
+    h = hashlib.sha256(json.dumps(secciones, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    ruta_modelo = Path(datos['ruta_modelo'])
+    if ruta_modelo.exists():
+        estado = ruta_modelo.stat()
+        h.update(f"|{estado.st_mtime_ns}|{estado.st_size}".encode('utf-8'))
+    return h.hexdigest()
+
+
+def leer_manifiesto() -> Dict[str, Dict]:
+    if not MANIFIESTO_INFORMES.exists():
+        return {}
+    try:
+        with open(MANIFIESTO_INFORMES, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_manifiesto(manifiesto: Dict[str, Dict]):
+    # Escritura atómica: un corte a mitad de camino no deja el manifiesto roto
+    temporal = MANIFIESTO_INFORMES.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, MANIFIESTO_INFORMES)
+
+
+RENDERIZADORES = {
+    'txt': renderizar_txt,
+    'json': renderizar_json,
+    'md': renderizar_md,
+}
+
+
+def guardar_informe(juez: str, formato: str, contenido: str, directorio: Optional[Path] = None) -> Path:
+    # INFORMES_DIR se resuelve al llamar: se puede redirigir después de importar
+    directorio = INFORMES_DIR if directorio is None else directorio
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    nombre_archivo = f"informe_completo_{juez.replace(' ', '_')}_{timestamp}.{formato}"
+    ruta_archivo = Path(directorio) / nombre_archivo
+    with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    return ruta_archivo
+
+
+def generar_en_proceso(tarea: Tuple) -> str:
+    """
+    Renderiza y guarda un informe a partir de datos ya precargados. Es una
+    función de módulo para poder ejecutarse en un ProcessPoolExecutor: el
+    modelo se carga acá, no viaja serializado desde el proceso principal.
+    """
+    juez, formato, datos, directorio = tarea
+    renderizar = RENDERIZADORES.get(formato, renderizar_txt)
+    contenido = renderizar(juez, datos['perfil'], datos['sentencias'], datos['lineas'], datos['red'],
+                           datos['factores'], cargar_modelo(Path(datos['ruta_modelo'])), datetime.now())
+    return str(guardar_informe(juez, formato, contenido, directorio))
+
+
 class GeneradorInformesJudicial:
     """
     Genera informes escritos sobre jueces argentinos
@@ -67,188 +511,152 @@ class GeneradorInformesJudicial:
     def __init__(self, db_path: Path = DB_FILE):
         """Inicializa el generador"""
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pool = None
         self.conectar_bd()
 
     def conectar_bd(self):
-        """Conecta a la BD"""
+        """Conecta a la BD (pool compartido, seguro entre hilos)"""
         if not self.db_path.exists():
             raise FileNotFoundError(f"BD no encontrada: {self.db_path}")
 
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        self.pool = obtener_pool(self.db_path)
+
+    @property
+    def cursor(self):
+        """Cursor de lectura del hilo actual (pool compartido entre requests)"""
+        return self.pool.cursor()
 
     def cerrar_bd(self):
-        """Cierra la conexión"""
-        if self.conn:
-            self.conn.close()
+        """Devuelve la conexión del hilo al pool"""
+        if self.pool:
+            self.pool.liberar()
 
     # =========================================================================
     # OBTENCIÓN DE DATOS
     # =========================================================================
+    # Cada sección se lee para un conjunto de jueces con una consulta
+    # (IN por bloques); las variantes de un solo juez usan las mismas.
+
+    def _por_bloques(self, sql: str, jueces: List[str]) -> List[tuple]:
+        """Ejecuta ``sql`` (con {marcas} en el IN) por bloques de jueces"""
+        filas = []
+        for i in range(0, len(jueces), TAMANO_BLOQUE_IN):
+            bloque = jueces[i:i + TAMANO_BLOQUE_IN]
+            filas.extend(self.pool.consultar(sql.format(marcas=','.join('?' * len(bloque))), bloque))
+        return filas
+
+    def precargar_perfiles(self, jueces: List[str]) -> Dict[str, Dict]:
+        perfiles = {}
+        for i in range(0, len(jueces), TAMANO_BLOQUE_IN):
+            bloque = jueces[i:i + TAMANO_BLOQUE_IN]
+            for perfil in self.pool.consultar_dicts(
+                f"SELECT * FROM perfiles_judiciales_argentinos WHERE juez IN ({','.join('?' * len(bloque))})",
+                bloque
+            ):
+                perfiles[perfil['juez']] = perfil
+        return perfiles
+
+    def precargar_sentencias(self, jueces: List[str]) -> Dict[str, List[Dict]]:
+        sentencias = {juez: [] for juez in jueces}
+        for row in self._por_bloques(SQL_SENTENCIAS, jueces):
+            sentencias[row[0]].append({
+                'sentencia_id': row[1],
+                'expediente': row[2],
+                'caratula': row[3],
+                'fecha': row[4],
+                'fuero': row[5],
+                'tribunal': row[6],
+                'materia': row[7],
+                'resultado': row[8],
+                'actor': row[9],
+                'demandado': row[10]
+            })
+        return sentencias
 
-    def obtener_perfil_juez(self, juez: str) -> Optional[Dict]:
-        """Obtiene el perfil completo del juez"""
-        self.cursor.execute("""
-        SELECT *
-        FROM perfiles_judiciales_argentinos
-        WHERE juez = ?
-        """, (juez,))
+    def precargar_lineas(self, jueces: List[str]) -> Dict[str, List[Dict]]:
+        lineas = {juez: [] for juez in jueces}
+        for row in self._por_bloques(SQL_LINEAS, jueces):
+            lineas[row[0]].append({
+                'tema': row[1],
+                'cantidad': row[2],
+                'consistencia': row[3],
+                'criterio': row[4],
+                'casos_paradigmaticos': json.loads(row[5]) if row[5] else [],
+                'excepciones': json.loads(row[6]) if row[6] else [],
+                'confianza': row[7]
+            })
+        return lineas
 
-        row = self.cursor.fetchone()
-        if not row:
-            return None
+    def precargar_redes(self, jueces: List[str]) -> Dict[str, Dict]:
+        redes = {juez: {'csjn': [], 'tribunales': [], 'autores': []} for juez in jueces}
+        secciones = {'csjn': 'csjn', 'tribunal_superior': 'tribunales', 'autor_doctrinal': 'autores'}
+        for row in self._por_bloques(SQL_RED, jueces):
+            seccion = secciones.get(row[2])
+            if seccion:
+                redes[row[0]][seccion].append({
+                    'destino': row[1],
+                    'tipo': row[2],
+                    'intensidad': row[4],
+                    'citas': row[5]
+                })
+        return redes
+
+    def precargar_factores(self, jueces: List[str]) -> Dict[str, List[Dict]]:
+        factores = {juez: [] for juez in jueces}
+        for row in self._por_bloques(SQL_FACTORES, jueces):
+            factores[row[0]].append({
+                'factor': row[1],
+                'peso': row[2],
+                'confianza': row[3]
+            })
+        return factores
 
-        # Obtener nombres de columnas
-        columnas = [desc[0] for desc in self.cursor.description]
-        perfil = dict(zip(columnas, row))
+    def precargar(self, jueces: List[str]) -> Dict[str, Dict]:
+        """
+        Datos de todos los ``jueces`` con perfil: una consulta por sección.
+        El modelo predictivo queda como ruta (se carga al renderizar).
+        """
+        perfiles = self.precargar_perfiles(jueces)
+        con_perfil = [juez for juez in jueces if juez in perfiles]
+        sentencias = self.precargar_sentencias(con_perfil)
+        lineas = self.precargar_lineas(con_perfil)
+        redes = self.precargar_redes(con_perfil)
+        factores = self.precargar_factores(con_perfil)
+        return {
+            juez: {
+                'perfil': perfiles[juez],
+                'sentencias': sentencias[juez],
+                'lineas': lineas[juez],
+                'red': redes[juez],
+                'factores': factores[juez],
+                'ruta_modelo': ruta_modelo_predictivo(juez)
+            }
+            for juez in con_perfil
+        }
 
-        return perfil
+    def obtener_perfil_juez(self, juez: str) -> Optional[Dict]:
+        """Obtiene el perfil completo del juez"""
+        return self.precargar_perfiles([juez]).get(juez)
 
     def obtener_sentencias_juez(self, juez: str) -> List[Dict]:
         """Obtiene todas las sentencias del juez"""
-        self.cursor.execute("""
-        SELECT
-            sentencia_id,
-            expediente,
-            caratula,
-            fecha,
-            fuero,
-            tribunal,
-            materia,
-            resultado,
-            partes_actor,
-            partes_demandado
-        FROM sentencias_por_juez_arg
-        WHERE juez = ?
-        ORDER BY fecha DESC
-        """, (juez,))
-
-        sentencias = []
-        for row in self.cursor.fetchall():
-            sentencias.append({
-                'sentencia_id': row[0],
-                'expediente': row[1],
-                'caratula': row[2],
-                'fecha': row[3],
-                'fuero': row[4],
-                'tribunal': row[5],
-                'materia': row[6],
-                'resultado': row[7],
-                'actor': row[8],
-                'demandado': row[9]
-            })
-
-        return sentencias
+        return self.precargar_sentencias([juez])[juez]
 
     def obtener_lineas_jurisprudenciales(self, juez: str) -> List[Dict]:
         """Obtiene líneas jurisprudenciales del juez"""
-        self.cursor.execute("""
-        SELECT
-            tema,
-            cantidad_sentencias,
-            consistencia_score,
-            criterio_dominante,
-            casos_tipo,
-            excepciones,
-            confianza
-        FROM lineas_jurisprudenciales
-        WHERE juez = ?
-        ORDER BY cantidad_sentencias DESC
-        """, (juez,))
-
-        lineas = []
-        for row in self.cursor.fetchall():
-            lineas.append({
-                'tema': row[0],
-                'cantidad': row[1],
-                'consistencia': row[2],
-                'criterio': row[3],
-                'casos_paradigmaticos': json.loads(row[4]) if row[4] else [],
-                'excepciones': json.loads(row[5]) if row[5] else [],
-                'confianza': row[6]
-            })
-
-        return lineas
+        return self.precargar_lineas([juez])[juez]
 
     def obtener_red_influencias(self, juez: str) -> Dict:
         """Obtiene red de influencias del juez"""
-        self.cursor.execute("""
-        SELECT
-            juez_destino,
-            tipo_destino,
-            tipo_influencia,
-            intensidad,
-            cantidad_citas
-        FROM redes_influencia_judicial
-        WHERE juez_origen = ?
-        ORDER BY cantidad_citas DESC
-        """, (juez,))
-
-        csjn = []
-        tribunales = []
-        autores = []
-
-        for row in self.cursor.fetchall():
-            dato = {
-                'destino': row[0],
-                'tipo': row[1],
-                'intensidad': row[3],
-                'citas': row[4]
-            }
-
-            if row[1] == 'csjn':
-                csjn.append(dato)
-            elif row[1] == 'tribunal_superior':
-                tribunales.append(dato)
-            elif row[1] == 'autor_doctrinal':
-                autores.append(dato)
-
-        return {
-            'csjn': csjn,
-            'tribunales': tribunales,
-            'autores': autores
-        }
+        return self.precargar_redes([juez])[juez]
 
     def obtener_factores_predictivos(self, juez: str) -> List[Dict]:
         """Obtiene factores predictivos del juez"""
-        self.cursor.execute("""
-        SELECT
-            factor,
-            peso,
-            confianza
-        FROM factores_predictivos
-        WHERE juez = ?
-        ORDER BY peso DESC
-        LIMIT 15
-        """, (juez,))
-
-        factores = []
-        for row in self.cursor.fetchall():
-            factores.append({
-                'factor': row[0],
-                'peso': row[1],
-                'confianza': row[2]
-            })
-
-        return factores
+        return self.precargar_factores([juez])[juez]
 
     def cargar_modelo_predictivo(self, juez: str) -> Optional[Dict]:
         """Carga el modelo predictivo del juez"""
-        # Normalizar nombre para archivo
-        nombre_archivo = juez.replace(" ", "_").replace(".", "_")
-        modelo_path = MODELOS_DIR / f"modelo_{nombre_archivo}.pkl"
-
-        if not modelo_path.exists():
-            return None
-
-        try:
-            with open(modelo_path, 'rb') as f:
-                modelo_data = pickle.load(f)
-            return modelo_data
-        except Exception:
-            return None
+        return cargar_modelo(ruta_modelo_predictivo(juez))
 
     # =========================================================================
     # GENERACIÓN DE INFORMES
@@ -269,323 +677,120 @@ class GeneradorInformesJudicial:
 
         # Obtener datos
         print_info("Recopilando datos...")
-        perfil = self.obtener_perfil_juez(juez)
-        if not perfil:
+        datos = self.precargar([juez]).get(juez)
+        if not datos:
             print_error(f"No se encontró perfil para {juez}")
             return None
 
-        sentencias = self.obtener_sentencias_juez(juez)
-        lineas = self.obtener_lineas_jurisprudenciales(juez)
-        red = self.obtener_red_influencias(juez)
-        factores = self.obtener_factores_predictivos(juez)
-        modelo = self.cargar_modelo_predictivo(juez)
+        sentencias = datos['sentencias']
+        lineas = datos['lineas']
+        modelo = cargar_modelo(datos['ruta_modelo'])
 
         print_success(f"Datos obtenidos: {len(sentencias)} sentencias, {len(lineas)} líneas")
 
         # Generar según formato
+        argumentos = (juez, datos['perfil'], sentencias, lineas, datos['red'], datos['factores'], modelo)
         if formato == 'json':
-            return self._generar_json_completo(juez, perfil, sentencias, lineas, red, factores, modelo)
+            return self._generar_json_completo(*argumentos)
         elif formato == 'md':
-            return self._generar_markdown_completo(juez, perfil, sentencias, lineas, red, factores, modelo)
+            return self._generar_markdown_completo(*argumentos)
         else:
-            return self._generar_txt_completo(juez, perfil, sentencias, lineas, red, factores, modelo)
+            return self._generar_txt_completo(*argumentos)
 
     def _generar_txt_completo(self, juez, perfil, sentencias, lineas, red, factores, modelo) -> str:
-        """Genera informe en formato TXT"""
-        lineas_txt = []
-
-        # Encabezado
-        lineas_txt.append("=" * 80)
-        lineas_txt.append(f"INFORME COMPLETO DEL JUEZ: {juez}".center(80))
-        lineas_txt.append("=" * 80)
-        lineas_txt.append(f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        lineas_txt.append(f"Sistema: Análisis de Pensamiento Judicial Argentina v1.0")
-        lineas_txt.append("=" * 80)
-        lineas_txt.append("")
-
-        # SECCIÓN 1: INFORMACIÓN BÁSICA
-        lineas_txt.append("1. INFORMACIÓN BÁSICA")
-        lineas_txt.append("-" * 80)
-        lineas_txt.append(f"Nombre: {juez}")
-        lineas_txt.append(f"Tipo: {perfil.get('tipo_entidad', 'N/D')}")
-        lineas_txt.append(f"Fuero: {perfil.get('fuero', 'N/D')}")
-        lineas_txt.append(f"Jurisdicción: {perfil.get('jurisdiccion', 'N/D')}")
-        lineas_txt.append(f"Tribunal: {perfil.get('tribunal', 'N/D')}")
-        lineas_txt.append(f"Sentencias analizadas: {perfil.get('total_sentencias', 0)}")
-        lineas_txt.append(f"Confianza del análisis: {perfil.get('confianza_analisis', 0):.2f}")
-        lineas_txt.append("")
-
-        # SECCIÓN 2: PERFIL JUDICIAL
-        lineas_txt.append("2. PERFIL JUDICIAL")
-        lineas_txt.append("-" * 80)
-
-        activismo = perfil.get('tendencia_activismo', 0)
-        lineas_txt.append(f"\n2.1 ACTIVISMO JUDICIAL: {activismo:.2f}")
-        lineas_txt.append(self._interpretar_activismo(activismo))
-
-        formalism = perfil.get('nivel_formalismo', 0)
-        lineas_txt.append(f"\n2.2 FORMALISMO: {formalism:.2f}")
-        lineas_txt.append(self._interpretar_formalismo(formalism))
-
-        # Interpretación dominante
-        interpretacion = perfil.get('interpretacion_dominante', 'N/D')
-        lineas_txt.append(f"\n2.3 INTERPRETACIÓN DOMINANTE: {interpretacion}")
-        lineas_txt.append(self._explicar_interpretacion(interpretacion))
-
-        # Estándar probatorio
-        estandar = perfil.get('estandar_probatorio_dominante', 'N/D')
-        lineas_txt.append(f"\n2.4 ESTÁNDAR PROBATORIO: {estandar}")
-        lineas_txt.append("")
-
-        # SECCIÓN 3: PROTECCIÓN DE DERECHOS
-        lineas_txt.append("3. PROTECCIÓN DE DERECHOS")
-        lineas_txt.append("-" * 80)
-        lineas_txt.append(f"Trabajo: {perfil.get('proteccion_trabajo', 0):.2f}")
-        lineas_txt.append(f"Igualdad: {perfil.get('proteccion_igualdad', 0):.2f}")
-        lineas_txt.append(f"Libertad expresión: {perfil.get('proteccion_libertad_expresion', 0):.2f}")
-        lineas_txt.append(f"Privacidad: {perfil.get('proteccion_privacidad', 0):.2f}")
-        lineas_txt.append(f"Propiedad: {perfil.get('proteccion_propiedad', 0):.2f}")
-        lineas_txt.append(f"Consumidor: {perfil.get('proteccion_consumidor', 0):.2f}")
-        lineas_txt.append("")
-
-        # SECCIÓN 4: TESTS Y DOCTRINAS
-        lineas_txt.append("4. TESTS Y DOCTRINAS APLICADOS")
-        lineas_txt.append("-" * 80)
-        tests_aplicados = []
-        if perfil.get('usa_test_proporcionalidad', 0) > 0.3:
-            tests_aplicados.append(f"✓ Test de proporcionalidad (frecuencia: {perfil.get('usa_test_proporcionalidad', 0):.2f})")
-        if perfil.get('usa_test_razonabilidad', 0) > 0.3:
-            tests_aplicados.append(f"✓ Test de razonabilidad (frecuencia: {perfil.get('usa_test_razonabilidad', 0):.2f})")
-        if perfil.get('usa_in_dubio_pro_operario', 0) > 0.3:
-            tests_aplicados.append(f"✓ In dubio pro operario (frecuencia: {perfil.get('usa_in_dubio_pro_operario', 0):.2f})")
-        if perfil.get('usa_in_dubio_pro_consumidor', 0) > 0.3:
-            tests_aplicados.append(f"✓ In dubio pro consumidor (frecuencia: {perfil.get('usa_in_dubio_pro_consumidor', 0):.2f})")
-
-        if tests_aplicados:
-            lineas_txt.extend(tests_aplicados)
-        else:
-            lineas_txt.append("No se identificaron tests o doctrinas recurrentes.")
-        lineas_txt.append("")
-
-        # SECCIÓN 5: SESGOS ARGENTINOS
-        lineas_txt.append("5. SESGOS Y TENDENCIAS")
-        lineas_txt.append("-" * 80)
-        lineas_txt.append(f"Pro-trabajador: {perfil.get('sesgo_pro_trabajador', 0):.2f}")
-        lineas_txt.append(f"Pro-empresa: {perfil.get('sesgo_pro_empresa', 0):.2f}")
-        lineas_txt.append(f"Garantista: {perfil.get('sesgo_garantista', 0):.2f}")
-        lineas_txt.append(f"Punitivista: {perfil.get('sesgo_punitivista', 0):.2f}")
-        lineas_txt.append(f"Pro-consumidor: {perfil.get('sesgo_pro_consumidor', 0):.2f}")
-        lineas_txt.append("")
-
-        # SECCIÓN 6: LÍNEAS JURISPRUDENCIALES
-        lineas_txt.append("6. LÍNEAS JURISPRUDENCIALES")
-        lineas_txt.append("-" * 80)
-        if lineas:
-            for i, linea in enumerate(lineas, 1):
-                lineas_txt.append(f"\n6.{i} {linea['tema'].upper()}")
-                lineas_txt.append(f"   Sentencias: {linea['cantidad']}")
-                lineas_txt.append(f"   Consistencia: {linea['consistencia']:.2f}")
-                lineas_txt.append(f"   Confianza: {linea['confianza']:.2f}")
-                lineas_txt.append(f"   Criterio: {linea['criterio']}")
-
-                if linea['casos_paradigmaticos']:
-                    lineas_txt.append(f"   Casos paradigmáticos: {', '.join(linea['casos_paradigmaticos'][:3])}")
-
-                if linea['excepciones']:
-                    lineas_txt.append(f"   Excepciones: {len(linea['excepciones'])} casos")
-        else:
-            lineas_txt.append("No hay suficientes sentencias para identificar líneas consolidadas.")
-        lineas_txt.append("")
-
-        # SECCIÓN 7: RED DE INFLUENCIAS
-        lineas_txt.append("7. RED DE INFLUENCIAS")
-        lineas_txt.append("-" * 80)
-
-        lineas_txt.append("\n7.1 CSJN")
-        if red['csjn']:
-            for cita in red['csjn'][:5]:
-                lineas_txt.append(f"   • {cita['citas']} citas (intensidad: {cita['intensidad']:.2f})")
-        else:
-            lineas_txt.append("   No se detectaron citas a CSJN")
-
-        lineas_txt.append("\n7.2 TRIBUNALES SUPERIORES")
-        if red['tribunales']:
-            for trib in red['tribunales'][:5]:
-                lineas_txt.append(f"   • {trib['destino']}: {trib['citas']} citas (intensidad: {trib['intensidad']:.2f})")
-        else:
-            lineas_txt.append("   No se detectaron citas a tribunales")
-
-        lineas_txt.append("\n7.3 AUTORES DOCTRINALES")
-        if red['autores']:
-            for autor in red['autores'][:10]:
-                lineas_txt.append(f"   • {autor['destino']}: {autor['citas']} citas (intensidad: {autor['intensidad']:.2f})")
-        else:
-            lineas_txt.append("   No se detectaron citas doctrinales")
-        lineas_txt.append("")
-
-        # SECCIÓN 8: ANÁLISIS PREDICTIVO
-        lineas_txt.append("8. ANÁLISIS PREDICTIVO")
-        lineas_txt.append("-" * 80)
-
-        if modelo:
-            lineas_txt.append(f"Modelo disponible: SÍ")
-            lineas_txt.append(f"Accuracy: {modelo.get('accuracy', 0):.2%}")
-            lineas_txt.append(f"Sentencias de entrenamiento: {modelo.get('n_sentencias', 0)}")
-            lineas_txt.append(f"Clases predichas: {', '.join(modelo.get('clases', []))}")
-            lineas_txt.append(f"\nFactores más importantes:")
-
-            if factores:
-                for i, factor in enumerate(factores[:10], 1):
-                    lineas_txt.append(f"   {i}. {factor['factor']}: {factor['peso']:.3f} (confianza: {factor['confianza']:.2f})")
-        else:
-            lineas_txt.append("Modelo predictivo no disponible.")
-            lineas_txt.append("Razones posibles:")
-            lineas_txt.append("  • Insuficientes sentencias (<5)")
-            lineas_txt.append("  • Modelo no entrenado aún")
-        lineas_txt.append("")
-
-        # SECCIÓN 9: SENTENCIAS ANALIZADAS
-        lineas_txt.append("9. SENTENCIAS ANALIZADAS")
-        lineas_txt.append("-" * 80)
-        lineas_txt.append(f"Total: {len(sentencias)}")
-        lineas_txt.append("\nÚltimas 10 sentencias:")
-        for i, sent in enumerate(sentencias[:10], 1):
-            lineas_txt.append(f"\n{i}. {sent['caratula'] or sent['sentencia_id']}")
-            lineas_txt.append(f"   Expediente: {sent['expediente'] or 'N/D'}")
-            lineas_txt.append(f"   Fecha: {sent['fecha'] or 'N/D'}")
-            lineas_txt.append(f"   Materia: {sent['materia'] or 'N/D'}")
-            lineas_txt.append(f"   Resultado: {sent['resultado'] or 'N/D'}")
-        lineas_txt.append("")
-
-        # Pie de página
-        lineas_txt.append("=" * 80)
-        lineas_txt.append("FIN DEL INFORME")
-        lineas_txt.append("=" * 80)
-
-        # Guardar
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nombre_archivo = f"informe_completo_{juez.replace(' ', '_')}_{timestamp}.txt"
-        ruta_archivo = INFORMES_DIR / nombre_archivo
-
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lineas_txt))
-
+        """Genera informe completo en formato TXT"""
+        contenido = renderizar_txt(juez, perfil, sentencias, lineas, red, factores, modelo, datetime.now())
+        ruta_archivo = guardar_informe(juez, 'txt', contenido)
         print_success(f"Informe guardado: {ruta_archivo}")
         return str(ruta_archivo)
 
     def _generar_json_completo(self, juez, perfil, sentencias, lineas, red, factores, modelo) -> str:
-        """Genera informe en formato JSON"""
-        data = {
-            'juez': juez,
-            'fecha_generacion': datetime.now().isoformat(),
-            'perfil': perfil,
-            'sentencias': sentencias,
-            'lineas_jurisprudenciales': lineas,
-            'red_influencias': red,
-            'factores_predictivos': factores,
-            'modelo_predictivo': {
-                'disponible': modelo is not None,
-                'accuracy': modelo.get('accuracy') if modelo else None,
-                'n_sentencias': modelo.get('n_sentencias') if modelo else None,
-                'clases': modelo.get('clases') if modelo else None
-            }
-        }
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nombre_archivo = f"informe_completo_{juez.replace(' ', '_')}_{timestamp}.json"
-        ruta_archivo = INFORMES_DIR / nombre_archivo
-
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
+        """Genera informe completo en formato JSON"""
+        contenido = renderizar_json(juez, perfil, sentencias, lineas, red, factores, modelo, datetime.now())
+        ruta_archivo = guardar_informe(juez, 'json', contenido)
         print_success(f"Informe JSON guardado: {ruta_archivo}")
         return str(ruta_archivo)
 
     def _generar_markdown_completo(self, juez, perfil, sentencias, lineas, red, factores, modelo) -> str:
-        """Genera informe en formato Markdown"""
-        md = []
-
-        md.append(f"# Informe Completo del Juez: {juez}\n")
-        md.append(f"**Fecha**: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
-        md.append(f"**Sistema**: Análisis de Pensamiento Judicial Argentina v1.0\n")
-        md.append("---\n")
-
-        # Información básica
-        md.append("## 1. Información Básica\n")
-        md.append(f"- **Nombre**: {juez}")
-        md.append(f"- **Tipo**: {perfil.get('tipo_entidad', 'N/D')}")
-        md.append(f"- **Fuero**: {perfil.get('fuero', 'N/D')}")
-        md.append(f"- **Jurisdicción**: {perfil.get('jurisdiccion', 'N/D')}")
-        md.append(f"- **Sentencias analizadas**: {perfil.get('total_sentencias', 0)}\n")
-
-        # Perfil judicial
-        md.append("## 2. Perfil Judicial\n")
-        md.append(f"### 2.1 Activismo: {perfil.get('tendencia_activismo', 0):.2f}\n")
-        md.append(f"{self._interpretar_activismo(perfil.get('tendencia_activismo', 0))}\n")
-
-        # Líneas jurisprudenciales
-        md.append("## 6. Líneas Jurisprudenciales\n")
-        if lineas:
-            for linea in lineas:
-                md.append(f"### {linea['tema'].title()}\n")
-                md.append(f"- **Sentencias**: {linea['cantidad']}")
-                md.append(f"- **Consistencia**: {linea['consistencia']:.2f}")
-                md.append(f"- **Criterio**: {linea['criterio']}\n")
-
-        # Red de influencias
-        md.append("## 7. Red de Influencias\n")
-        if red['autores']:
-            md.append("### Autores más citados\n")
-            for autor in red['autores'][:10]:
-                md.append(f"- **{autor['destino']}**: {autor['citas']} citas")
-
-        # Guardar
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nombre_archivo = f"informe_completo_{juez.replace(' ', '_')}_{timestamp}.md"
-        ruta_archivo = INFORMES_DIR / nombre_archivo
-
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(md))
-
+        """Genera informe completo en formato Markdown"""
+        contenido = renderizar_md(juez, perfil, sentencias, lineas, red, factores, modelo, datetime.now())
+        ruta_archivo = guardar_informe(juez, 'md', contenido)
         print_success(f"Informe Markdown guardado: {ruta_archivo}")
         return str(ruta_archivo)
 
     # =========================================================================
-    # UTILIDADES DE INTERPRETACIÓN
+    # MODO MASIVO
     # =========================================================================
 
-    def _interpretar_activismo(self, score: float) -> str:
-        """Interpreta el score de activismo"""
-        if score > 0.6:
-            return "Juez marcadamente activista. Interviene activamente en cuestiones de constitucionalidad y políticas públicas."
-        elif score > 0.3:
-            return "Juez moderadamente activista. Ocasionalmente ejerce control de constitucionalidad y expansión de derechos."
-        elif score > -0.3:
-            return "Juez equilibrado. Balance entre activismo y restricción judicial."
-        elif score > -0.6:
-            return "Juez moderadamente restrictivo. Tiende a la deferencia con otros poderes."
-        else:
-            return "Juez muy restrictivo. Alta deferencia con poderes políticos, interpretación estricta."
-
-    def _interpretar_formalismo(self, score: float) -> str:
-        """Interpreta el score de formalismo"""
-        if score > 0.6:
-            return "Alto formalismo. Enfoque muy procedimentalista, énfasis en requisitos formales."
-        elif score > 0.3:
-            return "Formalismo moderado. Balance entre forma y sustancia."
-        else:
-            return "Bajo formalismo. Prioriza sustancia sobre forma, flexibilidad procesal."
-
-    def _explicar_interpretacion(self, tipo: str) -> str:
-        """Explica el tipo de interpretación"""
-        explicaciones = {
-            'literal': "Interpretación apegada al texto de la norma, significado ordinario de las palabras.",
-            'sistematica': "Interpretación considerando el sistema jurídico completo, coherencia normativa.",
-            'teleologica': "Interpretación orientada a los fines y objetivos de la norma.",
-            'historica': "Interpretación considerando el contexto histórico y evolución normativa.",
-            'mixta': "Combinación de varios métodos interpretativos según el caso."
-        }
-        return explicaciones.get(tipo, "No disponible")
+    def generar_informes_lote(self, jueces: Optional[List[str]] = None, formato: str = 'txt',
+                              procesos: Optional[int] = None, forzar: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Genera el informe completo de muchos jueces (todos si ``jueces`` es None).
+
+        Los datos se precargan por bloques con una consulta por sección y los
+        informes se renderizan en un pool de procesos. Se omiten los jueces
+        cuya huella de datos coincide con la de su último informe (salvo
+        ``forzar``).
+
+        Returns:
+            {juez: ruta del informe (nuevo o vigente) o None si no tiene perfil}
+        """
+        if jueces is None:
+            jueces = [row[0] for row in self.pool.consultar(
+                "SELECT juez FROM perfiles_judiciales_argentinos ORDER BY juez"
+            )]
+        procesos = procesos or os.cpu_count() or 1
+        print(f"\n{Colors.BOLD}GENERANDO INFORMES: {len(jueces)} jueces ({procesos} procesos){Colors.ENDC}\n")
+
+        manifiesto = leer_manifiesto()
+        resultados: Dict[str, Optional[str]] = {juez: None for juez in jueces}
+        omitidos = 0
+        con_perfil = 0
+        pendientes = []
+
+        executor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+        try:
+            for i in range(0, len(jueces), TAMANO_BLOQUE_IN):
+                datos = self.precargar(jueces[i:i + TAMANO_BLOQUE_IN])
+                con_perfil += len(datos)
+                for juez, datos_juez in datos.items():
+                    huella = huella_datos(datos_juez)
+                    previo = manifiesto.get(f"{juez}|{formato}")
+                    if (not forzar and previo and previo['huella'] == huella
+                            and Path(previo['ruta']).exists()):
+                        resultados[juez] = previo['ruta']
+                        omitidos += 1
+                        continue
+
+                    tarea = (juez, formato, datos_juez, str(INFORMES_DIR))
+                    if executor:
+                        pendientes.append((juez, huella, executor.submit(generar_en_proceso, tarea)))
+                        continue
+                    # Modo serial: un informe que falla no corta el lote (igual que en el pool)
+                    try:
+                        pendientes.append((juez, huella, generar_en_proceso(tarea)))
+                    except Exception as e:
+                        print_error(f"{juez}: {e}")
+
+            for juez, huella, resultado in pendientes:
+                try:
+                    ruta = resultado.result() if executor else resultado
+                except Exception as e:
+                    print_error(f"{juez}: {e}")
+                    continue
+                resultados[juez] = ruta
+                manifiesto[f"{juez}|{formato}"] = {
+                    'huella': huella, 'ruta': ruta, 'fecha': datetime.now().isoformat(timespec='seconds')
+                }
+        finally:
+            if executor:
+                executor.shutdown()
+            guardar_manifiesto(manifiesto)
+
+        generados = sum(1 for juez, _, _ in pendientes if resultados[juez])
+        print_success(f"Informes generados: {generados}, sin cambios: {omitidos}, "
+                      f"sin perfil: {len(jueces) - con_perfil}")
+        return resultados
 
     # =========================================================================
     # INFORMES ESPECIALIZADOS
@@ -607,12 +812,12 @@ class GeneradorInformesJudicial:
             print_error(f"No se encontró línea para {juez} - {tema}")
             return None
 
-        # Obtener sentencias del tema
+        # Obtener sentencias del tema (sin perfil_cognitivo ni texto completo)
         self.cursor.execute("""
-        SELECT *
+        SELECT sentencia_id, fecha_sentencia, materia, resultado
         FROM sentencias_por_juez_arg
         WHERE juez = ? AND materia LIKE ?
-        ORDER BY fecha DESC
+        ORDER BY fecha_sentencia DESC
         """, (juez, f"%{tema}%"))
 
         sentencias_tema = self.cursor.fetchall()
@@ -648,6 +853,15 @@ class GeneradorInformesJudicial:
         return "informe_predictivo_generado.txt"
 
 
+def trabajo_informe_juez(contexto, juez: str, formato: str = 'txt') -> Dict[str, str]:
+    """Tarea 'informe_juez' de la cola de trabajos (ver cola_trabajos.py)"""
+    contexto.progreso(0.1, f"Generando informe de {juez}")
+    ruta = GeneradorInformesJudicial().generar_informe_completo(juez, formato)
+    if not ruta:
+        raise ValueError(f"No se encontró perfil para {juez}")
+    return {"archivo": str(Path(ruta).resolve()), "nombre": Path(ruta).name, "ruta": ruta}
+
+
 def main():
     """Función principal"""
     import argparse
@@ -658,7 +872,8 @@ def main():
     )
     parser.add_argument(
         'juez',
-        help='Nombre del juez'
+        nargs='*',
+        help='Nombre del juez (con --todos o varios nombres: modo masivo)'
     )
     parser.add_argument(
         '--tipo',
@@ -676,8 +891,28 @@ def main():
         '--tema',
         help='Tema para informe de línea'
     )
+    parser.add_argument(
+        '--todos',
+        action='store_true',
+        help='Informe completo de todos los jueces con perfil (modo masivo)'
+    )
+    parser.add_argument(
+        '--procesos',
+        type=int,
+        help='Procesos para renderizar en modo masivo (default: CPUs)'
+    )
+    parser.add_argument(
+        '--forzar',
+        action='store_true',
+        help='Regenerar aunque los datos del juez no hayan cambiado'
+    )
 
     args = parser.parse_args()
+    masivo = args.todos or len(args.juez) > 1
+    if not args.juez and not args.todos:
+        parser.error('Debe indicar un juez o --todos')
+    if masivo and args.tipo != 'completo':
+        parser.error('El modo masivo sólo genera informes completos')
 
     # Crear generador
     try:
@@ -687,15 +922,22 @@ def main():
         sys.exit(1)
 
     try:
+        if masivo:
+            generador.generar_informes_lote(
+                None if args.todos else args.juez, args.formato, args.procesos, args.forzar
+            )
+            return
+
+        juez = args.juez[0]
         if args.tipo == 'completo':
-            ruta = generador.generar_informe_completo(args.juez, args.formato)
+            ruta = generador.generar_informe_completo(juez, args.formato)
         elif args.tipo == 'linea':
             if not args.tema:
                 print_error("Debe especificar --tema para informe de línea")
                 sys.exit(1)
-            ruta = generador.generar_informe_linea(args.juez, args.tema, args.formato)
+            ruta = generador.generar_informe_linea(juez, args.tema, args.formato)
         elif args.tipo == 'red':
-            ruta = generador.generar_informe_red(args.juez, args.formato)
+            ruta = generador.generar_informe_red(juez, args.formato)
         elif args.tipo == 'predictivo':
             print_error("Informe predictivo requiere caso nuevo (no implementado en CLI)")
             sys.exit(1)
@@ -417,6 +417,21 @@ class AnalizadorHonorarios:
         """
         return self.gestor_jus.convertir_pesos_a_jus(monto_pesos, fecha)
 
+    def convertir_pesos_a_jus_lote(self, montos_pesos: List[float],
+                                   fechas: Optional[List[Optional[str]]] = None) -> Dict:
+        """
+        Convierte muchos montos de pesos a JUS en una sola llamada
+        (auditorias sobre miles de sentencias)
+
+        Args:
+            montos_pesos: Montos en pesos argentinos
+            fechas: Fecha de cada monto para el valor JUS (None = hoy)
+
+        Returns:
+            Diccionario de arreglos (ver GestorValoresJUS.convertir_pesos_a_jus_lote)
+        """
+        return self.gestor_jus.convertir_pesos_a_jus_lote(montos_pesos, fechas)
+
 
 def test_analizador_honorarios():
     """Test del analizador de honorarios"""
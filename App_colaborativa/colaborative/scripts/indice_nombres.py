@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+🪪 ÍNDICE DE NOMBRES CANÓNICOS (RESOLUCIÓN DE ENTIDADES)
+=======================================================
+
+Los nombres de jueces y autores llegan con variantes de acentos, iniciales,
+títulos y orden ("Dra. María E. Pérez", "PEREZ, Maria Elena", "Perez Maria").
+Cada variante terminaba siendo un perfil distinto.
+
+- Normalización: minúsculas, sin acentos, sin títulos (dr., juez, vocal...),
+  tokens ordenados.
+- Bloqueo: cada nombre se indexa por la clave fonética (español) y el prefijo
+  de 3 letras de cada token largo. Una consulta sólo se compara contra los
+  nombres que comparten algún bloque, no contra todo el padrón.
+- Fusión (mismo_nombre): dos nombres son la misma persona sólo si tienen la
+  misma cantidad de tokens y cada token coincide con uno del otro: igual
+  (sin acentos ni mayúsculas), inicial del otro ("m." ~ "maria"), misma
+  pronunciación (Fernandez ~ Fernandes, Vázquez ~ Basquez) o una diferencia
+  de tipeo en un apellido largo (Rodriguez ~ Rodriquez). Nunca se fusionan
+  nombres que difieren en la terminación de género (Luis / Luisa, Mario /
+  Maria), nombres de pila distintos aunque difieran en una letra (Andrea /
+  Andrés, Alexia / Alexis) ni tokens cortos distintos (Marta / Maria). Un apellido suelto no se fusiona con un nombre completo. El
+  puntaje de rapidfuzz sólo ordena los candidatos que pasan esa regla.
+- Búsqueda: partial/token_set de rapidfuzz contra el canónico y contra todas
+  las variantes registradas.
+- Persistencia: tabla nombres_canonicos (variante normalizada → canónico) en
+  la misma base. Una variante ya vista se resuelve con una sola búsqueda.
+
+USO:
+    from indice_nombres import obtener_indice
+    indice = obtener_indice(DB_JUDICIAL, "juez", "perfiles_judiciales_argentinos", "juez")
+    indice.canonizar("Dra. PEREZ, María E.")   # ingesta: devuelve o registra el canónico
+    indice.resolver("maria perez")             # consulta: canónico o None
+    indice.buscar("pere", limite=10)           # rutas de búsqueda: [(canónico, puntaje)]
+"""
+
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from pool_sqlite import obtener_pool
+
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_DISPONIBLE = True
+except ImportError:
+    import difflib
+    RAPIDFUZZ_DISPONIBLE = False
+
+UMBRAL_CANONICO = 90.0   # puntaje mínimo para fusionar dos nombres (además de mismo_nombre)
+UMBRAL_BUSQUEDA = 60.0   # puntaje mínimo para mostrar un resultado de búsqueda
+LARGO_PREFIJO = 3
+LARGO_TOLERANTE = 6      # tokens desde este largo admiten una diferencia de tipeo
+
+# Nombres de pila frecuentes (normalizados). Entre nombres de pila una letra
+# distinta es otra persona (Andrea / Andrés, Alexia / Alexis): la tolerancia
+# de tipeo sólo se aplica a tokens que no están acá (apellidos).
+NOMBRES_PILA = frozenset("""
+    adolfo adrian adriana agustin agustina alberto alejandra alejandro alexia
+    alexis alfredo alicia ana analia andrea andres angel angela antonio ariel
+    armando beatriz belen benjamin bernardo blanca camila carina carla carlos
+    carmen carolina catalina cecilia celia claudia claudio cristian cristina
+    daniel daniela dario david delia diana diego dolores eduardo elena elias
+    elisa eliana emilia emiliano emilio enrique ernesto esteban estela eugenia
+    eugenio eva ezequiel fabian fabiana facundo federico felipe fernanda
+    fernando florencia francisco franco gabriel gabriela gaston gerardo german
+    gloria graciela guillermo gustavo hector horacio hugo ignacio ines irene
+    isabel ivan javier jesus jorge jose josefina juan juana julia julian juliana
+    julio laura leandro leonardo lidia liliana lorena lucas lucia luciana
+    luciano luis luisa manuel marcela marcelo marcos margarita maria mariana
+    mariano mario marisa marta martin martina matias mauricio maximiliano
+    mercedes miguel miriam monica natalia nicolas norma oscar pablo patricia
+    paula pedro rafael ramiro ramon raul ricardo roberto rodolfo rodrigo rosa
+    rosana ruben sandra santiago sebastian sergio silvia silvina sofia susana
+    teresa tomas valeria vanesa veronica vicente victor victoria walter
+""".split())
+
+TITULOS = {
+    "dr", "dra", "doctor", "doctora", "sr", "sra", "juez", "jueza", "vocal",
+    "camarista", "ministro", "ministra", "conjuez", "conjueza", "prof", "lic", "abog"
+}
+
+_NO_LETRA = re.compile(r"[^a-z0-9ñ ]+")
+
+
+def normalizar_nombre(nombre: str) -> List[str]:
+    """Tokens del nombre: minúsculas, sin acentos ni títulos, ordenados"""
+    nombre = (nombre or "").lower().replace("ñ", "n~")
+    nombre = unicodedata.normalize("NFKD", nombre)
+    nombre = "".join(c for c in nombre if not unicodedata.combining(c)).replace("n~", "ñ")
+    tokens = _NO_LETRA.sub(" ", nombre).split()
+    return sorted(t for t in tokens if t not in TITULOS)
+
+
+def clave_fonetica(token: str) -> str:
+    """Clave fonética simplificada para español (b/v, c/s/z, ll/y, h muda, qu/k...)"""
+    t = token
+    for origen, destino in (("ch", "x"), ("qu", "k"), ("ll", "y"), ("gue", "ge"), ("gui", "gi"),
+                            ("ce", "se"), ("ci", "si"), ("ge", "je"), ("gi", "ji")):
+        t = t.replace(origen, destino)
+    t = t.translate(str.maketrans({"v": "b", "z": "s", "c": "k", "q": "k", "w": "u", "ñ": "n"}))
+    t = t.replace("h", "")
+    # Colapsar letras repetidas
+    return re.sub(r"(.)\1+", r"\1", t)
+
+
+def bloques(tokens: List[str]) -> Set[str]:
+    """Claves de bloqueo: fonética (4 letras) y prefijo de cada token de 3+ letras"""
+    claves = set()
+    for t in tokens:
+        if len(t) >= LARGO_PREFIJO:
+            claves.add("f:" + clave_fonetica(t)[:4])
+            claves.add("p:" + t[:LARGO_PREFIJO])
+    return claves
+
+
+def _expandir_iniciales(tokens: List[str], referencia: List[str]) -> List[str]:
+    """Reemplaza iniciales ("m") por el token de la referencia que empieza igual"""
+    expandidos = []
+    for t in tokens:
+        if len(t) == 1:
+            t = next((r for r in referencia if len(r) > 1 and r[0] == t), t)
+        expandidos.append(t)
+    return sorted(expandidos)
+
+
+def distancia_edicion(a: str, b: str) -> int:
+    """Levenshtein (los tokens de un nombre son cortos)"""
+    if RAPIDFUZZ_DISPONIBLE:
+        from rapidfuzz.distance import Levenshtein
+        return Levenshtein.distance(a, b)
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = actual
+    return anterior[-1]
+
+
+def difiere_en_genero(a: str, b: str) -> bool:
+    """Luis/Luisa, Mario/Maria, Daniel/Daniela: misma raíz, otra terminación"""
+    if a == b:
+        return False
+    corto, largo = sorted((a, b), key=len)
+    if largo == corto + "a":
+        return True
+    return len(a) == len(b) and a[:-1] == b[:-1] and {a[-1], b[-1]} <= {"a", "o", "e"}
+
+
+def tokens_coinciden(a: str, b: str) -> bool:
+    """Dos tokens normalizados del nombre designan lo mismo"""
+    if a == b:
+        return True
+    if len(a) == 1 or len(b) == 1:
+        # Inicial contra nombre completo (dos iniciales distintas no coinciden)
+        return len(a) != len(b) and a[0] == b[0]
+    if difiere_en_genero(a, b):
+        return False
+    # Misma pronunciación (Vázquez ~ Basquez, Luis ~ Luiz)
+    if min(len(a), len(b)) >= 4 and clave_fonetica(a) == clave_fonetica(b):
+        return True
+    # Un error de tipeo sólo en apellidos largos (Gonzales ~ Gonzalez ya es fonético)
+    if a in NOMBRES_PILA or b in NOMBRES_PILA:
+        return False
+    return (a[0] == b[0] and min(len(a), len(b)) >= LARGO_TOLERANTE
+            and distancia_edicion(a, b) <= 1)
+
+
+def mismo_nombre(tokens_a: List[str], tokens_b: List[str]) -> bool:
+    """
+    Regla de fusión: misma cantidad de tokens, cada uno emparejado con un
+    token distinto del otro nombre y al menos dos tokens completos (no
+    iniciales) en cada lado.
+    """
+    if len(tokens_a) != len(tokens_b):
+        return False
+    if sum(len(t) > 1 for t in tokens_a) < 2 or sum(len(t) > 1 for t in tokens_b) < 2:
+        return False
+    libres = list(tokens_b)
+    # Primero los tokens completos: una inicial no debe "robar" su pareja
+    for token in sorted(tokens_a, key=lambda t: -len(t)):
+        pareja = next((i for i, otro in enumerate(libres)
+                       if tokens_coinciden(token, otro) and (len(token) > 1) == (len(otro) > 1)), None)
+        if pareja is None:
+            pareja = next((i for i, otro in enumerate(libres) if tokens_coinciden(token, otro)), None)
+        if pareja is None:
+            return False
+        libres.pop(pareja)
+    return True
+
+
+def puntaje_nombres(tokens_a: List[str], tokens_b: List[str]) -> float:
+    """Similitud 0-100 entre dos nombres normalizados"""
+    a = _expandir_iniciales(tokens_a, tokens_b)
+    b = _expandir_iniciales(tokens_b, tokens_a)
+    # Se toma el mejor entre la grafía y la clave fonética (Vázquez ~ Basquez)
+    pares = [(" ".join(a), " ".join(b)),
+             (" ".join(sorted(map(clave_fonetica, a))), " ".join(sorted(map(clave_fonetica, b))))]
+    if RAPIDFUZZ_DISPONIBLE:
+        return max(fuzz.token_sort_ratio(x, y) for x, y in pares)
+    return max(difflib.SequenceMatcher(None, x, y).ratio() for x, y in pares) * 100
+
+
+class IndiceNombres:
+    """Índice persistente variante → nombre canónico con bloqueo fonético/prefijo"""
+
+    def __init__(self, db_path, tipo: str, tabla_origen: Optional[str] = None,
+                 columna_origen: Optional[str] = None, umbral: float = UMBRAL_CANONICO):
+        self.pool = obtener_pool(db_path)
+        self.tipo = tipo
+        self.umbral = umbral
+        self._lock = threading.Lock()
+        self.variantes: Dict[str, str] = {}          # variante normalizada -> canónico
+        self.canonicos: Dict[str, List[str]] = {}    # canónico -> tokens
+        self._variantes_de: Dict[str, Set[str]] = {} # canónico -> variantes normalizadas
+        self._bloques: Dict[str, Set[str]] = {}      # bloque -> canónicos (por canónico o variante)
+        self.tabla_origen = tabla_origen
+        self.columna_origen = columna_origen
+        self._marca_origen = 0                       # último rowid visto en la tabla de origen
+
+        self._crear_tabla()
+        self._cargar()
+        self.sincronizar()
+
+    # ------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------
+    def _crear_tabla(self):
+        with self.pool.escritura() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS nombres_canonicos (
+                tipo TEXT NOT NULL,            -- juez | autor
+                variante TEXT NOT NULL,        -- variante normalizada
+                original TEXT,                 -- cómo llegó la primera vez
+                canonico TEXT NOT NULL,
+                puntaje REAL,
+                fecha TEXT,
+                PRIMARY KEY (tipo, variante)
+            )
+            """)
+
+    def _cargar(self):
+        filas = self.pool.consultar(
+            "SELECT variante, canonico FROM nombres_canonicos WHERE tipo = ?", (self.tipo,)
+        )
+        for variante, canonico in filas:
+            if canonico not in self.canonicos:
+                self._indexar_canonico(canonico)
+            self._indexar_variante(variante, canonico)
+
+    def _indexar_canonico(self, canonico: str):
+        tokens = normalizar_nombre(canonico)
+        self.canonicos[canonico] = tokens
+        self._variantes_de.setdefault(canonico, set())
+        for clave in bloques(tokens):
+            self._bloques.setdefault(clave, set()).add(canonico)
+
+    def _indexar_variante(self, variante: str, canonico: str):
+        self.variantes[variante] = canonico
+        self._variantes_de.setdefault(canonico, set()).add(variante)
+        for clave in bloques(variante.split()):
+            self._bloques.setdefault(clave, set()).add(canonico)
+
+    def formas(self, canonico: str) -> List[List[str]]:
+        """Tokens del canónico y de cada variante registrada"""
+        formas = [self.canonicos[canonico]]
+        formas.extend(v.split() for v in self._variantes_de.get(canonico, ()))
+        return formas
+
+    def _guardar(self, variante: str, original: str, canonico: str, puntaje: float):
+        self.pool.ejecutar(
+            """INSERT OR IGNORE INTO nombres_canonicos
+            (tipo, variante, original, canonico, puntaje, fecha) VALUES (?, ?, ?, ?, ?, ?)""",
+            (self.tipo, variante, original, canonico, puntaje, datetime.now().isoformat(timespec="seconds"))
+        )
+
+    def sincronizar(self) -> int:
+        """
+        Incorpora los nombres agregados a la tabla de origen desde la última
+        llamada (filas con rowid mayor a la marca). Devuelve cuántos leyó.
+        """
+        if not (self.tabla_origen and self.columna_origen):
+            return 0
+        columna = self.columna_origen
+        filas = self.pool.consultar(
+            f"""SELECT rowid, {columna} FROM {self.tabla_origen}
+            WHERE rowid > ? AND {columna} IS NOT NULL AND {columna} != ''
+            ORDER BY rowid""",
+            (self._marca_origen,)
+        )
+        for rowid, nombre in filas:
+            self.canonizar(nombre)
+            self._marca_origen = rowid
+        return len(filas)
+
+    # ------------------------------------------------------
+    # Resolución
+    # ------------------------------------------------------
+    def candidatos(self, tokens: List[str]) -> Set[str]:
+        encontrados: Set[str] = set()
+        for clave in bloques(tokens):
+            encontrados |= self._bloques.get(clave, set())
+        return encontrados
+
+    def _mejor(self, tokens: List[str], umbral: float) -> Optional[Tuple[str, float]]:
+        """Canónico con el que ``tokens`` puede fusionarse (mismo_nombre) y mejor puntaje"""
+        mejor = None
+        for canonico in self.candidatos(tokens):
+            for forma in self.formas(canonico):
+                if not mismo_nombre(tokens, forma):
+                    continue
+                puntaje = puntaje_nombres(tokens, forma)
+                if puntaje >= umbral and (mejor is None or puntaje > mejor[1]):
+                    mejor = (canonico, puntaje)
+        return mejor
+
+    def resolver(self, nombre: str) -> Optional[str]:
+        """Nombre canónico de ``nombre`` o None si no se parece a ninguno"""
+        tokens = normalizar_nombre(nombre)
+        if not tokens:
+            return None
+        self.sincronizar()
+        variante = " ".join(tokens)
+        if variante in self.variantes:
+            return self.variantes[variante]
+        mejor = self._mejor(tokens, self.umbral)
+        return mejor[0] if mejor else None
+
+    def canonizar(self, nombre: str) -> str:
+        """
+        Para ingesta: devuelve el canónico de ``nombre`` y registra la variante.
+        Si no se parece a ninguno, ``nombre`` pasa a ser un canónico nuevo.
+        """
+        tokens = normalizar_nombre(nombre)
+        if not tokens:
+            return nombre
+        variante = " ".join(tokens)
+
+        with self._lock:
+            if variante in self.variantes:
+                return self.variantes[variante]
+
+            mejor = self._mejor(tokens, self.umbral)
+            if mejor:
+                canonico, puntaje = mejor
+            else:
+                canonico, puntaje = nombre.strip(), 100.0
+                self._indexar_canonico(canonico)
+
+            self._indexar_variante(variante, canonico)
+            self._guardar(variante, nombre, canonico, puntaje)
+            return canonico
+
+    def buscar(self, termino: str, limite: int = 20,
+               umbral: float = UMBRAL_BUSQUEDA) -> List[Tuple[str, float]]:
+        """
+        Búsqueda tolerante para las rutas: prefijos ("pere"), apellidos sueltos,
+        acentos y orden. Términos muy cortos se comparan contra todo el padrón.
+        """
+        tokens = normalizar_nombre(termino)
+        if not tokens:
+            return []
+        self.sincronizar()
+
+        candidatos = self.candidatos(tokens)
+        if not candidatos and all(len(t) < LARGO_PREFIJO for t in tokens):
+            candidatos = set(self.canonicos)
+
+        consulta = " ".join(tokens)
+        resultados = []
+        for canonico in candidatos:
+            puntaje = 0.0
+            # Se puntúa el canónico y cada variante fusionada en él. Sólo la
+            # misma persona (mismo_nombre) llega a 100: "Luis Fernandez" está
+            # contenido en "Luisa Fernandez" pero no puede empatarla
+            for forma in self.formas(canonico):
+                nombre = " ".join(forma)
+                if mismo_nombre(tokens, forma):
+                    puntaje = 100.0
+                    break
+                if RAPIDFUZZ_DISPONIBLE:
+                    puntaje = max(puntaje, fuzz.partial_ratio(consulta, nombre),
+                                  fuzz.token_set_ratio(consulta, nombre),
+                                  puntaje_nombres(tokens, forma))
+                else:
+                    puntaje = max(puntaje, puntaje_nombres(tokens, forma))
+                puntaje = min(puntaje, 99.0)
+            if puntaje >= umbral:
+                resultados.append((canonico, round(float(puntaje), 1)))
+
+        resultados.sort(key=lambda r: -r[1])
+        return resultados[:limite]
+
+    def variantes_de(self, canonico: str) -> List[str]:
+        return sorted(self._variantes_de.get(canonico, ()))
+
+
+_INDICES: Dict[Tuple[str, str], IndiceNombres] = {}
+_LOCK_INDICES = threading.Lock()
+
+
+def obtener_indice(db_path, tipo: str, tabla_origen: Optional[str] = None,
+                   columna_origen: Optional[str] = None) -> IndiceNombres:
+    """Índice compartido por todo el proceso para (db_path, tipo)"""
+    clave = (str(Path(db_path).resolve()), tipo)
+    with _LOCK_INDICES:
+        if clave not in _INDICES:
+            _INDICES[clave] = IndiceNombres(db_path, tipo, tabla_origen, columna_origen)
+        return _INDICES[clave]
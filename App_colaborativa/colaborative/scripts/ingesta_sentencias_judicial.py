@@ -10,8 +10,9 @@ Este script procesa sentencias argentinas:
 1. Extrae texto de PDF/TXT
 2. Extrae metadata automáticamente
 3. Realiza chunking del texto
-4. Guarda en base de datos judicial
-5. Prepara para análisis cognitivo posterior
+4. Detecta casi-duplicados (MinHash/LSH) de sentencias y chunks
+5. Guarda en base de datos judicial
+6. Prepara para análisis cognitivo posterior
 """
 
 import sqlite3
@@ -26,6 +27,11 @@ import uuid
 # Importar extractor de metadata
 from extractor_metadata_argentina import ExtractorMetadataArgentina
 
+# Detección de casi-duplicados
+from deduplicador import DetectorDuplicados, firma_minhash, POLITICAS, UMBRAL_DUPLICADO
+from indice_nombres import obtener_indice
+from citas_sentencia import asegurar_citas, registrar_citas
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -62,17 +68,79 @@ def print_info(text):
     print(f"{Colors.OKBLUE}ℹ {text}{Colors.ENDC}")
 
 
+def asegurar_columna_original(conn: sqlite3.Connection):
+    """
+    sentencias_por_juez_arg.juez es el nombre canónico (el del perfil, con el
+    que agrupan agregador, motor predictivo, líneas, informes, buscador y
+    citas); juez_original guarda el nombre tal como figura en la sentencia.
+
+    Bases que todavía tienen la columna juez_canonico (juez crudo + canónico
+    aparte): se copia el crudo a juez_original, juez pasa a ser el canónico
+    (los triggers de citas_sentencia invalidan esas citas para re-extraerlas)
+    y los perfiles básicos creados con el nombre crudo se renombran o se
+    borran si quedaron sin sentencias.
+    """
+    columnas = {fila[1] for fila in conn.execute("PRAGMA table_info(sentencias_por_juez_arg)")}
+    if 'juez_original' not in columnas:
+        conn.execute("ALTER TABLE sentencias_por_juez_arg ADD COLUMN juez_original TEXT")
+        conn.execute("UPDATE sentencias_por_juez_arg SET juez_original = juez")
+
+        if 'juez_canonico' in columnas:
+            pares = conn.execute("""
+                SELECT DISTINCT juez, juez_canonico FROM sentencias_por_juez_arg
+                WHERE juez_canonico IS NOT NULL AND juez_canonico != juez
+            """).fetchall()
+            for crudo, canonico in pares:
+                conn.execute("""
+                    UPDATE perfiles_judiciales_argentinos SET juez = ?
+                    WHERE juez = ? AND NOT EXISTS (
+                        SELECT 1 FROM perfiles_judiciales_argentinos WHERE juez = ?)
+                """, (canonico, crudo, canonico))
+            conn.execute("""
+                UPDATE sentencias_por_juez_arg SET juez = juez_canonico
+                WHERE juez_canonico IS NOT NULL AND juez_canonico != juez
+            """)
+            for crudo, _ in pares:
+                conn.execute("""
+                    DELETE FROM perfiles_judiciales_argentinos
+                    WHERE juez = ? AND version_analyser = '1.0-ingesta' AND NOT EXISTS (
+                        SELECT 1 FROM sentencias_por_juez_arg s WHERE s.juez = ?)
+                """, (crudo, crudo))
+
+    if 'juez_canonico' in columnas:
+        conn.execute("DROP INDEX IF EXISTS idx_sentencia_juez_canonico")
+        try:
+            conn.execute("ALTER TABLE sentencias_por_juez_arg DROP COLUMN juez_canonico")
+        except sqlite3.OperationalError:
+            pass  # SQLite < 3.35: la columna queda, sin uso
+    conn.commit()
+
+
 class IngestorSentenciasJudicial:
     """
     Ingestor de sentencias para el sistema judicial argentino
     """
 
-    def __init__(self, db_path: Path = DB_FILE):
-        """Inicializa el ingestor"""
+    def __init__(self, db_path: Path = DB_FILE, politica_duplicados: str = 'vincular',
+                 umbral_duplicados: float = UMBRAL_DUPLICADO):
+        """
+        Inicializa el ingestor
+
+        Args:
+            politica_duplicados: 'omitir', 'colapsar', 'vincular' o 'ninguna'
+                                 (ver deduplicador.py)
+            umbral_duplicados: similitud de Jaccard estimada mínima
+        """
+        if politica_duplicados not in POLITICAS:
+            raise ValueError(f"Política de duplicados inválida: {politica_duplicados}")
+
         self.db_path = db_path
         self.extractor_metadata = ExtractorMetadataArgentina()
         self.conn = None
         self.cursor = None
+        self.politica_duplicados = politica_duplicados
+        self.umbral_duplicados = umbral_duplicados
+        self.detector = None
 
         # Verificar que la BD existe
         if not self.db_path.exists():
@@ -83,6 +151,16 @@ class IngestorSentenciasJudicial:
 
         # Conectar a BD
         self.conectar_bd()
+        asegurar_citas(self.conn)
+        asegurar_columna_original(self.conn)
+
+        if self.politica_duplicados != 'ninguna':
+            self.detector = DetectorDuplicados(self.conn, umbral_duplicados)
+
+        # Variantes del nombre del juez ("Dra. PEREZ, María E.") -> un único perfil
+        self.indice_jueces = obtener_indice(
+            self.db_path, "juez", "perfiles_judiciales_argentinos", "juez"
+        )
 
     def conectar_bd(self):
         """Conecta a la base de datos"""
@@ -257,28 +335,40 @@ class IngestorSentenciasJudicial:
             print_warning(f"Sentencia ya existe: {sentencia_id}")
             return False
 
-        # Guardar chunks como JSON
-        chunks_json = json.dumps(chunks, ensure_ascii=False)
+        # Casi-duplicados (re-escaneos, copias con otro nombre)
+        firma = None
+        duplicado = None
+        if self.detector:
+            firma = firma_minhash(texto_completo)
+            duplicado = self.detector.buscar('sentencia', firma)
+
+        if duplicado:
+            original, sim = duplicado
+            print_warning(f"Casi-duplicado de {original} (similitud {sim:.2f}): {self.politica_duplicados}")
+
+            if self.politica_duplicados == 'omitir':
+                return False
+            if self.politica_duplicados == 'colapsar':
+                self.detector.registrar('sentencia', sentencia_id, firma, original, sim, 'colapsar')
+                return False
 
-        # Guardar en ruta de chunks si es necesario
         chunks_file = CHUNKS_DIR / f"{sentencia_id}_chunks.json"
-        chunks_file.parent.mkdir(parents=True, exist_ok=True)
-        chunks_file.write_text(chunks_json, encoding='utf-8')
 
         # Insertar sentencia
         try:
             self.cursor.execute("""
             INSERT INTO sentencias_por_juez_arg (
-                sentencia_id, juez, archivo_original,
+                sentencia_id, juez, juez_original, archivo_original,
                 fecha_sentencia, expediente, caratula,
                 fuero, instancia, jurisdiccion, tribunal,
                 tipo_sentencia, materia, actor, demandado, resultado,
                 texto_completo, ruta_chunks,
                 fecha_procesamiento, extension_palabras
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 sentencia_id,
                 metadata['juez'],
+                metadata.get('juez_original', metadata['juez']),
                 metadata.get('archivo_original'),
                 metadata.get('fecha_sentencia'),
                 metadata.get('expediente'),
@@ -298,8 +388,23 @@ class IngestorSentenciasJudicial:
                 len(texto_completo.split())
             ))
 
-            self.conn.commit()
-            print_success(f"Sentencia guardada: {sentencia_id}")
+            # Citas extraídas una sola vez, en la misma transacción
+            n_citas = registrar_citas(self.conn, sentencia_id, metadata['juez'], texto_completo)
+
+            # Los chunks casi duplicados no llegan al archivo de chunks (lo que
+            # se embebe): quedan sólo como firma vinculada a su original
+            if self.detector:
+                chunks = self._registrar_firmas(sentencia_id, firma, duplicado, chunks)
+
+            # Guardar chunks como JSON
+            chunks_file.parent.mkdir(parents=True, exist_ok=True)
+            chunks_file.write_text(json.dumps(chunks, ensure_ascii=False), encoding='utf-8')
+
+            if self.detector:
+                self.detector.confirmar()
+            else:
+                self.conn.commit()
+            print_success(f"Sentencia guardada: {sentencia_id} ({n_citas} citas)")
 
             # Actualizar contador del juez
             self.cursor.execute("""
@@ -314,8 +419,41 @@ class IngestorSentenciasJudicial:
         except sqlite3.Error as e:
             print_error(f"Error al guardar sentencia: {e}")
             self.conn.rollback()
+            if self.detector:
+                self.detector.descartar()
             return False
 
+    def _registrar_firmas(self, sentencia_id: str, firma, duplicado, chunks: List[str]) -> List[str]:
+        """
+        Registra la firma de la sentencia y de cada chunk (en la misma
+        transacción que la sentencia). Los chunks casi idénticos a chunks ya
+        ingresados, de otra sentencia (p.ej. una apelación que transcribe la
+        primera instancia) o de ésta misma, quedan vinculados a su original.
+
+        Returns:
+            Los chunks originales, en orden (los que se guardan y se embeben)
+        """
+        original, sim = duplicado if duplicado else (None, None)
+        self.detector.registrar('sentencia', sentencia_id, firma, original, sim,
+                                self.politica_duplicados if original else None, confirmar=False)
+
+        originales = []
+        for k, chunk in enumerate(chunks):
+            firma_chunk = firma_minhash(chunk)
+            previo = self.detector.buscar('chunk', firma_chunk)
+            self.detector.registrar(
+                'chunk', f"{sentencia_id}#{k:04d}", firma_chunk,
+                previo[0] if previo else None, previo[1] if previo else None,
+                self.politica_duplicados if previo else None, confirmar=False
+            )
+            if not previo:
+                originales.append(chunk)
+
+        chunks_duplicados = len(chunks) - len(originales)
+        if chunks_duplicados:
+            print_info(f"Chunks casi duplicados omitidos: {chunks_duplicados}/{len(chunks)}")
+        return originales
+
     def procesar_sentencia(self, archivo_path: Path) -> bool:
         """
         Procesa una sentencia completa
@@ -361,6 +499,13 @@ class IngestorSentenciasJudicial:
                 if error.startswith('Advertencia'):
                     print_warning(error)
 
+            # Perfil, citas y sentencia van con el canónico; el nombre tal como
+            # figura en la sentencia queda en juez_original
+            metadata['juez_original'] = metadata['juez']
+            metadata['juez'] = self.indice_jueces.canonizar(metadata['juez_original'])
+            if metadata['juez'] != metadata['juez_original']:
+                print_info(f"Juez '{metadata['juez_original']}' → perfil '{metadata['juez']}'")
+
         except Exception as e:
             print_error(f"Error al extraer metadata: {e}")
             return False
@@ -499,6 +644,18 @@ def main():
         action='store_true',
         help='Mostrar estadísticas al final'
     )
+    parser.add_argument(
+        '--duplicados',
+        choices=POLITICAS,
+        default='vincular',
+        help='Qué hacer con sentencias casi duplicadas (default: vincular)'
+    )
+    parser.add_argument(
+        '--umbral-duplicados',
+        type=float,
+        default=UMBRAL_DUPLICADO,
+        help=f'Similitud mínima para considerar duplicado (default: {UMBRAL_DUPLICADO})'
+    )
 
     args = parser.parse_args()
 
@@ -509,7 +666,10 @@ def main():
 
     # Crear ingestor
     try:
-        ingestor = IngestorSentenciasJudicial()
+        ingestor = IngestorSentenciasJudicial(
+            politica_duplicados=args.duplicados,
+            umbral_duplicados=args.umbral_duplicados
+        )
     except FileNotFoundError as e:
         print_error(str(e))
         sys.exit(1)
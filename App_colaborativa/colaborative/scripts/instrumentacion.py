@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 MÉTRICAS POR ETAPA EN FORMATO PROMETHEUS (instrumentacion)
+=============================================================
+
+Tiempos por etapa (búsqueda, carga de índice, embeddings, Gemini, PDF,
+analizadores) sin depender de prometheus_client:
+
+- etapa_duracion_segundos{etapa}:   histograma con buckets fijos
+- etapa_total{etapa,resultado}:     contador ok | error
+- etapa_en_curso{etapa}:            gauge de llamadas en vuelo
+- fijar(nombre, valor, ...):        gauges arbitrarios (p.ej. estado de caché)
+
+La webapp lo expone en /metrics (text format 0.0.4). Los procesos batch, que
+no tienen servidor para scrapear, vuelcan el mismo texto a un archivo .prom
+al terminar (compatible con el textfile collector de node_exporter).
+
+USO:
+    from instrumentacion import medir, instrumentar, exponer, volcar
+
+    @instrumentar("buscar")
+    def buscar(q): ...
+
+    with medir("gemini"):
+        respuesta = model.generate_content(prompt)
+
+    volcar("../logs/metricas/procesar_sentencias.prom")
+
+    python instrumentacion.py --demo
+"""
+
+import argparse
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Segundos: de un lookup en memoria a una llamada lenta a Gemini
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+PREFIJO = "colaborativa_"
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatear_etiquetas(etiquetas: Etiquetas) -> str:
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{clave}="{_escapar(valor)}"' for clave, valor in etiquetas) + "}"
+
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Histograma:
+    """Conteo acumulado por bucket, suma y total (no thread-safe: lo protege el registro)"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.conteos = [0] * len(self.buckets)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.conteos[i] += 1
+                break
+        self.suma += valor
+        self.total += 1
+
+
+class RegistroMetricas:
+    """Contadores, gauges e histogramas con etiquetas, protegidos por un único lock"""
+
+    def __init__(self, prefijo: str = PREFIJO):
+        self.prefijo = prefijo
+        self._lock = threading.Lock()
+        self._ayudas: Dict[str, Tuple[str, str]] = {}
+        self._contadores: Dict[str, Dict[Etiquetas, float]] = {}
+        self._gauges: Dict[str, Dict[Etiquetas, float]] = {}
+        self._histogramas: Dict[str, Dict[Etiquetas, Histograma]] = {}
+
+    def _declarar(self, nombre: str, tipo: str, ayuda: str):
+        if nombre not in self._ayudas:
+            self._ayudas[nombre] = (tipo, ayuda)
+
+    def incrementar(self, nombre: str, valor: float = 1, ayuda: str = "", **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            self._declarar(nombre, "counter", ayuda)
+            serie = self._contadores.setdefault(nombre, {})
+            serie[clave] = serie.get(clave, 0) + valor
+
+    def sumar_gauge(self, nombre: str, valor: float, ayuda: str = "", **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            self._declarar(nombre, "gauge", ayuda)
+            serie = self._gauges.setdefault(nombre, {})
+            serie[clave] = serie.get(clave, 0) + valor
+
+    def fijar(self, nombre: str, valor: float, ayuda: str = "", **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            self._declarar(nombre, "gauge", ayuda)
+            self._gauges.setdefault(nombre, {})[clave] = valor
+
+    def observar(self, nombre: str, valor: float, ayuda: str = "", **etiquetas):
+        clave = tuple(sorted(etiquetas.items()))
+        with self._lock:
+            self._declarar(nombre, "histogram", ayuda)
+            serie = self._histogramas.setdefault(nombre, {})
+            histograma = serie.get(clave)
+            if histograma is None:
+                histograma = serie[clave] = Histograma()
+            histograma.observar(valor)
+
+    def reiniciar(self):
+        with self._lock:
+            self._ayudas.clear()
+            self._contadores.clear()
+            self._gauges.clear()
+            self._histogramas.clear()
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """{etapa: {llamadas, errores, segundos, promedio}} para imprimir al final de un batch"""
+        with self._lock:
+            duraciones = dict(self._histogramas.get("etapa_duracion_segundos", {}))
+            totales = dict(self._contadores.get("etapa_total", {}))
+            salida = {}
+            for clave, histograma in duraciones.items():
+                etapa = dict(clave).get("etapa", "")
+                errores = totales.get((("etapa", etapa), ("resultado", "error")), 0)
+                salida[etapa] = {
+                    "llamadas": histograma.total,
+                    "errores": errores,
+                    "segundos": histograma.suma,
+                    "promedio": histograma.suma / histograma.total if histograma.total else 0.0,
+                }
+            return salida
+
+    def exponer(self) -> str:
+        """Todas las series en text format 0.0.4 de Prometheus"""
+        lineas: List[str] = []
+        with self._lock:
+            for nombre in sorted(self._ayudas):
+                tipo, ayuda = self._ayudas[nombre]
+                completo = self.prefijo + nombre
+                if ayuda:
+                    lineas.append(f"# HELP {completo} {ayuda}")
+                lineas.append(f"# TYPE {completo} {tipo}")
+
+                if tipo == "histogram":
+                    for clave, h in sorted(self._histogramas.get(nombre, {}).items()):
+                        acumulado = 0
+                        for limite, conteo in zip(h.buckets, h.conteos):
+                            acumulado += conteo
+                            etiquetas = clave + (("le", _numero(limite)),)
+                            lineas.append(f"{completo}_bucket{_formatear_etiquetas(etiquetas)} {acumulado}")
+                        etiquetas = clave + (("le", "+Inf"),)
+                        lineas.append(f"{completo}_bucket{_formatear_etiquetas(etiquetas)} {h.total}")
+                        lineas.append(f"{completo}_sum{_formatear_etiquetas(clave)} {_numero(h.suma)}")
+                        lineas.append(f"{completo}_count{_formatear_etiquetas(clave)} {h.total}")
+                else:
+                    series = self._contadores if tipo == "counter" else self._gauges
+                    for clave, valor in sorted(series.get(nombre, {}).items()):
+                        lineas.append(f"{completo}{_formatear_etiquetas(clave)} {_numero(valor)}")
+        return "\n".join(lineas) + "\n"
+
+
+REGISTRO_METRICAS = RegistroMetricas()
+
+
+@contextmanager
+def medir(etapa: str, registro: RegistroMetricas = REGISTRO_METRICAS):
+    """Mide una etapa: duración, resultado ok/error y llamadas en curso"""
+    registro.sumar_gauge("etapa_en_curso", 1, "Llamadas en curso por etapa", etapa=etapa)
+    inicio = time.perf_counter()
+    resultado = "error"
+    try:
+        yield
+        resultado = "ok"
+    finally:
+        registro.observar("etapa_duracion_segundos", time.perf_counter() - inicio,
+                          "Duración de cada etapa en segundos", etapa=etapa)
+        registro.incrementar("etapa_total", 1, "Llamadas por etapa y resultado",
+                             etapa=etapa, resultado=resultado)
+        registro.sumar_gauge("etapa_en_curso", -1, etapa=etapa)
+
+
+def instrumentar(etapa: str, registro: RegistroMetricas = REGISTRO_METRICAS):
+    """Decorador equivalente a envolver el cuerpo en ``with medir(etapa)``"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(etapa, registro):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def exponer(registro: RegistroMetricas = REGISTRO_METRICAS) -> str:
+    return registro.exponer()
+
+
+def volcar(ruta, registro: RegistroMetricas = REGISTRO_METRICAS) -> Path:
+    """Escribe las métricas en ``ruta`` de forma atómica (nunca queda un .prom a medias)"""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    temporal.write_text(registro.exponer(), encoding="utf-8")
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def imprimir_resumen(registro: RegistroMetricas = REGISTRO_METRICAS):
+    resumen = registro.resumen()
+    if not resumen:
+        return
+    print("\n⏱️ Tiempos por etapa:")
+    for etapa, datos in sorted(resumen.items(), key=lambda item: -item[1]["segundos"]):
+        errores = f", {int(datos['errores'])} errores" if datos["errores"] else ""
+        print(f"   {etapa:28} {int(datos['llamadas']):>6} llamadas  "
+              f"{datos['segundos']:>9.3f}s  ({datos['promedio'] * 1000:.1f} ms/llamada{errores})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas por etapa en formato Prometheus")
+    parser.add_argument("--demo", action="store_true", help="Mide unas etapas de ejemplo e imprime el resultado")
+    parser.add_argument("--salida", help="Archivo .prom donde volcar la demo")
+    args = parser.parse_args()
+
+    if not args.demo:
+        parser.print_help()
+        return
+
+    for _ in range(3):
+        with medir("demo_rapida"):
+            time.sleep(0.002)
+    try:
+        with medir("demo_con_error"):
+            raise ValueError("error de ejemplo")
+    except ValueError:
+        pass
+
+    print(exponer(), end="")
+    imprimir_resumen()
+    if args.salida:
+        print(f"💾 Métricas en {volcar(args.salida)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,8 +33,9 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 try:
-    from chunker_inteligente import ChunkerInteligente
-    CHUNKER_DISPONIBLE = True
+    from chunker_inteligente import ChunkerInteligente, EMBEDDINGS_DISPONIBLE as CHUNKER_DISPONIBLE
+    if not CHUNKER_DISPONIBLE:
+        print("⚠️ chunker_inteligente.py sin sentence_transformers")
 except ImportError:
     CHUNKER_DISPONIBLE = False
     print("⚠️ chunker_inteligente.py no disponible")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📐 PROYECCIÓN TIPADA DE perfil_cognitivo (metricas_sentencia)
+=============================================================
+
+perfil_cognitivo es un JSON grande por sentencia, pero el agregador, el
+analizador de líneas y el motor predictivo sólo leen una docena de campos de
+analisis_judicial. metricas_sentencia guarda esos campos en columnas tipadas:
+
+- Triggers sobre sentencias_por_juez_arg (json_extract de SQLite) mantienen
+  la tabla al escribir: insert, re-análisis, cambio de juez y borrado. Ningún
+  escritor tiene que acordarse de actualizarla.
+- Sólo tienen fila las sentencias con un perfil JSON válido (objeto).
+- Los diccionarios chicos (tests, derechos, in dubio, sesgos, fuentes) quedan
+  como JSON propio; las claves que usa el motor predictivo tienen columna.
+
+USO:
+    from metricas_sentencia import asegurar_metricas, perfil_desde_metricas
+    asegurar_metricas(conn)        # crea tabla y triggers; proyecta lo existente
+    python metricas_sentencia.py --reproyectar
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+DB_FILE = SCRIPT_DIR.parent / "bases_rag" / "cognitiva" / "juez_centrico_arg.db"
+
+JUDICIAL = "$.analisis_judicial"
+
+# columna -> ruta JSON (escalares numéricos)
+COLUMNAS_REALES = {
+    'tendencia_activismo': f"{JUDICIAL}.tendencia_activismo",
+    'formalismo_vs_sustancialismo': f"{JUDICIAL}.formalismo_vs_sustancialismo",
+    'proteccion_general': f"{JUDICIAL}.proteccion_general",
+    'deferencia_legislativo': f"{JUDICIAL}.deferencia_legislativo",
+    'deferencia_ejecutivo': f"{JUDICIAL}.deferencia_ejecutivo",
+    'test_proporcionalidad': f"{JUDICIAL}.tests_aplicados.test_proporcionalidad",
+    'test_razonabilidad': f"{JUDICIAL}.tests_aplicados.test_razonabilidad",
+    'pro_operario': f"{JUDICIAL}.in_dubio_pro_aplicado.pro_operario",
+    'pro_consumidor': f"{JUDICIAL}.in_dubio_pro_aplicado.pro_consumidor",
+    'derecho_trabajo': f"{JUDICIAL}.derechos_protegidos.trabajo",
+    'derecho_igualdad': f"{JUDICIAL}.derechos_protegidos.igualdad",
+}
+
+# columna -> ruta JSON (categorías)
+COLUMNAS_TEXTO = {
+    'interpretacion_normativa': f"{JUDICIAL}.interpretacion_normativa",
+    'estandar_prueba': f"{JUDICIAL}.estandar_prueba",
+    'sesgo_dominante': f"{JUDICIAL}.sesgo_dominante",
+}
+
+# columna -> clave en analisis_judicial (diccionarios, guardados como JSON)
+COLUMNAS_DICCIONARIO = {
+    'tests_aplicados': 'tests_aplicados',
+    'derechos_protegidos': 'derechos_protegidos',
+    'in_dubio_pro_aplicado': 'in_dubio_pro_aplicado',
+    'sesgos_detectados': 'sesgos_detectados',
+    'fuentes_citadas': 'fuentes_citadas',
+}
+
+# Escalares que forman parte de analisis_judicial (el resto son derivados)
+ESCALARES_JUDICIALES = (
+    'tendencia_activismo', 'formalismo_vs_sustancialismo', 'proteccion_general',
+    'deferencia_legislativo', 'deferencia_ejecutivo'
+)
+
+
+def _ddl() -> str:
+    columnas = ["sentencia_id TEXT PRIMARY KEY", "juez TEXT NOT NULL",
+                "perfil_vacio INTEGER", "tiene_judicial INTEGER", "tiene_cognitivo INTEGER"]
+    columnas += [f"{c} REAL" for c in COLUMNAS_REALES]
+    columnas += [f"{c} TEXT" for c in COLUMNAS_TEXTO]
+    columnas += [f"{c} TEXT" for c in COLUMNAS_DICCIONARIO]
+    return (
+        "CREATE TABLE IF NOT EXISTS metricas_sentencia (\n    "
+        + ",\n    ".join(columnas)
+        + "\n);\n"
+        "CREATE INDEX IF NOT EXISTS idx_metricas_juez ON metricas_sentencia(juez);\n"
+        "CREATE INDEX IF NOT EXISTS idx_metricas_interpretacion "
+        "ON metricas_sentencia(juez, interpretacion_normativa);\n"
+    )
+
+
+def _columnas() -> str:
+    return ", ".join(
+        ["sentencia_id", "juez", "perfil_vacio", "tiene_judicial", "tiene_cognitivo"]
+        + list(COLUMNAS_REALES) + list(COLUMNAS_TEXTO) + list(COLUMNAS_DICCIONARIO)
+    )
+
+
+def _proyeccion(origen: str) -> str:
+    """Expresiones SELECT que proyectan ``origen``.perfil_cognitivo (origen = NEW o alias)"""
+    p = f"{origen}.perfil_cognitivo"
+    expresiones = [
+        f"{origen}.sentencia_id",
+        f"{origen}.juez",
+        f"json({p}) = '{{}}'",
+        f"CASE WHEN json_type({p}, '{JUDICIAL}') = 'object' "
+        f"THEN json_extract({p}, '{JUDICIAL}') != '{{}}' ELSE 0 END",
+        f"""CASE json_type({p}, '$.analisis_cognitivo')
+            WHEN 'object' THEN json_extract({p}, '$.analisis_cognitivo') != '{{}}'
+            WHEN 'array' THEN json_extract({p}, '$.analisis_cognitivo') != '[]'
+            WHEN 'text' THEN json_extract({p}, '$.analisis_cognitivo') != ''
+            WHEN 'integer' THEN json_extract({p}, '$.analisis_cognitivo') != 0
+            WHEN 'real' THEN json_extract({p}, '$.analisis_cognitivo') != 0
+            WHEN 'true' THEN 1 ELSE 0 END""",
+    ]
+    expresiones += [f"CAST(json_extract({p}, '{ruta}') AS REAL)" for ruta in COLUMNAS_REALES.values()]
+    expresiones += [f"json_extract({p}, '{ruta}')" for ruta in COLUMNAS_TEXTO.values()]
+    expresiones += [
+        f"CASE WHEN json_type({p}, '{JUDICIAL}.{clave}') = 'object' "
+        f"THEN json_extract({p}, '{JUDICIAL}.{clave}') END"
+        for clave in COLUMNAS_DICCIONARIO.values()
+    ]
+    return ",\n        ".join(expresiones)
+
+
+def _valido(origen: str) -> str:
+    # CASE garantiza que json_type no se evalúe sobre JSON inválido (daría error)
+    p = f"{origen}.perfil_cognitivo"
+    return f"CASE WHEN json_valid({p}) THEN json_type({p}) = 'object' ELSE 0 END"
+
+
+def _triggers() -> str:
+    insertar = f"""
+    INSERT OR REPLACE INTO metricas_sentencia ({_columnas()})
+    SELECT {_proyeccion('NEW')}
+    WHERE NEW.perfil_cognitivo IS NOT NULL AND {_valido('NEW')};"""
+    return f"""
+CREATE TRIGGER IF NOT EXISTS trg_metricas_insert
+AFTER INSERT ON sentencias_por_juez_arg
+WHEN NEW.perfil_cognitivo IS NOT NULL
+BEGIN{insertar}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_metricas_update
+AFTER UPDATE OF perfil_cognitivo, juez, sentencia_id ON sentencias_por_juez_arg
+BEGIN
+    DELETE FROM metricas_sentencia WHERE sentencia_id = OLD.sentencia_id;{insertar}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_metricas_delete
+AFTER DELETE ON sentencias_por_juez_arg
+BEGIN
+    DELETE FROM metricas_sentencia WHERE sentencia_id = OLD.sentencia_id;
+END;
+"""
+
+
+def reproyectar(conn: sqlite3.Connection) -> int:
+    """Recalcula metricas_sentencia completa con un único INSERT ... SELECT"""
+    conn.execute("DELETE FROM metricas_sentencia")
+    cursor = conn.execute(f"""
+    INSERT INTO metricas_sentencia ({_columnas()})
+    SELECT {_proyeccion('s')}
+    FROM sentencias_por_juez_arg s
+    WHERE s.perfil_cognitivo IS NOT NULL AND {_valido('s')}
+    """)
+    conn.commit()
+    return cursor.rowcount
+
+
+def asegurar_metricas(conn: sqlite3.Connection) -> int:
+    """
+    Crea metricas_sentencia y sus triggers si faltan. La primera vez proyecta
+    las sentencias existentes. Devuelve cuántas filas proyectó (0 si ya existía).
+    """
+    existia = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metricas_sentencia'"
+    ).fetchone()
+    conn.executescript(_ddl() + _triggers())
+    if existia:
+        return 0
+    return reproyectar(conn)
+
+
+def perfil_desde_metricas(fila: Optional[Dict]) -> Dict:
+    """
+    Reconstruye un perfil mínimo {'analisis_judicial': {...}} desde una fila de
+    metricas_sentencia, con las mismas claves que el JSON original. {} si la
+    sentencia no tiene perfil válido o está vacío.
+    """
+    if not fila or fila.get('perfil_vacio') is None or fila['perfil_vacio']:
+        return {}
+
+    judicial = {}
+    if fila.get('tiene_judicial'):
+        for campo in ESCALARES_JUDICIALES + tuple(COLUMNAS_TEXTO):
+            if fila.get(campo) is not None:
+                judicial[campo] = fila[campo]
+        for columna, clave in COLUMNAS_DICCIONARIO.items():
+            if fila.get(columna):
+                judicial[clave] = json.loads(fila[columna])
+    return {'analisis_judicial': judicial}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proyección tipada de perfil_cognitivo")
+    parser.add_argument("--db", default=str(DB_FILE))
+    parser.add_argument("--reproyectar", action="store_true", help="Recalcula toda la tabla")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    filas = asegurar_metricas(conn)
+    if args.reproyectar:
+        filas = reproyectar(conn)
+    total = conn.execute("SELECT COUNT(*) FROM metricas_sentencia").fetchone()[0]
+    print(f"📐 metricas_sentencia: {total} sentencias proyectadas ({filas} en esta corrida)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,19 +19,41 @@ Modelos:
 - Logistic Regression
 - Feature importance analysis
 
+Entrenamiento masivo (entrenar_todos_los_jueces / --todos): una sola pasada
+sobre las sentencias arma la matriz de factores de todos los jueces, los
+bosques se ajustan en un pool de procesos (procesos x hilos acotados) y se
+omiten los jueces sin sentencias nuevas desde su último modelo (marca de
+datos en manifiesto_modelos.json).
+
+Actualización incremental (actualizar_modelo / --actualizar): las sentencias
+con id posterior a la marca del modelo se suman a su matriz de entrenamiento
+y el bosque crece con warm_start (ARBOLES_POR_ACTUALIZACION árboles nuevos)
+en vez de reentrenarse. Si cambió el etiquetado de sentencias anteriores a la
+marca (p.ej. una que recibió su resultado después), se reentrena de cero.
+predecir() no cambia.
+
+USO:
+    python motor_predictivo_judicial.py "Juez X"
+    python motor_predictivo_judicial.py --todos --procesos 4 --hilos 1 [--forzar]
+    python motor_predictivo_judicial.py --actualizar ["Juez X"]
+
 AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
 import sqlite3
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 import pickle
 
+from metricas_sentencia import asegurar_metricas, perfil_desde_metricas
+
 try:
     from sklearn.ensemble import RandomForestClassifier
     from sklearn.linear_model import LogisticRegression
@@ -50,6 +72,17 @@ BASE_DIR = SCRIPT_DIR.parent
 BASES_RAG_DIR = BASE_DIR / "bases_rag" / "cognitiva"
 DB_FILE = BASES_RAG_DIR / "juez_centrico_arg.db"
 MODELS_DIR = BASES_RAG_DIR / "modelos_predictivos"
+MANIFIESTO_MODELOS = MODELS_DIR / "manifiesto_modelos.json"
+
+# Filas por fetchmany al recorrer todas las sentencias (el texto no se acumula)
+TAMANO_LOTE_FILAS = 500
+
+# Actualización incremental: árboles que se agregan por tanda de sentencias
+# nuevas y tope del bosque (al superarlo se reajusta con N_ARBOLES desde la
+# matriz guardada, sin volver a extraer factores)
+N_ARBOLES = 50
+ARBOLES_POR_ACTUALIZACION = 10
+MAX_ARBOLES = 200
 
 # Colores
 class Colors:
@@ -188,23 +221,222 @@ class ExtractorFactores:
 
             return vector, feature_names
 
-        # Usar feature_names dados
+        # Usar feature_names dados. Los one-hot se comparan por nombre
+        # completo: tanto la clave como el valor pueden tener '_'
+        # (p.ej. estandar_prueba_sana_critica)
+        activos = {f"{key}_{value}" for key, value in factores.items() if isinstance(value, str)}
         vector = []
         for fname in feature_names:
-            if '_' in fname:
-                # Es un one-hot encoding
-                key, valor = fname.rsplit('_', 1)
-                if factores.get(key) == valor:
-                    vector.append(1)
-                else:
-                    vector.append(0)
+            valor = factores.get(fname)
+            if isinstance(valor, (int, float)):
+                vector.append(valor)
             else:
-                # Es un valor numérico
-                vector.append(factores.get(fname, 0))
+                vector.append(1 if fname in activos else 0)
 
         return vector, feature_names
 
 
+# =============================================================================
+# MATRIZ DE FACTORES, AJUSTE Y GUARDADO
+# =============================================================================
+
+def ruta_modelo(juez: str, models_dir: Path = MODELS_DIR) -> Path:
+    return Path(models_dir) / f"modelo_{juez.replace(' ', '_')}.pkl"
+
+
+def construir_matriz(lista_factores: List[Dict]) -> Tuple["np.ndarray", List[str]]:
+    """
+    Matriz de factores con un vocabulario común a todas las filas: los
+    numéricos van tal cual y los categóricos en one-hot (clave_valor).
+    """
+    nombres = set()
+    for factores in lista_factores:
+        for key, value in factores.items():
+            if isinstance(value, (int, float)):
+                nombres.add(key)
+            elif isinstance(value, str):
+                nombres.add(f"{key}_{value}")
+    feature_names = sorted(nombres)
+    columna = {fname: j for j, fname in enumerate(feature_names)}
+
+    X = np.zeros((len(lista_factores), len(feature_names)), dtype=np.float32)
+    for i, factores in enumerate(lista_factores):
+        for key, value in factores.items():
+            if isinstance(value, (int, float)):
+                X[i, columna[key]] = value
+            elif isinstance(value, str):
+                X[i, columna[f"{key}_{value}"]] = 1
+    return X, feature_names
+
+
+def ajustar_modelo(X: "np.ndarray", y: "np.ndarray", feature_names: List[str],
+                   n_jobs: int = 1) -> Optional[Dict]:
+    """
+    Ajusta el Random Forest de un juez. Devuelve modelo_data (sin guardar) o
+    None si hay una sola clase.
+    """
+    y = np.asarray(y)
+    if len(set(y)) < 2:
+        return None
+
+    # Columnas siempre en cero para este juez no aportan nada
+    usadas = np.flatnonzero(np.any(X != 0, axis=0))
+    X = X[:, usadas]
+    feature_names = [feature_names[j] for j in usadas]
+
+    # Dividir train/test
+    if len(y) >= 10:
+        _, conteos = np.unique(y, return_counts=True)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y if conteos.min() >= 2 else None
+        )
+    else:
+        # Muy pocas sentencias, usar todas para entrenar
+        X_train, X_test, y_train, y_test = X, X, y, y
+
+    modelo = RandomForestClassifier(
+        n_estimators=N_ARBOLES,
+        max_depth=5,
+        min_samples_split=2,
+        random_state=42,
+        n_jobs=n_jobs
+    )
+    modelo.fit(X_train, y_train)
+    accuracy = accuracy_score(y_test, modelo.predict(X_test))
+
+    return {
+        'modelo': modelo,
+        'feature_names': feature_names,
+        'accuracy': accuracy,
+        'n_sentencias': len(y),
+        'clases': sorted(set(y)),
+        'feature_importance': importancias(modelo, feature_names),
+        'fecha_entrenamiento': datetime.now().isoformat(),
+        # Matriz de entrenamiento: permite crecer el bosque sin re-extraer factores
+        'X_entrenamiento': X,
+        'y_entrenamiento': y
+    }
+
+
+def importancias(modelo, feature_names: List[str]) -> List[Tuple[str, float]]:
+    feature_importance = [(fname, float(imp)) for fname, imp in zip(feature_names, modelo.feature_importances_)]
+    feature_importance.sort(key=lambda x: x[1], reverse=True)
+    return feature_importance
+
+
+def crecer_modelo(modelo_data: Dict, X_nuevo: "np.ndarray", y_nuevo: "np.ndarray",
+                  arboles: int = ARBOLES_POR_ACTUALIZACION) -> Dict:
+    """
+    Incorpora sentencias nuevas (ya vectorizadas con modelo_data['feature_names'])
+    a un modelo existente:
+
+    - accuracy_ultimas se mide sobre las sentencias nuevas ANTES de sumarlas
+      (el modelo no las vio: es una evaluación honesta)
+    - el bosque crece con warm_start: ``arboles`` árboles nuevos ajustados
+      sobre la matriz acumulada; los existentes no se tocan
+    - si aparece una clase que el bosque no conoce, o se pasaría de
+      MAX_ARBOLES, se reajusta desde la matriz acumulada (ajustar_modelo)
+    """
+    modelo = modelo_data['modelo']
+    X_nuevo = np.asarray(X_nuevo, dtype=np.float32)
+    y_nuevo = np.asarray(y_nuevo, dtype=object)
+    accuracy_ultimas = float(accuracy_score(y_nuevo, modelo.predict(X_nuevo)))
+
+    X = np.vstack([modelo_data['X_entrenamiento'], X_nuevo])
+    y = np.concatenate([np.asarray(modelo_data['y_entrenamiento'], dtype=object), y_nuevo])
+
+    clase_nueva = not set(y_nuevo) <= set(modelo.classes_)
+    if clase_nueva or len(modelo.estimators_) + arboles > MAX_ARBOLES:
+        nuevo = ajustar_modelo(X, y, modelo_data['feature_names'], n_jobs=modelo.n_jobs or 1)
+        if nuevo is None:
+            raise ValueError(f"Solo hay una clase ({set(y)})")
+        nuevo['reajustado'] = True
+    else:
+        modelo.set_params(warm_start=True, n_estimators=len(modelo.estimators_) + arboles)
+        modelo.fit(X, y)
+        modelo.set_params(warm_start=False)
+        nuevo = dict(modelo_data)
+        nuevo.update({
+            'n_sentencias': len(y),
+            'clases': sorted(set(y)),
+            'feature_importance': importancias(modelo, modelo_data['feature_names']),
+            'X_entrenamiento': X,
+            'y_entrenamiento': y,
+            'reajustado': False
+        })
+
+    nuevo['accuracy_ultimas'] = accuracy_ultimas
+    nuevo['fecha_actualizacion'] = datetime.now().isoformat()
+    nuevo['actualizaciones'] = modelo_data.get('actualizaciones', 0) + 1
+    return nuevo
+
+
+def guardar_modelo(ruta: Path, modelo_data: Dict):
+    # Escritura atómica: un proceso que muere a mitad no deja un pickle roto
+    temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    with open(temporal, 'wb') as f:
+        pickle.dump(modelo_data, f)
+    os.replace(temporal, ruta)
+
+
+def leer_manifiesto_modelos(ruta: Path = MANIFIESTO_MODELOS) -> Dict[str, Dict]:
+    """{juez: {'marca': {...}, 'ruta': ..., 'fecha': ...}} del último entrenamiento"""
+    if not ruta.exists():
+        return {}
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_manifiesto_modelos(manifiesto: Dict[str, Dict], ruta: Path = MANIFIESTO_MODELOS):
+    temporal = ruta.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+def limitar_hilos(hilos: int):
+    """
+    Inicializador de los procesos del pool: cada uno usa a lo sumo ``hilos``
+    hilos (BLAS/OpenMP), así procesos x hilos no sobresuscribe la CPU.
+    """
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = str(hilos)
+    try:
+        from threadpoolctl import threadpool_limits
+        global _LIMITE_HILOS
+        _LIMITE_HILOS = threadpool_limits(limits=hilos)
+    except ImportError:
+        pass
+
+
+def entrenar_en_proceso(tarea: Tuple) -> Dict:
+    """
+    Ajusta y guarda el modelo de un juez a partir de su bloque de la matriz
+    compartida. Función de módulo para correr en un ProcessPoolExecutor: el
+    bosque se guarda acá y al proceso principal sólo vuelve el resumen.
+    """
+    juez, X, y, feature_names, marca, ruta, hilos = tarea
+    try:
+        modelo_data = ajustar_modelo(X, y, feature_names, n_jobs=hilos)
+        if modelo_data is None:
+            return {'juez': juez, 'error': f"Solo hay una clase ({set(y)})"}
+        modelo_data['marca_datos'] = marca
+        guardar_modelo(Path(ruta), modelo_data)
+    except Exception as e:
+        return {'juez': juez, 'error': str(e)}
+    return {
+        'juez': juez,
+        'ruta': str(ruta),
+        'accuracy': modelo_data['accuracy'],
+        'n_sentencias': modelo_data['n_sentencias'],
+        'feature_importance': modelo_data['feature_importance'],
+        'marca': marca,
+    }
+
+
 class MotorPredictivoJudicial:
     """
     Motor de predicción de decisiones judiciales
@@ -230,52 +462,82 @@ class MotorPredictivoJudicial:
 
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
+        asegurar_metricas(self.conn)
 
     def cerrar_bd(self):
         """Cierra la conexión"""
         if self.conn:
             self.conn.close()
 
-    def obtener_sentencias_juez(self, juez: str) -> List[Dict]:
-        """Obtiene sentencias de un juez con resultado conocido"""
+    def obtener_sentencias_juez(self, juez: str, desde_id: int = 0) -> List[Dict]:
+        """
+        Obtiene sentencias de un juez con resultado conocido (sólo las de id
+        mayor a ``desde_id`` si se indica: las nuevas desde la marca de un modelo)
+        """
+        # El perfil se arma desde metricas_sentencia (sin json.loads del perfil completo)
         self.cursor.execute("""
         SELECT
-            sentencia_id,
-            materia,
-            resultado,
-            actor,
-            demandado,
-            perfil_cognitivo,
-            texto_completo
-        FROM sentencias_por_juez_arg
-        WHERE juez = ?
-          AND resultado IS NOT NULL
-          AND resultado != ''
-        """, (juez,))
+            s.id,
+            s.sentencia_id,
+            s.materia,
+            s.resultado,
+            s.actor,
+            s.demandado,
+            s.texto_completo,
+            m.*
+        FROM sentencias_por_juez_arg s
+        LEFT JOIN metricas_sentencia m ON m.sentencia_id = s.sentencia_id
+        WHERE s.juez = ?
+          AND s.id > ?
+          AND s.resultado IS NOT NULL
+          AND s.resultado != ''
+        ORDER BY s.id
+        """, (juez, desde_id or 0))
+        columnas_metricas = [desc[0] for desc in self.cursor.description[7:]]
 
         sentencias = []
         for row in self.cursor.fetchall():
-            sent_id, materia, resultado, actor, demandado, perfil_json, texto = row
-
-            perfil = {}
-            if perfil_json:
-                try:
-                    perfil = json.loads(perfil_json)
-                except:
-                    pass
+            fila_id, sent_id, materia, resultado, actor, demandado, texto = row[:7]
 
             sentencias.append({
+                'id': fila_id,
                 'sentencia_id': sent_id,
                 'materia': materia,
                 'resultado': resultado,
                 'actor': actor,
                 'demandado': demandado,
-                'perfil': perfil,
+                'perfil': perfil_desde_metricas(dict(zip(columnas_metricas, row[7:]))),
                 'texto_completo': texto
             })
 
         return sentencias
 
+    @staticmethod
+    def marca_de(sentencias: List[Dict], previa: Optional[Dict] = None) -> Dict:
+        """Marca de datos hasta la que llega un modelo entrenado con ``sentencias``"""
+        previa = previa or {'n_sentencias': 0, 'hasta_id': 0}
+        return {
+            'n_sentencias': previa['n_sentencias'] + len(sentencias),
+            'hasta_id': max([previa['hasta_id'] or 0] + [s['id'] for s in sentencias])
+        }
+
+    def marcas_datos(self, juez: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Marca de datos por juez: cantidad de sentencias con resultado y el
+        mayor id (AUTOINCREMENT) entre ellas. Cambia si entra una sentencia nueva.
+        """
+        consulta = """
+        SELECT juez, COUNT(*), MAX(id)
+        FROM sentencias_por_juez_arg
+        WHERE resultado IS NOT NULL AND resultado != ''
+        """
+        parametros: Tuple = ()
+        if juez is not None:
+            consulta += " AND juez = ?"
+            parametros = (juez,)
+        self.cursor.execute(consulta + " GROUP BY juez", parametros)
+        return {row[0]: {'n_sentencias': row[1], 'hasta_id': row[2]} for row in self.cursor.fetchall()}
+
     def entrenar_modelo(self, juez: str, min_sentencias: int = 5) -> Optional[Dict]:
         """
         Entrena un modelo predictivo para un juez
@@ -295,27 +557,8 @@ class MotorPredictivoJudicial:
         print_success(f"  Sentencias disponibles: {len(sentencias)}")
 
         # Extraer factores
-        X = []  # Features
-        y = []  # Labels (resultados)
-        feature_names_list = []
-
-        for sent in sentencias:
-            factores = self.extractor.extraer_factores(sent)
-            vector, fnames = self.extractor.factores_a_vector(factores)
-
-            if not feature_names_list:
-                feature_names_list = fnames
-
-            X.append(vector)
-            y.append(sent['resultado'])
-
-        if not X:
-            print_error("  No se pudieron extraer factores")
-            return None
-
-        # Convertir a numpy
-        X = np.array(X)
-        y = np.array(y)
+        X, feature_names_list = construir_matriz([self.extractor.extraer_factores(s) for s in sentencias])
+        y = np.array([s['resultado'] for s in sentencias])
 
         # Verificar variabilidad
         if len(set(y)) < 2:
@@ -324,55 +567,25 @@ class MotorPredictivoJudicial:
 
         print_info(f"  Features: {len(feature_names_list)}, Clases: {set(y)}")
 
-        # Dividir train/test
-        if len(sentencias) >= 10:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y if len(set(y)) > 1 else None
-            )
-        else:
-            # Muy pocas sentencias, usar todas para entrenar
-            X_train, X_test, y_train, y_test = X, X, y, y
-
         # Entrenar Random Forest
         try:
-            modelo = RandomForestClassifier(
-                n_estimators=50,
-                max_depth=5,
-                min_samples_split=2,
-                random_state=42
-            )
-            modelo.fit(X_train, y_train)
+            modelo_data = ajustar_modelo(X, y, feature_names_list)
+            modelo_data['marca_datos'] = self.marca_de(sentencias)
 
-            # Evaluar
-            y_pred = modelo.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
-
-            print_success(f"  Accuracy: {accuracy:.2%}")
-
-            # Feature importance
-            importances = modelo.feature_importances_
-            feature_importance = list(zip(feature_names_list, importances))
-            feature_importance.sort(key=lambda x: x[1], reverse=True)
+            print_success(f"  Accuracy: {modelo_data['accuracy']:.2%}")
 
+            feature_importance = modelo_data['feature_importance']
             print_info("  Top 5 factores importantes:")
             for fname, importance in feature_importance[:5]:
                 print(f"    - {fname}: {importance:.3f}")
 
-            # Guardar modelo
-            modelo_data = {
-                'modelo': modelo,
-                'feature_names': feature_names_list,
-                'accuracy': accuracy,
-                'n_sentencias': len(sentencias),
-                'clases': list(set(y)),
-                'feature_importance': feature_importance,
-                'fecha_entrenamiento': datetime.now().isoformat()
-            }
-
             # Guardar en disco
-            modelo_path = self.models_dir / f"modelo_{juez.replace(' ', '_')}.pkl"
-            with open(modelo_path, 'wb') as f:
-                pickle.dump(modelo_data, f)
+            modelo_path = ruta_modelo(juez, self.models_dir)
+            guardar_modelo(modelo_path, modelo_data)
+            self.registrar_en_manifiesto({juez: {
+                'marca': modelo_data['marca_datos'], 'ruta': str(modelo_path),
+                'fecha': modelo_data['fecha_entrenamiento']
+            }})
 
             print_success(f"  Modelo guardado: {modelo_path.name}")
 
@@ -385,6 +598,106 @@ class MotorPredictivoJudicial:
             print_error(f"  Error al entrenar: {e}")
             return None
 
+    def actualizar_modelo(self, juez: str, arboles: int = ARBOLES_POR_ACTUALIZACION) -> Optional[Dict]:
+        """
+        Suma al modelo del juez las sentencias etiquetadas posteriores a su
+        marca de datos (crecer_modelo). Si el modelo no existe, es anterior a
+        la actualización incremental (no guarda su matriz) o las sentencias
+        nuevas no explican la cantidad etiquetada actual (se etiquetó o
+        desetiquetó alguna con id menor a la marca), entrena de cero.
+
+        Returns:
+            modelo_data actualizado, el vigente si no hay sentencias nuevas, o None
+        """
+        modelo_path = ruta_modelo(juez, self.models_dir)
+        modelo_data = None
+        if modelo_path.exists():
+            with open(modelo_path, 'rb') as f:
+                modelo_data = pickle.load(f)
+        if not modelo_data or 'X_entrenamiento' not in modelo_data or not modelo_data.get('marca_datos'):
+            print_info(f"{juez}: sin modelo incremental previo, entrenamiento completo")
+            return self.entrenar_modelo(juez)
+
+        marca = modelo_data['marca_datos']
+        nuevas = self.obtener_sentencias_juez(juez, desde_id=marca['hasta_id'])
+        vigente = self.marcas_datos(juez).get(juez, {'n_sentencias': 0})
+        if marca['n_sentencias'] + len(nuevas) != vigente['n_sentencias']:
+            print_info(f"{juez}: cambió el etiquetado anterior a id {marca['hasta_id']} "
+                       f"({marca['n_sentencias'] + len(nuevas)} != {vigente['n_sentencias']}), "
+                       f"entrenamiento completo")
+            return self.entrenar_modelo(juez)
+        if not nuevas:
+            print_info(f"{juez}: sin sentencias nuevas desde id {marca['hasta_id']}")
+            return modelo_data
+
+        # Vectorizar con las columnas del modelo: un valor categórico nunca
+        # visto (p.ej. una materia nueva) no tiene columna hasta el próximo
+        # entrenamiento completo
+        feature_names = modelo_data['feature_names']
+        conocidas = set(feature_names)
+        X_nuevo, y_nuevo, ignorados = [], [], Counter()
+        for sent in nuevas:
+            factores = self.extractor.extraer_factores(sent)
+            ignorados.update(f"{key}_{value}" for key, value in factores.items()
+                             if isinstance(value, str) and f"{key}_{value}" not in conocidas)
+            vector, _ = self.extractor.factores_a_vector(factores, feature_names=feature_names)
+            X_nuevo.append(vector)
+            y_nuevo.append(sent['resultado'])
+
+        try:
+            modelo_data = crecer_modelo(modelo_data, X_nuevo, y_nuevo, arboles)
+        except Exception as e:
+            print_error(f"{juez}: error al actualizar: {e}")
+            return None
+        modelo_data['marca_datos'] = self.marca_de(nuevas, marca)
+        modelo_data['factores_sin_columna'] = dict(ignorados)
+
+        guardar_modelo(modelo_path, modelo_data)
+        self.registrar_en_manifiesto({juez: {
+            'marca': modelo_data['marca_datos'], 'ruta': str(modelo_path),
+            'fecha': modelo_data['fecha_actualizacion']
+        }})
+        self.guardar_factores_bd(juez, modelo_data['feature_importance'])
+
+        modo = "reajustado" if modelo_data['reajustado'] else f"+{arboles} árboles"
+        print_success(f"{juez}: {len(nuevas)} sentencias nuevas ({modo}, "
+                      f"{len(modelo_data['modelo'].estimators_)} árboles), "
+                      f"accuracy sobre ellas {modelo_data['accuracy_ultimas']:.2%}")
+        if ignorados:
+            print_warning(f"  Factores sin columna en el modelo (requieren --todos --forzar): "
+                          f"{', '.join(sorted(ignorados))}")
+        return modelo_data
+
+    def actualizar_modelos(self, arboles: int = ARBOLES_POR_ACTUALIZACION) -> Dict:
+        """
+        Pasada nocturna: actualiza incrementalmente a los jueces con modelo
+        cuya marca de datos quedó atrás. Los jueces sin modelo quedan para
+        entrenar_todos_los_jueces. Sólo cuenta como actualizado el juez cuyo
+        modelo quedó con la marca vigente.
+        """
+        marcas = self.marcas_datos()
+        manifiesto = leer_manifiesto_modelos(self.models_dir / MANIFIESTO_MODELOS.name)
+        atrasados = [juez for juez, marca in sorted(marcas.items())
+                     if juez in manifiesto and manifiesto[juez].get('marca') != marca]
+        sin_modelo = sum(1 for juez in marcas if juez not in manifiesto)
+        print_info(f"Jueces con sentencias nuevas: {len(atrasados)} (sin modelo: {sin_modelo})")
+
+        actualizados = fallidos = 0
+        for juez in atrasados:
+            modelo_data = self.actualizar_modelo(juez, arboles)
+            if modelo_data and modelo_data.get('marca_datos') == marcas[juez]:
+                actualizados += 1
+            else:
+                fallidos += 1
+        return {'total': len(marcas), 'actualizados': actualizados,
+                'fallidos': fallidos, 'sin_modelo': sin_modelo}
+
+    def registrar_en_manifiesto(self, entradas: Dict[str, Dict]):
+        ruta = self.models_dir / MANIFIESTO_MODELOS.name
+        manifiesto = leer_manifiesto_modelos(ruta)
+        manifiesto.update(entradas)
+        guardar_manifiesto_modelos(manifiesto, ruta)
+
     def guardar_factores_bd(self, juez: str, feature_importance: List[Tuple[str, float]]):
         """Guarda factores predictivos en la BD"""
         # Limpiar factores antiguos
@@ -427,7 +740,7 @@ class MotorPredictivoJudicial:
             Diccionario con predicción o None
         """
         # Cargar modelo
-        modelo_path = self.models_dir / f"modelo_{juez.replace(' ', '_')}.pkl"
+        modelo_path = ruta_modelo(juez, self.models_dir)
 
         if not modelo_path.exists():
             print_error(f"Modelo no encontrado para {juez}")
@@ -462,47 +775,165 @@ class MotorPredictivoJudicial:
 
         return resultado
 
-    def entrenar_todos_los_jueces(self, min_sentencias: int = 5) -> Dict:
-        """Entrena modelos para todos los jueces"""
+    def matriz_compartida(self, jueces: List[str]) -> Tuple["np.ndarray", List[str], "np.ndarray",
+                                                           Dict[str, Tuple[int, int]], Dict[str, Dict]]:
+        """
+        Una sola pasada sobre las sentencias con resultado de ``jueces``:
+        devuelve (X, feature_names, y, {juez: (desde, hasta)}, {juez: marca})
+        con las filas de cada juez contiguas. La marca sale de las filas
+        leídas, no de una consulta previa. El texto se descarta apenas se
+        extraen los factores.
+        """
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS jueces_a_entrenar (juez TEXT PRIMARY KEY)")
+        self.cursor.execute("DELETE FROM jueces_a_entrenar")
+        self.cursor.executemany("INSERT OR IGNORE INTO jueces_a_entrenar VALUES (?)", [(j,) for j in jueces])
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT
+            s.juez,
+            s.id,
+            s.sentencia_id,
+            s.materia,
+            s.resultado,
+            s.actor,
+            s.demandado,
+            s.texto_completo,
+            m.*
+        FROM sentencias_por_juez_arg s
+        JOIN jueces_a_entrenar j ON j.juez = s.juez
+        LEFT JOIN metricas_sentencia m ON m.sentencia_id = s.sentencia_id
+        WHERE s.resultado IS NOT NULL
+          AND s.resultado != ''
+        ORDER BY s.juez, s.id
+        """)
+        columnas_metricas = [desc[0] for desc in cursor.description[8:]]
+
+        lista_factores = []
+        resultados = []
+        rangos: Dict[str, Tuple[int, int]] = {}
+        hasta_ids: Dict[str, int] = {}
+        while True:
+            filas = cursor.fetchmany(TAMANO_LOTE_FILAS)
+            if not filas:
+                break
+            for row in filas:
+                juez, fila_id, sent_id, materia, resultado, actor, demandado, texto = row[:8]
+                lista_factores.append(self.extractor.extraer_factores({
+                    'sentencia_id': sent_id,
+                    'materia': materia,
+                    'actor': actor,
+                    'demandado': demandado,
+                    'perfil': perfil_desde_metricas(dict(zip(columnas_metricas, row[8:]))),
+                    'texto_completo': texto
+                }))
+                resultados.append(resultado)
+                desde, _ = rangos.get(juez, (len(resultados) - 1, 0))
+                rangos[juez] = (desde, len(resultados))
+                hasta_ids[juez] = fila_id
+        cursor.close()
+
+        marcas = {juez: {'n_sentencias': hasta - desde, 'hasta_id': hasta_ids[juez]}
+                  for juez, (desde, hasta) in rangos.items()}
+        X, feature_names = construir_matriz(lista_factores)
+        return X, feature_names, np.array(resultados, dtype=object), rangos, marcas
+
+    def entrenar_todos_los_jueces(self, min_sentencias: int = 5, procesos: Optional[int] = None,
+                                  hilos_por_proceso: int = 1, forzar: bool = False) -> Dict:
+        """
+        Entrena modelos para todos los jueces.
+
+        Los factores de todos los jueces a entrenar se extraen en una sola
+        pasada (matriz_compartida) y los bosques se ajustan en ``procesos``
+        procesos de ``hilos_por_proceso`` hilos cada uno. Se omiten los jueces
+        cuya marca de datos coincide con la de su último modelo (salvo ``forzar``).
+        """
         print(f"\n{Colors.BOLD}{'='*70}")
         print("ENTRENAMIENTO DE MODELOS PREDICTIVOS - TODOS LOS JUECES")
         print(f"{'='*70}{Colors.ENDC}\n")
 
-        # Obtener jueces
-        self.cursor.execute("""
-        SELECT DISTINCT juez
-        FROM sentencias_por_juez_arg
-        WHERE resultado IS NOT NULL AND resultado != ''
-        """)
-
-        jueces = [row[0] for row in self.cursor.fetchall()]
+        # Jueces y su marca de datos actual
+        marcas = self.marcas_datos()
 
-        if not jueces:
+        if not marcas:
             print_error("No hay jueces con sentencias y resultados")
             return {'total': 0, 'entrenados': 0}
 
-        print_info(f"Jueces candidatos: {len(jueces)}")
+        hilos_por_proceso = max(1, hilos_por_proceso)
+        procesos = procesos or max(1, (os.cpu_count() or 1) // hilos_por_proceso)
+        print_info(f"Jueces candidatos: {len(marcas)} ({procesos} procesos x {hilos_por_proceso} hilos)")
+
+        manifiesto = leer_manifiesto_modelos(self.models_dir / MANIFIESTO_MODELOS.name)
+        a_entrenar = []
+        insuficientes = omitidos = 0
+        for juez, marca in sorted(marcas.items()):
+            previo = manifiesto.get(juez)
+            if marca['n_sentencias'] < min_sentencias:
+                insuficientes += 1
+            elif (not forzar and previo and previo.get('marca') == marca
+                    and ruta_modelo(juez, self.models_dir).exists()):
+                omitidos += 1
+            else:
+                a_entrenar.append(juez)
+        print_info(f"Sin sentencias nuevas desde su último modelo: {omitidos}, "
+                   f"insuficientes (< {min_sentencias}): {insuficientes}, a entrenar: {len(a_entrenar)}")
+
+        entrenados = fallidos = 0
+        if a_entrenar:
+            X, feature_names, y, rangos, marcas_leidas = self.matriz_compartida(a_entrenar)
+            print_success(f"Matriz compartida: {X.shape[0]} sentencias x {X.shape[1]} factores")
+
+            tareas = (
+                (juez, X[desde:hasta], y[desde:hasta], feature_names, marcas_leidas[juez],
+                 str(ruta_modelo(juez, self.models_dir)), hilos_por_proceso)
+                for juez, (desde, hasta) in rangos.items()
+            )
+
+            nuevas_entradas: Dict[str, Dict] = {}
+
+            def registrar(resumen: Dict):
+                nonlocal entrenados, fallidos
+                juez = resumen['juez']
+                if 'error' in resumen:
+                    fallidos += 1
+                    print_warning(f"  {juez}: {resumen['error']}")
+                    return
+                entrenados += 1
+                self.guardar_factores_bd(juez, resumen['feature_importance'])
+                nuevas_entradas[juez] = {'marca': resumen['marca'], 'ruta': resumen['ruta'],
+                                         'fecha': datetime.now().isoformat()}
+                print_success(f"  {juez}: {resumen['n_sentencias']} sentencias, "
+                              f"accuracy {resumen['accuracy']:.2%}")
 
-        # Entrenar cada juez
-        entrenados = 0
-        for juez in jueces:
             try:
-                modelo = self.entrenar_modelo(juez, min_sentencias)
-                if modelo:
-                    entrenados += 1
-            except Exception as e:
-                print_error(f"Error con {juez}: {e}")
+                if procesos > 1:
+                    with ProcessPoolExecutor(max_workers=procesos, initializer=limitar_hilos,
+                                             initargs=(hilos_por_proceso,)) as executor:
+                        futuros = [executor.submit(entrenar_en_proceso, tarea) for tarea in tareas]
+                        for futuro in as_completed(futuros):
+                            registrar(futuro.result())
+                else:
+                    for tarea in tareas:
+                        registrar(entrenar_en_proceso(tarea))
+            finally:
+                # Lo ya entrenado queda registrado aunque la corrida se corte
+                if nuevas_entradas:
+                    self.registrar_en_manifiesto(nuevas_entradas)
 
         # Resumen
         print(f"\n{Colors.BOLD}{'='*70}")
         print("RESUMEN")
         print(f"{'='*70}{Colors.ENDC}")
-        print(f"Jueces candidatos: {len(jueces)}")
+        print(f"Jueces candidatos: {len(marcas)}")
+        print(f"Omitidos (sin sentencias nuevas): {omitidos}")
         print(f"{Colors.OKGREEN}Modelos entrenados: {entrenados}{Colors.ENDC}\n")
 
         return {
-            'total': len(jueces),
-            'entrenados': entrenados
+            'total': len(marcas),
+            'entrenados': entrenados,
+            'omitidos': omitidos,
+            'insuficientes': insuficientes,
+            'fallidos': fallidos
         }
 
 
@@ -534,6 +965,28 @@ def main():
         action='store_true',
         help='Modo predicción (requiere --juez y factores)'
     )
+    parser.add_argument(
+        '--procesos',
+        type=int,
+        default=None,
+        help='Procesos para --todos (default: CPUs / hilos)'
+    )
+    parser.add_argument(
+        '--hilos',
+        type=int,
+        default=1,
+        help='Hilos por proceso para --todos (default: 1)'
+    )
+    parser.add_argument(
+        '--forzar',
+        action='store_true',
+        help='Con --todos, reentrenar también a los jueces sin sentencias nuevas'
+    )
+    parser.add_argument(
+        '--actualizar',
+        action='store_true',
+        help='Sumar sentencias nuevas a los modelos existentes (del juez indicado o de todos)'
+    )
     parser.add_argument(
         '--min-sentencias',
         type=int,
@@ -552,9 +1005,15 @@ def main():
 
     try:
         if args.todos:
-            stats = motor.entrenar_todos_los_jueces(args.min_sentencias)
+            stats = motor.entrenar_todos_los_jueces(args.min_sentencias, args.procesos, args.hilos, args.forzar)
             sys.exit(0)
 
+        elif args.actualizar:
+            if args.juez:
+                sys.exit(0 if motor.actualizar_modelo(args.juez) else 1)
+            stats = motor.actualizar_modelos()
+            sys.exit(0 if not stats['fallidos'] else 1)
+
         elif args.juez and not args.predecir:
             modelo = motor.entrenar_modelo(args.juez, args.min_sentencias)
             sys.exit(0 if modelo else 1)
@@ -11,14 +11,15 @@ AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
-import sqlite3
 import json
 import pickle
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from sistema_preguntas_judiciales import SistemaPreguntasJudiciales, Pregunta
+from pool_sqlite import obtener_pool
 
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
@@ -46,6 +47,16 @@ def print_info(text):
     print(f"{Colors.OKBLUE}ℹ {text}{Colors.ENDC}")
 
 
+@dataclass
+class ContextoJuez:
+    """Datos de un juez cargados una sola vez para responder muchas preguntas"""
+    juez: str
+    perfil: Optional[Dict]
+    lineas: List[Dict] = field(default_factory=list)
+    red: Dict = field(default_factory=lambda: {'csjn': [], 'tribunales': [], 'autores': []})
+    factores: List[Dict] = field(default_factory=list)
+
+
 class MotorRespuestasJudiciales:
     """
     Motor inteligente que responde preguntas sobre jueces
@@ -54,23 +65,26 @@ class MotorRespuestasJudiciales:
     def __init__(self, db_path: Path = DB_FILE):
         """Inicializa el motor"""
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pool = None
         self.sistema_preguntas = SistemaPreguntasJudiciales()
         self.conectar_bd()
 
     def conectar_bd(self):
-        """Conecta a la BD"""
+        """Conecta a la BD (pool compartido, seguro entre hilos)"""
         if not self.db_path.exists():
             raise FileNotFoundError(f"BD no encontrada: {self.db_path}")
 
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        self.pool = obtener_pool(self.db_path)
+
+    @property
+    def cursor(self):
+        """Cursor de lectura del hilo actual (pool compartido entre requests)"""
+        return self.pool.cursor()
 
     def cerrar_bd(self):
-        """Cierra la conexión"""
-        if self.conn:
-            self.conn.close()
+        """Devuelve la conexión del hilo al pool"""
+        if self.pool:
+            self.pool.liberar()
 
     # =========================================================================
     # OBTENCIÓN DE DATOS
@@ -151,6 +165,33 @@ class MotorRespuestasJudiciales:
 
         return [{'factor': r[0], 'peso': r[1], 'confianza': r[2]} for r in self.cursor.fetchall()]
 
+    def cargar_contexto(self, juez: str) -> ContextoJuez:
+        """
+        Carga perfil, líneas, red de influencias y factores del juez una sola
+        vez (4 consultas) para reutilizarlos en todas las preguntas
+        """
+        perfil = self.obtener_perfil_juez(juez)
+
+        if not perfil:
+            return ContextoJuez(juez=juez, perfil=None)
+
+        return ContextoJuez(
+            juez=juez,
+            perfil=perfil,
+            lineas=self.obtener_lineas_jurisprudenciales(juez),
+            red=self.obtener_red_influencias(juez),
+            factores=self.obtener_factores_predictivos(juez)
+        )
+
+    def _lineas(self, juez: str, contexto: Optional[ContextoJuez]) -> List[Dict]:
+        return contexto.lineas if contexto else self.obtener_lineas_jurisprudenciales(juez)
+
+    def _red(self, juez: str, contexto: Optional[ContextoJuez]) -> Dict:
+        return contexto.red if contexto else self.obtener_red_influencias(juez)
+
+    def _factores(self, juez: str, contexto: Optional[ContextoJuez]) -> List[Dict]:
+        return contexto.factores if contexto else self.obtener_factores_predictivos(juez)
+
     def cargar_modelo_predictivo(self, juez: str) -> Optional[Dict]:
         """Carga modelo predictivo"""
         nombre_archivo = juez.replace(" ", "_").replace(".", "_")
@@ -188,10 +229,11 @@ class MotorRespuestasJudiciales:
 
         return str(int(valor))
 
-    def responder_boolean(self, juez: str, campo: str, perfil: Dict) -> str:
+    def responder_boolean(self, juez: str, campo: str, perfil: Dict,
+                          contexto: Optional[ContextoJuez] = None) -> str:
         """Responde pregunta tipo booleano"""
         if campo == 'factores_predictivos':
-            factores = self.obtener_factores_predictivos(juez)
+            factores = self._factores(juez, contexto)
             return "SÍ" if factores else "NO"
 
         valor = perfil.get(campo)
@@ -213,7 +255,7 @@ class MotorRespuestasJudiciales:
     # RESPUESTAS COMPLEJAS
     # =========================================================================
 
-    def responder_A01(self, juez: str, perfil: Dict) -> str:
+    def responder_A01(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """A01: Perfil judicial general"""
         activismo = perfil.get('tendencia_activismo', 0)
         formalismo = perfil.get('nivel_formalismo', 0)
@@ -226,7 +268,7 @@ y método interpretativo dominante {interpretacion}. \
 Analizado con base en {perfil.get('total_sentencias', 0)} sentencias \
 (confianza: {perfil.get('confianza_analisis', 0):.2f})."""
 
-    def responder_A20(self, juez: str, perfil: Dict) -> str:
+    def responder_A20(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """A20: Síntesis completa del perfil"""
         activismo = perfil.get('tendencia_activismo', 0)
         formalismo = perfil.get('nivel_formalismo', 0)
@@ -240,7 +282,7 @@ Analizado con base en {perfil.get('total_sentencias', 0)} sentencias \
 Protección laboral: {trabajo:.2f}. Perfil {'garantista' if garantista > 0.5 else 'equilibrado'}. \
 Base: {perfil.get('total_sentencias', 0)} sentencias."""
 
-    def responder_C09(self, juez: str, perfil: Dict) -> str:
+    def responder_C09(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """C09: Derechos protegidos con mayor intensidad"""
         derechos = {
             'trabajo': perfil.get('proteccion_trabajo', 0),
@@ -258,7 +300,7 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
         top = ordenados[:3]
         return ", ".join([f"{d.replace('_', ' ').title()} ({v:.2f})" for d, v in top])
 
-    def responder_C10(self, juez: str, perfil: Dict) -> str:
+    def responder_C10(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """C10: Derechos protegidos con menor intensidad"""
         derechos = {
             'trabajo': perfil.get('proteccion_trabajo', 0),
@@ -273,9 +315,9 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
         bottom = ordenados[:3]
         return ", ".join([f"{d.replace('_', ' ').title()} ({v:.2f})" for d, v in bottom])
 
-    def responder_D01(self, juez: str, perfil: Dict) -> str:
+    def responder_D01(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """D01: Principales líneas jurisprudenciales"""
-        lineas = self.obtener_lineas_jurisprudenciales(juez)
+        lineas = self._lineas(juez, contexto)
 
         if not lineas:
             return "No hay líneas consolidadas (insuficientes sentencias por tema)"
@@ -287,9 +329,9 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
 
         return "; ".join(resultado)
 
-    def responder_E01(self, juez: str, perfil: Dict) -> str:
+    def responder_E01(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """E01: Tribunales más citados"""
-        red = self.obtener_red_influencias(juez)
+        red = self._red(juez, contexto)
 
         if not red['csjn'] and not red['tribunales']:
             return "No se detectaron citas a tribunales superiores"
@@ -306,9 +348,9 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
 
         return ", ".join(resultado)
 
-    def responder_E03(self, juez: str, perfil: Dict) -> str:
+    def responder_E03(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """E03: Autores doctrinales más citados"""
-        red = self.obtener_red_influencias(juez)
+        red = self._red(juez, contexto)
 
         if not red['autores']:
             return "No se detectaron citas doctrinales"
@@ -320,9 +362,9 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
 
         return ", ".join(resultado)
 
-    def responder_F03(self, juez: str, perfil: Dict) -> str:
+    def responder_F03(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """F03: Factores más determinantes"""
-        factores = self.obtener_factores_predictivos(juez)
+        factores = self._factores(juez, contexto)
 
         if not factores:
             return "Modelo predictivo no disponible"
@@ -335,7 +377,7 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
 
         return "; ".join(resultado)
 
-    def responder_G06(self, juez: str, perfil: Dict) -> str:
+    def responder_G06(self, juez: str, perfil: Dict, contexto: Optional[ContextoJuez] = None) -> str:
         """G06: Sesgo dominante"""
         sesgos = {
             'pro-trabajador': perfil.get('sesgo_pro_trabajador', 0),
@@ -357,10 +399,14 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
     # MOTOR PRINCIPAL
     # =========================================================================
 
-    def responder_pregunta(self, juez: str, pregunta_id: str) -> Dict:
+    def responder_pregunta(self, juez: str, pregunta_id: str,
+                           contexto: Optional[ContextoJuez] = None) -> Dict:
         """
         Responde una pregunta específica
 
+        Args:
+            contexto: datos precargados del juez (evita volver a consultar la BD)
+
         Returns:
             Dict con pregunta, respuesta, metadatos
         """
@@ -373,8 +419,14 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
                 'error': 'Pregunta no encontrada'
             }
 
-        # Obtener datos necesarios
-        perfil = self.obtener_perfil_juez(juez)
+        perfil = contexto.perfil if contexto else self.obtener_perfil_juez(juez)
+
+        return self._evaluar_pregunta(juez, pregunta, perfil, contexto)
+
+    def _evaluar_pregunta(self, juez: str, pregunta: Pregunta, perfil: Optional[Dict],
+                          contexto: Optional[ContextoJuez]) -> Dict:
+        """Evalúa una pregunta contra el perfil (y el contexto, si está precargado)"""
+        pregunta_id = pregunta.id
 
         if not perfil:
             return {
@@ -389,7 +441,7 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
             # Respuestas especializadas
             if hasattr(self, f'responder_{pregunta_id}'):
                 metodo = getattr(self, f'responder_{pregunta_id}')
-                respuesta = metodo(juez, perfil)
+                respuesta = metodo(juez, perfil, contexto)
             # Respuestas genéricas por tipo
             elif pregunta.tipo_respuesta == 'score':
                 campo = pregunta.campos_necesarios[0]
@@ -399,7 +451,7 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
                 respuesta = self.responder_numero(juez, campo, perfil)
             elif pregunta.tipo_respuesta == 'boolean':
                 campo = pregunta.campos_necesarios[0]
-                respuesta = self.responder_boolean(juez, campo, perfil)
+                respuesta = self.responder_boolean(juez, campo, perfil, contexto)
             elif pregunta.tipo_respuesta == 'texto':
                 campo = pregunta.campos_necesarios[0]
                 respuesta = self.responder_texto_simple(juez, campo, perfil)
@@ -423,27 +475,34 @@ Base: {perfil.get('total_sentencias', 0)} sentencias."""
                 'disponible': False
             }
 
-    def responder_categoria(self, juez: str, categoria: str) -> List[Dict]:
+    def responder_lote(self, contexto: ContextoJuez, preguntas: List[Pregunta]) -> List[Dict]:
+        """Evalúa un lote de preguntas contra un contexto ya cargado (sin consultas extra)"""
+        return [
+            self._evaluar_pregunta(contexto.juez, pregunta, contexto.perfil, contexto)
+            for pregunta in preguntas
+        ]
+
+    def responder_categoria(self, juez: str, categoria: str,
+                            contexto: Optional[ContextoJuez] = None) -> List[Dict]:
         """Responde todas las preguntas de una categoría"""
         preguntas = self.sistema_preguntas.obtener_preguntas_por_categoria(categoria)
 
-        respuestas = []
-        for pregunta in preguntas:
-            respuesta = self.responder_pregunta(juez, pregunta.id)
-            respuestas.append(respuesta)
+        if contexto is None:
+            contexto = self.cargar_contexto(juez)
 
-        return respuestas
+        return self.responder_lote(contexto, preguntas)
 
     def responder_todas(self, juez: str) -> Dict:
-        """Responde las 140+ preguntas"""
+        """Responde las 140+ preguntas con una sola carga de datos del juez"""
         print(f"\n{Colors.BOLD}RESPONDIENDO 140+ PREGUNTAS: {juez}{Colors.ENDC}\n")
 
+        contexto = self.cargar_contexto(juez)
         todas_respuestas = {}
 
         for categoria in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
             print_info(f"Procesando categoría {categoria}...")
-            respuestas = self.responder_categoria(juez, categoria)
-            todas_respuestas[categoria] = respuestas
+            preguntas = self.sistema_preguntas.obtener_preguntas_por_categoria(categoria)
+            todas_respuestas[categoria] = self.responder_lote(contexto, preguntas)
 
         total = sum(len(r) for r in todas_respuestas.values())
         disponibles = sum(1 for cat in todas_respuestas.values() for r in cat if r.get('disponible'))
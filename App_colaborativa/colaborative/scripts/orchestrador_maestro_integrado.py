@@ -37,6 +37,14 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from analyser_metodo_mejorado import AnalyserMetodoMejorado
 from comparador_mentes import ComparadorMentes, SimilitudMental
+from indice_nombres import obtener_indice
+from exportador_columnar import exportar_dataset
+
+# Mismas columnas que listar_autores_disponibles()
+COLUMNAS_AUTORES_DISPONIBLES = [
+    "autor", "razonamiento_dominante", "modalidad_dominante", "estilo_dominante",
+    "nivel_abstraccion", "creatividad", "empirismo", "timestamp",
+]
 
 class OrchestadorMaestroIntegrado:
     """Orchestrador maestro con mejoras integrales v6.0"""
@@ -51,6 +59,9 @@ class OrchestadorMaestroIntegrado:
         
         # Configurar base de datos integrada
         self._configurar_db_integrada()
+
+        # Variantes del nombre del autor -> un único perfil
+        self.indice_autores = obtener_indice(self.db_integrada, "autor", "perfiles_integrados_v2", "autor")
         
         print(f"🚀 ORCHESTRADOR MAESTRO INTEGRADO {self.version} INICIADO")
         print("🔧 Motores disponibles:")
@@ -163,6 +174,9 @@ class OrchestadorMaestroIntegrado:
     def analizar_documento_completo(self, texto: str, autor: str = None, fuente: str = None) -> Dict[str, Any]:
         """Análisis completo usando todos los motores mejorados"""
         
+        if autor:
+            autor = self.indice_autores.canonizar(autor)
+        
         print(f"\n🧠 INICIANDO ANÁLISIS COMPLETO INTEGRADO")
         print(f"📄 Fuente: {fuente or 'Texto directo'}")
         print(f"👤 Autor: {autor or 'Desconocido'}")
@@ -366,6 +380,10 @@ class OrchestadorMaestroIntegrado:
     def generar_reporte_comparativo_completo(self, autor_a: str, autor_b: str) -> str:
         """Genera reporte comparativo detallado usando el comparador de mentes"""
         
+        # Aceptar variantes del nombre (acentos, iniciales, orden)
+        autor_a = self.indice_autores.resolver(autor_a) or autor_a
+        autor_b = self.indice_autores.resolver(autor_b) or autor_b
+        
         print(f"\n📊 GENERANDO REPORTE COMPARATIVO")
         print(f"👤 {autor_a} vs {autor_b}")
         
@@ -463,19 +481,22 @@ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             conn.close()
             return []
     
-    def exportar_datos_completos(self, output_dir: str = "exports_orchestrador_integrado"):
-        """Exporta todos los datos del análisis integrado"""
+    def exportar_datos_completos(self, output_dir: str = "exports_orchestrador_integrado",
+                                 formato: str = "parquet"):
+        """
+        Exporta todos los datos del análisis integrado en streaming (Parquet,
+        o JSONL sin pyarrow): perfiles, comparaciones y la matriz de
+        similitudes en formato largo, calculada por bloques.
+        """
         
         os.makedirs(output_dir, exist_ok=True)
         
-        # Exportar perfiles completos
-        autores = self.listar_autores_disponibles()
-        with open(f"{output_dir}/autores_disponibles.json", 'w', encoding='utf-8') as f:
-            json.dump(autores, f, indent=2, ensure_ascii=False)
-        
-        # Exportar matriz de similitudes
-        matriz_path = f"{output_dir}/matriz_similitudes_completa.json"
-        self.comparador_mentes.exportar_matriz_similitudes(matriz_path)
+        for dataset, columnas in (
+            ("perfiles_integrados", COLUMNAS_AUTORES_DISPONIBLES),
+            ("comparaciones", None),
+            ("similitudes", None),
+        ):
+            exportar_dataset(dataset, output_dir, formato, columnas, db_path=self.db_integrada)
         
         print(f"📁 Datos exportados a: {output_dir}")
         return output_dir
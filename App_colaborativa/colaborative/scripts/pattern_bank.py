@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+🧩 BANCO DE PATRONES COMPILADOS
+===============================
+
+Compila una sola vez cada taxonomía de patrones (RAZONAMIENTO, MODALIDAD,
+RETÓRICA, ESTILOS, FALACIAS, AXIOMAS, SESGOS, FUENTES y los indicadores de
+rasgos cognitivos) y devuelve los conteos de todas sus categorías en una
+sola llamada.
+
+Lo usan:
+- analyser_metodo_mejorado.py (AnalyserMetodoMejorado)
+- vectorizador_cognitivo.py (extraer_rasgos_cognitivos)
+
+Cada taxonomía regex se recorre UNA sola vez: todos sus patrones se unen en
+una alternancia con grupos nombrados, agrupada por el primer carácter posible
+de cada patrón para que el motor descarte ramas sin probarlas. Como varias
+categorías se solapan (p.ej. "necesario" cuenta para apodíctico y certeza) y
+la alternancia sólo reporta una rama por posición, en cada posición candidata
+se prueban además las ramas posteriores que comparten primer carácter; cada
+patrón lleva su propio cursor, así que los conteos son idénticos a los de
+``re.findall``. Las taxonomías literales siguen con ``str.count`` (un barrido
+en C por literal, más rápido que cualquier autómata en Python puro).
+La regresión se valida con validar_pattern_bank.py.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple, Union
+
+try:
+    # Python 3.11+: el parser de re pasó a módulos privados
+    from re import _constants as sre_constants
+    from re import _parser as sre_parser
+except ImportError:
+    # Python 3.8 - 3.10
+    import sre_constants
+    import sre_parse as sre_parser
+
+Taxonomia = Dict[str, Union[str, List[str]]]
+
+
+@lru_cache(maxsize=1024)
+def compilar(patron: str, flags: int = 0) -> Pattern:
+    """Compila un patrón suelto reutilizando la compilación previa"""
+    return re.compile(patron, flags)
+
+
+def contar_matches(regex: Pattern, texto: str) -> int:
+    """Cuenta matches de una regex ya compilada (mismo conteo que re.findall)"""
+    return len(regex.findall(texto))
+
+
+def _primeros_caracteres(items) -> Optional[FrozenSet[str]]:
+    """
+    Conjunto de caracteres con los que puede empezar un match, o None si no
+    se puede acotar (clases como \\w, comodines, repeticiones opcionales...).
+    """
+    for op, av in items:
+        if op is sre_constants.AT:
+            continue
+        if op is sre_constants.LITERAL:
+            return frozenset(chr(av))
+        if op is sre_constants.IN:
+            conjunto = set()
+            for sub_op, sub_av in av:
+                if sub_op is sre_constants.LITERAL:
+                    conjunto.add(chr(sub_av))
+                elif sub_op is sre_constants.RANGE and sub_av[1] - sub_av[0] < 64:
+                    conjunto.update(chr(c) for c in range(sub_av[0], sub_av[1] + 1))
+                else:
+                    return None
+            return frozenset(conjunto)
+        if op is sre_constants.SUBPATTERN:
+            _, agrega, quita, sub = av
+            return None if agrega or quita else _primeros_caracteres(sub)
+        if op is sre_constants.BRANCH:
+            conjunto = set()
+            for rama in av[1]:
+                primeros = _primeros_caracteres(rama)
+                if primeros is None:
+                    return None
+                conjunto |= primeros
+            return frozenset(conjunto)
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            return _primeros_caracteres(av[2])
+        return None
+    return None
+
+
+def _usa_referencias(items) -> bool:
+    """True si el patrón usa \\1 / (?(1)...): no se puede renumerar dentro de la alternancia"""
+    for op, av in items:
+        if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            return True
+        for valor in (av if isinstance(av, (list, tuple)) else ()):
+            if isinstance(valor, sre_parser.SubPattern) and _usa_referencias(valor):
+                return True
+            if isinstance(valor, (list, tuple)) and any(
+                isinstance(v, sre_parser.SubPattern) and _usa_referencias(v) for v in valor
+            ):
+                return True
+    return False
+
+
+def _clase(caracteres) -> str:
+    return "[" + "".join(re.escape(c) for c in sorted(caracteres)) + "]"
+
+
+class AlternanciaUnica:
+    """
+    Cuenta varios patrones con un solo barrido del texto.
+
+    ``contar(texto)`` devuelve, en el orden de ``patrones``, lo mismo que
+    ``[len(p.findall(texto)) for p in patrones]``. Los patrones que no se
+    pueden combinar (referencias a grupos, matches vacíos) o una alternancia
+    que no compila se cuentan con ``findall`` como antes.
+    """
+
+    def __init__(self, patrones: List[Pattern], flags: int = 0):
+        self.patrones = patrones
+        self.flags = flags
+        self.sueltos: List[int] = []
+        self.regex: Optional[Pattern] = None
+        # nombre de grupo -> (índice, [(índice, patrón) de ramas posteriores que pueden
+        # empezar en la misma posición])
+        self.siguientes: Dict[str, Tuple[int, List[Tuple[int, Pattern]]]] = {}
+
+        grupos: Dict[Optional[FrozenSet[str]], List[int]] = {}
+        for i, patron in enumerate(patrones):
+            arbol = sre_parser.parse(patron.pattern, patron.flags)
+            if arbol.getwidth()[0] == 0 or _usa_referencias(arbol):
+                self.sueltos.append(i)
+            else:
+                grupos.setdefault(_primeros_caracteres(arbol), []).append(i)
+
+        if grupos:
+            try:
+                self.regex = self._compilar(grupos)
+            except re.error:
+                self.sueltos = list(range(len(patrones)))
+                self.regex = None
+
+    def _compilar(self, grupos) -> Pattern:
+        partes = []
+        orden = []
+        for primeros, indices in grupos.items():
+            ramas = "|".join(f"(?P<p{i}>{self.patrones[i].pattern})" for i in indices)
+            partes.append(f"(?:{ramas})" if primeros is None else f"(?={_clase(primeros)})(?:{ramas})")
+            orden.extend(indices)
+        cuerpo = "(?=(?:" + "|".join(partes) + "))"
+
+        if None in grupos:
+            regex = re.compile(cuerpo, self.flags)
+        else:
+            # Un primer carácter consumido permite al motor saltar directo a las
+            # posiciones candidatas; el lookbehind vuelve a evaluar desde ahí
+            union = frozenset().union(*grupos)
+            regex = re.compile(f"{_clase(union)}(?<={cuerpo}.)", self.flags)
+
+        primeros_de = {i: primeros for primeros, indices in grupos.items() for i in indices}
+        clases = {
+            primeros: re.compile(_clase(primeros), self.flags)
+            for primeros in grupos if primeros is not None
+        }
+
+        def pueden_coincidir(a, b) -> bool:
+            if a is None or b is None:
+                return True
+            return any(clases[a].match(c) for c in b)
+
+        for posicion, i in enumerate(orden):
+            self.siguientes[f"p{i}"] = (i, [
+                (k, self.patrones[k]) for k in orden[posicion + 1:]
+                if pueden_coincidir(primeros_de[i], primeros_de[k])
+            ])
+        return regex
+
+    def contar(self, texto: str) -> List[int]:
+        conteos = [0] * len(self.patrones)
+        if self.regex is not None:
+            # cursor[i]: fin del último match contado del patrón i (findall no solapa)
+            cursor = [0] * len(self.patrones)
+            for m in self.regex.finditer(texto):
+                posicion = m.start()
+                nombre = m.lastgroup
+                i, posteriores = self.siguientes[nombre]
+                if cursor[i] <= posicion:
+                    conteos[i] += 1
+                    cursor[i] = m.end(nombre)
+                for k, patron in posteriores:
+                    if cursor[k] > posicion:
+                        continue
+                    otro = patron.match(texto, posicion)
+                    if otro:
+                        conteos[k] += 1
+                        cursor[k] = otro.end()
+        for i in self.sueltos:
+            conteos[i] = contar_matches(self.patrones[i], texto)
+        return conteos
+
+
+class PatternBank:
+    """
+    Taxonomía compilada: categoría -> uno o más patrones.
+
+    - ``literal=False``: cada patrón es una regex (conteo = findall, un solo
+      barrido con ``AlternanciaUnica``)
+    - ``literal=True``: cada patrón es un literal (conteo = str.count)
+    """
+
+    def __init__(self, taxonomia: Taxonomia, flags: int = 0, literal: bool = False):
+        self.taxonomia = taxonomia
+        self.flags = flags
+        self.literal = literal
+        self.categorias: Dict[str, List] = {}
+
+        for categoria, patrones in taxonomia.items():
+            lista = [patrones] if isinstance(patrones, str) else list(patrones)
+            if literal:
+                self.categorias[categoria] = lista
+            else:
+                self.categorias[categoria] = [compilar(p, flags) for p in lista]
+
+        self.alternancia = None
+        if not literal:
+            todos = [p for patrones in self.categorias.values() for p in patrones]
+            self.alternancia = AlternanciaUnica(todos, flags)
+
+    def contar_detalle(self, texto: str) -> Dict[str, List[int]]:
+        """Conteo por subpatrón de cada categoría"""
+        if self.literal:
+            return {
+                categoria: [texto.count(p) for p in patrones]
+                for categoria, patrones in self.categorias.items()
+            }
+
+        conteos = self.alternancia.contar(texto)
+        detalle = {}
+        inicio = 0
+        for categoria, patrones in self.categorias.items():
+            detalle[categoria] = conteos[inicio:inicio + len(patrones)]
+            inicio += len(patrones)
+        return detalle
+
+    def contar(self, texto: str) -> Dict[str, int]:
+        """Conteo total por categoría"""
+        return {categoria: sum(conteos) for categoria, conteos in self.contar_detalle(texto).items()}
+
+    def total(self, texto: str) -> int:
+        """Suma de conteos de todas las categorías"""
+        return sum(self.contar(texto).values())
+
+
+# ========================================
+# INDICADORES DE RASGOS COGNITIVOS
+# (vectorizador_cognitivo.extraer_rasgos_cognitivos)
+# ========================================
+RASGOS_REGEX = {
+    "formalismo": [
+        r'\bart\.\s*\d+', r'\binc\.\s*\d+', r'\bley\s+\d+',
+        r'\bcódigo\s+civil', r'\bcódigo\s+penal', r'\bconstituci[óo]n',
+        r'\bdecreto\s+\d+', r'\bresoluci[óo]n\s+\d+'
+    ],
+    "empirismo": [
+        r'\bcaso\b', r'\bejemplo\b', r'\bpráctica\b', r'\bexperiencia\b',
+        r'\bfallo\b', r'\bsentencia\b', r'\bjurisprudencia\b',
+        r'\btribunal\b', r'\bcorte\b', r'\bjuzgado\b'
+    ],
+    "interdisciplinariedad": [
+        'sociolog[íi]a', 'econom[íi]a', 'filosofia', 'psicolog[íi]a',
+        'antropolog[íi]a', 'ciencia pol[íi]tica', 'historia',
+        'lingü[íi]stica', 'l[óo]gica', 'estadística'
+    ],
+    "uso_jurisprudencia": [
+        r'c\.s\.j\.n\.', r'corte suprema', r'cámara nacional', r'tribunal superior',
+        r'fallo\s+\w+', r'sentencia\s+del', r'decidió que', r'sostuvo que',
+        r'in re\s+\w+', r'autos\s+\w+'
+    ]
+}
+
+# Se cuentan con str.count (comportamiento histórico: 'interpretaci[óo]n'
+# se busca como literal, no como regex)
+RASGOS_LITERALES = {
+    "creatividad": [
+        'interpretaci[óo]n', 'reinterpret', 'nueva perspectiva', 'enfoque innovador',
+        'propone', 'sugiere', 'plantea', 'considera', 'podríamos entender',
+        'cabe preguntarse', 'sería posible', 'alternativa'
+    ],
+    "dogmatismo": [
+        'según la doctrina', 'la doctrina enseña', 'es incuestionable', 'sin duda',
+        'claramente establece', 'definitivamente', 'incondicionalmente',
+        'tradicionalmente', 'clásicamente', 'ortodoxamente'
+    ],
+    "abstraccion": [
+        'principio', 'concepto', 'teoría', 'fundamento', 'esencia',
+        'naturaleza', 'categoría', 'noción', 'idea', 'pensamiento'
+    ],
+    "concreto": [
+        'específicamente', 'concretamente', 'en particular', 'por ejemplo',
+        'caso concreto', 'situación específica', 'aplicación práctica'
+    ]
+}
+
+BANCO_RASGOS_REGEX = PatternBank(RASGOS_REGEX)
+BANCO_RASGOS_LITERALES = PatternBank(RASGOS_LITERALES, literal=True)
+
+
+def contar_rasgos(texto_lower: str) -> Dict[str, int]:
+    """Conteos crudos de todos los indicadores de rasgos sobre el texto en minúsculas"""
+    conteos = BANCO_RASGOS_REGEX.contar(texto_lower)
+    conteos.update(BANCO_RASGOS_LITERALES.contar(texto_lower))
+    return conteos
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+🔌 POOL DE CONEXIONES SQLITE (LECTURA POR HILO + ESCRITOR SERIALIZADO)
+=====================================================================
+
+Capa de conexiones compartida por el blueprint judicial
+(webapp_rutas_judicial.py), AnalyserJudicialAdapter, MotorRespuestasJudiciales,
+GeneradorInformesJudicial y end2end_webapp.py.
+
+- Lectura: cada hilo toma una conexión del pool y la conserva hasta
+  liberar() (en Flask, al terminar la request). Las conexiones vuelven a una
+  lista libre y se reutilizan, así que el esquema ya parseado y la caché de
+  sentencias preparadas (cached_statements) sobreviven entre requests.
+- Escritura: una única conexión protegida por un lock; escritura() abre una
+  transacción y hace commit/rollback.
+- La base se pasa a modo WAL para que las lecturas no bloqueen al escritor
+  ni reciban "database is locked".
+
+USO:
+    from pool_sqlite import obtener_pool
+    pool = obtener_pool(DB_JUDICIAL)
+    filas = pool.consultar("SELECT ... WHERE juez = ?", (juez,))
+    with pool.escritura() as cursor:
+        cursor.execute("UPDATE ...", valores)
+
+    # En Flask (devuelve las conexiones al pool al cerrar cada request)
+    from pool_sqlite import registrar_en_flask
+    registrar_en_flask(app)
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Sentencias preparadas que conserva cada conexión
+SENTENCIAS_EN_CACHE = 256
+TIMEOUT_SEGUNDOS = 30.0
+
+
+class PoolSQLite:
+    """Conexiones de lectura reutilizables por hilo y un escritor serializado"""
+
+    def __init__(self, db_path, max_lectores: int = 8,
+                 cached_statements: int = SENTENCIAS_EN_CACHE,
+                 timeout: float = TIMEOUT_SEGUNDOS):
+        self.db_path = Path(db_path)
+        self.max_lectores = max_lectores
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._lock_libres = threading.Lock()
+        self._libres: List[sqlite3.Connection] = []
+        self._lock_escritura = threading.RLock()
+        self._escritor: Optional[sqlite3.Connection] = None
+        self.creadas = 0
+
+        self._activar_wal()
+
+    # ------------------------------------------------------
+    # Conexiones
+    # ------------------------------------------------------
+    def _conectar(self) -> sqlite3.Connection:
+        # check_same_thread=False: la conexión pasa de un hilo a otro a
+        # través del pool, pero nunca la usan dos hilos a la vez
+        conn = sqlite3.connect(
+            str(self.db_path), timeout=self.timeout,
+            cached_statements=self.cached_statements, check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        return conn
+
+    def _activar_wal(self):
+        if not self.db_path.exists():
+            return
+        try:
+            with self._lock_escritura:
+                self._conexion_escritura().execute("PRAGMA journal_mode = WAL")
+        except sqlite3.DatabaseError as e:
+            print(f"⚠️ No se pudo activar WAL en {self.db_path.name}: {e}")
+
+    def lector(self) -> sqlite3.Connection:
+        """Conexión de lectura asignada al hilo actual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock_libres:
+                conn = self._libres.pop() if self._libres else None
+            if conn is None:
+                conn = self._conectar()
+                conn.execute("PRAGMA query_only = ON")
+                self.creadas += 1
+            self._local.conn = conn
+            self._local.cursor = None
+        return conn
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Cursor de lectura del hilo actual (el mismo hasta liberar())"""
+        conn = self.lector()
+        if self._local.cursor is None:
+            self._local.cursor = conn.cursor()
+        return self._local.cursor
+
+    def liberar(self):
+        """Devuelve la conexión de lectura del hilo actual al pool"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        if self._local.cursor is not None:
+            self._local.cursor.close()
+        self._local.conn = None
+        self._local.cursor = None
+
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock_libres:
+            if len(self._libres) < self.max_lectores:
+                self._libres.append(conn)
+                return
+        conn.close()
+
+    def _conexion_escritura(self) -> sqlite3.Connection:
+        if self._escritor is None:
+            self._escritor = self._conectar()
+        return self._escritor
+
+    # ------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------
+    def consultar(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self.lector().execute(sql, params).fetchall()
+
+    def consultar_uno(self, sql: str, params: Sequence[Any] = ()) -> Optional[tuple]:
+        return self.lector().execute(sql, params).fetchone()
+
+    def consultar_dicts(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        cursor = self.lector().execute(sql, params)
+        columnas = [desc[0] for desc in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+    def consultar_dict(self, sql: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        cursor = self.lector().execute(sql, params)
+        fila = cursor.fetchone()
+        if fila is None:
+            return None
+        return dict(zip([desc[0] for desc in cursor.description], fila))
+
+    # ------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------
+    @contextmanager
+    def escritura(self) -> Iterator[sqlite3.Cursor]:
+        """Transacción de escritura serializada (commit al salir, rollback si falla)"""
+        with self._lock_escritura:
+            conn = self._conexion_escritura()
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def ejecutar(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Ejecuta una sentencia de escritura y devuelve las filas afectadas"""
+        with self.escritura() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def ejecutar_muchos(self, sql: str, filas: Sequence[Sequence[Any]]) -> int:
+        with self.escritura() as cursor:
+            cursor.executemany(sql, filas)
+            return cursor.rowcount
+
+    # ------------------------------------------------------
+    # Cierre y diagnóstico
+    # ------------------------------------------------------
+    def cerrar(self):
+        """Cierra las conexiones libres y el escritor"""
+        self.liberar()
+        with self._lock_libres:
+            libres, self._libres = self._libres, []
+        for conn in libres:
+            conn.close()
+        with self._lock_escritura:
+            if self._escritor is not None:
+                self._escritor.close()
+                self._escritor = None
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "db": self.db_path.name,
+            "lectores_creados": self.creadas,
+            "lectores_libres": len(self._libres),
+            "escritor_abierto": self._escritor is not None
+        }
+
+
+_POOLS: Dict[str, PoolSQLite] = {}
+_LOCK_POOLS = threading.Lock()
+
+
+def obtener_pool(db_path, **kwargs) -> PoolSQLite:
+    """Pool compartido por todo el proceso para ``db_path``"""
+    clave = str(Path(db_path).resolve())
+    pool = _POOLS.get(clave)
+    if pool is None:
+        with _LOCK_POOLS:
+            pool = _POOLS.get(clave)
+            if pool is None:
+                pool = PoolSQLite(db_path, **kwargs)
+                _POOLS[clave] = pool
+    return pool
+
+
+def liberar_hilo():
+    """Devuelve al pool las conexiones de lectura del hilo actual (todas las bases)"""
+    for pool in list(_POOLS.values()):
+        pool.liberar()
+
+
+def cerrar_pools():
+    with _LOCK_POOLS:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.cerrar()
+
+
+def registrar_en_flask(app):
+    """Libera las conexiones del hilo al terminar cada request (idempotente)"""
+    if app.extensions.get("pool_sqlite"):
+        return
+    app.extensions["pool_sqlite"] = True
+
+    @app.teardown_appcontext
+    def _liberar_conexiones_sqlite(_excepcion=None):
+        liberar_hilo()
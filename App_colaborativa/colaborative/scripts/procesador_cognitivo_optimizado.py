@@ -9,6 +9,8 @@ CARACTERÍSTICAS:
 ✅ Progreso detallado en tiempo real
 ✅ Análisis por chunks con combinación final
 ✅ Timeouts y recuperación de errores
+✅ Análisis de chunks en paralelo (pool de procesos, orden preservado)
+✅ Pipeline de documentos para mantener todos los núcleos ocupados
 ✅ Compatibilidad total con sistema existente
 """
 
@@ -19,10 +21,13 @@ import sqlite3
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import uuid
 import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from functools import reduce
 
 # Agregar rutas al sistema
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -46,6 +51,101 @@ except ImportError:
     print("⚠️ PyPDF2 o PyMuPDF no disponible")
     PDF_DISPONIBLE = False
 
+# Secciones numéricas que se promedian al combinar chunks
+METRICAS_NUMERICAS = [
+    "cognicion.razonamiento_formal",
+    "cognicion.modalidad_epistemica", 
+    "cognicion.estilo_literario",
+    "cognicion.estructuras_argumentativas",
+    "dogmas_y_valores.sesgos_valorativos",
+    "puntos_de_apoyo.intensidad_fuentes",
+    "marcadores_cognitivos"
+]
+
+# Listas que se combinan por unión sin duplicados
+LISTAS_A_COMBINAR = [
+    ("dogmas_y_valores", "axiomas_autor"),
+    ("dogmas_y_valores", "creencias_explicitas"),
+    ("puntos_de_apoyo", "fuentes"),
+    ("dilemas_y_limites", "dilemas_explicitados"),
+    ("dilemas_y_limites", "limitaciones_reconocidas"),
+    ("dilemas_y_limites", "areas_de_ambiguedad")
+]
+
+# ----------------------------------------------------------
+# PERFILES PARCIALES FUSIONABLES
+# ----------------------------------------------------------
+# Un parcial guarda sumas, conteos y conjuntos en lugar de promedios, de modo
+# que fusionar_parciales es una reducción asociativa: el resultado no depende
+# de cómo se agrupen los chunks, sólo del orden (que el pool preserva).
+
+def perfil_a_parcial(perfil: Dict) -> Dict:
+    """Convierte el perfil de un chunk en un parcial fusionable"""
+    parcial = {"chunks": 1, "sumas": {}, "conteos": {}, "listas": {}, "falacias": set()}
+    
+    for metrica_path in METRICAS_NUMERICAS:
+        seccion = perfil
+        for key in metrica_path.split('.'):
+            if isinstance(seccion, dict) and key in seccion:
+                seccion = seccion[key]
+            else:
+                seccion = {}
+                break
+        
+        sumas = parcial["sumas"].setdefault(metrica_path, {})
+        conteos = parcial["conteos"].setdefault(metrica_path, {})
+        if isinstance(seccion, dict):
+            for k, v in seccion.items():
+                if isinstance(v, (int, float)):
+                    sumas[k] = sumas.get(k, 0) + v
+                    conteos[k] = conteos.get(k, 0) + 1
+    
+    for seccion, clave in LISTAS_A_COMBINAR:
+        elementos = perfil.get(seccion, {}).get(clave, [])
+        parcial["listas"][(seccion, clave)] = set(elementos) if isinstance(elementos, list) else set()
+    
+    falacias = perfil.get("cognicion", {}).get("retorica", {}).get("falacias_probables", [])
+    if isinstance(falacias, list):
+        parcial["falacias"].update(falacias)
+    
+    return parcial
+
+def fusionar_parciales(a: Dict, b: Dict) -> Dict:
+    """Fusiona dos parciales (operación asociativa)"""
+    fusion = {"chunks": a["chunks"] + b["chunks"], "sumas": {}, "conteos": {}, "listas": {}}
+    
+    for campo in ("sumas", "conteos"):
+        for metrica_path in METRICAS_NUMERICAS:
+            destino = dict(a[campo].get(metrica_path, {}))
+            for k, v in b[campo].get(metrica_path, {}).items():
+                destino[k] = destino[k] + v if k in destino else v
+            fusion[campo][metrica_path] = destino
+    
+    for clave_lista in LISTAS_A_COMBINAR:
+        fusion["listas"][clave_lista] = a["listas"].get(clave_lista, set()) | b["listas"].get(clave_lista, set())
+    
+    fusion["falacias"] = a["falacias"] | b["falacias"]
+    return fusion
+
+# ----------------------------------------------------------
+# WORKERS DEL POOL DE PROCESOS
+# ----------------------------------------------------------
+_ANALYSER_WORKER = None
+
+def _inicializar_worker():
+    """Crea un ANALYSER por proceso del pool (patrones compilados una vez por proceso)"""
+    global _ANALYSER_WORKER
+    _ANALYSER_WORKER = AnalyserMetodoMejorado()
+
+def _analizar_chunk_worker(args) -> Optional[Dict]:
+    """Analiza un chunk dentro de un proceso del pool"""
+    texto, autor, fuente = args
+    try:
+        return _ANALYSER_WORKER.generar_perfil_autoral_completo(texto, autor, fuente)
+    except Exception as e:
+        print(f"❌ Error en {fuente}: {e}")
+        return None
+
 class ProcesadorCognitivoOptimizado:
     """
     🧠 Procesador cognitivo optimizado para textos grandes
@@ -54,10 +154,11 @@ class ProcesadorCognitivoOptimizado:
     - División inteligente de textos
     - Progreso detallado en tiempo real
     - Análisis por chunks con combinación
+    - Paralelismo por chunks en pool de procesos
     - Recuperación de errores
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.version = "v1.0_optimizado"
         
         # Configuración de chunks
@@ -65,6 +166,10 @@ class ProcesadorCognitivoOptimizado:
         self.CHUNK_OVERLAP = 2000  # Solapamiento entre chunks
         self.MIN_CHUNK_SIZE = 5000  # Tamaño mínimo para analizar
         
+        # Configuración de paralelismo (1 = secuencial, como antes)
+        self.MAX_WORKERS = max(1, max_workers or os.cpu_count() or 1)
+        self.DOCS_EN_VUELO = 2  # Documentos con chunks en el pool a la vez (pipeline)
+        
         # Rutas
         self.base_path = Path(__file__).parent.parent.parent
         self.pdfs_path = self.base_path / "colaborative" / "data" / "pdfs" / "general"
@@ -176,14 +281,23 @@ class ProcesadorCognitivoOptimizado:
         if len(perfiles_chunks) == 1:
             return perfiles_chunks[0]
         
-        # Inicializar perfil combinado
+        parcial = reduce(fusionar_parciales, map(perfil_a_parcial, perfiles_chunks))
+        perfil_combinado = self.finalizar_parcial(parcial, autor, nombre_archivo)
+        
+        print(f"✅ Perfiles combinados: {len(perfiles_chunks)} chunks → 1 perfil consolidado")
+        
+        return perfil_combinado
+    
+    def finalizar_parcial(self, parcial: Dict, autor: str, nombre_archivo: str) -> Dict:
+        """Convierte un parcial fusionado en el perfil consolidado (promedios y uniones)"""
+        
         perfil_combinado = {
             "meta": {
                 "autor_probable": autor,
                 "fuente": nombre_archivo,
                 "timestamp": datetime.now().isoformat(),
                 "version_analyser": f"{self.version}_combinado",
-                "chunks_analizados": len(perfiles_chunks)
+                "chunks_analizados": parcial["chunks"]
             },
             "cognicion": {
                 "razonamiento_formal": {},
@@ -209,90 +323,81 @@ class ProcesadorCognitivoOptimizado:
             "marcadores_cognitivos": {}
         }
         
-        # Combinar métricas numéricas (promedio)
-        metricas_numericas = [
-            "cognicion.razonamiento_formal",
-            "cognicion.modalidad_epistemica", 
-            "cognicion.estilo_literario",
-            "cognicion.estructuras_argumentativas",
-            "dogmas_y_valores.sesgos_valorativos",
-            "puntos_de_apoyo.intensidad_fuentes",
-            "marcadores_cognitivos"
-        ]
-        
-        for metrica_path in metricas_numericas:
+        # Métricas numéricas (promedio = suma / conteo)
+        for metrica_path in METRICAS_NUMERICAS:
             keys = metrica_path.split('.')
+            sumas = parcial["sumas"].get(metrica_path, {})
+            conteos = parcial["conteos"].get(metrica_path, {})
+            resultado = {k: sumas[k] / conteos[k] if conteos.get(k) else 0.0 for k in sumas}
             
-            # Recopilar valores de todos los chunks
-            valores_por_clave = {}
-            
-            for perfil in perfiles_chunks:
-                seccion = perfil
-                for key in keys:
-                    if key in seccion:
-                        seccion = seccion[key]
-                    else:
-                        seccion = {}
-                        break
-                
-                if isinstance(seccion, dict):
-                    for k, v in seccion.items():
-                        if isinstance(v, (int, float)):
-                            if k not in valores_por_clave:
-                                valores_por_clave[k] = []
-                            valores_por_clave[k].append(v)
-            
-            # Calcular promedios
-            resultado = {}
-            for k, valores in valores_por_clave.items():
-                resultado[k] = sum(valores) / len(valores) if valores else 0.0
-            
-            # Asignar al perfil combinado
             seccion_destino = perfil_combinado
             for key in keys[:-1]:
                 seccion_destino = seccion_destino[key]
             seccion_destino[keys[-1]] = resultado
         
-        # Combinar listas (unión sin duplicados)
-        listas_a_combinar = [
-            ("dogmas_y_valores", "axiomas_autor"),
-            ("dogmas_y_valores", "creencias_explicitas"),
-            ("puntos_de_apoyo", "fuentes"),
-            ("dilemas_y_limites", "dilemas_explicitados"),
-            ("dilemas_y_limites", "limitaciones_reconocidas"),
-            ("dilemas_y_limites", "areas_de_ambiguedad")
-        ]
+        # Listas (unión sin duplicados)
+        for seccion, clave in LISTAS_A_COMBINAR:
+            perfil_combinado[seccion][clave] = list(parcial["listas"].get((seccion, clave), set()))
         
-        for seccion, clave in listas_a_combinar:
-            elementos_combinados = set()
+        perfil_combinado["cognicion"]["retorica"]["falacias_probables"] = list(parcial["falacias"])
+        
+        return perfil_combinado
+    
+    def _usar_pool(self, chunks: List[Dict]) -> bool:
+        """Decide si vale la pena repartir los chunks en el pool de procesos"""
+        return self.MAX_WORKERS > 1 and len(chunks) > 1
+    
+    def _crear_pool(self) -> ProcessPoolExecutor:
+        """Pool de procesos con un ANALYSER inicializado por worker"""
+        return ProcessPoolExecutor(max_workers=self.MAX_WORKERS, initializer=_inicializar_worker)
+    
+    def enviar_chunks(self, executor: ProcessPoolExecutor, chunks: List[Dict],
+                      autor: str, nombre_archivo: str) -> List[Future]:
+        """Envía todos los chunks de un documento al pool (no bloquea)"""
+        return [
+            executor.submit(
+                _analizar_chunk_worker,
+                (chunk_data["chunk"], autor, f"{nombre_archivo}_chunk_{chunk_data['posicion'] + 1}")
+            )
+            for chunk_data in chunks
+        ]
+    
+    def recolectar_chunks(self, futuros: List[Future]) -> List[Dict]:
+        """Recolecta los perfiles en el orden original de los chunks"""
+        perfiles_chunks = []
+        for i, futuro in enumerate(futuros):
+            try:
+                perfil_chunk = futuro.result()
+            except Exception as e:
+                print(f"❌ Error en chunk {i + 1}: {e}")
+                perfil_chunk = None
             
-            for perfil in perfiles_chunks:
-                if seccion in perfil and clave in perfil[seccion]:
-                    elementos = perfil[seccion][clave]
-                    if isinstance(elementos, list):
-                        elementos_combinados.update(elementos)
+            if perfil_chunk:
+                perfiles_chunks.append(perfil_chunk)
             
-            perfil_combinado[seccion][clave] = list(elementos_combinados)
-        
-        # Combinar falacias
-        falacias_combinadas = set()
-        for perfil in perfiles_chunks:
-            if "cognicion" in perfil and "retorica" in perfil["cognicion"]:
-                falacias = perfil["cognicion"]["retorica"].get("falacias_probables", [])
-                if isinstance(falacias, list):
-                    falacias_combinadas.update(falacias)
+            self.mostrar_progreso(i + 1, len(futuros), "chunks procesados")
         
-        perfil_combinado["cognicion"]["retorica"]["falacias_probables"] = list(falacias_combinadas)
+        return perfiles_chunks
+    
+    def analizar_chunks_secuencial(self, chunks: List[Dict], autor: str, nombre_archivo: str) -> List[Dict]:
+        """Analiza los chunks uno a uno en el proceso actual"""
+        perfiles_chunks = []
         
-        print(f"✅ Perfiles combinados: {len(perfiles_chunks)} chunks → 1 perfil consolidado")
+        for i, chunk_data in enumerate(chunks):
+            perfil_chunk = self.analizar_chunk_con_progreso(chunk_data, autor, nombre_archivo)
+            
+            if perfil_chunk:
+                perfiles_chunks.append(perfil_chunk)
+            
+            # Mostrar progreso general
+            self.mostrar_progreso(i + 1, len(chunks), "chunks procesados")
         
-        return perfil_combinado
+        return perfiles_chunks
     
-    def procesar_documento_optimizado(self, ruta_pdf: str) -> Optional[str]:
-        """Procesa un documento PDF con optimización y progreso detallado"""
+    def preparar_documento(self, ruta_pdf: str) -> Optional[Dict]:
+        """Extrae texto, detecta autor y divide en chunks (etapa previa al análisis)"""
         
         nombre_archivo = os.path.basename(ruta_pdf)
-        print(f"\\n🚀 PROCESANDO (OPTIMIZADO): {nombre_archivo}")
         
         # 1. Extraer texto
         print("📄 Extrayendo texto...")
@@ -318,31 +423,33 @@ class ProcesadorCognitivoOptimizado:
         if len(chunks) > 1:
             print(f"📊 Procesando {len(chunks)} chunks para optimizar rendimiento")
         
-        # 4. Procesar cada chunk
-        perfiles_chunks = []
-        tiempo_total_inicio = time.time()
+        return {
+            "ruta_pdf": ruta_pdf,
+            "nombre_archivo": nombre_archivo,
+            "autor": autor,
+            "chunks": chunks
+        }
+    
+    def finalizar_documento(self, documento: Dict, perfiles_chunks: List[Dict],
+                            tiempo_total_inicio: float) -> Optional[str]:
+        """Combina los perfiles de chunks y guarda el resultado"""
         
-        for i, chunk_data in enumerate(chunks):
-            perfil_chunk = self.analizar_chunk_con_progreso(chunk_data, autor, nombre_archivo)
-            
-            if perfil_chunk:
-                perfiles_chunks.append(perfil_chunk)
-            
-            # Mostrar progreso general
-            self.mostrar_progreso(i + 1, len(chunks), "chunks procesados")
+        ruta_pdf = documento["ruta_pdf"]
+        autor = documento["autor"]
+        nombre_archivo = documento["nombre_archivo"]
         
         if not perfiles_chunks:
             print("❌ No se pudo procesar ningún chunk")
             return None
         
         # 5. Combinar perfiles si hay múltiples chunks
-        if len(chunks) > 1:
+        if len(documento["chunks"]) > 1:
             perfil_final = self.combinar_perfiles_chunks(perfiles_chunks, autor, nombre_archivo)
         else:
             perfil_final = perfiles_chunks[0]
         
         tiempo_total = time.time() - tiempo_total_inicio
-        print(f"\\n⏱️ Tiempo total de procesamiento: {tiempo_total:.1f} segundos")
+        print(f"⏱️ Tiempo total de procesamiento ({nombre_archivo}): {tiempo_total:.1f} segundos")
         
         # 6. Guardar en base de datos
         doc_id = str(uuid.uuid4())
@@ -356,6 +463,32 @@ class ProcesadorCognitivoOptimizado:
             print(f"❌ Error guardando en BD: {e}")
             return None
     
+    def procesar_documento_optimizado(self, ruta_pdf: str) -> Optional[str]:
+        """Procesa un documento PDF con optimización y progreso detallado"""
+        
+        nombre_archivo = os.path.basename(ruta_pdf)
+        print(f"\\n🚀 PROCESANDO (OPTIMIZADO): {nombre_archivo}")
+        
+        documento = self.preparar_documento(ruta_pdf)
+        if not documento:
+            return None
+        
+        chunks = documento["chunks"]
+        
+        # 4. Procesar chunks (en paralelo si hay más de uno y más de un núcleo)
+        tiempo_total_inicio = time.time()
+        
+        if self._usar_pool(chunks):
+            workers = min(self.MAX_WORKERS, len(chunks))
+            print(f"⚡ Analizando {len(chunks)} chunks en {workers} procesos")
+            with self._crear_pool() as executor:
+                futuros = self.enviar_chunks(executor, chunks, documento["autor"], nombre_archivo)
+                perfiles_chunks = self.recolectar_chunks(futuros)
+        else:
+            perfiles_chunks = self.analizar_chunks_secuencial(chunks, documento["autor"], nombre_archivo)
+        
+        return self.finalizar_documento(documento, perfiles_chunks, tiempo_total_inicio)
+    
     def extraer_texto_pdf(self, ruta_pdf: str) -> str:
         """Extrae texto de PDF (igual que el original)"""
         
@@ -449,8 +582,68 @@ class ProcesadorCognitivoOptimizado:
         conn.commit()
         conn.close()
     
-    def procesar_todos_los_pdfs(self):
-        """Procesa todos los PDFs con optimización"""
+    def _procesar_pdfs_en_pipeline(self, pdfs: List[Path]) -> Tuple[int, int]:
+        """
+        Procesa los PDFs compartiendo un único pool de procesos.
+        
+        Mientras el pool analiza los chunks del documento N, el proceso
+        principal extrae y divide el documento N+1, y sólo espera los
+        resultados cuando hay más de DOCS_EN_VUELO documentos enviados.
+        """
+        documentos_procesados = 0
+        errores = 0
+        en_vuelo = deque()
+        
+        def cerrar_mas_antiguo():
+            nonlocal documentos_procesados, errores
+            documento, futuros, inicio = en_vuelo.popleft()
+            nombre = documento["nombre_archivo"]
+            try:
+                perfiles_chunks = self.recolectar_chunks(futuros)
+                resultado = self.finalizar_documento(documento, perfiles_chunks, inicio)
+            except Exception as e:
+                resultado = None
+                print(f"💥 EXCEPCIÓN en {nombre}: {e}")
+            
+            if resultado:
+                documentos_procesados += 1
+                print(f"✅ COMPLETADO: {nombre}")
+            else:
+                errores += 1
+                print(f"❌ ERROR: {nombre}")
+        
+        print(f"⚡ Pipeline con {self.MAX_WORKERS} procesos ({self.DOCS_EN_VUELO} documentos en vuelo)")
+        
+        with self._crear_pool() as executor:
+            for i, pdf_path in enumerate(pdfs):
+                print(f"📄 PREPARANDO [{i+1}/{len(pdfs)}]: {pdf_path.name}")
+                
+                try:
+                    documento = self.preparar_documento(str(pdf_path))
+                except Exception as e:
+                    documento = None
+                    print(f"💥 EXCEPCIÓN en {pdf_path.name}: {e}")
+                
+                if not documento:
+                    errores += 1
+                    print(f"❌ ERROR: {pdf_path.name}")
+                    continue
+                
+                futuros = self.enviar_chunks(
+                    executor, documento["chunks"], documento["autor"], documento["nombre_archivo"]
+                )
+                en_vuelo.append((documento, futuros, time.time()))
+                
+                while len(en_vuelo) > self.DOCS_EN_VUELO:
+                    cerrar_mas_antiguo()
+            
+            while en_vuelo:
+                cerrar_mas_antiguo()
+        
+        return documentos_procesados, errores
+    
+    def procesar_todos_los_pdfs(self, pipeline: bool = True):
+        """Procesa todos los PDFs con optimización (pipeline en pool de procesos por defecto)"""
         
         print("\\n🚀 INICIANDO PROCESAMIENTO OPTIMIZADO DE PDFs")
         print("=" * 60)
@@ -471,24 +664,27 @@ class ProcesadorCognitivoOptimizado:
         errores = 0
         tiempo_total_inicio = time.time()
         
-        for i, pdf_path in enumerate(pdfs):
-            print(f"\\n{'='*60}")
-            print(f"📄 PROCESANDO [{i+1}/{len(pdfs)}]: {pdf_path.name}")
-            print(f"{'='*60}")
+        if pipeline and self.MAX_WORKERS > 1:
+            documentos_procesados, errores = self._procesar_pdfs_en_pipeline(pdfs)
+        else:
+            for i, pdf_path in enumerate(pdfs):
+                print(f"\\n{'='*60}")
+                print(f"📄 PROCESANDO [{i+1}/{len(pdfs)}]: {pdf_path.name}")
+                print(f"{'='*60}")
             
-            try:
-                resultado = self.procesar_documento_optimizado(str(pdf_path))
+                try:
+                    resultado = self.procesar_documento_optimizado(str(pdf_path))
                 
-                if resultado:
-                    documentos_procesados += 1
-                    print(f"✅ COMPLETADO: {pdf_path.name}")
-                else:
-                    errores += 1
-                    print(f"❌ ERROR: {pdf_path.name}")
+                    if resultado:
+                        documentos_procesados += 1
+                        print(f"✅ COMPLETADO: {pdf_path.name}")
+                    else:
+                        errores += 1
+                        print(f"❌ ERROR: {pdf_path.name}")
                     
-            except Exception as e:
-                errores += 1
-                print(f"💥 EXCEPCIÓN en {pdf_path.name}: {e}")
+                except Exception as e:
+                    errores += 1
+                    print(f"💥 EXCEPCIÓN en {pdf_path.name}: {e}")
         
         tiempo_total = time.time() - tiempo_total_inicio
         
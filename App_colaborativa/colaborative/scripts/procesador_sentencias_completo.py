@@ -29,6 +29,7 @@ from typing import Dict, Optional, Tuple
 # Imports locales
 from analizador_pensamiento_judicial_arg import AnalizadorPensamientoJudicialArg, AnalisisJudicial
 from dataclasses import asdict
+from instrumentacion import imprimir_resumen, medir, volcar
 
 # Intentar importar ANALYSER v2.0
 try:
@@ -43,6 +44,7 @@ SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
 BASES_RAG_DIR = BASE_DIR / "bases_rag" / "cognitiva"
 DB_FILE = BASES_RAG_DIR / "juez_centrico_arg.db"
+METRICAS_BATCH = BASE_DIR / "logs" / "metricas" / "procesar_sentencias_pendientes.prom"
 
 # Colores
 class Colors:
@@ -148,7 +150,8 @@ class ProcesadorSentenciasCompleto:
         if self.analyser_cognitivo:
             print_info("Ejecutando análisis cognitivo (ANALYSER v2.0)...")
             try:
-                analisis_cognitivo = self.analyser_cognitivo.analizar_documento(texto, "sentencia")
+                with medir("analyser_cognitivo"):
+                    analisis_cognitivo = self.analyser_cognitivo.analizar_documento(texto, "sentencia")
                 resultado['analisis_cognitivo'] = analisis_cognitivo
                 print_success("Análisis cognitivo completado")
             except Exception as e:
@@ -231,7 +234,8 @@ class ProcesadorSentenciasCompleto:
 
         # 1. Obtener sentencia
         print_info("Obteniendo sentencia de la BD...")
-        sentencia = self.obtener_sentencia(sentencia_id)
+        with medir("obtener_sentencia"):
+            sentencia = self.obtener_sentencia(sentencia_id)
 
         if not sentencia:
             print_error(f"Sentencia no encontrada: {sentencia_id}")
@@ -246,12 +250,15 @@ class ProcesadorSentenciasCompleto:
 
         # 3. Guardar análisis
         print_info("Guardando análisis en BD...")
-        if not self.guardar_analisis_sentencia(sentencia_id, analisis):
+        with medir("guardar_analisis"):
+            guardado = self.guardar_analisis_sentencia(sentencia_id, analisis)
+        if not guardado:
             return False
 
         # 4. Actualizar perfil del juez (llamar al agregador)
         print_info(f"Actualizando perfil del juez: {juez}")
-        self.actualizar_perfil_juez_basico(juez, analisis)
+        with medir("actualizar_perfil"):
+            self.actualizar_perfil_juez_basico(juez, analisis)
 
         print(f"\n{Colors.OKGREEN}✓ SENTENCIA PROCESADA EXITOSAMENTE{Colors.ENDC}\n")
         return True
@@ -328,7 +335,9 @@ class ProcesadorSentenciasCompleto:
 
         for sentencia_id in pendientes:
             try:
-                if self.procesar_sentencia_completa(sentencia_id):
+                with medir("procesar_sentencia"):
+                    procesada = self.procesar_sentencia_completa(sentencia_id)
+                if procesada:
                     exitosas += 1
                 else:
                     fallidas += 1
@@ -342,7 +351,9 @@ class ProcesadorSentenciasCompleto:
         print(f"{'='*70}{Colors.ENDC}")
         print(f"Total: {len(pendientes)}")
         print(f"{Colors.OKGREEN}Exitosas: {exitosas}{Colors.ENDC}")
-        print(f"{Colors.FAIL}Fallidas: {fallidas}{Colors.ENDC}\n")
+        print(f"{Colors.FAIL}Fallidas: {fallidas}{Colors.ENDC}")
+        imprimir_resumen()
+        print()
 
         return {
             'total': len(pendientes),
@@ -374,6 +385,11 @@ def main():
         default=None,
         help='Límite de sentencias en modo batch'
     )
+    parser.add_argument(
+        '--metricas',
+        default=None,
+        help=f'Archivo .prom con los tiempos por etapa (batch: {METRICAS_BATCH.relative_to(BASE_DIR)})'
+    )
 
     args = parser.parse_args()
 
@@ -404,6 +420,9 @@ def main():
 
     finally:
         procesador.cerrar_bd()
+        ruta_metricas = args.metricas or (METRICAS_BATCH if args.batch else None)
+        if ruta_metricas:
+            print_info(f"Métricas por etapa en {volcar(ruta_metricas)}")
 
 
 if __name__ == "__main__":
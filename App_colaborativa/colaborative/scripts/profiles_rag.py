@@ -15,18 +15,21 @@ import numpy as np
 # Imports con manejo de errores
 try:
     from sentence_transformers import SentenceTransformer
-    import faiss
 except ImportError as e:
     print(f"⚠️ Error importing dependencies: {e}")
-    print("Instala con: pip install sentence-transformers faiss-cpu")
+    print("Instala con: pip install sentence-transformers")
     raise
 
+from segmentos_perfiles import AlmacenSegmentos, migrar_faiss
+
 # ==========================================================
 # 🔹 CONFIGURACIÓN
 # ==========================================================
 DB_PROFILES = "colaborative/data/perfiles.db"
+# Formato anterior (se migra solo la primera vez que se abre el almacén)
 INDEX_PROFILES = "colaborative/data/faiss_profiles.index"
 META_PROFILES = "colaborative/data/faiss_profiles_meta.json"
+SEGMENTOS_PROFILES = "colaborative/data/perfiles_segmentos"
 EMB_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # Modelo compatible con tu sistema
 
 # Crear directorio si no existe
@@ -62,35 +65,16 @@ def init_db_profiles():
     conn.close()
 
 # ==========================================================
-# 🔹 FAISS_B: ÍNDICE VECTORIAL DE PERFILES
+# 🔹 FAISS_B: ALMACÉN VECTORIAL DE PERFILES (segmentos append-only)
 # ==========================================================
-def _load_index(dim: int) -> faiss.IndexFlatIP:
-    """Carga o crea el índice FAISS de perfiles"""
-    if not os.path.exists(INDEX_PROFILES):
-        # Crear índice nuevo (similitud coseno con vectores normalizados)
-        index = faiss.IndexFlatIP(dim)
-        faiss.write_index(index, INDEX_PROFILES)
-        return index
-    return faiss.read_index(INDEX_PROFILES)
-
-def _save_index(index):
-    """Guarda el índice FAISS"""
-    faiss.write_index(index, INDEX_PROFILES)
-
-def _load_metadata() -> List[Dict]:
-    """Carga metadatos de vectores"""
-    if os.path.exists(META_PROFILES):
-        try:
-            with open(META_PROFILES, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-def _save_metadata(meta: List[Dict]):
-    """Guarda metadatos de vectores"""
-    with open(META_PROFILES, "w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
+def _abrir_almacen(dim: int) -> AlmacenSegmentos:
+    """Abre el almacén de segmentos; la primera vez importa el índice FAISS anterior"""
+    almacen = AlmacenSegmentos(SEGMENTOS_PROFILES, dim=dim)
+    if not almacen.total and os.path.exists(INDEX_PROFILES):
+        migrados = migrar_faiss(almacen, INDEX_PROFILES, META_PROFILES)
+        if migrados:
+            print(f"🪵 Migrados {migrados} perfiles de {INDEX_PROFILES} a segmentos")
+    return almacen
 
 # ==========================================================
 # 🔹 CLASE PRINCIPAL: ProfilesStore
@@ -113,11 +97,10 @@ class ProfilesStore:
             print(f"❌ Error cargando modelo: {e}")
             raise
         
-        # Cargar índice FAISS
-        self.index = _load_index(self.dim)
-        self.meta = _load_metadata()
+        # Abrir almacén de segmentos (lecturas mapeadas en memoria)
+        self.almacen = _abrir_almacen(self.dim)
         
-        print(f"📊 Perfiles cargados: {self.index.ntotal}")
+        print(f"📊 Perfiles cargados: {self.almacen.total}")
 
     def _embed(self, texts: List[str]) -> np.ndarray:
         """Genera embeddings normalizados"""
@@ -162,13 +145,13 @@ class ProfilesStore:
             print(f"❌ Error generando embeddings: {e}")
             return
         
-        # Añadir a FAISS
-        self.index.add(vecs)
-        
         # Guardar en BD SQLite
         conn = sqlite3.connect(DB_PROFILES)
         c = conn.cursor()
         created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        primer_id = self.almacen.total
+        metas = []
+        filas = []
         
         for i, r in enumerate(rows):
             try:
@@ -185,9 +168,9 @@ class ProfilesStore:
                     created
                 ))
                 
-                # Actualizar metadatos para FAISS
-                self.meta.append({
-                    "id": len(self.meta),
+                # Metadatos del vector (misma fila en el segmento)
+                metas.append({
+                    "id": primer_id + len(metas),
                     "doc_hash": r["doc_hash"],
                     "doc_titulo": r["doc_titulo"],
                     "autor_detectado": r.get("autor_detectado", "No identificado"),
@@ -195,6 +178,7 @@ class ProfilesStore:
                     "firma": r["firma"],
                     "fecha_registro": created
                 })
+                filas.append(i)
                 
             except sqlite3.IntegrityError:
                 print(f"⚠️ Perfil duplicado ignorado: {r['doc_hash']}")
@@ -203,11 +187,10 @@ class ProfilesStore:
         conn.commit()
         conn.close()
         
-        # Guardar índice y metadatos
-        _save_index(self.index)
-        _save_metadata(self.meta)
+        # Append al segmento activo: no reescribe los perfiles anteriores
+        self.almacen.agregar(vecs[filas], metas)
         
-        print(f"✅ {len(rows)} perfiles añadidos. Total: {self.index.ntotal}")
+        print(f"✅ {len(metas)} perfiles añadidos. Total: {self.almacen.total}")
 
     def search_profiles(self, query_firma: str, k: int = 8) -> List[Tuple[float, Dict]]:
         """
@@ -220,24 +203,17 @@ class ProfilesStore:
         Returns:
             Lista de (score, metadata) ordenada por similitud
         """
-        if self.index.ntotal == 0:
+        # Ver perfiles agregados por otros procesos
+        self.almacen.refrescar()
+        if self.almacen.total == 0:
             return []
         
         try:
             # Generar embedding de consulta
             qv = self._embed([query_firma])
             
-            # Búsqueda en FAISS
-            D, I = self.index.search(qv, min(k, self.index.ntotal))
-            
-            # Construir resultados
-            results = []
-            for score, idx in zip(D[0], I[0]):
-                if idx < 0 or idx >= len(self.meta):
-                    continue
-                results.append((float(score), self.meta[idx]))
-            
-            return results
+            # Producto punto sobre los segmentos mapeados (vectores normalizados)
+            return self.almacen.buscar(qv[0], k)
             
         except Exception as e:
             print(f"❌ Error en búsqueda de perfiles: {e}")
@@ -246,10 +222,11 @@ class ProfilesStore:
     def get_stats(self) -> Dict:
         """Retorna estadísticas del almacén"""
         return {
-            "total_perfiles": self.index.ntotal,
+            "total_perfiles": self.almacen.total,
             "dimension": self.dim,
             "modelo": EMB_MODEL,
-            "metadatos": len(self.meta)
+            "metadatos": self.almacen.total,
+            "segmentos": len(self.almacen.segmentos)
         }
 
 # ==========================================================
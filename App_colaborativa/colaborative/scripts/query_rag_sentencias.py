@@ -10,8 +10,23 @@ def faiss_search(query, topk=30):
     D, I = index.search(np.array(q, dtype="float32"), topk)
     with open(FAISS_META, "rb") as f:
         meta = pickle.load(f)
-    ids = [meta["ids"][int(i)] for i in I[0]]
-    return ids, D[0].tolist()
+    # Los casi-duplicados colapsados en build_faiss_sentencias.py no tienen
+    # vector propio: heredan el puntaje de su original, así los filtros por
+    # tribunal/fecha también encuentran las copias (p.ej. la transcripción en
+    # la apelación). original_de permite quedarse con uno por grupo.
+    copias = {}
+    for duplicado, original in meta.get("alias", {}).items():
+        copias.setdefault(original, []).append(duplicado)
+    ids, scores, original_de = [], [], {}
+    for i, d in zip(I[0], D[0]):
+        if i < 0:
+            continue
+        original = meta["ids"][int(i)]
+        for chunk_id in [original] + copias.get(original, []):
+            ids.append(chunk_id)
+            scores.append(float(d))
+            original_de[chunk_id] = original
+    return ids, scores, original_de
 
 def fetch_chunks(ids, filtros=None):
     con = sqlite3.connect(PENSAMIENTO_DB)
@@ -48,9 +63,22 @@ def fetch_chunks(ids, filtros=None):
     return rows
 
 def buscar(query, filtros=None, topk=30):
-    ids, _ = faiss_search(query, topk=topk)
+    ids, _, original_de = faiss_search(query, topk=topk)
     rows = fetch_chunks(ids, filtros=filtros)
 
+    # Un solo chunk por grupo de casi-duplicados: el original si pasa los
+    # filtros, si no la primera copia que los pasa
+    orden = {chunk_id: k for k, chunk_id in enumerate(ids)}
+    rows.sort(key=lambda r: orden.get(r[0], len(orden)))
+    vistos = set()
+    unicos = []
+    for r in rows:
+        grupo = original_de.get(r[0], r[0])
+        if grupo not in vistos:
+            vistos.add(grupo)
+            unicos.append(r)
+    rows = unicos
+
     # re-rank simple: boosts por coincidencia en metadatos
     scored = []
     for r in rows:
@@ -12,10 +12,14 @@ Genera reportes agregados de distancia doctrinal por:
 Útil para identificar patrones de apartamiento doctrinal
 por sala, juez o tipo de causa.
 
+Con --snapshot agrega desde un snapshot de chunks (exportador_columnar.py)
+leyendo sólo las columnas necesarias, sin tocar la base viva.
+
 AUTOR: Sistema Cognitivo v7.5
 FECHA: 10 NOV 2025
 """
 
+import argparse
 import sqlite3
 import pandas as pd
 from pathlib import Path
@@ -28,6 +32,75 @@ def crear_directorio_exports():
     exports_dir.mkdir(exist_ok=True)
     return exports_dir
 
+# Columnas del snapshot de chunks que usa la agregación
+COLUMNAS_SNAPSHOT = ["expediente", "tribunal", "jurisdiccion", "materia",
+                     "fecha_sentencia", "distancia_doctrinal"]
+CLAVES_AGREGADO = ["expediente", "tribunal", "jurisdiccion", "materia", "fecha_sentencia"]
+
+def categorizar_apartamiento(dist_prom):
+    if dist_prom <= 0.20:
+        return "🟢 Alineado"
+    elif dist_prom <= 0.50:
+        return "🟡 Moderado"
+    else:
+        return "🔴 Apartado"
+
+def completar_reporte(df):
+    """Porcentajes y categoría de apartamiento sobre el agregado por expediente"""
+    df['pct_alineados'] = (df['chunks_alineados'] / df['chunks_total'] * 100).round(1)
+    df['pct_moderados'] = (df['chunks_moderados'] / df['chunks_total'] * 100).round(1)
+    df['pct_apartados'] = (df['chunks_apartados'] / df['chunks_total'] * 100).round(1)
+    df['categoria_apartamiento'] = df['dist_prom_redondeada'].apply(categorizar_apartamiento)
+    return df
+
+def generar_reporte_desde_snapshot(ruta):
+    """Mismo agregado que la consulta SQL, desde un snapshot Parquet/JSONL de chunks"""
+    print("📊 GENERANDO REPORTE AGREGADO DESDE SNAPSHOT")
+    print("=" * 60)
+
+    ruta = Path(ruta)
+    if not ruta.exists():
+        print(f"❌ Snapshot no encontrado: {ruta}")
+        print("📋 Ejecutá primero: python exportador_columnar.py chunks")
+        return None
+
+    if ruta.suffix == ".parquet":
+        chunks = pd.read_parquet(ruta, columns=COLUMNAS_SNAPSHOT)
+    else:
+        chunks = pd.read_json(ruta, lines=True, dtype=False)
+        chunks = chunks.reindex(columns=COLUMNAS_SNAPSHOT)
+
+    chunks = chunks[chunks['distancia_doctrinal'].notna()
+                    & chunks['expediente'].notna()
+                    & (chunks['expediente'] != '')]
+    if len(chunks) == 0:
+        print("⚠️ El snapshot no tiene chunks con distancia doctrinal")
+        return None
+    print(f"📈 Procesando {len(chunks)} chunks con distancia doctrinal...")
+
+    distancia = chunks['distancia_doctrinal']
+    chunks = chunks.assign(
+        alineado=(distancia <= 0.20).astype(int),
+        moderado=((distancia > 0.20) & (distancia <= 0.50)).astype(int),
+        apartado=(distancia > 0.50).astype(int),
+    )
+    # dropna=False: GROUP BY de SQLite agrupa los NULL juntos
+    df = (chunks.groupby(CLAVES_AGREGADO, dropna=False)
+          .agg(chunks_total=('distancia_doctrinal', 'size'),
+               dist_promedio=('distancia_doctrinal', 'mean'),
+               dist_minima=('distancia_doctrinal', 'min'),
+               dist_maxima=('distancia_doctrinal', 'max'),
+               chunks_alineados=('alineado', 'sum'),
+               chunks_moderados=('moderado', 'sum'),
+               chunks_apartados=('apartado', 'sum'))
+          .reset_index())
+    df.insert(df.columns.get_loc('dist_maxima') + 1, 'dist_prom_redondeada', df['dist_promedio'].round(4))
+    df = df.sort_values('dist_promedio', ascending=False).reset_index(drop=True)
+
+    df = completar_reporte(df)
+    print(f"✅ Datos procesados: {len(df)} expedientes únicos")
+    return df
+
 def generar_reporte_agregado():
     """Genera reporte agregado principal"""
     print("📊 GENERANDO REPORTE AGREGADO DE DISTANCIAS DOCTRINALES")
@@ -80,21 +153,8 @@ def generar_reporte_agregado():
         df = pd.read_sql_query(query, con)
         con.close()
         
-        # Calcular porcentajes
-        df['pct_alineados'] = (df['chunks_alineados'] / df['chunks_total'] * 100).round(1)
-        df['pct_moderados'] = (df['chunks_moderados'] / df['chunks_total'] * 100).round(1)
-        df['pct_apartados'] = (df['chunks_apartados'] / df['chunks_total'] * 100).round(1)
-        
-        # Categorizar nivel de apartamiento
-        def categorizar_apartamiento(dist_prom):
-            if dist_prom <= 0.20:
-                return "🟢 Alineado"
-            elif dist_prom <= 0.50:
-                return "🟡 Moderado"
-            else:
-                return "🔴 Apartado"
-        
-        df['categoria_apartamiento'] = df['dist_prom_redondeada'].apply(categorizar_apartamiento)
+        # Porcentajes y categoría de apartamiento
+        df = completar_reporte(df)
         
         print(f"✅ Datos procesados: {len(df)} expedientes únicos")
         return df
@@ -195,11 +255,18 @@ def mostrar_estadisticas_resumen(df):
 
 def main():
     """Proceso principal de generación de reportes"""
+    parser = argparse.ArgumentParser(description="Reportes de distancia doctrinal por expediente/tribunal")
+    parser.add_argument("--snapshot", help="Snapshot de chunks (.parquet/.jsonl) en vez de la base viva")
+    args = parser.parse_args()
+
     print("📊 GENERADOR DE REPORTES DE DISTANCIA DOCTRINAL V7.5")
     print("=" * 65)
     
     # Generar datos agregados
-    df = generar_reporte_agregado()
+    if args.snapshot:
+        df = generar_reporte_desde_snapshot(args.snapshot)
+    else:
+        df = generar_reporte_agregado()
     
     if df is not None:
         # Mostrar estadísticas
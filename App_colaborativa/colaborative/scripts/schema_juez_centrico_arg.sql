@@ -150,7 +150,8 @@ CREATE TABLE IF NOT EXISTS sentencias_por_juez_arg (
 
     -- ===== IDENTIFICACIÓN =====
     sentencia_id TEXT UNIQUE NOT NULL,
-    juez TEXT NOT NULL,
+    juez TEXT NOT NULL,                  -- nombre canónico (nombres_canonicos), el del perfil
+    juez_original TEXT,                  -- nombre tal como figura en la sentencia
     archivo_original TEXT,
 
     -- ===== METADATA PROCESAL ARGENTINA =====
@@ -352,6 +353,11 @@ CREATE INDEX IF NOT EXISTS idx_sentencia_fecha ON sentencias_por_juez_arg(fecha_
 CREATE INDEX IF NOT EXISTS idx_sentencia_materia ON sentencias_por_juez_arg(materia);
 CREATE INDEX IF NOT EXISTS idx_sentencia_expediente ON sentencias_por_juez_arg(expediente);
 CREATE INDEX IF NOT EXISTS idx_sentencia_fuero ON sentencias_por_juez_arg(fuero);
+CREATE INDEX IF NOT EXISTS idx_sentencia_jurisdiccion ON sentencias_por_juez_arg(jurisdiccion);
+CREATE INDEX IF NOT EXISTS idx_sentencia_resultado ON sentencias_por_juez_arg(resultado);
+-- Índice cubriente de los conteos por faceta del buscador (no lee el texto completo)
+CREATE INDEX IF NOT EXISTS idx_sentencia_facetas
+    ON sentencias_por_juez_arg(fuero, jurisdiccion, resultado, juez, fecha_sentencia, sentencia_id);
 
 -- Índices para lineas_jurisprudenciales
 CREATE INDEX IF NOT EXISTS idx_linea_juez ON lineas_jurisprudenciales(juez);
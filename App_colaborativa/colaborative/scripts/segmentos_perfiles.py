@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+🪵 ALMACÉN DE PERFILES EN SEGMENTOS APPEND-ONLY
+==============================================
+
+Reemplaza el par faiss_profiles.index + faiss_profiles_meta.json de
+ProfilesStore, que se reescribían enteros en cada add_profiles():
+
+- seg-NNNNNN.f32     vectores float32 (filas x dim), sólo se agrega al final
+- seg-NNNNNN.jsonl   un metadato JSON por línea, en el mismo orden
+- MANIFIESTO.json    dim, segmentos y, por segmento, filas y bytes confirmados;
+                     segmentos retirados por la última compactación
+
+Agregar = append a los dos archivos del segmento activo + fsync + reemplazo
+atómico del manifiesto (que no crece con los perfiles, sólo con los
+segmentos). Un lector sólo mira hasta lo que declara el manifiesto: nunca ve
+un append a medias, y lo que sobre de un append interrumpido se trunca en el
+próximo.
+
+Cuando el segmento activo llega a FILAS_POR_SEGMENTO se sella. Si se juntan
+UMBRAL_COMPACTACION segmentos sellados chicos, un hilo en segundo plano los
+fusiona en uno nuevo y cambia el manifiesto. Los segmentos reemplazados
+quedan en el manifiesto como "retirados" y sus archivos se borran recién en
+la compactación siguiente: un lector de otro proceso con el manifiesto
+anterior todavía puede abrirlos. Si aun así falta un archivo, el lector
+relee el manifiesto y reintenta.
+
+Lecturas: np.memmap de vectores y metadatos; la búsqueda es un producto
+punto por segmento (vectores normalizados = coseno) y un top-k combinado.
+
+Las escrituras están serializadas dentro del proceso; no está pensado para
+varios procesos escribiendo a la vez. Los lectores de otros procesos ven
+los agregados al llamar refrescar().
+
+USO:
+    python segmentos_perfiles.py --estado
+    python segmentos_perfiles.py --migrar      # desde faiss_profiles.index + meta.json
+    python segmentos_perfiles.py --compactar
+"""
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MANIFIESTO = "MANIFIESTO.json"
+FILAS_POR_SEGMENTO = 4096
+UMBRAL_COMPACTACION = 8
+# Los segmentos ya compactados a este tamaño no se vuelven a reescribir
+FILAS_MAXIMAS_COMPACTADO = FILAS_POR_SEGMENTO * 64
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+SEGMENTOS_DIR = DATA_DIR / "perfiles_segmentos"
+
+
+def _escribir_atomico(ruta: Path, contenido: str):
+    tmp = ruta.with_name(ruta.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ruta)
+
+
+def _append(ruta: Path, confirmado: int, datos: bytes):
+    """Trunca lo no confirmado (append interrumpido) y agrega ``datos``"""
+    with open(ruta, "ab") as f:
+        f.truncate(confirmado)
+        f.write(datos)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SegmentoLeido:
+    """Vista de sólo lectura de un segmento hasta las filas confirmadas"""
+
+    def __init__(self, directorio: Path, nombre: str, filas: int, bytes_meta: int, dim: int):
+        self.nombre = nombre
+        self.filas = filas
+        self.bytes_meta = bytes_meta
+        if filas:
+            self.vectores = np.memmap(directorio / f"{nombre}.f32", dtype=np.float32, mode="r",
+                                      shape=(filas, dim))
+            self.meta_cruda = np.memmap(directorio / f"{nombre}.jsonl", dtype=np.uint8, mode="r",
+                                        shape=(bytes_meta,))
+            fines = np.flatnonzero(self.meta_cruda == 10)[:filas]
+            self._inicios = np.concatenate(([0], fines[:-1] + 1))
+            self._fines = fines
+        else:
+            self.vectores = np.zeros((0, dim), dtype=np.float32)
+            self.meta_cruda = None
+
+    def metadato(self, fila: int) -> Dict:
+        inicio, fin = int(self._inicios[fila]), int(self._fines[fila])
+        return json.loads(bytes(self.meta_cruda[inicio:fin]).decode("utf-8"))
+
+    def metadatos(self) -> List[Dict]:
+        return [self.metadato(i) for i in range(self.filas)]
+
+
+class AlmacenSegmentos:
+    """Vectores normalizados + metadatos en segmentos append-only con manifiesto"""
+
+    def __init__(self, directorio=SEGMENTOS_DIR, dim: Optional[int] = None,
+                 filas_por_segmento: int = FILAS_POR_SEGMENTO,
+                 umbral_compactacion: int = UMBRAL_COMPACTACION,
+                 compactar_en_fondo: bool = True):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.ruta_manifiesto = self.directorio / MANIFIESTO
+        self.filas_por_segmento = filas_por_segmento
+        self.umbral_compactacion = umbral_compactacion
+        self.compactar_en_fondo = compactar_en_fondo
+
+        self._lock = threading.Lock()
+        self._lock_compactacion = threading.RLock()
+        self._hilo_compactacion: Optional[threading.Thread] = None
+        self._leidos: Dict[str, SegmentoLeido] = {}
+        self._mtime_manifiesto = None
+
+        self.dim = dim
+        self.segmentos: List[Dict] = []
+        self.retirados: List[str] = []
+        self.siguiente = 1
+        self.refrescar()
+
+    # ------------------------------------------------------
+    # Manifiesto
+    # ------------------------------------------------------
+    def refrescar(self) -> bool:
+        """Relee el manifiesto si cambió (agregados de otro proceso). True si cambió"""
+        try:
+            mtime = self.ruta_manifiesto.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime_manifiesto:
+            return False
+        with open(self.ruta_manifiesto, "r", encoding="utf-8") as f:
+            manifiesto = json.load(f)
+        if self.dim and manifiesto.get("dim") and manifiesto["dim"] != self.dim:
+            raise ValueError(f"Dimensión {self.dim} incompatible con el almacén ({manifiesto['dim']})")
+        self.dim = manifiesto.get("dim") or self.dim
+        self.segmentos = manifiesto.get("segmentos", [])
+        self.retirados = manifiesto.get("retirados", [])
+        self.siguiente = manifiesto.get("siguiente", len(self.segmentos) + 1)
+        self._mtime_manifiesto = mtime
+        return True
+
+    def _guardar_manifiesto(self):
+        _escribir_atomico(self.ruta_manifiesto, json.dumps({
+            "dim": self.dim,
+            "segmentos": self.segmentos,
+            "retirados": self.retirados,
+            "siguiente": self.siguiente,
+        }, ensure_ascii=False))
+        self._mtime_manifiesto = self.ruta_manifiesto.stat().st_mtime_ns
+
+    def _nuevo_nombre(self) -> str:
+        nombre = f"seg-{self.siguiente:06d}"
+        self.siguiente += 1
+        return nombre
+
+    # ------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------
+    def agregar(self, vectores: np.ndarray, metadatos: Sequence[Dict]) -> int:
+        """Agrega filas (vector, metadato) con un append por archivo. Devuelve cuántas"""
+        vectores = np.atleast_2d(np.asarray(vectores, dtype=np.float32))
+        if len(vectores) != len(metadatos):
+            raise ValueError("Cantidad de vectores y metadatos distinta")
+        if not len(vectores):
+            return 0
+
+        with self._lock:
+            self.refrescar()
+            if self.dim is None:
+                self.dim = int(vectores.shape[1])
+            if vectores.shape[1] != self.dim:
+                raise ValueError(f"Dimensión {vectores.shape[1]} incompatible con el almacén ({self.dim})")
+
+            activo = self.segmentos[-1] if self.segmentos else None
+            if activo is None or activo["filas"] >= self.filas_por_segmento:
+                activo = {"nombre": self._nuevo_nombre(), "filas": 0, "bytes_meta": 0}
+                self.segmentos.append(activo)
+
+            lineas = "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in metadatos).encode("utf-8")
+            _append(self.directorio / f"{activo['nombre']}.f32", activo["filas"] * 4 * self.dim,
+                    np.ascontiguousarray(vectores).tobytes())
+            _append(self.directorio / f"{activo['nombre']}.jsonl", activo["bytes_meta"], lineas)
+
+            # Sólo ahora las filas existen para los lectores
+            activo["filas"] += len(vectores)
+            activo["bytes_meta"] += len(lineas)
+            self._guardar_manifiesto()
+            a_compactar = self._candidatos_compactacion()
+
+        if len(a_compactar) >= self.umbral_compactacion:
+            if self.compactar_en_fondo:
+                self._compactar_en_fondo()
+            else:
+                self.compactar()
+        return len(vectores)
+
+    # ------------------------------------------------------
+    # Compactación
+    # ------------------------------------------------------
+    def _candidatos_compactacion(self) -> List[Dict]:
+        """Segmentos sellados (todos menos el activo) que todavía son chicos"""
+        return [s for s in self.segmentos[:-1] if s["filas"] < FILAS_MAXIMAS_COMPACTADO]
+
+    def _compactar_en_fondo(self):
+        if self._hilo_compactacion and self._hilo_compactacion.is_alive():
+            return
+        self._hilo_compactacion = threading.Thread(target=self.compactar, name="compactacion-perfiles",
+                                                   daemon=True)
+        self._hilo_compactacion.start()
+
+    def esperar_compactacion(self):
+        if self._hilo_compactacion:
+            self._hilo_compactacion.join()
+
+    def compactar(self) -> int:
+        """
+        Fusiona los segmentos sellados chicos en uno. Los agregados siguen
+        mientras se escribe el nuevo segmento; sólo el cambio de manifiesto
+        toma el lock. Devuelve cuántos segmentos fusionó.
+        """
+        with self._lock_compactacion:
+            with self._lock:
+                candidatos = [dict(s) for s in self._candidatos_compactacion()]
+                if len(candidatos) < 2:
+                    return 0
+                destino = self._nuevo_nombre()
+                # Reservar el nombre aunque la compactación falle
+                self._guardar_manifiesto()
+
+            filas = bytes_meta = 0
+            with open(self.directorio / f"{destino}.f32", "wb") as f_vec, \
+                    open(self.directorio / f"{destino}.jsonl", "wb") as f_meta:
+                for seg in candidatos:
+                    leido = SegmentoLeido(self.directorio, seg["nombre"], seg["filas"], seg["bytes_meta"], self.dim)
+                    if seg["filas"]:
+                        f_vec.write(np.ascontiguousarray(leido.vectores).tobytes())
+                        f_meta.write(bytes(leido.meta_cruda))
+                    filas += seg["filas"]
+                    bytes_meta += seg["bytes_meta"]
+                    del leido
+                for f in (f_vec, f_meta):
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            with self._lock:
+                nombres = {s["nombre"] for s in candidatos}
+                posicion = next(i for i, s in enumerate(self.segmentos) if s["nombre"] in nombres)
+                restantes = [s for s in self.segmentos if s["nombre"] not in nombres]
+                restantes.insert(posicion, {"nombre": destino, "filas": filas, "bytes_meta": bytes_meta})
+                self.segmentos = restantes
+                # Los de la compactación anterior ya se pueden borrar; éstos esperan a la próxima
+                self.retirados = sorted(nombres)
+                self._guardar_manifiesto()
+                for nombre in nombres:
+                    self._leidos.pop(nombre, None)
+
+            self.limpiar_huerfanos()
+            print(f"🪵 Compactados {len(candidatos)} segmentos de perfiles en {destino} ({filas} filas)")
+            return len(candidatos)
+
+    def limpiar_huerfanos(self) -> int:
+        """Borra archivos de segmentos que ya no están en el manifiesto (ni retirados)"""
+        # El lock de compactación excluye un segmento compactado a medio escribir;
+        # _lock, durante todo el listado y borrado, excluye a agregar(), que
+        # crea el archivo de un segmento activo nuevo bajo ese mismo lock
+        with self._lock_compactacion, self._lock:
+            vigentes = {s["nombre"] for s in self.segmentos} | set(self.retirados)
+            borrados = 0
+            for ruta in self.directorio.glob("seg-*.*"):
+                if ruta.name.split(".")[0] in vigentes:
+                    continue
+                try:
+                    ruta.unlink()
+                    borrados += 1
+                except OSError:
+                    # Otro lector todavía lo tiene mapeado (Windows): se reintenta luego
+                    pass
+            return borrados
+
+    # ------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------
+    def _segmentos_leidos(self) -> List[SegmentoLeido]:
+        try:
+            return self._abrir_segmentos()
+        except FileNotFoundError:
+            # Otro proceso compactó dos veces desde nuestro último refrescar()
+            # y ya borró un segmento que seguíamos listando
+            self._mtime_manifiesto = None
+            self.refrescar()
+            return self._abrir_segmentos()
+
+    def _abrir_segmentos(self) -> List[SegmentoLeido]:
+        with self._lock:
+            segmentos = [dict(s) for s in self.segmentos]
+            leidos = []
+            for seg in segmentos:
+                leido = self._leidos.get(seg["nombre"])
+                if leido is None or leido.filas != seg["filas"]:
+                    leido = SegmentoLeido(self.directorio, seg["nombre"], seg["filas"], seg["bytes_meta"], self.dim)
+                    self._leidos[seg["nombre"]] = leido
+                leidos.append(leido)
+            return leidos
+
+    def buscar(self, consulta: np.ndarray, k: int = 8) -> List[Tuple[float, Dict]]:
+        """Top-k por producto punto (coseno si los vectores están normalizados)"""
+        if not self.dim or not self.total:
+            return []
+        consulta = np.asarray(consulta, dtype=np.float32).ravel()
+        candidatos: List[Tuple[float, SegmentoLeido, int]] = []
+        for leido in self._segmentos_leidos():
+            if not leido.filas:
+                continue
+            puntajes = leido.vectores @ consulta
+            n = min(k, len(puntajes))
+            mejores = np.argpartition(-puntajes, n - 1)[:n]
+            candidatos.extend((float(puntajes[i]), leido, int(i)) for i in mejores)
+        candidatos.sort(key=lambda c: -c[0])
+        return [(puntaje, leido.metadato(fila)) for puntaje, leido, fila in candidatos[:k]]
+
+    def metadatos(self) -> List[Dict]:
+        return [m for leido in self._segmentos_leidos() for m in leido.metadatos()]
+
+    def vectores(self) -> np.ndarray:
+        leidos = [leido.vectores for leido in self._segmentos_leidos() if leido.filas]
+        return np.vstack(leidos) if leidos else np.zeros((0, self.dim or 0), dtype=np.float32)
+
+    @property
+    def total(self) -> int:
+        return sum(s["filas"] for s in self.segmentos)
+
+    def estado(self) -> Dict:
+        return {
+            "dim": self.dim,
+            "filas": self.total,
+            "segmentos": len(self.segmentos),
+            "a_compactar": len(self._candidatos_compactacion()),
+        }
+
+
+def migrar_faiss(almacen: AlmacenSegmentos, index_path, meta_path) -> int:
+    """Copia un IndexFlat de FAISS + su JSON de metadatos al almacén (si está vacío)"""
+    index_path, meta_path = Path(index_path), Path(meta_path)
+    if almacen.total or not index_path.exists():
+        return 0
+    import faiss
+
+    index = faiss.read_index(str(index_path))
+    if not index.ntotal:
+        return 0
+    vectores = index.reconstruct_n(0, index.ntotal)
+    metadatos: List[Dict] = []
+    if meta_path.exists():
+        with open(meta_path, "r", encoding="utf-8") as f:
+            metadatos = json.load(f)
+    # El JSON viejo podía quedar desfasado del índice tras un corte a mitad de escritura
+    metadatos = (metadatos + [{"id": i} for i in range(len(metadatos), len(vectores))])[:len(vectores)]
+
+    for inicio in range(0, len(vectores), almacen.filas_por_segmento):
+        fin = inicio + almacen.filas_por_segmento
+        almacen.agregar(vectores[inicio:fin], metadatos[inicio:fin])
+    return len(vectores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén de perfiles en segmentos append-only")
+    parser.add_argument("--directorio", default=str(SEGMENTOS_DIR))
+    parser.add_argument("--estado", action="store_true")
+    parser.add_argument("--migrar", action="store_true", help="Importar faiss_profiles.index + meta.json")
+    parser.add_argument("--compactar", action="store_true")
+    args = parser.parse_args()
+
+    almacen = AlmacenSegmentos(args.directorio, compactar_en_fondo=False)
+    if args.migrar:
+        migradas = migrar_faiss(almacen, DATA_DIR / "faiss_profiles.index", DATA_DIR / "faiss_profiles_meta.json")
+        print(f"✅ Migrados {migradas} perfiles" if migradas else "ℹ️ Nada para migrar")
+    if args.compactar:
+        print(f"✅ Segmentos fusionados: {almacen.compactar()}")
+        print(f"🧹 Archivos huérfanos borrados: {almacen.limpiar_huerfanos()}")
+    print(f"📊 {almacen.estado()}")
+
+
+if __name__ == "__main__":
+    main()
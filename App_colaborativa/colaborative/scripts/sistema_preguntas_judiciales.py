@@ -20,7 +20,7 @@ AUTOR: Sistema de Análisis Judicial Argentina
 FECHA: 12 NOV 2025
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 import json
 
@@ -46,6 +46,15 @@ class SistemaPreguntasJudiciales:
     def __init__(self):
         """Inicializa el sistema con todas las preguntas"""
         self.preguntas = self._definir_preguntas()
+        self.indice = self._indexar_preguntas()
+
+    def _indexar_preguntas(self) -> Dict[str, Pregunta]:
+        """Índice id -> Pregunta para búsquedas O(1)"""
+        return {
+            pregunta.id: pregunta
+            for categoria in self.preguntas.values()
+            for pregunta in categoria
+        }
 
     def _definir_preguntas(self) -> Dict[str, List[Pregunta]]:
         """Define todas las preguntas del sistema"""
@@ -1239,11 +1248,7 @@ class SistemaPreguntasJudiciales:
 
     def obtener_pregunta_por_id(self, pregunta_id: str) -> Optional[Pregunta]:
         """Obtiene una pregunta por su ID"""
-        for categoria in self.preguntas.values():
-            for pregunta in categoria:
-                if pregunta.id == pregunta_id:
-                    return pregunta
-        return None
+        return self.indice.get(pregunta_id)
 
     def buscar_preguntas(self, termino: str) -> List[Pregunta]:
         """Busca preguntas que contengan un término"""
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de nombres canónicos: las variantes de una misma persona
+se fusionan y los nombres parecidos de personas distintas quedan separados.
+
+USO:
+    python -m pytest test_indice_nombres.py -q
+    python test_indice_nombres.py
+"""
+
+import tempfile
+from pathlib import Path
+
+from indice_nombres import IndiceNombres, mismo_nombre, normalizar_nombre
+
+
+def _indice(nombres):
+    directorio = tempfile.mkdtemp()
+    indice = IndiceNombres(Path(directorio) / "nombres.db", "juez")
+    for nombre in nombres:
+        indice.canonizar(nombre)
+    return indice
+
+
+def _mismo(a, b):
+    return mismo_nombre(normalizar_nombre(a), normalizar_nombre(b))
+
+
+def test_variantes_de_la_misma_persona():
+    assert _mismo("Dra. María E. Pérez", "PEREZ, Maria Elena")
+    assert _mismo("Perez Maria", "María Pérez")
+    assert _mismo("Juan Fernandez", "Juan Fernandes")
+    assert _mismo("Juan Vázquez", "Juan Basquez")
+
+
+def test_nombres_parecidos_de_personas_distintas():
+    assert not _mismo("Luisa Fernandez", "Luis Fernandez")
+    assert not _mismo("Mario Pérez", "Maria Perez")
+    assert not _mismo("Daniela Gomez", "Daniel Gomez")
+    assert not _mismo("Marta Perez", "Maria Perez")
+    assert not _mismo("Perez", "Maria Perez")
+    assert not _mismo("J. Perez", "M. Perez")
+    assert not _mismo("Andrea Gomez", "Andrés Gómez")
+    assert not _mismo("Alexia Ruiz", "Alexis Ruiz")
+    assert not _mismo("Mariana Lopez", "Mariano Lopez")
+
+
+def test_tipeo_solo_en_apellidos():
+    assert _mismo("Carlos Rodriguez", "Carlos Rodriquez")
+    assert _mismo("Ana Bustamante", "Ana Bustamente")
+
+
+def test_canonizar_no_fusiona_personas_distintas():
+    indice = _indice(["Luis Fernandez", "Maria Perez"])
+    assert indice.canonizar("Luisa Fernandez") == "Luisa Fernandez"
+    assert indice.canonizar("Mario Pérez") == "Mario Pérez"
+    assert indice.canonizar("PEREZ, María") == "Maria Perez"
+
+
+def test_buscar_distingue_y_encuentra_variantes():
+    indice = _indice(["Luis Fernandez", "Luisa Fernandez"])
+    resultados = dict(indice.buscar("Luisa Fernandez"))
+    assert resultados["Luisa Fernandez"] == 100.0
+    assert resultados.get("Luis Fernandez", 0) < 100.0
+
+    # Una variante fusionada se encuentra por su propia grafía
+    indice = _indice(["Maria Elena Perez", "Dra. PEREZ, María E."])
+    assert indice.variantes_de("Maria Elena Perez") == ["e maria perez", "elena maria perez"]
+    assert indice.buscar("e. maria")[0][0] == "Maria Elena Perez"
+
+
+def main():
+    for nombre, prueba in sorted(globals().items()):
+        if nombre.startswith("test_"):
+            prueba()
+            print(f"✅ {nombre}")
+
+
+if __name__ == "__main__":
+    main()
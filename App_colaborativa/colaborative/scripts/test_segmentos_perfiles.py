@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del almacén de perfiles en segmentos: los agregados que corren
+mientras una compactación trabaja en segundo plano no pierden ni corrompen
+filas.
+
+USO:
+    python -m pytest test_segmentos_perfiles.py -q
+    python test_segmentos_perfiles.py
+"""
+
+import tempfile
+
+import numpy as np
+
+from segmentos_perfiles import AlmacenSegmentos
+
+
+def test_agregar_durante_compactacion_en_fondo():
+    directorio = tempfile.mkdtemp()
+    almacen = AlmacenSegmentos(directorio, filas_por_segmento=4, umbral_compactacion=2)
+    rng = np.random.default_rng(7)
+    esperados = []
+    for i in range(600):
+        vector = rng.random((1, 8)).astype(np.float32) + 0.1
+        almacen.agregar(vector, [{"id": i}])
+        esperados.append(vector[0])
+    almacen.esperar_compactacion()
+
+    for seg in almacen.segmentos:
+        assert (almacen.directorio / f"{seg['nombre']}.f32").exists(), seg["nombre"]
+
+    # Otro lector (manifiesto en disco) ve todas las filas, sin ceros
+    lector = AlmacenSegmentos(directorio, compactar_en_fondo=False)
+    assert [m["id"] for m in lector.metadatos()] == list(range(600))
+    np.testing.assert_array_equal(lector.vectores(), np.vstack(esperados))
+
+
+def test_lector_con_manifiesto_viejo_sobrevive_a_dos_compactaciones():
+    directorio = tempfile.mkdtemp()
+    escritor = AlmacenSegmentos(directorio, dim=4, filas_por_segmento=2,
+                                umbral_compactacion=99, compactar_en_fondo=False)
+    for i in range(6):
+        escritor.agregar(np.full((1, 4), i + 1.0), [{"id": i}])
+    lector = AlmacenSegmentos(directorio, compactar_en_fondo=False)
+
+    assert escritor.compactar() >= 2
+    assert len(lector.metadatos()) == 6          # archivos retirados todavía presentes
+
+    for i in range(6, 12):
+        escritor.agregar(np.full((1, 4), i + 1.0), [{"id": i}])
+    assert escritor.compactar() >= 2
+    lector._leidos.clear()
+    assert len(lector.metadatos()) == 12         # relee el manifiesto y reintenta
+
+
+def main():
+    for nombre, prueba in sorted(globals().items()):
+        if nombre.startswith("test_"):
+            prueba()
+            print(f"✅ {nombre}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 REGRESIÓN DEL BANCO DE PATRONES COMPILADOS
+=============================================
+
+Verifica que pattern_bank.py produce exactamente los mismos scores que
+la implementación original basada en re.findall / str.count:
+1. Taxonomías de AnalyserMetodoMejorado (categoría por categoría)
+2. Perfil autoral completo (sin timestamp)
+3. Conteos de rasgos de vectorizador_cognitivo.extraer_rasgos_cognitivos
+
+Usa un corpus fijo (textos de ejemplo del sistema y un chunk sintético de
+~15k caracteres como los de ProcesadorCognitivoOptimizado).
+
+FECHA: 18 NOV 2025
+"""
+
+import re
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+CORPUS_FIJO = [
+    "",
+    "Texto breve.",
+    """
+    En primer lugar, debemos analizar sistemáticamente los elementos que configuran
+    esta figura jurídica. La doctrina establece claramente que no puede haber
+    ambigüedad en la interpretación. Por tanto, se sigue necesariamente que
+    la única opción viable es aplicar el criterio restrictivo.
+
+    Como sostiene la jurisprudencia de la Corte Suprema, el principio protectorio
+    debe ser interpretado en función de la finalidad social que persigue. Sin embargo,
+    reconozco que los datos disponibles son limitados y que existe una zona gris
+    en la aplicación práctica de esta norma.
+    """,
+    """
+    La aplicación del artículo 1197 del Código Civil argentino establece claramente
+    que las convenciones hechas en los contratos forman para las partes una regla
+    a la cual deben someterse como a la ley misma. Sin embargo, la jurisprudencia
+    de la Corte Suprema ha sostenido que este principio debe interpretarse
+    conforme a los postulados de la buena fe contractual. En el caso "Banco de
+    Boston c/ García" la Corte decidió que la autonomía de la voluntad encuentra
+    límites en el orden público y las buenas costumbres.
+    """,
+    """
+    VISTOS: los autos caratulados "Pérez c/ Estado Nacional s/ amparo", Expte. 1234/2020.
+    CONSIDERANDO: Que conforme art. 14 y arts. 16, 17 de la Constitución Nacional, y la ley 24240,
+    la CSJN (Fallos: 330:1234) y la SCBA sostienen que el consumidor hipervulnerable merece
+    tutela judicial efectiva; (i) el debido proceso; (ii) las garantías (cfr. art. 43);
+    es sabido que la mayoría de la doctrina opina que, inevitablemente, la sanción ejemplar
+    resulta obvio que corresponde. Pienso, considero y propongo una reinterpretación: "la
+    justicia tardía no es justicia". Por el contrario, a contrario sensu, el costo-beneficio
+    y los incentivos; datos, estadística, muestra y regresión.
+    RESUELVO: Hágase lugar. Notifíquese. Cítese. Tómese razón.
+    """,
+]
+
+
+def _chunk_sintetico(tamano: int = 15000) -> str:
+    base = " ".join(t.strip() for t in CORPUS_FIJO if t.strip())
+    repeticiones = tamano // max(1, len(base)) + 1
+    return (base + "\n") * repeticiones
+
+
+def _legacy_score(text, pattern):
+    """Implementación original de AnalyserMetodoMejorado.score_pattern"""
+    matches = re.findall(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
+    return min(1.0, len(matches) / max(1, len(text) // 800))
+
+
+def _legacy_style(text, patterns_list):
+    total_score = sum(_legacy_score(text, p) for p in patterns_list)
+    return min(1.0, total_score / max(1, len(patterns_list)))
+
+
+def _sin_timestamp(perfil):
+    perfil = dict(perfil)
+    perfil["meta"] = {k: v for k, v in perfil["meta"].items() if k != "timestamp"}
+    return perfil
+
+
+def test_taxonomias_analyser(corpus):
+    """Scores por categoría de cada taxonomía"""
+    print("🔍 1. Comparando taxonomías de AnalyserMetodoMejorado...")
+    try:
+        from analyser_metodo_mejorado import AnalyserMetodoMejorado, BANCOS
+
+        analyser = AnalyserMetodoMejorado()
+        for texto in corpus:
+            for nombre, banco in BANCOS.items():
+                if nombre == "estilos":
+                    nuevo = analyser.score_style_bank(texto, banco)
+                    legado = {k: _legacy_style(texto, p) for k, p in banco.taxonomia.items()}
+                else:
+                    nuevo = analyser.score_bank(texto, banco)
+                    legado = {k: _legacy_score(texto, p) for k, p in banco.taxonomia.items()}
+                if nuevo != legado:
+                    raise ValueError(f"Diferencia en '{nombre}': {nuevo} != {legado}")
+
+        print(f"   ✅ {len(BANCOS)} taxonomías idénticas en {len(corpus)} textos")
+        return True
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+
+def test_perfil_completo(corpus):
+    """Perfil autoral completo contra la versión basada en re.findall"""
+    print("🔍 2. Comparando perfil autoral completo...")
+    try:
+        from analyser_metodo_mejorado import AnalyserMetodoMejorado
+
+        class AnalyserLegado(AnalyserMetodoMejorado):
+            def score_pattern(self, text, pattern):
+                return _legacy_score(text, pattern)
+
+            def score_bank(self, text, banco):
+                return {k: _legacy_score(text, p) for k, p in banco.taxonomia.items()}
+
+            def score_style_bank(self, text, banco):
+                return {k: _legacy_style(text, p) for k, p in banco.taxonomia.items()}
+
+        nuevo_analyser = AnalyserMetodoMejorado()
+        legado_analyser = AnalyserLegado()
+
+        t_nuevo = t_legado = 0.0
+        for texto in corpus:
+            inicio = time.perf_counter()
+            nuevo = nuevo_analyser.generar_perfil_autoral_completo(texto, "Autor de Prueba")
+            t_nuevo += time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            legado = legado_analyser.generar_perfil_autoral_completo(texto, "Autor de Prueba")
+            t_legado += time.perf_counter() - inicio
+
+            if _sin_timestamp(nuevo) != _sin_timestamp(legado):
+                raise ValueError("El perfil compilado difiere del perfil original")
+
+        print(f"   ✅ Perfiles idénticos ({t_legado:.3f}s original → {t_nuevo:.3f}s compilado)")
+        return True
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+
+def test_rasgos_cognitivos(corpus):
+    """Conteos de indicadores de extraer_rasgos_cognitivos"""
+    print("🔍 3. Comparando conteos de rasgos cognitivos...")
+    try:
+        from pattern_bank import RASGOS_REGEX, RASGOS_LITERALES, contar_rasgos
+
+        for texto in corpus:
+            texto_lower = texto.lower()
+            legado = {
+                k: sum(len(re.findall(p, texto_lower)) for p in patrones)
+                for k, patrones in RASGOS_REGEX.items()
+            }
+            legado.update({
+                k: sum(texto_lower.count(ind) for ind in patrones)
+                for k, patrones in RASGOS_LITERALES.items()
+            })
+            nuevo = contar_rasgos(texto_lower)
+            if nuevo != legado:
+                raise ValueError(f"Diferencia en rasgos: {nuevo} != {legado}")
+
+        print(f"   ✅ Conteos de rasgos idénticos en {len(corpus)} textos")
+        return True
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
+
+
+def main():
+    """Ejecuta todos los tests"""
+    print("🚀 BANCO DE PATRONES - VALIDACIÓN DE REGRESIÓN")
+    print("=" * 50)
+
+    corpus = CORPUS_FIJO + [_chunk_sintetico()]
+
+    tests = [
+        test_taxonomias_analyser,
+        test_perfil_completo,
+        test_rasgos_cognitivos
+    ]
+
+    exitosos = 0
+    for test in tests:
+        if test(corpus):
+            exitosos += 1
+        print()
+
+    print("=" * 50)
+    print(f"🎯 RESULTADO: {exitosos}/{len(tests)} tests exitosos")
+
+    return exitosos == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -15,6 +15,13 @@ IMPORTANTE:
 - Si el valor esta en pesos, debe traducirse al valor JUS vigente
 - El valor JUS se actualiza periodicamente por el Tribunal Superior de Justicia
 
+RENDIMIENTO:
+- La tabla valores_jus se carga una sola vez por proceso en un indice
+  ordenado por fecha (IndiceValoresJUS); cada consulta es un bisect.
+- El indice se recarga solo si la tabla cambio (PRAGMA data_version).
+- convertir_pesos_a_jus_lote / convertir_jus_a_pesos_lote convierten
+  arreglos completos de (monto, fecha) en una sola llamada.
+
 AUTOR: Sistema Judicial v1.0
 FECHA: 10 DIC 2025
 """
@@ -22,9 +29,12 @@ FECHA: 10 DIC 2025
 import json
 import os
 import sqlite3
+import threading
+from bisect import bisect_right
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, asdict
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 import re
@@ -39,6 +49,98 @@ class ValorJUS:
     observaciones: str = ""
 
 
+class IndiceValoresJUS:
+    """
+    Indice en memoria de valores_jus ordenado por fecha de vigencia
+
+    Se carga una vez y se comparte en el proceso (obtener_indice_jus).
+    Antes de cada consulta compara PRAGMA data_version de su propia
+    conexion: si otra conexion escribio en la base, recarga la tabla.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._version = None
+        # (fechas, valores, fechas como arreglo, pesos como arreglo)
+        self._datos: Tuple[List[str], List[ValorJUS], np.ndarray, np.ndarray] = (
+            [], [], np.array([], dtype=str), np.array([], dtype=float)
+        )
+
+    def invalidar(self):
+        """Fuerza la recarga en la proxima consulta"""
+        with self._lock:
+            self._version = None
+
+    def _cargar(self) -> Tuple[List[str], List[ValorJUS], np.ndarray, np.ndarray]:
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._version:
+                rows = self._conn.execute("""
+                    SELECT fecha_vigencia, valor_pesos, acuerdo_tsj, observaciones
+                    FROM valores_jus
+                    ORDER BY fecha_vigencia
+                """).fetchall()
+                valores = [
+                    ValorJUS(
+                        fecha_vigencia=row[0],
+                        valor_pesos=row[1],
+                        acuerdo_tsj=row[2],
+                        observaciones=row[3] or ""
+                    )
+                    for row in rows
+                ]
+                fechas = [v.fecha_vigencia for v in valores]
+                self._datos = (fechas, valores, np.array(fechas, dtype=str),
+                               np.array([v.valor_pesos for v in valores], dtype=float))
+                self._version = version
+            return self._datos
+
+    def vigente(self, fecha: str) -> Optional[ValorJUS]:
+        """Valor con la fecha de vigencia mas reciente <= fecha"""
+        fechas, valores, _, _ = self._cargar()
+        i = bisect_right(fechas, fecha) - 1
+        return valores[i] if i >= 0 else None
+
+    def vigentes_lote(self, fechas: np.ndarray) -> Tuple[np.ndarray, List[ValorJUS], np.ndarray]:
+        """
+        Posicion del valor vigente para cada fecha (-1 si no hay), junto con
+        la lista de valores y sus montos en pesos
+        """
+        _, valores, fechas_vigencia, pesos = self._cargar()
+        posiciones = np.searchsorted(fechas_vigencia, fechas, side="right") - 1
+        return posiciones, valores, pesos
+
+    def historico(self) -> List[ValorJUS]:
+        return list(self._cargar()[1])
+
+
+_INDICES_JUS: Dict[str, IndiceValoresJUS] = {}
+_BASES_INICIALIZADAS = set()
+_LOCK_INDICES_JUS = threading.Lock()
+
+
+def obtener_indice_jus(db_path: str) -> IndiceValoresJUS:
+    """Indice compartido por todo el proceso para db_path"""
+    clave = os.path.abspath(db_path)
+    with _LOCK_INDICES_JUS:
+        if clave not in _INDICES_JUS:
+            _INDICES_JUS[clave] = IndiceValoresJUS(db_path)
+        return _INDICES_JUS[clave]
+
+
+def _fechas_lote(fechas: Union[None, str, Sequence[Optional[str]]], cantidad: int) -> np.ndarray:
+    """Normaliza las fechas de un lote (None = hoy; una sola fecha se repite)"""
+    hoy = date.today().strftime("%Y-%m-%d")
+    if fechas is None or isinstance(fechas, str):
+        return np.full(cantidad, fechas or hoy)
+    fechas = np.array([f or hoy for f in fechas], dtype=str)
+    if len(fechas) != cantidad:
+        raise ValueError(f"Se esperaban {cantidad} fechas y llegaron {len(fechas)}")
+    return fechas
+
+
 class GestorValoresJUS:
     """
     Gestor de valores JUS del Poder Judicial de Cordoba
@@ -75,7 +177,11 @@ class GestorValoresJUS:
             db_path = os.path.join(script_dir, "..", "data", "valores_jus.db")
 
         self.db_path = db_path
-        self._inicializar_db()
+        clave = os.path.abspath(db_path)
+        if clave not in _BASES_INICIALIZADAS:
+            self._inicializar_db()
+            _BASES_INICIALIZADAS.add(clave)
+        self.indice = obtener_indice_jus(db_path)
 
     def _inicializar_db(self):
         """Crea la tabla de valores JUS si no existe"""
@@ -144,30 +250,8 @@ class GestorValoresJUS:
         if fecha is None:
             fecha = date.today().strftime("%Y-%m-%d")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Buscar el valor vigente mas reciente anterior o igual a la fecha
-        cursor.execute("""
-            SELECT fecha_vigencia, valor_pesos, acuerdo_tsj, observaciones
-            FROM valores_jus
-            WHERE fecha_vigencia <= ?
-            ORDER BY fecha_vigencia DESC
-            LIMIT 1
-        """, (fecha,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            return ValorJUS(
-                fecha_vigencia=row[0],
-                valor_pesos=row[1],
-                acuerdo_tsj=row[2],
-                observaciones=row[3] or ""
-            )
-
-        return None
+        # Valor vigente mas reciente anterior o igual a la fecha
+        return self.indice.vigente(fecha)
 
     def convertir_pesos_a_jus(self, monto_pesos: float,
                               fecha: Optional[str] = None) -> Dict:
@@ -239,6 +323,60 @@ class GestorValoresJUS:
             "url_consulta": self.URL_OFICIAL_JUS
         }
 
+    def _convertir_lote(self, montos: Sequence[float],
+                        fechas: Union[None, str, Sequence[Optional[str]]],
+                        a_jus: bool) -> Dict[str, np.ndarray]:
+        montos = np.asarray(montos, dtype=float)
+        posiciones, valores, pesos = self.indice.vigentes_lote(_fechas_lote(fechas, len(montos)))
+
+        exito = posiciones >= 0
+        valor_aplicado = np.full(len(montos), np.nan)
+        valor_aplicado[exito] = pesos[posiciones[exito]]
+        convertido = np.round(montos / valor_aplicado if a_jus else montos * valor_aplicado, 2)
+
+        fecha_valor = np.full(len(montos), None, dtype=object)
+        fecha_valor[exito] = [valores[i].fecha_vigencia for i in posiciones[exito]]
+
+        return {
+            "exito": exito,
+            "monto_pesos" if a_jus else "monto_jus": montos,
+            "monto_jus" if a_jus else "monto_pesos": convertido,
+            "valor_jus_aplicado": valor_aplicado,
+            "fecha_valor_jus": fecha_valor
+        }
+
+    def convertir_pesos_a_jus_lote(self, montos_pesos: Sequence[float],
+                                   fechas: Union[None, str, Sequence[Optional[str]]] = None) -> Dict[str, np.ndarray]:
+        """
+        Convierte un arreglo de montos en pesos a JUS en una sola llamada
+
+        Args:
+            montos_pesos: Montos en pesos argentinos
+            fechas: Una fecha por monto (YYYY-MM-DD), una fecha para todos
+                    o None (fecha actual)
+
+        Returns:
+            Diccionario de arreglos: exito, monto_pesos, monto_jus (NaN si no
+            hay valor vigente), valor_jus_aplicado y fecha_valor_jus
+        """
+        return self._convertir_lote(montos_pesos, fechas, a_jus=True)
+
+    def convertir_jus_a_pesos_lote(self, montos_jus: Sequence[float],
+                                   fechas: Union[None, str, Sequence[Optional[str]]] = None) -> Dict[str, np.ndarray]:
+        """
+        Convierte un arreglo de montos en JUS a pesos en una sola llamada
+
+        Args:
+            montos_jus: Montos en unidades JUS
+            fechas: Una fecha por monto (YYYY-MM-DD), una fecha para todos
+                    o None (fecha actual)
+
+        Returns:
+            Diccionario de arreglos: exito, monto_jus, monto_pesos (NaN si no
+            hay valor vigente), valor_jus_aplicado y fecha_valor_jus
+        """
+        return self._convertir_lote(montos_jus, fechas, a_jus=False)
+
     def agregar_valor_jus(self, valor: ValorJUS) -> bool:
         """
         Agrega un nuevo valor JUS a la base de datos
@@ -262,6 +400,7 @@ class GestorValoresJUS:
 
             conn.commit()
             conn.close()
+            self.indice.invalidar()
             return True
         except Exception as e:
             conn.close()
@@ -278,28 +417,7 @@ class GestorValoresJUS:
         Returns:
             Lista de ValorJUS ordenados por fecha descendente
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT fecha_vigencia, valor_pesos, acuerdo_tsj, observaciones
-            FROM valores_jus
-            ORDER BY fecha_vigencia DESC
-            LIMIT ?
-        """, (limit,))
-
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [
-            ValorJUS(
-                fecha_vigencia=row[0],
-                valor_pesos=row[1],
-                acuerdo_tsj=row[2],
-                observaciones=row[3] or ""
-            )
-            for row in rows
-        ]
+        return self.indice.historico()[::-1][:limit]
 
     def intentar_actualizar_desde_web(self) -> Dict:
         """
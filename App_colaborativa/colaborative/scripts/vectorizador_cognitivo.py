@@ -22,13 +22,9 @@ import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Tuple, List, Optional
-
-# Imports con manejo de errores
-try:
-    from sentence_transformers import SentenceTransformer
-except ImportError:
-    print("❌ Error: Instala sentence-transformers con: pip install sentence-transformers")
-    raise
+from pattern_bank import contar_rasgos
+from carga_perezosa import REGISTRO
+from almacen_vectorial import AlmacenVectorialMmap, referencia, es_referencia, id_de_referencia
 
 # ----------------------------------------------------------
 # CONFIGURACIÓN DE RUTAS
@@ -87,19 +83,63 @@ def init_cognitive_db():
     conn.close()
     print("✅ Base de datos cognitiva inicializada")
 
-# Inicializar al importar
-init_cognitive_db()
+# Inicialización diferida: se ejecuta en la primera operación sobre la base
+_db_inicializada = False
+
+def _asegurar_db():
+    global _db_inicializada
+    if not _db_inicializada:
+        init_cognitive_db()
+        _db_inicializada = True
 
 # ----------------------------------------------------------
-# MODELO DE EMBEDDINGS
+# MODELO DE EMBEDDINGS (carga perezosa)
 # ----------------------------------------------------------
-print("🔹 Cargando modelo cognitivo (all-mpnet-base-v2)...")
-try:
-    model = SentenceTransformer('all-mpnet-base-v2')
-    print("✅ Modelo cargado exitosamente")
-except Exception as e:
-    print(f"❌ Error cargando modelo: {e}")
-    raise
+def _crear_modelo_cognitivo():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("❌ Error: Instala sentence-transformers con: pip install sentence-transformers")
+        raise
+    
+    print("🔹 Cargando modelo cognitivo (all-mpnet-base-v2)...")
+    try:
+        modelo = SentenceTransformer('all-mpnet-base-v2')
+        print("✅ Modelo cargado exitosamente")
+        return modelo
+    except Exception as e:
+        print(f"❌ Error cargando modelo: {e}")
+        raise
+
+REGISTRO.registrar("modelo_cognitivo", _crear_modelo_cognitivo)
+
+def get_model():
+    """Modelo de embeddings cognitivo (se carga en el primer uso)"""
+    return REGISTRO.obtener("modelo_cognitivo")
+
+# ----------------------------------------------------------
+# ALMACÉN VECTORIAL CONSOLIDADO (reemplaza un .npy por documento)
+# ----------------------------------------------------------
+_almacen = None
+
+def get_almacen() -> AlmacenVectorialMmap:
+    """Almacén memory-mapped de vectores cognitivos en FAISS_PATH"""
+    global _almacen
+    if _almacen is None:
+        _almacen = AlmacenVectorialMmap(FAISS_PATH)
+    return _almacen
+
+def cargar_vector(vector_path: str) -> Optional[np.ndarray]:
+    """Resuelve perfiles_cognitivos.vector_path (referencia del almacén o .npy heredado)"""
+    if es_referencia(vector_path):
+        return get_almacen().obtener(id_de_referencia(vector_path))
+    if vector_path and os.path.exists(vector_path):
+        return np.load(vector_path)
+    return None
+
+def cargar_todos_los_vectores() -> Tuple[List[str], np.ndarray]:
+    """Ids y matriz de todos los vectores cognitivos vivos (un solo mmap)"""
+    return get_almacen().vivos()
 
 # ----------------------------------------------------------
 # ANÁLISIS COGNITIVO AVANZADO
@@ -127,57 +167,27 @@ def extraer_rasgos_cognitivos(texto: str) -> Dict[str, float]:
     oraciones = re.split(r'[.!?]+', texto)
     total_oraciones = len([s for s in oraciones if s.strip()]) or 1
     
+    # Conteos de todos los indicadores en una sola pasada del banco compilado
+    conteos = contar_rasgos(texto_lower)
+    
     # 1. FORMALISMO JURÍDICO
-    indicadores_formales = [
-        r'\bart\.\s*\d+', r'\binc\.\s*\d+', r'\bley\s+\d+',
-        r'\bcódigo\s+civil', r'\bcódigo\s+penal', r'\bconstituci[óo]n',
-        r'\bdecreto\s+\d+', r'\bresoluci[óo]n\s+\d+'
-    ]
-    formalismo = sum(len(re.findall(patron, texto_lower)) for patron in indicadores_formales) / total_palabras
+    formalismo = conteos["formalismo"] / total_palabras
     
     # 2. CREATIVIDAD INTERPRETATIVA
-    indicadores_creativos = [
-        'interpretaci[óo]n', 'reinterpret', 'nueva perspectiva', 'enfoque innovador',
-        'propone', 'sugiere', 'plantea', 'considera', 'podríamos entender',
-        'cabe preguntarse', 'sería posible', 'alternativa'
-    ]
-    creatividad = sum(texto_lower.count(ind) for ind in indicadores_creativos) / total_palabras
+    creatividad = conteos["creatividad"] / total_palabras
     
     # 3. DOGMATISMO DOCTRINAL
-    indicadores_dogmaticos = [
-        'según la doctrina', 'la doctrina enseña', 'es incuestionable', 'sin duda',
-        'claramente establece', 'definitivamente', 'incondicionalmente',
-        'tradicionalmente', 'clásicamente', 'ortodoxamente'
-    ]
-    dogmatismo = sum(texto_lower.count(ind) for ind in indicadores_dogmaticos) / total_palabras
+    dogmatismo = conteos["dogmatismo"] / total_palabras
     
     # 4. EMPIRISMO (uso de casos, ejemplos)
-    indicadores_empiricos = [
-        r'\bcaso\b', r'\bejemplo\b', r'\bpráctica\b', r'\bexperiencia\b',
-        r'\bfallo\b', r'\bsentencia\b', r'\bjurisprudencia\b',
-        r'\btribunal\b', r'\bcorte\b', r'\bjuzgado\b'
-    ]
-    empirismo = sum(len(re.findall(patron, texto_lower)) for patron in indicadores_empiricos) / total_palabras
+    empirismo = conteos["empirismo"] / total_palabras
     
     # 5. INTERDISCIPLINARIEDAD
-    disciplinas = [
-        'sociolog[íi]a', 'econom[íi]a', 'filosofia', 'psicolog[íi]a',
-        'antropolog[íi]a', 'ciencia pol[íi]tica', 'historia',
-        'lingü[íi]stica', 'l[óo]gica', 'estadística'
-    ]
-    interdisciplinariedad = sum(len(re.findall(disc, texto_lower)) for disc in disciplinas) / total_palabras
+    interdisciplinariedad = conteos["interdisciplinariedad"] / total_palabras
     
     # 6. NIVEL DE ABSTRACCIÓN
-    indicadores_abstractos = [
-        'principio', 'concepto', 'teoría', 'fundamento', 'esencia',
-        'naturaleza', 'categoría', 'noción', 'idea', 'pensamiento'
-    ]
-    indicadores_concretos = [
-        'específicamente', 'concretamente', 'en particular', 'por ejemplo',
-        'caso concreto', 'situación específica', 'aplicación práctica'
-    ]
-    abstraccion_score = sum(texto_lower.count(ind) for ind in indicadores_abstractos)
-    concreto_score = sum(texto_lower.count(ind) for ind in indicadores_concretos)
+    abstraccion_score = conteos["abstraccion"]
+    concreto_score = conteos["concreto"]
     
     if abstraccion_score + concreto_score > 0:
         nivel_abstraccion = abstraccion_score / (abstraccion_score + concreto_score)
@@ -189,12 +199,7 @@ def extraer_rasgos_cognitivos(texto: str) -> Dict[str, float]:
     complejidad_sintactica = min(palabras_por_oracion / 20.0, 1.0)  # Normalizado a [0,1]
     
     # 8. USO DE JURISPRUDENCIA
-    indicadores_jurisprudenciales = [
-        r'c\.s\.j\.n\.', r'corte suprema', r'cámara nacional', r'tribunal superior',
-        r'fallo\s+\w+', r'sentencia\s+del', r'decidió que', r'sostuvo que',
-        r'in re\s+\w+', r'autos\s+\w+'
-    ]
-    uso_jurisprudencia = sum(len(re.findall(patron, texto_lower)) for patron in indicadores_jurisprudenciales) / total_palabras
+    uso_jurisprudencia = conteos["uso_jurisprudencia"] / total_palabras
     
     return {
         "formalismo": min(formalismo * 100, 1.0),  # Escalar apropiadamente
@@ -263,7 +268,7 @@ def generar_vector_cognitivo(texto: str) -> Tuple[np.ndarray, Dict[str, float]]:
 
     # Embedding semántico base
     try:
-        emb = model.encode(texto, normalize_embeddings=True)
+        emb = get_model().encode(texto, normalize_embeddings=True)
     except Exception as e:
         raise ValueError(f"Error generando embedding: {e}")
 
@@ -284,8 +289,9 @@ def generar_vector_cognitivo(texto: str) -> Tuple[np.ndarray, Dict[str, float]]:
 def registrar_perfil(autor: str, texto: str, fuente: str, texto_muestra: Optional[str] = None, 
                     metadatos_extra: Optional[Dict] = None) -> str:
     """
-    Registra un perfil cognitivo en la base de datos y guarda el vector
-    en un archivo .npy dentro del índice FAISS.
+    Registra un perfil cognitivo en la base de datos y agrega el vector
+    al almacén consolidado de FAISS_PATH. Devuelve la referencia guardada
+    en vector_path ("mmap:<id>").
     """
     if not autor or not texto or not fuente:
         raise ValueError("Autor, texto y fuente son obligatorios")
@@ -297,16 +303,17 @@ def registrar_perfil(autor: str, texto: str, fuente: str, texto_muestra: Optiona
         tipo_pensamiento = detectar_tipo_pensamiento(rasgos)
         tono = detectar_tono(texto)
         
-        # Generar nombre único para el archivo
+        # Generar id único para el vector
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         autor_clean = re.sub(r'[^\w\s-]', '', autor).replace(' ', '_').lower()
-        nombre_archivo = f"{autor_clean}_{timestamp}.npy"
-        vector_path = FAISS_PATH / nombre_archivo
+        vector_id = f"{autor_clean}_{timestamp}"
+        vector_path = referencia(vector_id)
         
-        # Guardar vector
-        np.save(vector_path, vector)
+        # Guardar vector en el almacén consolidado
+        get_almacen().agregar_lote([(vector_id, vector)])
         
         # Registrar en base de datos
+        _asegurar_db()
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
@@ -389,6 +396,7 @@ def registrar_perfil(autor: str, texto: str, fuente: str, texto_muestra: Optiona
 # ----------------------------------------------------------
 def listar_perfiles(limit: int = 10) -> List[Tuple]:
     """Devuelve una lista de perfiles registrados en la base de datos."""
+    _asegurar_db()
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -405,6 +413,7 @@ def listar_perfiles(limit: int = 10) -> List[Tuple]:
 
 def obtener_estadisticas() -> Dict:
     """Retorna estadísticas generales de los perfiles"""
+    _asegurar_db()
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -29,9 +29,11 @@ FECHA: 12 NOV 2025
 from flask import render_template_string, request, jsonify, send_file
 from pathlib import Path
 import json
-import sqlite3
 from datetime import datetime
 
+# Pool de conexiones compartido (lecturas por hilo + escritor serializado)
+from pool_sqlite import obtener_pool, registrar_en_flask
+
 # Importar adaptador
 from analyser_judicial_adapter import AnalyserJudicialAdapter, BibliotecaJudicial
 
@@ -46,6 +48,15 @@ from analizador_lineas_jurisprudenciales import AnalizadorLineasJurisprudenciale
 from analizador_redes_influencia import AnalizadorRedesInfluencia
 from motor_predictivo_judicial import MotorPredictivoJudicial
 
+# Búsqueda facetada de sentencias
+from buscador_sentencias import BuscadorSentencias, FACETAS
+
+# ETag / 304 por generación de datos del juez
+from cache_respuestas import cache_condicional
+
+# Informes en segundo plano
+from cola_trabajos import encolar, registrar_rutas_trabajos, respuesta_encolado
+
 # Configuración
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR = SCRIPT_DIR.parent
@@ -56,19 +67,32 @@ DB_JUDICIAL = BASES_RAG_DIR / "juez_centrico_arg.db"
 biblioteca_judicial = None
 generador_informes = None
 motor_preguntas = None
+buscador_sentencias = None
 
 
 def init_sistema_judicial():
     """Inicializa el sistema judicial"""
-    global biblioteca_judicial, generador_informes, motor_preguntas
+    global biblioteca_judicial, generador_informes, motor_preguntas, buscador_sentencias
 
     biblioteca_judicial = BibliotecaJudicial()
     generador_informes = GeneradorInformesJudicial()
     motor_preguntas = MotorRespuestasJudiciales()
 
+    # Los índices y el FTS5 se crean fuera del arranque (buscador_sentencias.py
+    # --preparar); acá sólo se verifica que existan
+    buscador_sentencias = BuscadorSentencias(DB_JUDICIAL)
+    if not buscador_sentencias.fts_disponible:
+        print("⚠️ Índice FTS5 de sentencias ausente: búsqueda sin recuperación léxica")
+        print("📋 Ejecutá: python buscador_sentencias.py --preparar")
+
     print("✅ Sistema Judicial inicializado")
 
 
+def dependencias_juez(nombre: str):
+    """Generación de la que depende una página del juez (el mismo juez que muestra la página)"""
+    return [(DB_JUDICIAL, 'juez', biblioteca_judicial.resolver_juez(nombre))]
+
+
 def registrar_rutas_judicial(app):
     """
     Registra las rutas judiciales en la app Flask
@@ -77,6 +101,10 @@ def registrar_rutas_judicial(app):
         from webapp_rutas_judicial import registrar_rutas_judicial
         registrar_rutas_judicial(app)
     """
+    # Devuelve las conexiones de lectura al pool al terminar cada request
+    registrar_en_flask(app)
+    # Estado/cancelación de los informes encolados (idempotente si ya estaban)
+    registrar_rutas_trabajos(app)
 
     # =========================================================================
     # RUTA PRINCIPAL: BÚSQUEDA DE SENTENCIAS
@@ -90,21 +118,30 @@ def registrar_rutas_judicial(app):
 
     @app.route('/judicial/buscar/query', methods=['POST'])
     def judicial_buscar_query():
-        """API: Búsqueda semántica de sentencias"""
-        data = request.get_json()
-        query = data.get('query', '')
-        fuero = data.get('fuero', None)
-        juez = data.get('juez', None)
-
-        # TODO: Implementar búsqueda RAG adaptada
-        # Por ahora devolver placeholder
-        resultados = {
-            'query': query,
-            'resultados': [],
-            'mensaje': 'Búsqueda RAG en desarrollo'
+        """API: Búsqueda híbrida (facetas SQL + FTS5 + vectores) de sentencias"""
+        data = request.get_json() or {}
+        filtros = {
+            campo: data.get(campo)
+            for campo in FACETAS + ('fecha_desde', 'fecha_hasta')
+            if data.get(campo)
         }
 
-        return jsonify(resultados)
+        try:
+            pagina = int(data.get('pagina', 1))
+            por_pagina = int(data.get('por_pagina', 20))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'pagina y por_pagina deben ser enteros', 'resultados': []}), 400
+
+        try:
+            resultados = buscador_sentencias.buscar(
+                data.get('query', ''),
+                filtros,
+                pagina=pagina,
+                por_pagina=por_pagina
+            )
+            return jsonify(resultados)
+        except Exception as e:
+            return jsonify({'error': str(e), 'resultados': []}), 500
 
     # =========================================================================
     # LISTADO DE JUECES
@@ -129,6 +166,7 @@ def registrar_rutas_judicial(app):
     # =========================================================================
 
     @app.route('/juez/<nombre>')
+    @cache_condicional(dependencias_juez)
     def perfil_juez(nombre):
         """Perfil completo del juez"""
         try:
@@ -188,10 +226,7 @@ def registrar_rutas_judicial(app):
     def lineas_juez(juez):
         """Líneas jurisprudenciales del juez"""
         try:
-            conn = sqlite3.connect(DB_JUDICIAL)
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            filas = obtener_pool(DB_JUDICIAL).consultar("""
             SELECT tema, cantidad_sentencias, consistencia_score,
                    criterio_dominante, confianza
             FROM lineas_jurisprudenciales
@@ -200,7 +235,7 @@ def registrar_rutas_judicial(app):
             """, (juez,))
 
             lineas = []
-            for row in cursor.fetchall():
+            for row in filas:
                 lineas.append({
                     'tema': row[0],
                     'cantidad': row[1],
@@ -209,8 +244,6 @@ def registrar_rutas_judicial(app):
                     'confianza': row[4]
                 })
 
-            conn.close()
-
             return render_template_string(
                 TEMPLATE_LINEAS,
                 juez=juez,
@@ -227,40 +260,37 @@ def registrar_rutas_judicial(app):
     def red_influencias(juez):
         """Red de influencias del juez"""
         try:
-            conn = sqlite3.connect(DB_JUDICIAL)
-            cursor = conn.cursor()
+            pool = obtener_pool(DB_JUDICIAL)
 
             # CSJN
-            cursor.execute("""
+            filas = pool.consultar("""
             SELECT juez_destino, intensidad, cantidad_citas
             FROM redes_influencia_judicial
             WHERE juez_origen = ? AND tipo_destino = 'csjn'
             ORDER BY cantidad_citas DESC
             LIMIT 10
             """, (juez,))
-            csjn = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in cursor.fetchall()]
+            csjn = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in filas]
 
             # Tribunales
-            cursor.execute("""
+            filas = pool.consultar("""
             SELECT juez_destino, intensidad, cantidad_citas
             FROM redes_influencia_judicial
             WHERE juez_origen = ? AND tipo_destino = 'tribunal_superior'
             ORDER BY cantidad_citas DESC
             LIMIT 10
             """, (juez,))
-            tribunales = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in cursor.fetchall()]
+            tribunales = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in filas]
 
             # Autores
-            cursor.execute("""
+            filas = pool.consultar("""
             SELECT juez_destino, intensidad, cantidad_citas
             FROM redes_influencia_judicial
             WHERE juez_origen = ? AND tipo_destino = 'autor_doctrinal'
             ORDER BY cantidad_citas DESC
             LIMIT 15
             """, (juez,))
-            autores = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in cursor.fetchall()]
-
-            conn.close()
+            autores = [{'destino': r[0], 'intensidad': r[1], 'citas': r[2]} for r in filas]
 
             return render_template_string(
                 TEMPLATE_RED,
@@ -280,10 +310,7 @@ def registrar_rutas_judicial(app):
     def prediccion_juez(juez):
         """Análisis predictivo del juez"""
         try:
-            conn = sqlite3.connect(DB_JUDICIAL)
-            cursor = conn.cursor()
-
-            cursor.execute("""
+            filas = obtener_pool(DB_JUDICIAL).consultar("""
             SELECT factor, peso, confianza
             FROM factores_predictivos
             WHERE juez = ?
@@ -292,15 +319,13 @@ def registrar_rutas_judicial(app):
             """, (juez,))
 
             factores = []
-            for row in cursor.fetchall():
+            for row in filas:
                 factores.append({
                     'factor': row[0],
                     'peso': row[1],
                     'confianza': row[2]
                 })
 
-            conn.close()
-
             return render_template_string(
                 TEMPLATE_PREDICCION,
                 juez=juez,
@@ -320,20 +345,20 @@ def registrar_rutas_judicial(app):
 
     @app.route('/informes/generar', methods=['POST'])
     def generar_informe():
-        """API: Genera informe"""
-        data = request.get_json()
+        """API: Encola el informe y responde 202 con la URL de estado del trabajo"""
+        data = request.get_json() or {}
         juez = data.get('juez')
         tipo = data.get('tipo', 'completo')
         formato = data.get('formato', 'txt')
 
-        try:
-            if tipo == 'completo':
-                ruta = generador_informes.generar_informe_completo(juez, formato)
+        if not juez:
+            return jsonify({'success': False, 'error': 'Falta el juez'}), 400
+        if tipo != 'completo':
             # TODO: Otros tipos de informes
+            return jsonify({'success': False, 'error': f'Tipo de informe no soportado: {tipo}'}), 400
 
-            return jsonify({'success': True, 'ruta': ruta})
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e)}), 500
+        trabajo_id, nuevo = encolar('informe_juez', {'juez': juez, 'formato': formato})
+        return respuesta_encolado(trabajo_id, nuevo)
 
     # =========================================================================
     # SISTEMA DE PREGUNTAS
@@ -738,12 +763,21 @@ TEMPLATE_INFORMES = """
     </div>
 
     <script>
+        // Rutas, errores y mensajes del trabajo van con textContent (no como HTML)
+        function mensaje(texto, color) {
+            const p = document.createElement('p');
+            p.textContent = texto;
+            if (color) { p.style.color = color; }
+            document.getElementById('resultado').replaceChildren(p);
+            return p;
+        }
+
         function generar() {
             const juez = document.getElementById('juez').value;
             const tipo = document.getElementById('tipo').value;
             const formato = document.getElementById('formato').value;
 
-            document.getElementById('resultado').innerHTML = '<p>Generando informe...</p>';
+            mensaje('Generando informe...');
 
             fetch('/informes/generar', {
                 method: 'POST',
@@ -753,11 +787,34 @@ TEMPLATE_INFORMES = """
             .then(r => r.json())
             .then(data => {
                 if (data.success) {
-                    document.getElementById('resultado').innerHTML =
-                        '<p style="color: green;">✓ Informe generado: ' + data.ruta + '</p>';
+                    seguirTrabajo(data.estado_url);
                 } else {
-                    document.getElementById('resultado').innerHTML =
-                        '<p style="color: red;">✗ Error: ' + data.error + '</p>';
+                    mensaje('✗ Error: ' + data.error, 'red');
+                }
+            });
+        }
+
+        function seguirTrabajo(url) {
+            fetch(url)
+            .then(r => r.json())
+            .then(t => {
+                if (t.estado === 'terminado') {
+                    const p = mensaje('✓ Informe generado: ' + t.resultado.ruta + ' ', 'green');
+                    const enlace = document.createElement('a');
+                    enlace.href = '/trabajos/' + encodeURIComponent(t.id) + '/resultado';
+                    enlace.textContent = '⬇️ Descargar';
+                    p.append(enlace);
+                } else if (t.estado === 'error' || t.estado === 'cancelado') {
+                    mensaje('✗ ' + (t.error || t.estado), 'red');
+                } else {
+                    const p = mensaje('Generando informe... ' + Math.round(t.progreso * 100) + '% ' +
+                        (t.mensaje || '') + ' ');
+                    const boton = document.createElement('button');
+                    boton.textContent = 'Cancelar';
+                    boton.addEventListener('click', () =>
+                        fetch('/trabajos/' + encodeURIComponent(t.id) + '/cancelar', {method: 'POST'}));
+                    p.append(boton);
+                    setTimeout(() => seguirTrabajo(url), 1000);
                 }
             });
         }
@@ -773,38 +830,123 @@ TEMPLATE_BUSCAR_SENTENCIAS = """
     <title>Búsqueda de Sentencias - Sistema Judicial</title>
     <style>
         body { font-family: Arial; padding: 20px; background: #f5f5f5; }
-        .container { max-width: 900px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }
+        .container { max-width: 1100px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }
         h1 { color: #2c3e50; }
         input, select { padding: 10px; margin: 5px 0; border: 1px solid #ddd; border-radius: 5px; }
         button { background: #3498db; color: white; padding: 10px 20px; border: none; border-radius: 5px; cursor: pointer; }
         button:hover { background: #2980b9; }
+        .layout { display: grid; grid-template-columns: 250px 1fr; gap: 20px; margin-top: 20px; }
+        .faceta h4 { margin: 15px 0 5px 0; color: #2c3e50; }
+        .faceta a { display: block; color: #3498db; cursor: pointer; font-size: 13px; }
+        .resultado { border-bottom: 1px solid #eee; padding: 10px 0; }
+        .meta { color: #7f8c8d; font-size: 13px; }
     </style>
 </head>
 <body>
     <div class="container">
         <h1>🔍 Búsqueda de Sentencias (RAG)</h1>
-        <p>Búsqueda semántica en sentencias judiciales argentinas</p>
-
-        <input type="text" id="query" placeholder="Ej: despido discriminatorio por embarazo" style="width: 70%;">
-        <button onclick="buscar()">Buscar</button>
-
-        <div id="resultados" style="margin-top: 20px;"></div>
+        <p>Búsqueda semántica y léxica en sentencias judiciales argentinas</p>
+
+        <input type="text" id="query" placeholder="Ej: despido discriminatorio por embarazo" style="width: 60%;">
+        <input type="date" id="fecha_desde"> <input type="date" id="fecha_hasta">
+        <button onclick="buscar(1)">Buscar</button>
+        <div id="filtros"></div>
+
+        <div class="layout">
+            <div id="facetas"></div>
+            <div>
+                <div id="resumen"></div>
+                <div id="resultados"></div>
+                <div id="paginas"></div>
+            </div>
+        </div>
     </div>
 
     <script>
-        function buscar() {
-            const query = document.getElementById('query').value;
-            document.getElementById('resultados').innerHTML = '<p>Buscando...</p>';
+        const filtros = {};
+
+        // Todo dato del servidor (carátulas, jueces, fragmentos, facetas) se
+        // inserta con textContent: nunca se interpreta como HTML
+        function nodo(tag, texto, clase) {
+            const el = document.createElement(tag);
+            if (texto !== undefined && texto !== null) { el.textContent = texto; }
+            if (clase) { el.className = clase; }
+            return el;
+        }
+
+        function mostrar(id, ...hijos) {
+            document.getElementById(id).replaceChildren(...hijos);
+        }
+
+        function filtrar(campo, valor) {
+            if (filtros[campo] === valor) { delete filtros[campo]; } else { filtros[campo] = valor; }
+            buscar(1);
+        }
+
+        function enlaceFiltro(campo, valor, texto) {
+            const a = nodo('a', texto);
+            a.addEventListener('click', () => filtrar(campo, valor));
+            return a;
+        }
+
+        function buscar(pagina) {
+            const body = Object.assign({}, filtros, {
+                query: document.getElementById('query').value,
+                fecha_desde: document.getElementById('fecha_desde').value,
+                fecha_hasta: document.getElementById('fecha_hasta').value,
+                pagina: pagina
+            });
+            mostrar('resultados', nodo('p', 'Buscando...'));
 
             fetch('/judicial/buscar/query', {
                 method: 'POST',
                 headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({query})
+                body: JSON.stringify(body)
             })
             .then(r => r.json())
             .then(data => {
-                document.getElementById('resultados').innerHTML =
-                    '<p>' + data.mensaje + '</p>';
+                if (data.error) {
+                    mostrar('resultados', nodo('p', 'Error: ' + data.error));
+                    return;
+                }
+                mostrar('filtros', ...Object.keys(filtros).map(
+                    c => enlaceFiltro(c, filtros[c], '✖ ' + c + ': ' + filtros[c])
+                ));
+
+                const resumen = nodo('p');
+                resumen.append(nodo('strong', String(data.total)),
+                    ' sentencias (' + data.modo + ', ' + data.ms + ' ms)');
+                mostrar('resumen', resumen);
+
+                mostrar('resultados', ...data.resultados.map(r => {
+                    const div = nodo('div', null, 'resultado');
+                    div.append(
+                        nodo('strong', r.caratula || r.sentencia_id),
+                        nodo('div', [r.fecha_sentencia || '', r.juez || '', r.fuero || '',
+                                     r.resultado || ''].join(' · '), 'meta'),
+                        nodo('div', (r.fragmento || '') + '...')
+                    );
+                    return div;
+                }));
+
+                const paginas = [];
+                for (let p = 1; p <= Math.min(data.paginas, 20); p++) {
+                    const boton = nodo('button', String(p));
+                    boton.disabled = (p === data.pagina);
+                    boton.addEventListener('click', () => buscar(p));
+                    paginas.push(boton, ' ');
+                }
+                mostrar('paginas', ...paginas);
+
+                mostrar('facetas', ...Object.entries(data.facetas || {})
+                    .filter(([campo]) => campo !== 'anio')
+                    .map(([campo, valores]) => {
+                        const div = nodo('div', null, 'faceta');
+                        div.append(nodo('h4', campo), ...valores.map(
+                            v => enlaceFiltro(campo, v.valor, v.valor + ' (' + v.cantidad + ')')
+                        ));
+                        return div;
+                    }));
             });
         }
     </script>